@@ -10,24 +10,40 @@ bl_info = {
 }
 
 import bpy
+import time
+_import_start = time.perf_counter()
 from . import (
 	propertygroup,
-	move_to_furthest_uv,
-	stitch,
 	panel,
-	loopringuv,
-	gridify,
-	relativeislands,
-	uvtransform,
-	unrotate,
-	rectangularize,
-	hotspot,
-	uvboundstransform,
-	uvgrowshrink,
-	preferences,
-	linear_deformer_uv,
-	seambyangle
+	startup
 )
+startup.import_times['__init__'] = time.perf_counter() - _import_start
+
+#the tool modules are imported and registered from register() through startup, which times each of them.
+#instrument wraps the operators of the modules before it. preferences goes last since its keymaps set operator
+#properties.
+TOOL_MODULES = (
+	'loopringuv',
+	'move_to_furthest_uv',
+	'linear_deformer_uv',
+	'stitch',
+	'gridify',
+	'relativeislands',
+	'unrotate',
+	'uvtransform',
+	'rectangularize',
+	'hotspot',
+	'uvboundstransform',
+	'uvgrowshrink',
+	'seambyangle',
+	'islandpick',
+	'islandtable',
+	'looptris',
+	'redocache',
+	'instrument',
+	'preferences'
+)
+tool_modules = []
 
 class rmKitUVPannel_parent( bpy.types.Panel ):
 	bl_idname = "VIEW3D_PT_RMKITUV_PARENT"
@@ -50,48 +66,30 @@ class rmKitUVPannel_parent_uv( bpy.types.Panel ):
 	def draw( self, context ):
 		layout = self.layout
 
+
 def register():
+	startup.reset()
 	bpy.utils.register_class( rmKitUVPannel_parent )
 	bpy.utils.register_class( rmKitUVPannel_parent_uv )
 
-	propertygroup.register()
-	panel.register()
+	startup.register_modules( (
+		propertygroup,
+		panel
+	) )
+
+	modules = startup.import_modules( __package__, TOOL_MODULES )
+	for module in modules:
+		startup.register_modules( ( module, ) )
+		tool_modules.append( module )
 
-	loopringuv.register()
-	move_to_furthest_uv.register()
-	linear_deformer_uv.register()	
-	stitch.register()
-	gridify.register()
-	relativeislands.register()
-	unrotate.register()
-	uvtransform.register()
-	rectangularize.register()
-	hotspot.register()
-	uvboundstransform.register()
-	uvgrowshrink.register()
-	seambyangle.register()
-	
-	preferences.register()
 
 def unregister():
-	bpy.utils.unregister_class( rmKitUVPannel_parent )
-	bpy.utils.unregister_class( rmKitUVPannel_parent_uv )
+	for module in tool_modules:
+		module.unregister()
+	tool_modules.clear()
 
 	propertygroup.unregister()
 	panel.unregister()
 
-	loopringuv.unregister()
-	move_to_furthest_uv.unregister()
-	linear_deformer_uv.unregister()
-	stitch.unregister()
-	gridify.unregister()
-	relativeislands.unregister()
-	unrotate.unregister()
-	uvtransform.unregister()
-	rectangularize.unregister()
-	hotspot.unregister()
-	uvboundstransform.unregister()
-	uvgrowshrink.unregister()
-	seambyangle.unregister()
-	
-	preferences.unregister()
\ No newline at end of file
+	bpy.utils.unregister_class( rmKitUVPannel_parent )
+	bpy.utils.unregister_class( rmKitUVPannel_parent_uv )
@@ -0,0 +1,87 @@
+#rmKitUV numeric core benchmark. runs on plain CPython with numpy, no blender needed:
+#	python benchmarks/bench_core.py [--sizes 16,64,128] [--repeat 5] [--json core.json]
+#the core modules can be profiled the same way, e.g. python -m cProfile -s cumtime benchmarks/bench_core.py
+
+import argparse, json, os, statistics, sys, tempfile, time
+import numpy as np
+
+sys.path.insert( 0, os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) ) )
+from core import gridmap, hotfile, lscm, stitchalign
+
+
+def parse_args():
+	parser = argparse.ArgumentParser( description='Time the bpy independent rmKitUV cores.' )
+	parser.add_argument( '--sizes', default='16,48,96', help='comma separated sizes ( grid quads per side, hotspots in the repo )' )
+	parser.add_argument( '--repeat', type=int, default=5, help='runs per case, the median is reported' )
+	parser.add_argument( '--json', default='', help='write the results to this file' )
+	return parser.parse_args()
+
+
+def grid_patch( size, rng ):
+	#( (V,3) coords, (T,3) tris, (V,2) uvs ) of a bumpy size x size quad grid
+	xs, ys = np.meshgrid( np.arange( size + 1, dtype=np.float64 ), np.arange( size + 1, dtype=np.float64 ) )
+	coords = np.stack( ( xs.ravel(), ys.ravel(), rng.random( xs.size ) * 0.25 ), axis=1 )
+	a = ( np.arange( size )[None,:] + np.arange( size )[:,None] * ( size + 1 ) ).ravel()
+	tris = np.concatenate( ( np.stack( ( a, a + 1, a + size + 2 ), axis=1 ), np.stack( ( a, a + size + 2, a + size + 1 ), axis=1 ) ) )
+	return coords, tris, coords[:,0:2] / size
+
+
+def hot_repo( count, rng ):
+	materials = []
+	hotspots = []
+	for i in range( count ):
+		edges = np.sort( rng.random( 8 ) )
+		bounds = [ hotfile.Bounds2d.from_floats( 0.0, edges[j], 1.0, edges[j+1] ) for j in range( 7 ) ]
+		materials.append( [ 'mat_{}'.format( i ) ] )
+		hotspots.append( hotfile.Hotspot( bounds, name='mat_{}'.format( i ) ) )
+	return materials, hotspots
+
+
+def cases( size, rng, tmpdir ):
+	#( name, callable ) pairs for one size
+	coords, tris, uvs = grid_patch( size, rng )
+	pins = [ 0, len( coords ) - 1 ]
+	rings = coords.reshape( size + 1, size + 1, 3 )
+	chain = np.stack( ( np.linspace( 0.0, 1.0, size ), np.zeros( size ) ), axis=1 )
+	materials, hotspots = hot_repo( size, rng )
+	hotpath = os.path.join( tmpdir, 'bench_{}.hot'.format( size ) )
+	hotfile.write_hot_file( hotpath, materials, hotspots )
+	sources = hotfile.pack_bounds( [ hotfile.Bounds2d.from_floats( 0.0, 0.0, w, h ) for w, h in rng.random( ( size * size, 2 ) ) + 0.01 ] )
+	targets = hotspots[0].packed()[np.arange( size * size ) % len( hotspots[0].data )]
+	source_bounds = hotfile.Bounds2d.from_floats( 0.0, 0.0, 0.3, 0.1, materialaspect=1.0 )
+	return (
+		( 'lscm_solve', lambda : lscm.solve( coords, tris, pins, uvs[pins], uvs, 2 ) ),
+		( 'lscm_solve_axis', lambda : lscm.solve( coords, tris, pins, uvs[pins], uvs, 1 ) ),
+		( 'grid_uvs', lambda : gridmap.grid_uvs( rings ) ),
+		( 'grid_fit', lambda : gridmap.fit_affine( *gridmap.bbox( uvs ), uvs ) ),
+		( 'stitch_align', lambda : stitchalign.align( chain, chain[::-1] + 1.0, midpoint=True ) ),
+		( 'hot_write', lambda : hotfile.write_hot_file( hotpath, materials, hotspots ) ),
+		( 'hot_read', lambda : hotfile.read_hot_file( hotpath ) ),
+		( 'hotspot_match', lambda : [ h.match( source_bounds ) for h in hotspots ] ),
+		( 'fit_array', lambda : hotfile.fit_array( sources, targets ) ),
+	)
+
+
+def main():
+	args = parse_args()
+	sizes = [ int( s ) for s in args.sizes.split( ',' ) if s.strip() ]
+	rng = np.random.default_rng( 0 )
+	results = []
+	with tempfile.TemporaryDirectory( prefix='rmkituv_core_' ) as tmpdir:
+		for size in sizes:
+			for name, func in cases( size, rng, tmpdir ):
+				times = []
+				for n in range( max( 1, args.repeat ) ):
+					t = time.perf_counter()
+					func()
+					times.append( time.perf_counter() - t )
+				results.append( { 'case' : name, 'size' : size, 'median_ms' : statistics.median( times ) * 1000.0, 'min_ms' : min( times ) * 1000.0 } )
+				print( '{:<18}{:>5}  {:9.3f} ms'.format( name, size, results[-1]['median_ms'] ) )
+
+	if args.json:
+		with open( args.json, 'w' ) as f:
+			json.dump( { 'python' : sys.version.split()[0], 'numpy' : np.__version__, 'results' : results }, f, indent=2 )
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,379 @@
+#rmKitUV operator benchmark. run it headless from the add-on directory:
+#	blender -b --factory-startup --python benchmarks/bench_operators.py -- [--sizes 8,32,128] [--repeat 3] [--json ops.json] [--baseline old.json]
+#synthetic fixtures ( quad grids, open cylinders, beveled panels with seams, multi material trim kits ) are generated
+#at every size, a synthetic .hot repo with one hotspot per trim material is written to a temp file, and every operator
+#that can run without a mouse runs through a context override of the startup screen, so no gpu or display is needed.
+#wall time is the median of --repeat untraced runs from the same starting mesh. peak memory is the tracemalloc peak
+#of one extra run, since tracing slows every allocation down. it covers python objects and numpy buffers but not
+#blender's own allocations.
+#--baseline compares medians against an earlier --json file and exits with status 1 when an operator got slower
+#than --threshold times its baseline.
+
+import argparse, importlib, json, math, os, platform, random, statistics, sys, tempfile, time, tracemalloc
+import bpy, bmesh
+
+FIXTURES = ( 'grid', 'cylinder', 'panels', 'trimkit' )
+TRIM_PREFIX = 'bench_trim_'
+
+#( name, bl_idname, area type, mesh select mode, operator properties, fixtures )
+#interactive tools ( bounds transform, linear deformers, hotspot paint, mouse over hotspot ), operators that write the
+#user's repo or clipboard, and loop/ring ( they hand off to rmKit in sync mode ) are left out.
+OPERATORS = (
+	( 'uvmove', 'mesh.rm_uvmove', 'IMAGE_EDITOR', 'FACE', { 'dir' : 'n' }, FIXTURES ),
+	( 'uvslam', 'mesh.rm_uvslam', 'IMAGE_EDITOR', 'FACE', { 'dir' : 'n' }, FIXTURES ),
+	( 'uvrotate', 'mesh.rm_uvrotate', 'IMAGE_EDITOR', 'FACE', { 'dir' : 'cw' }, FIXTURES ),
+	( 'uvscale', 'mesh.rm_uvscale', 'IMAGE_EDITOR', 'FACE', { 'dir' : 'u+' }, FIXTURES ),
+	( 'uvflip', 'mesh.rm_uvflip', 'IMAGE_EDITOR', 'FACE', { 'dir' : 'u' }, FIXTURES ),
+	( 'uvfit', 'mesh.rm_uvfit', 'IMAGE_EDITOR', 'FACE', { 'dir' : 'u' }, FIXTURES ),
+	( 'uvrandom', 'mesh.rm_uvrandom', 'IMAGE_EDITOR', 'FACE', {}, FIXTURES ),
+	( 'uvunrotate', 'mesh.rm_uvunrotate', 'IMAGE_EDITOR', 'FACE', {}, FIXTURES ),
+	( 'uvmovetofurthest', 'mesh.rm_uvmovetofurthest', 'IMAGE_EDITOR', 'FACE', { 'str_dir' : 'up' }, FIXTURES ),
+	( 'uvgrow', 'mesh.rm_uvgrowshrink', 'IMAGE_EDITOR', 'FACE', { 'mode' : 'GROW' }, FIXTURES ),
+	( 'uvshrink', 'mesh.rm_uvgrowshrink', 'IMAGE_EDITOR', 'FACE', { 'mode' : 'SHRINK' }, FIXTURES ),
+	( 'stitch', 'mesh.rm_stitch', 'IMAGE_EDITOR', 'EDGE', {}, FIXTURES ),
+	( 'gridify', 'mesh.rm_uvgridify', 'IMAGE_EDITOR', 'FACE', {}, FIXTURES ),
+	( 'rectangularize', 'mesh.rm_uvrectangularize', 'IMAGE_EDITOR', 'FACE', {}, FIXTURES ),
+	( 'lscm', 'mesh.rm_lscm', 'IMAGE_EDITOR', 'FACE', {}, FIXTURES ),
+	( 'relativeislands', 'mesh.rm_relativeislands', 'IMAGE_EDITOR', 'FACE', {}, FIXTURES ),
+	( 'scaletomaterialsize', 'mesh.rm_scaletomaterialsize', 'IMAGE_EDITOR', 'FACE', {}, ( 'trimkit', ) ),
+	( 'normalizetexels', 'mesh.rm_normalizetexels', 'IMAGE_EDITOR', 'FACE', {}, FIXTURES ),
+	( 'worldspaceproject', 'mesh.rm_worldspaceproject', 'VIEW_3D', 'FACE', {}, FIXTURES ),
+	( 'seambyangle', 'mesh.rm_seambyangle', 'VIEW_3D', 'EDGE', {}, FIXTURES ),
+	( 'aspectscale', 'mesh.rm_uvaspectscale', 'IMAGE_EDITOR', 'FACE', {}, ( 'trimkit', ) ),
+	( 'matchhotspot_uv', 'mesh.matchhotspot', 'IMAGE_EDITOR', 'FACE', {}, ( 'trimkit', ) ),
+	( 'matchhotspot_3d', 'mesh.matchhotspot', 'VIEW_3D', 'FACE', {}, ( 'trimkit', ) ),
+)
+
+
+def parse_args():
+	argv = sys.argv[sys.argv.index( '--' ) + 1:] if '--' in sys.argv else []
+	parser = argparse.ArgumentParser( description='Time every headless rmKitUV operator on synthetic fixtures.' )
+	parser.add_argument( '--sizes', default='8,32,96', help='comma separated fixture sizes ( quads per side )' )
+	parser.add_argument( '--repeat', type=int, default=3, help='runs per operator and size, the median is reported' )
+	parser.add_argument( '--materials', type=int, default=8, help='materials in the trim kit and the synthetic .hot repo' )
+	parser.add_argument( '--only', default='', help='comma separated operator names to run, all by default' )
+	parser.add_argument( '--fixtures', default=','.join( FIXTURES ), help='comma separated fixtures to run' )
+	parser.add_argument( '--json', default='', help='write the results to this file' )
+	parser.add_argument( '--baseline', default='', help='compare against the results of an earlier --json run' )
+	parser.add_argument( '--threshold', type=float, default=1.25, help='slowdown ratio reported as a regression' )
+	parser.add_argument( '--seed', type=int, default=0 )
+	return parser.parse_args( argv )
+
+
+#fixtures. each builder fills a bmesh and returns the material count its faces use.
+
+def build_grid( bm, size, materials ):
+	#size x size unit quads, cut into 4x4 quad islands by seams
+	bmesh.ops.create_grid( bm, x_segments=size, y_segments=size, size=size * 0.5 )
+	mark_seams_on_grid( bm, 4 )
+	return 1
+
+
+def build_cylinder( bm, size, materials ):
+	#open cylinder with size segments around and size rings, one seam down its side
+	rings = []
+	for j in range( size + 1 ):
+		ring = []
+		for i in range( size ):
+			a = 2.0 * math.pi * i / size
+			ring.append( bm.verts.new( ( math.cos( a ) * size / math.pi, math.sin( a ) * size / math.pi, float( j ) ) ) )
+		rings.append( ring )
+	for j in range( size ):
+		for i in range( size ):
+			n = ( i + 1 ) % size
+			bm.faces.new( ( rings[j][i], rings[j][n], rings[j+1][n], rings[j+1][i] ) )
+	for j in range( size ):
+		bm.edges.get( ( rings[j][0], rings[j+1][0] ) ).seam = True
+	return 1
+
+
+def build_panels( bm, size, materials ):
+	#( size / 8 )^2 flat boxes with beveled edges. seams go on every edge sharper than 60 degrees.
+	count = max( 1, size // 8 )
+	for y in range( count ):
+		for x in range( count ):
+			geom = bmesh.ops.create_cube( bm, size=1.0 )
+			verts = geom['verts']
+			bmesh.ops.scale( bm, vec=( 3.0, 2.0, 0.25 ), verts=verts )
+			bmesh.ops.translate( bm, vec=( x * 4.0, y * 3.0, 0.0 ), verts=verts )
+			edges = list( { e for v in verts for e in v.link_edges } )
+			bmesh.ops.bevel( bm, geom=verts + edges, offset=0.05, segments=3, affect='EDGES', profile=0.5 )
+	for e in bm.edges:
+		if len( e.link_faces ) == 2 and e.calc_face_angle( 0.0 ) > math.radians( 60.0 ):
+			e.seam = True
+	return 1
+
+
+def build_trimkit( bm, size, materials ):
+	#size x size grid whose rows are trim strips, cycling through the trim materials. seams separate the strips and
+	#cut them every 8 quads.
+	bmesh.ops.create_grid( bm, x_segments=size, y_segments=size, size=size * 0.5 )
+	bm.faces.ensure_lookup_table()
+	for f in bm.faces:
+		c = f.calc_center_median()
+		row = int( math.floor( c.y + size * 0.5 ) )
+		f.material_index = row % materials
+	for e in bm.edges:
+		if len( e.link_faces ) == 2 and e.link_faces[0].material_index != e.link_faces[1].material_index:
+			e.seam = True
+	mark_seams_on_grid( bm, 8, axis=0 )
+	return materials
+
+
+def mark_seams_on_grid( bm, step, axis=None ):
+	#seam every edge lying on a grid line that is a multiple of step ( on the given axis, or both )
+	for e in bm.edges:
+		a, b = e.verts[0].co, e.verts[1].co
+		for i in ( ( 0, 1 ) if axis is None else ( axis, ) ):
+			if abs( a[i] - b[i] ) < 1e-6 and abs( round( a[i] ) % step ) < 1e-6:
+				e.seam = True
+
+
+BUILDERS = { 'grid' : build_grid, 'cylinder' : build_cylinder, 'panels' : build_panels, 'trimkit' : build_trimkit }
+
+
+def trim_materials( count ):
+	materials = []
+	for i in range( count ):
+		name = '{}{}'.format( TRIM_PREFIX, i )
+		mat = bpy.data.materials.get( name ) or bpy.data.materials.new( name )
+		mat['WorldMappingWidth'] = 2.0 ** ( i % 3 + 1 )
+		mat['WorldMappingHeight'] = 2.0 ** ( i % 2 + 1 )
+		materials.append( mat )
+	return materials
+
+
+def write_hot_repo( hotspot, file, count, rng ):
+	#one hotspot per trim material, the unit square split into 4 to 32 rectangles
+	materials = []
+	hotspots = []
+	for i in range( count ):
+		rects = [ ( 0.0, 0.0, 1.0, 1.0 ) ]
+		for n in range( rng.randint( 3, 31 ) ):
+			rects.sort( key=lambda r : ( r[2] - r[0] ) * ( r[3] - r[1] ) )
+			x0, y0, x1, y1 = rects.pop()
+			t = rng.choice( ( 0.25, 0.5, 0.75 ) )
+			if x1 - x0 >= y1 - y0:
+				m = x0 + ( x1 - x0 ) * t
+				rects += [ ( x0, y0, m, y1 ), ( m, y0, x1, y1 ) ]
+			else:
+				m = y0 + ( y1 - y0 ) * t
+				rects += [ ( x0, y0, x1, m ), ( x0, m, x1, y1 ) ]
+		bounds = [ hotspot.Bounds2d( [ ( r[0], r[1] ), ( r[2], r[3] ) ] ) for r in rects ]
+		materials.append( [ '{}{}'.format( TRIM_PREFIX, i ) ] )
+		hotspots.append( hotspot.Hotspot( bounds, name='{}{}'.format( TRIM_PREFIX, i ) ) )
+	hotspot.write_hot_file( file, materials, hotspots )
+
+
+#headless context. the startup file keeps its window and screen in background mode, so the biggest area of that screen
+#is retyped to whatever editor an operator polls for.
+
+def get_override_area():
+	wm = bpy.context.window_manager
+	window = wm.windows[0] if len( wm.windows ) > 0 else None
+	screen = window.screen if window is not None else bpy.data.screens[0]
+	area = max( screen.areas, key=lambda a : a.width * a.height )
+	return window, screen, area
+
+
+def context_override( window, screen, area, area_type ):
+	if area.type != area_type:
+		area.type = area_type
+	region = None
+	for r in area.regions:
+		if r.type == 'WINDOW':
+			region = r
+	kwargs = { 'screen' : screen, 'area' : area, 'region' : region }
+	if window is not None:
+		kwargs['window'] = window
+	return bpy.context.temp_override( **kwargs )
+
+
+def clear_scene():
+	for obj in list( bpy.data.objects ):
+		bpy.data.objects.remove( obj )
+	for mesh in list( bpy.data.meshes ):
+		bpy.data.meshes.remove( mesh )
+
+
+def create_fixture( name, size, materials, override ):
+	#returns ( object, pristine mesh ). the pristine mesh holds the unwrapped fixture every run starts from.
+	mesh = bpy.data.meshes.new( '{}_{}'.format( name, size ) )
+	bm = bmesh.new()
+	material_count = BUILDERS[name]( bm, size, len( materials ) )
+	bm.to_mesh( mesh )
+	bm.free()
+	for mat in materials[:material_count] if material_count > 1 else []:
+		mesh.materials.append( mat )
+	mesh.uv_layers.new( name='UVMap' )
+
+	obj = bpy.data.objects.new( mesh.name, mesh )
+	bpy.context.scene.collection.objects.link( obj )
+	for o in bpy.context.view_layer.objects:
+		o.select_set( o == obj )
+	bpy.context.view_layer.objects.active = obj
+	with override( 'VIEW_3D' ):
+		bpy.ops.object.mode_set( mode='EDIT' )
+		bpy.ops.mesh.select_all( action='SELECT' )
+		bpy.ops.uv.unwrap( method='ANGLE_BASED', margin=0.01 )
+		bpy.ops.object.mode_set( mode='OBJECT' )
+	return obj, mesh.copy()
+
+
+def reset_fixture( obj, pristine, select_mode, override ):
+	ts = bpy.context.scene.tool_settings
+	ts.use_uv_select_sync = True
+	ts.mesh_select_mode = ( False, select_mode == 'EDGE', select_mode == 'FACE' )
+	with override( 'VIEW_3D' ):
+		if obj.mode != 'OBJECT':
+			bpy.ops.object.mode_set( mode='OBJECT' )
+		bm = bmesh.new()
+		bm.from_mesh( pristine )
+		for f in bm.faces:
+			f.select = True
+		bm.to_mesh( obj.data )
+		bm.free()
+		bpy.ops.object.mode_set( mode='EDIT' )
+
+
+def run_operator( idname, props, area_type, override, trace=False ):
+	#returns the result, the wall time and, with trace, the tracemalloc peak of the run ( 0 otherwise )
+	category, name = idname.split( '.' )
+	op = getattr( getattr( bpy.ops, category ), name )
+	with override( area_type ):
+		if not op.poll():
+			return 'POLL_FAILED', 0.0, 0
+		peak = 0
+		if trace:
+			tracemalloc.start()
+		try:
+			t = time.perf_counter()
+			result = op( 'EXEC_DEFAULT', **props )
+			elapsed = time.perf_counter() - t
+			if trace:
+				peak = tracemalloc.get_traced_memory()[1]
+		finally:
+			if trace:
+				tracemalloc.stop()
+	return ','.join( sorted( result ) ), elapsed, peak
+
+
+def compare( results, baseline_file, threshold ):
+	#print operators whose median got slower than threshold x baseline. returns the number of regressions.
+	with open( baseline_file, 'r' ) as f:
+		baseline = { ( r['operator'], r['fixture'], r['size'] ) : r for r in json.load( f )['results'] }
+	regressions = 0
+	print( 'compared to {}'.format( baseline_file ) )
+	for r in results:
+		b = baseline.get( ( r['operator'], r['fixture'], r['size'] ) )
+		if b is None or b['median_ms'] <= 0.0 or r['median_ms'] <= 0.0:
+			continue
+		ratio = r['median_ms'] / b['median_ms']
+		if ratio > threshold:
+			regressions += 1
+			print( '  REGRESSION {:<20}{:<10}{:>5}  {:9.2f} ms -> {:9.2f} ms  x{:.2f}'.format( r['operator'], r['fixture'], r['size'], b['median_ms'], r['median_ms'], ratio ) )
+	print( '  {} regression(s) above x{:.2f}'.format( regressions, threshold ) )
+	return regressions
+
+
+def main():
+	args = parse_args()
+	addon_dir = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+	sys.path.insert( 0, os.path.dirname( addon_dir ) )
+	package = os.path.basename( addon_dir )
+
+	sizes = [ int( s ) for s in args.sizes.split( ',' ) if s.strip() ]
+	fixtures = [ s.strip() for s in args.fixtures.split( ',' ) if s.strip() in BUILDERS ]
+	only = { s.strip() for s in args.only.split( ',' ) if s.strip() }
+	rng = random.Random( args.seed )
+
+	clear_scene()
+	addon = importlib.import_module( package )
+	addon.register()
+
+	#point the hotspot tools at a synthetic repo instead of the user's atlas_repo.hot
+	hotspot = addon.hotspot
+	tmpdir = tempfile.mkdtemp( prefix='rmkituv_bench_' )
+	hotfile = os.path.join( tmpdir, 'atlas_repo.hot' )
+	write_hot_repo( hotspot, hotfile, args.materials, rng )
+	hotspot.get_hotfile_path = lambda : hotfile
+	hotspot.get_clipboardfile_path = lambda : hotfile
+
+	window, screen, area = get_override_area()
+	area_type = area.type
+	override = lambda t : context_override( window, screen, area, t )
+	materials = trim_materials( args.materials )
+
+	results = []
+	for fixture in fixtures:
+		for size in sizes:
+			obj, pristine = create_fixture( fixture, size, materials, override )
+			face_count = len( pristine.polygons )
+			for name, idname, op_area, select_mode, props, op_fixtures in OPERATORS:
+				if ( only and name not in only ) or fixture not in op_fixtures:
+					continue
+				times = []
+				peak = 0
+				status = ''
+				#the last run is traced for peak memory and left out of the timings
+				for n in range( max( 1, args.repeat ) + 1 ):
+					trace = n == max( 1, args.repeat )
+					reset_fixture( obj, pristine, select_mode, override )
+					random.seed( args.seed ) #uvrandom and friends draw from the global generator
+					try:
+						status, elapsed, run_peak = run_operator( idname, props, op_area, override, trace=trace )
+					except Exception as e:
+						status, elapsed, run_peak = 'ERROR: {}'.format( e ), 0.0, 0
+					if status == 'POLL_FAILED' or status.startswith( 'ERROR' ):
+						break
+					if trace:
+						peak = run_peak
+					else:
+						times.append( elapsed )
+				result = {
+					'operator' : name,
+					'bl_idname' : idname,
+					'fixture' : fixture,
+					'size' : size,
+					'faces' : face_count,
+					'status' : status,
+					'median_ms' : statistics.median( times ) * 1000.0 if times else 0.0,
+					'min_ms' : min( times ) * 1000.0 if times else 0.0,
+					'peak_kb' : peak / 1024.0,
+					'runs' : len( times ),
+				}
+				results.append( result )
+				print( '{:<20}{:<10}{:>5}{:>8} faces  {:9.2f} ms  {:9.1f} KB  {}'.format( name, fixture, size, face_count, result['median_ms'], result['peak_kb'], status ) )
+
+			with override( 'VIEW_3D' ):
+				if obj.mode != 'OBJECT':
+					bpy.ops.object.mode_set( mode='OBJECT' )
+			mesh = obj.data
+			bpy.data.objects.remove( obj )
+			bpy.data.meshes.remove( mesh )
+			bpy.data.meshes.remove( pristine )
+
+	area.type = area_type
+	addon.unregister()
+	os.remove( hotfile )
+	os.rmdir( tmpdir )
+
+	report = {
+		'blender' : bpy.app.version_string,
+		'python' : platform.python_version(),
+		'platform' : platform.platform(),
+		'sizes' : sizes,
+		'repeat' : args.repeat,
+		'materials' : args.materials,
+		'seed' : args.seed,
+		'results' : results,
+	}
+	if args.json:
+		with open( args.json, 'w' ) as f:
+			json.dump( report, f, indent=2 )
+
+	if args.baseline and compare( results, args.baseline, args.threshold ) > 0:
+		sys.exit( 1 )
+
+
+main()
@@ -0,0 +1,55 @@
+#rmKitUV startup benchmark. run it headless from the add-on directory:
+#	blender -b --factory-startup --python benchmarks/bench_startup.py -- [--json startup.json]
+#the add-on is imported from this checkout, registered, timed and unregistered again. rmlib has to be importable by
+#the blender that runs it. python caches imports, so every measurement needs a fresh blender process.
+
+import argparse, importlib, json, os, sys, time
+
+
+def parse_args():
+	argv = sys.argv[sys.argv.index( '--' ) + 1:] if '--' in sys.argv else []
+	parser = argparse.ArgumentParser( description='Report the import and register() cost of rmKitUV.' )
+	parser.add_argument( '--json', default='', help='also write the timings to this file' )
+	return parser.parse_args( argv )
+
+
+def main():
+	args = parse_args()
+	addon_dir = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+	sys.path.insert( 0, os.path.dirname( addon_dir ) )
+	package = os.path.basename( addon_dir )
+
+	t = time.perf_counter()
+	addon = importlib.import_module( package )
+	package_import = time.perf_counter() - t
+
+	#register() imports and registers the tool modules
+	t = time.perf_counter()
+	addon.register()
+	register_call = time.perf_counter() - t
+
+	startup = addon.startup
+	report = {
+		'package_import_ms' : package_import * 1000.0,
+		'register_call_ms' : register_call * 1000.0,
+		'total_ms' : ( package_import + register_call ) * 1000.0,
+		'module_import_ms' : { name : t * 1000.0 for name, t in startup.import_times.items() },
+		'module_register_ms' : { name : t * 1000.0 for name, t in startup.register_times.items() },
+	}
+	addon.unregister()
+
+	print( 'rmKitUV startup' )
+	print( '  package import  {:8.2f} ms'.format( report['package_import_ms'] ) )
+	print( '  register()      {:8.2f} ms'.format( report['register_call_ms'] ) )
+	print( '  total           {:8.2f} ms'.format( report['total_ms'] ) )
+	print( '  module            import ms  register ms' )
+	names = sorted( set( startup.import_times ) | set( startup.register_times ), key=lambda name : -( startup.import_times.get( name, 0.0 ) + startup.register_times.get( name, 0.0 ) ) )
+	for name in names:
+		print( '  {:<18}{:>9.2f}  {:>11.2f}'.format( name, startup.import_times.get( name, 0.0 ) * 1000.0, startup.register_times.get( name, 0.0 ) * 1000.0 ) )
+
+	if args.json:
+		with open( args.json, 'w' ) as f:
+			json.dump( report, f, indent=2 )
+
+
+main()
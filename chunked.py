@@ -0,0 +1,94 @@
+import bpy, bmesh
+from . import instrument
+
+#long running operators split their work into independent items ( usually islands ) and hand them to ChunkedOperator.
+#execute still runs every item in one go. invoke runs large jobs a slice at a time from a window timer so the ui
+#keeps drawing and shows progress, Esc rolls the mesh back to a copy taken before the first slice, and because the
+#operator only finishes once, its UNDO flag records the whole run as a single undo step.
+
+
+def get_prefs( context ):
+	return context.preferences.addons[__package__].preferences
+
+
+class ChunkedOperator():
+	#mixin for edit mode mesh operators. subclasses implement:
+	#	chunk_begin( context ) -> list of work items, or an operator result set to return right away
+	#	chunk_step( context, items ) -> process a slice of the work items
+	#	chunk_end( context ) -> operator result set, called once every item has been processed
+	#items should not hold bmesh elements, since the edit bmesh is written back between slices. store indexes.
+
+	def execute( self, context ):
+		items = self.chunk_begin( context )
+		if isinstance( items, set ):
+			return items
+		instrument.count_islands( len( items ) )
+		self.chunk_step( context, items )
+		return self.chunk_end( context )
+
+	def invoke( self, context, event ):
+		items = self.chunk_begin( context )
+		if isinstance( items, set ):
+			return items
+		instrument.count_islands( len( items ) )
+		prefs = get_prefs( context )
+		if len( items ) <= prefs.chunked_threshold:
+			self.chunk_step( context, items )
+			return self.chunk_end( context )
+
+		self._chunk_items = items
+		self._chunk_index = 0
+		self._chunk_size = max( 1, prefs.chunk_size )
+		self._chunk_object = context.active_object
+		self._chunk_backup = bmesh.from_edit_mesh( self._chunk_object.data ).copy()
+
+		wm = context.window_manager
+		wm.progress_begin( 0, len( items ) )
+		self._chunk_timer = wm.event_timer_add( 0.001, window=context.window )
+		wm.modal_handler_add( self )
+		return { 'RUNNING_MODAL' }
+
+	def modal( self, context, event ):
+		if event.type == 'ESC':
+			self.chunk_stop( context )
+			self.chunk_rollback( context )
+			self.report( { 'INFO' }, '{} cancelled after {} of {} items.'.format( self.bl_label, self._chunk_index, len( self._chunk_items ) ) )
+			return { 'CANCELLED' }
+
+		#the modal handler only gets the timer events of its own window, and Event has no timer attribute
+		if event.type == 'TIMER':
+			end = min( self._chunk_index + self._chunk_size, len( self._chunk_items ) )
+			self.chunk_step( context, self._chunk_items[self._chunk_index:end] )
+			self._chunk_index = end
+			context.window_manager.progress_update( end )
+			if context.area is not None:
+				context.area.header_text_set( '{} :: {} / {} ( Esc to cancel )'.format( self.bl_label, end, len( self._chunk_items ) ) )
+			if end >= len( self._chunk_items ):
+				self.chunk_stop( context )
+				self._chunk_backup.free()
+				return self.chunk_end( context )
+			return { 'RUNNING_MODAL' }
+
+		#let the view be navigated while the job runs
+		if event.type in { 'MIDDLEMOUSE', 'WHEELUPMOUSE', 'WHEELDOWNMOUSE', 'TRACKPADPAN', 'TRACKPADZOOM' }:
+			return { 'PASS_THROUGH' }
+		return { 'RUNNING_MODAL' }
+
+	def chunk_stop( self, context ):
+		wm = context.window_manager
+		wm.event_timer_remove( self._chunk_timer )
+		wm.progress_end()
+		if context.area is not None:
+			context.area.header_text_set( None )
+
+	def cancel( self, context ):
+		#blender cancels the modal handler when its window closes or the file is reloaded mid job
+		self.chunk_stop( context )
+		self._chunk_backup.free()
+
+	def chunk_rollback( self, context ):
+		#the edit bmesh cannot be swapped out in edit mode, so the copy is written to the mesh from object mode
+		bpy.ops.object.mode_set( mode='OBJECT', toggle=False )
+		self._chunk_backup.to_mesh( self._chunk_object.data )
+		self._chunk_backup.free()
+		bpy.ops.object.mode_set( mode='EDIT', toggle=False )
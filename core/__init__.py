@@ -0,0 +1,9 @@
+#numeric cores of the uv tools. the modules in this package only need numpy ( and use mathutils when it is around ),
+#so they import, profile and benchmark from plain CPython. the operators gather arrays from the bmesh, call in here
+#and write the results back.
+#outside blender put the add-on directory on sys.path and `import core`, importing it through the add-on package
+#would run the add-on's __init__ and need bpy.
+#	hotfile : Bounds2d, Hotspot and the .hot repo reader/writer
+#	lscm : least squares conformal map solve
+#	gridmap : gridify ring spacing and bounds fit
+#	stitchalign : island alignment before a stitch
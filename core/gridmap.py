@@ -0,0 +1,65 @@
+import numpy as np
+
+#gridify parameterization. gridify walks a quad island into rings of verts, the spacing of the grid and the fit back
+#into the island's original uv bounds are computed here from plain arrays.
+
+FLOAT_EPSILON = 0.000001
+
+
+def bbox( points ):
+	#( (2,) min, (2,) max ) of a (N,2) point array. degenerate bounds become the unit square.
+	points = np.asarray( points, dtype=np.float64 ).reshape( -1, 2 )
+	if len( points ) == 0:
+		return np.zeros( 2 ), np.ones( 2 )
+	bbmin = points.min( axis=0 )
+	bbmax = points.max( axis=0 )
+	if ( bbmax - bbmin ).min() <= FLOAT_EPSILON:
+		return np.zeros( 2 ), np.ones( 2 )
+	return bbmin, bbmax
+
+
+def grid_uvs( positions ):
+	#positions is the (R,N,3) array of the N verts of each of the R rings. rings map to u and the verts along a ring
+	#map to v. the spacing of a column/row is its average 3d edge length, the grid is scaled to fit the unit square.
+	#returns the (R,N,2) uv of every ring vert.
+	positions = np.asarray( positions, dtype=np.float64 )
+	ring_count, loop_count = positions.shape[0], positions.shape[1]
+
+	loop_steps = np.zeros( loop_count )
+	loop_steps[1:] = np.linalg.norm( positions[:,1:] - positions[:,:-1], axis=2 ).sum( axis=0 ) / ring_count
+	ring_steps = np.zeros( ring_count )
+	ring_steps[1:] = np.linalg.norm( positions[1:] - positions[:-1], axis=2 ).sum( axis=1 ) / loop_count
+
+	global_scalar = 1.0 / max( ring_steps.sum(), loop_steps.sum() )
+	uvs = np.empty( ( ring_count, loop_count, 2 ), dtype=np.float64 )
+	uvs[:,:,0] = ( np.cumsum( ring_steps ) * global_scalar )[:,None]
+	uvs[:,:,1] = ( np.cumsum( loop_steps ) * global_scalar )[None,:]
+	return uvs
+
+
+def fit_affine( initial_bbmin, initial_bbmax, uvs ):
+	#2x3 affine that moves the (K,2) uvs back into the initial bounds, keeping the initial aspect and swapping the
+	#axes when the gridified island turned from portrait to landscape or back.
+	uvs = np.asarray( uvs, dtype=np.float64 ).reshape( -1, 2 )
+	final_bbmin = uvs.min( axis=0 )
+	final_bbmax = uvs.max( axis=0 )
+	if ( final_bbmax - final_bbmin ).min() <= FLOAT_EPSILON:
+		final_bbmin = np.array( ( 0.0, 0.0 ) )
+		final_bbmax = np.array( ( 1.0, 1.0 ) )
+
+	initial_width = initial_bbmax[0] - initial_bbmin[0]
+	initial_height = initial_bbmax[1] - initial_bbmin[1]
+	initial_aspect = initial_height / initial_width
+	target_bounds_width = initial_bbmax[0] - initial_bbmin[0]
+	target_bounds_height = target_bounds_width * initial_aspect
+	final_width = final_bbmax[0] - final_bbmin[0]
+	final_height = final_bbmax[1] - final_bbmin[1]
+	final_aspect = final_height / final_width
+	if  ( final_aspect <= 1.0 and initial_aspect > 1.0 ) or ( final_aspect > 1.0 and initial_aspect <= 1.0 ):
+		final_width, final_height = final_height, final_width
+	scl_x = target_bounds_width / final_width
+	scl_y = target_bounds_height / final_height
+
+	#translate final center to origin, scale, then translate to initial center
+	return ( ( scl_x, 0.0, ( initial_bbmin[0] + initial_bbmax[0] ) * 0.5 - scl_x * ( final_bbmin[0] + final_bbmax[0] ) * 0.5 ),
+			( 0.0, scl_y, ( initial_bbmin[1] + initial_bbmax[1] ) * 0.5 - scl_y * ( final_bbmin[1] + final_bbmax[1] ) * 0.5 ) )
@@ -0,0 +1,632 @@
+import math, random, struct, ctypes
+import numpy as np
+try:
+	from mathutils import Matrix, Vector
+except ImportError:
+	Matrix = Vector = None
+
+#.hot repo format and the hotspot rect math. nothing in here touches bpy or bmesh, so it imports from plain CPython
+#with only numpy installed. the vector properties of Bounds2d return mathutils.Vector when the mathutils module ( or
+#wheel ) is importable and (2,) float64 arrays otherwise.
+
+MAT_CHUNK = 'MAT'
+HOT_CHUNK = 'HOT'
+
+MAX_SHORT = 1 << 15
+
+FLOAT_EPSILON = 0.000001
+
+#( min_x, min_y, max_x, max_y ) rects of the hotspot written to a new repo
+DEFAULT_RECTS = (
+	( 0.5, 0.0, 0.75, 0.5 ),
+	( 0.9375, 0.0, 0.96875, 0.5 ),
+	( 0.75, 0.0, 0.875, 0.5 ),
+	( 0.0, 0.0, 0.5, 0.5 ),
+	( 0.875, 0.0, 0.9375, 0.5 ),
+	( 0.75, 0.5, 0.875, 0.75 ),
+	( 0.875, 0.5, 0.9375, 0.75 ),
+	( 0.0, 0.5, 0.5, 0.75 ),
+	( 0.5, 0.5, 0.75, 0.75 ),
+	( 0.9375, 0.5, 0.96875, 0.75 ),
+	( 0.875, 0.75, 0.9375, 0.875 ),
+	( 0.5, 0.75, 0.75, 0.875 ),
+	( 0.9375, 0.75, 0.96875, 0.875 ),
+	( 0.75, 0.75, 0.875, 0.875 ),
+	( 0.0, 0.75, 0.5, 0.875 ),
+	( 0.0, 0.875, 0.5, 0.9375 ),
+	( 0.5, 0.875, 0.75, 0.9375 ),
+	( 0.9375, 0.875, 0.96875, 0.9375 ),
+	( 0.875, 0.875, 0.9375, 0.9375 ),
+	( 0.75, 0.875, 0.875, 0.9375 ),
+	( 0.875, 0.9375, 0.9375, 0.96875 ),
+	( 0.9375, 0.9375, 0.96875, 0.96875 ),
+	( 0.75, 0.9375, 0.875, 0.96875 ),
+	( 0.0, 0.9375, 0.5, 0.96875 ),
+	( 0.5, 0.9375, 0.75, 0.96875 ),
+	( 0.984375, 0.9375, 1.0, 0.96875 ),
+	( 0.96875, 0.9375, 0.984375, 0.96875 ),
+	( 0.984375, 0.875, 1.0, 0.9375 ),
+	( 0.96875, 0.875, 0.984375, 0.9375 ),
+	( 0.984375, 0.75, 1.0, 0.875 ),
+	( 0.96875, 0.75, 0.984375, 0.875 ),
+	( 0.984375, 0.0, 1.0, 0.5 ),
+	( 0.96875, 0.0, 0.984375, 0.5 ),
+	( 0.984375, 0.5, 1.0, 0.75 ),
+	( 0.96875, 0.5, 0.984375, 0.75 ),
+	( 0.0, 0.984375, 0.5, 1.0 ),
+	( 0.0, 0.96875, 0.5, 0.984375 ),
+	( 0.96875, 0.96875, 0.984375, 0.984375 ),
+	( 0.96875, 0.984375, 0.984375, 1.0 ),
+	( 0.9375, 0.984375, 0.96875, 1.0 ),
+	( 0.9375, 0.96875, 0.96875, 0.984375 ),
+	( 0.984375, 0.984375, 1.0, 1.0 ),
+	( 0.984375, 0.96875, 1.0, 0.984375 ),
+	( 0.5, 0.984375, 0.75, 1.0 ),
+	( 0.5, 0.96875, 0.75, 0.984375 ),
+	( 0.75, 0.984375, 0.875, 1.0 ),
+	( 0.75, 0.96875, 0.875, 0.984375 ),
+	( 0.875, 0.984375, 0.9375, 1.0 ),
+	( 0.875, 0.96875, 0.9375, 0.984375 ),
+)
+
+
+def vec2( x, y ):
+	if Vector is None:
+		return np.array( ( x, y ), dtype=np.float64 )
+	return Vector( ( x, y ) )
+
+
+def almost_equal_v2( a, b ):
+	return abs( a[0] - b[0] ) <= FLOAT_EPSILON and abs( a[1] - b[1] ) <= FLOAT_EPSILON
+
+
+def load_mat_subchunk( chunk, offset ):
+	'''
+	#Chunk layout described below:
+	3s(chunkname)
+	I(groupcount)
+		I(strcount for group)
+			I(charcount fror string)
+			{}s.format(charcount)(string)
+			...
+		...
+	'''
+	chunk_name = struct.unpack_from( '>3s', chunk, offset )[0].decode( 'utf-8' )
+	if chunk_name != MAT_CHUNK:
+		raise RuntimeError
+	offset += 3
+	str_list = []
+	group_count = struct.unpack_from( '>I', chunk, offset )[0]
+	offset += 4
+	str_groups = []
+	for i in range( group_count ):
+		str_count = struct.unpack_from( '>I', chunk, offset )[0]
+		offset += 4
+		str_list = []
+		for j in range( str_count ):
+			size = struct.unpack_from( '>I', chunk, offset )[0]
+			offset += 4
+			s = struct.unpack_from( '>{}s'.format( size ), chunk, offset )[0].decode( 'utf-8' )
+			str_list.append( s )
+			offset += size
+		str_groups.append( str_list )
+	return str_groups, offset
+
+
+def load_hot_chunk( chunk, offset ):
+	'''
+	#Chunk layout described below:
+	3s(chunkname)
+	I(hotspotcount)
+		hotspot data
+		...
+	'''
+	chunk_name = struct.unpack_from( '>3s', chunk, offset )[0].decode( 'utf-8' )
+	if chunk_name != HOT_CHUNK:
+		raise RuntimeError
+	offset += 3
+	hotspots = []
+	hotspot_count = struct.unpack_from( '>I', chunk, offset )[0]
+	offset += 4
+	for i in range( hotspot_count ):
+		new_hotspot, offset = Hotspot.unpack( chunk, offset )
+		hotspots.append( new_hotspot )
+	return hotspots, offset
+
+
+class Bounds2d():
+	__slots__ = ( '__min_x', '__min_y', '__max_x', '__max_y', '__materialaspect', '__horizontal' )
+
+	def __init__( self, points, **kwargs ):
+		self.__min_x = 0.0
+		self.__min_y = 0.0
+		self.__max_x = 1.0
+		self.__max_y = 1.0
+		self.__materialaspect = 1.0
+		self.__horizontal = False
+		if len( points ) > 0:
+			xs = [ float( p[0] ) for p in points ]
+			ys = [ float( p[1] ) for p in points ]
+			self.__min_x = min( xs )
+			self.__min_y = min( ys )
+			self.__max_x = max( xs )
+			self.__max_y = max( ys )
+
+		for key, value in kwargs.items():
+			if key == 'materialaspect':
+				self.__materialaspect = value
+				self.__horizontal = ( self.__max_x - self.__min_x ) * self.__materialaspect > self.__max_y - self.__min_y
+
+	def __repr__( self ):
+		return 'min:Vec2( {}, {} )  max:Vec2( {}, {} )'.format( self.__min_x, self.__min_y, self.__max_x, self.__max_y )
+
+	def __eq__( self, __o ):
+		return almost_equal_v2( ( self.__min_x, self.__min_y ), ( __o.__min_x, __o.__min_y ) ) and almost_equal_v2( ( self.__max_x, self.__max_y ), ( __o.__max_x, __o.__max_y ) )
+
+	def __bytes__( self ):
+		return struct.pack( '>HHHH', ctypes.c_ushort( int( self.__min_x * MAX_SHORT ) ).value,
+									ctypes.c_ushort( int( self.__min_y * MAX_SHORT ) ).value,
+									ctypes.c_ushort( int( self.__max_x * MAX_SHORT ) ).value,
+									ctypes.c_ushort( int( self.__max_y * MAX_SHORT ) ).value )
+
+	@classmethod
+	def from_floats( cls, min_x, min_y, max_x, max_y, **kwargs ):
+		#build bounds directly from its extents without going through a point list
+		b = cls( [], **kwargs )
+		b.__min_x = float( min_x )
+		b.__min_y = float( min_y )
+		b.__max_x = float( max_x )
+		b.__max_y = float( max_y )
+		if 'materialaspect' in kwargs:
+			b.__horizontal = ( b.__max_x - b.__min_x ) * b.__materialaspect > b.__max_y - b.__min_y
+		return b
+
+	@classmethod
+	def from_verts( cls, verts, **kwargs ):
+		#build bounds from list of BMVerts
+		poslist = [ v.co.to_2d() for v in verts ]
+		return cls( poslist, **kwargs )
+
+	@classmethod
+	def from_loops( cls, loops, uvlayer, **kwargs ):
+		#build bounds from list of BMLoops
+		uvlist = [ l[uvlayer].uv for l in loops ]
+		return cls( uvlist, **kwargs )
+
+	@property
+	def min( self ):
+		return vec2( self.__min_x, self.__min_y )
+
+	@property
+	def max( self ):
+		return vec2( self.__max_x, self.__max_y )
+
+	@property
+	def width( self ):
+		return self.__max_x - self.__min_x
+
+	@property
+	def height( self ):
+		return self.__max_y - self.__min_y
+
+	@property
+	def aspect( self ):
+		return self.width * self.__materialaspect / self.height
+	
+	@property
+	def invaspect( self ):
+		return self.height / ( self.width * self.__materialaspect )
+	
+	@property
+	def area( self ):
+		return self.width * self.height
+
+	@property
+	def center( self ):
+		return vec2( ( self.__min_x + self.__max_x ) * 0.5, ( self.__min_y + self.__max_y ) * 0.5 )
+
+	@property
+	def horizontal( self ):
+		#returns true if self is wider than it is tall
+		return self.__horizontal
+
+	@property
+	def tiling( self ):
+		if self.__max_x - self.__min_x == 1.0:
+			return 1
+		if self.__max_y - self.__min_y == 1.0:
+			return 2
+		return 0
+
+	@property
+	def corners( self ):
+		#return corner coords of self in (u,v) domain
+		return [ vec2( self.__min_x, self.__min_y ),
+				vec2( self.__max_x, self.__min_y ),
+				vec2( self.__max_x, self.__max_y ),
+				vec2( self.__min_x, self.__max_y ) ]
+	
+	@property
+	def materialaspect( self ):
+		return self.__materialaspect
+	
+	@materialaspect.setter
+	def materialaspect( self, value ):
+		self.__materialaspect = value
+		self.__horizontal = self.width * self.__materialaspect > self.height
+
+	def packed( self ):
+		#( min_x, min_y, max_x, max_y, materialaspect, horizontal ) row consumed by fit_array
+		return ( self.__min_x, self.__min_y, self.__max_x, self.__max_y, self.__materialaspect, float( self.__horizontal ) )
+
+	def clamp( self ):
+		#move into unit square
+		offset_x = math.floor( ( self.__min_x + self.__max_x ) / 2.0 )
+		offset_y = math.floor( ( self.__min_y + self.__max_y ) / 2.0 )
+
+		#clamp to 0.0-1.0 range
+		return Bounds2d.from_floats( max( self.__min_x - offset_x, 0.0 ),
+									max( self.__min_y - offset_y, 0.0 ),
+									min( self.__max_x - offset_x, 1.0 ),
+									min( self.__max_y - offset_y, 1.0 ) )
+
+	def normalized( self ):
+		#ensure bounds overlapps the 0-1 region
+		offset_x = float( math.floor( ( self.__min_x + self.__max_x ) * 0.5 ) )
+		offset_y = float( math.floor( ( self.__min_y + self.__max_y ) * 0.5 ) )
+		return Bounds2d.from_floats( self.__min_x - offset_x, self.__min_y - offset_y, self.__max_x - offset_x, self.__max_y - offset_y )
+
+	def inside( self, point ):
+		#test if point is inside self
+		return ( point[0] > self.__min_x and point[1] > self.__min_y and point[0] < self.__max_x and point[1] < self.__max_y )
+
+	def overlapping( self, bounds ):
+		#test if bounds overlapps self
+		return not ( self.__max_x < bounds.__min_x or self.__min_x > bounds.__max_x or self.__max_y < bounds.__min_y or self.__min_y > bounds.__max_y )
+	
+	def overlapping_area( self, bounds ):
+		#does not test if bounds actually overlapp
+		min_x = max( self.__min_x, bounds.__min_x )
+		min_y = max( self.__min_y, bounds.__min_y )
+		max_x = min( self.__max_x, bounds.__max_x )
+		max_y = min( self.__max_y, bounds.__max_y )
+		return ( max_x - min_x ) * ( max_y - min_y )
+
+	def fit( self, other, skip_rot=False, trim=False, inset=0.0, random_rot=False, random_flip=False ):
+		#closed form 2x3 affine ( ( a, b, tx ), ( c, d, ty ) ) that transforms self onto bound 'other'.
+		#equivalent to translate(other.center) @ scale @ rand_rot180 @ rot90 @ translate(-self.center)
+		width = self.__max_x - self.__min_x
+		height = self.__max_y - self.__min_y
+		if width < FLOAT_EPSILON or height < FLOAT_EPSILON:
+			return ( ( 1.0, 0.0, 0.0 ), ( 0.0, 1.0, 0.0 ) )
+
+		ma = self.__materialaspect
+		other_width = other.width
+		other_height = other.height
+		other_inset_width = other_width - inset
+		other_inset_height = other_height - inset * ma
+
+		#randomly rotate 180 degrees
+		r = 1.0
+		if random_rot and random.random() > 0.5:
+			r = -1.0
+
+		rotate = self.__horizontal != other.horizontal and not skip_rot
+		if trim and ( other_width >= 1.0 or other_height >= 1.0 ):
+			if rotate:
+				if other_width >= 1.0:
+					s1 = other_inset_height / width
+				else:
+					s1 = other_inset_width / height
+				s0 = s1 / ( ma * ma )
+			else:
+				if other_width >= 1.0:
+					s0 = s1 = other_inset_height / height
+				else:
+					s0 = s1 = other_inset_width / width
+		else:
+			if rotate:
+				s0 = other_inset_width / height
+				s1 = other_inset_height / width
+			else:
+				s0 = other_inset_width / width
+				s1 = other_inset_height / height
+
+		#randomly flip along each axis
+		if random_flip and random.random() > 0.5:
+			s0 *= -1.0
+		if random_flip and random.random() > 0.5:
+			s1 *= -1.0
+
+		s0 *= r
+		s1 *= r
+		if rotate:
+			a, b, c, d = 0.0, s0, -s1, 0.0
+		else:
+			a, b, c, d = s0, 0.0, 0.0, s1
+
+		cx = ( self.__min_x + self.__max_x ) * 0.5
+		cy = ( self.__min_y + self.__max_y ) * 0.5
+		ox = ( other.__min_x + other.__max_x ) * 0.5
+		oy = ( other.__min_y + other.__max_y ) * 0.5
+		return ( ( a, b, ox - a * cx - b * cy ), ( c, d, oy - c * cx - d * cy ) )
+
+	def transform( self, other, skip_rot=False, trim=False, inset=0.0, random_rot=False, random_flip=False ):
+		#compute the 3x3 matrix that transforms bound 'other' to self
+		r0, r1 = self.fit( other, skip_rot=skip_rot, trim=trim, inset=inset, random_rot=random_rot, random_flip=random_flip )
+		if Matrix is None:
+			return np.array( ( r0, r1, ( 0.0, 0.0, 1.0 ) ), dtype=np.float64 )
+		return Matrix( ( r0, r1, ( 0.0, 0.0, 1.0 ) ) )
+	
+	def copy( self ):
+		b = Bounds2d.from_floats( self.__min_x, self.__min_y, self.__max_x, self.__max_y )
+		b.__materialaspect = self.__materialaspect
+		b.__horizontal = self.__horizontal
+		return b
+
+	def inset( self, f, aspect=1.0 ):
+		self.__min_x += f * aspect
+		self.__min_y += f
+		self.__max_x -= f * aspect
+		self.__max_y -= f
+
+
+def pack_bounds( bounds_list ):
+	#(N,6) array of Bounds2d.packed() rows
+	return np.array( [ b.packed() for b in bounds_list ], dtype=np.float64 ).reshape( -1, 6 )
+
+
+def fit_array( sources, targets, skip_rot=False, trim=False, inset=0.0, random_rot=False, random_flip=False ):
+	#vectorized Bounds2d.fit over N source/target pairs. sources and targets are (N,6) arrays built by
+	#pack_bounds ( a single target row is broadcast ). returns an (N,2,3) array of affine transforms.
+	#random rotations and flips are drawn from the random module pair by pair, in the same order Bounds2d.fit
+	#draws them, so a seeded run gives the same result as fitting the pairs one at a time.
+	sources = np.asarray( sources, dtype=np.float64 ).reshape( -1, 6 )
+	targets = np.asarray( targets, dtype=np.float64 ).reshape( -1, 6 )
+	sources, targets = np.broadcast_arrays( sources, targets )
+	count = sources.shape[0]
+
+	width = sources[:,2] - sources[:,0]
+	height = sources[:,3] - sources[:,1]
+	ma = sources[:,4]
+	other_width = targets[:,2] - targets[:,0]
+	other_height = targets[:,3] - targets[:,1]
+	other_inset_width = other_width - inset
+	other_inset_height = other_height - inset * ma
+
+	degenerate = ( width < FLOAT_EPSILON ) | ( height < FLOAT_EPSILON )
+	safe_width = np.where( degenerate, 1.0, width )
+	safe_height = np.where( degenerate, 1.0, height )
+
+	if skip_rot:
+		rotate = np.zeros( count, dtype=bool )
+	else:
+		rotate = sources[:,5] != targets[:,5]
+	if trim:
+		trimmed = ( other_width >= 1.0 ) | ( other_height >= 1.0 )
+	else:
+		trimmed = np.zeros( count, dtype=bool )
+	wide = other_width >= 1.0
+
+	trim_rot_s1 = np.where( wide, other_inset_height / safe_width, other_inset_width / safe_height )
+	trim_s = np.where( wide, other_inset_height / safe_height, other_inset_width / safe_width )
+	s0 = np.select( [ trimmed & rotate, trimmed, rotate ], [ trim_rot_s1 / ( ma * ma ), trim_s, other_inset_width / safe_height ], other_inset_width / safe_width )
+	s1 = np.select( [ trimmed & rotate, trimmed, rotate ], [ trim_rot_s1, trim_s, other_inset_height / safe_width ], other_inset_height / safe_height )
+
+	#fit returns before drawing for degenerate sources
+	if random_rot or random_flip:
+		signs = np.ones( ( count, 3 ), dtype=np.float64 )
+		for i in np.flatnonzero( ~degenerate ).tolist():
+			if random_rot and random.random() > 0.5:
+				signs[i,0] = -1.0
+			if random_flip and random.random() > 0.5:
+				signs[i,1] = -1.0
+			if random_flip and random.random() > 0.5:
+				signs[i,2] = -1.0
+		s0 = s0 * signs[:,0] * signs[:,1]
+		s1 = s1 * signs[:,0] * signs[:,2]
+
+	mats = np.zeros( ( count, 2, 3 ), dtype=np.float64 )
+	mats[:,0,0] = np.where( rotate, 0.0, s0 )
+	mats[:,0,1] = np.where( rotate, s0, 0.0 )
+	mats[:,1,0] = np.where( rotate, -s1, 0.0 )
+	mats[:,1,1] = np.where( rotate, 0.0, s1 )
+
+	center = ( sources[:,0:2] + sources[:,2:4] ) * 0.5
+	other_center = ( targets[:,0:2] + targets[:,2:4] ) * 0.5
+	mats[:,:,2] = other_center - np.einsum( 'nij,nj->ni', mats[:,:,0:2], center )
+
+	mats[degenerate] = ( ( 1.0, 0.0, 0.0 ), ( 0.0, 1.0, 0.0 ) )
+	return mats
+
+
+class Hotspot():
+	def __init__( self, bounds2d_list, **kwargs ):
+		self.__name = ''
+		self.__properties = None
+		self.__packed = None
+		self.__data = []
+		for b in bounds2d_list:
+			if b.area > 0.0:
+				self.__data.append( b )
+		for key, value in kwargs.items():
+			if key == 'name':
+				self.__name = value
+			elif key == 'properties':
+				self.__properties = None
+
+	def __repr__( self ):
+		s = 'HOTSPOT :: \"{}\" \n'.format( self.__name )
+		#s += '\tproperties :: {}\n'.format( self.__properties )
+		for i, r in enumerate( self.__data ):
+			s += '\t{} :: {}\n'.format( i, r )
+		return s
+
+	def __eq__( self, __o ):
+		if len( self.__data ) != len( __o.__data ):
+			return False
+		
+		for b in self.__data:
+			if b not in __o.__data:
+				return False
+			
+		return True
+
+	def __bytes__( self ):
+		bounds_data = struct.pack( '>I', len( self.__data ) )
+		for b in self.__data:
+			bounds_data += bytes( b )		
+		return bounds_data
+	
+	@property
+	def data( self ):
+		return self.__data
+
+	@staticmethod
+	def unpack( bytearray, offset ):
+		bounds_count = struct.unpack_from( '>I', bytearray, offset )[0]
+		offset += 4
+		data = []
+		for i in range( bounds_count ):
+			bmin_x, bmin_y, bmax_x, bmax_y = struct.unpack_from( '>HHHH', bytearray, offset )
+			min_pos = ( bmin_x / MAX_SHORT, bmin_y / MAX_SHORT )
+			max_pos = ( bmax_x / MAX_SHORT, bmax_y / MAX_SHORT )
+			data.append( Bounds2d( [ min_pos, max_pos ] ) )
+			offset += 8
+		return Hotspot( data ), offset
+
+
+	@property
+	def name( self ):
+		return self.__name
+	
+	@property
+	def materialaspect( self ):
+		return self.__data[0].materialaspect
+
+	def match( self, source_bounds, tollerance=0.01, random_orient=True, trim_filter='none' ):
+		#find the bound in this hotspot that best matches source
+		sb_aspect = min( source_bounds.aspect, source_bounds.invaspect )
+		source_coord = ( math.sqrt( source_bounds.area ), sb_aspect )
+
+		min_dist = 9999999.9
+		best_bounds = self.__data[0]
+		for tb in self.__data:
+			if trim_filter == 'onlytrim':
+				if tb.width < 1.0 or tb.height < 1.0:
+					continue
+
+			elif trim_filter == 'notrim':
+				if tb.width >= 1.0 or tb.height >= 1.0:
+					continue
+
+			if not random_orient and tb.horizontal != best_bounds.horizontal:
+				continue
+
+			aspect = min( tb.aspect, tb.invaspect )
+			dist = math.hypot( math.sqrt( tb.area ) - source_coord[0], aspect - source_coord[1] )
+			if dist < min_dist:
+				min_dist = dist
+				best_bounds = tb
+		best_aspect = min( best_bounds.aspect, best_bounds.invaspect )
+		best_coord = ( math.sqrt( best_bounds.area ), best_aspect )
+
+		target_list = []
+		for tb in self.__data:
+			aspect = min( tb.aspect, tb.invaspect )
+			if math.hypot( math.sqrt( tb.area ) - best_coord[0], aspect - best_coord[1] ) <= tollerance:			
+				if not random_orient and tb.horizontal == best_bounds.horizontal:
+						target_list.append( tb )
+				else:
+					target_list.append( tb )
+
+		if len( target_list ) == 0:
+			return None
+
+		return random.choice( target_list )
+
+	def nearest( self, u, v ):
+		#normalize u and v
+		u -= math.floor( u )
+		v -= math.floor( v )
+
+		#find the bounds nearest to (u,v) coord. first bounds containing the point wins, otherwise the bounds with the nearest corner.
+		rects = self.packed()
+		inside = np.flatnonzero( ( u > rects[:,0] ) & ( v > rects[:,1] ) & ( u < rects[:,2] ) & ( v < rects[:,3] ) )
+		if len( inside ) > 0:
+			return self.__data[inside[0]]
+
+		du = np.minimum( np.abs( rects[:,0] - u ), np.abs( rects[:,2] - u ) )
+		dv = np.minimum( np.abs( rects[:,1] - v ), np.abs( rects[:,3] - v ) )
+		return self.__data[int( np.argmin( du * du + dv * dv ) )]
+
+	def packed( self ):
+		#(N,6) pack_bounds array of self.data. cached since hotspot rects are not edited in place.
+		if self.__packed is None or len( self.__packed ) != len( self.__data ):
+			self.__packed = pack_bounds( self.__data )
+		return self.__packed
+
+	def overlapping( self, bounds2d ):
+		b_in = bounds2d.normalized()
+
+		#find the bounds that most overlapps bounds2d
+		max_overlap_area = -1.0
+		overlap_bounds = self.__data[0]
+		for b in self.__data:
+			if b.overlapping( b_in ):
+				overlap_area = b.overlapping_area( b_in )
+				if overlap_area > max_overlap_area:
+					max_overlap_area = overlap_area
+					overlap_bounds = b
+		return overlap_bounds
+	
+	def applymaterialaspect( self, material_aspect ):
+		for b in self.__data:
+			b.materialaspect = material_aspect
+		self.__packed = None
+
+
+def write_default_file( file ):
+	bounds = [ Bounds2d.from_floats( *r ) for r in DEFAULT_RECTS ]
+	write_hot_file( file, [ [ 'default' ] ], [ Hotspot( bounds, name='default' ) ] )
+
+
+def write_hot_file( file, materials, hotspots ):
+	if len( hotspots ) != len( materials ):
+		raise RuntimeError
+
+	with open( file, 'wb' ) as f:
+		#write material chunk
+		f.write( struct.pack( '>3s', bytes( MAT_CHUNK, 'utf-8' ) ) )
+		f.write( struct.pack( '>I', len( materials ) ) )
+		for matgroup in materials:
+			f.write( struct.pack( '>I', len( matgroup ) ) )
+			for mat in matgroup:
+				size = len( mat )
+				f.write( struct.pack( '>I', size ) )
+				f.write( struct.pack( '>{}s'.format( size ), bytes( mat, 'utf-8' ) ) )
+
+		#write hotspot chunk
+		f.write( struct.pack( '>3s', bytes( HOT_CHUNK, 'utf-8' ) ) )
+		f.write( struct.pack( '>I', len( hotspots ) ) )
+		for h in hotspots:
+			f.write( bytes( h ) )
+
+
+def read_hot_file( file ):
+	materials = []
+	hotspots = []
+	with open( file, 'rb' ) as f:
+		data = f.read()
+
+		offset = 0
+		chunkname = struct.unpack_from( '>3s', data, offset )[0].decode( 'utf-8' )
+		if chunkname == MAT_CHUNK:
+			materials, offset = load_mat_subchunk( data, offset )
+		
+		chunkname = struct.unpack_from( '>3s', data, offset )[0].decode( 'utf-8' )
+		if chunkname == HOT_CHUNK:
+			hotspots, offset = load_hot_chunk( data, offset )
+
+	return materials, hotspots
+
@@ -0,0 +1,102 @@
+import numpy as np
+
+#least squares conformal map of one patch. rectangularize.lscm gathers the patch from the bmesh ( verts, fan
+#triangulated faces, pins ) and writes the solved uvs back, the solve itself works on plain arrays.
+
+
+def triangle_coefficients( coords, tris ):
+	#project each triangle to its own plane and return the (T,3,2) complex coefficients ( real, imaginary ) of its
+	#three corners. degenerate triangles get zero coefficients so they do not pull on the solve.
+	p = coords[tris] #(T,3,3)
+	edge_lengths = np.stack( ( np.linalg.norm( p[:,2] - p[:,1], axis=1 ),
+								np.linalg.norm( p[:,0] - p[:,2], axis=1 ),
+								np.linalg.norm( p[:,1] - p[:,0], axis=1 ) ), axis=1 ) #(T,3)
+	l0, l1, l2 = edge_lengths[:,0], edge_lengths[:,1], edge_lengths[:,2]
+	denom = 2.0 * l1 * l2
+	safe_denom = np.where( denom > 0.0, denom, 1.0 )
+	theta = np.arccos( np.clip( ( l1 * l1 + l2 * l2 - l0 * l0 ) / safe_denom, -1.0, 1.0 ) )
+
+	proj = np.zeros( ( len( tris ), 3, 2 ), dtype=np.float64 )
+	proj[:,1,0] = l2
+	proj[:,2,0] = l1 * np.cos( theta )
+	proj[:,2,1] = l1 * np.sin( theta )
+
+	#double area of the projected tri
+	a = ( proj[:,0,0] * proj[:,1,1] - proj[:,0,1] * proj[:,1,0] ) + ( proj[:,1,0] * proj[:,2,1] - proj[:,1,1] * proj[:,2,0] ) + ( proj[:,2,0] * proj[:,0,1] - proj[:,2,1] * proj[:,0,0] )
+	valid = ( np.abs( a ) > 0.0 ) & ( denom > 0.0 )
+	inv_a = np.where( valid, 1.0 / np.where( valid, a, 1.0 ), 0.0 )
+
+	ws = np.stack( ( proj[:,2] - proj[:,1], proj[:,0] - proj[:,2], proj[:,1] - proj[:,0] ), axis=1 ) #(T,3,2)
+	return ws * inv_a[:,None,None]
+
+
+def solve( coords, tris, pinned, pinned_uvs, uvs, constrain_axis=1 ):
+	#coords is the (V,3) vert positions, tris the (T,3) vert indexes of the triangles, pinned the (P,) indexes of
+	#the pinned verts with their (P,2) pinned_uvs, and uvs the (V,2) current uvs. constrain_axis 0 or 1 keeps that uv
+	#axis of the free verts and solves the other one, any other value solves both. returns the (V,2) solved uvs,
+	#pinned rows keep their input uv.
+	coords = np.asarray( coords, dtype=np.float64 ).reshape( -1, 3 )
+	tris = np.asarray( tris, dtype=np.int64 ).reshape( -1, 3 )
+	pinned = np.asarray( pinned, dtype=np.int64 ).reshape( -1 )
+	pinned_uvs = np.asarray( pinned_uvs, dtype=np.float64 ).reshape( -1, 2 )
+	uvs = np.array( uvs, dtype=np.float64 ).reshape( -1, 2 )
+
+	vert_count = len( coords )
+	is_pinned = np.zeros( vert_count, dtype=bool )
+	is_pinned[pinned] = True
+	free = np.flatnonzero( ~is_pinned )
+	column = np.zeros( vert_count, dtype=np.int64 )
+	column[free] = np.arange( len( free ) )
+	column[pinned[::-1]] = np.arange( len( pinned ) )[::-1] #first occurrence of a vert in pinned wins
+
+	tcount = len( tris )
+	pinned_vcount = len( pinned )
+	vcount = len( free )
+	ws = triangle_coefficients( coords, tris )
+
+	rows = np.repeat( np.arange( tcount ), 3 )
+	verts = tris.reshape( -1 )
+	w = ws.reshape( -1, 2 )
+	pin = is_pinned[verts]
+	pin_rows, pin_cols, pin_w = rows[pin], column[verts[pin]], w[pin]
+	free_rows, free_cols, free_w = rows[~pin], column[verts[~pin]], w[~pin]
+
+	#pinned block matrices
+	Mr_p = np.zeros( ( tcount, pinned_vcount ) )
+	Mi_p = np.zeros( ( tcount, pinned_vcount ) )
+	Mr_p[pin_rows, pin_cols] = pin_w[:,0]
+	Mi_p[pin_rows, pin_cols] = pin_w[:,1]
+	b = np.concatenate( ( pinned_uvs[:,0], pinned_uvs[:,1] ) )
+
+	#the free matrices are dense (T,V) arrays and dominate the memory of a solve. the full solve fills its (2T,2V)
+	#block matrix directly instead of building the four blocks and copying them into it.
+	if constrain_axis == 0 or constrain_axis == 1:
+		Mr_f = np.zeros( ( tcount, vcount ) )
+		Mi_f = np.zeros( ( tcount, vcount ) )
+		Mr_f[free_rows, free_cols] = free_w[:,0]
+		Mi_f[free_rows, free_cols] = free_w[:,1]
+		if constrain_axis == 0:
+			r = Mr_p @ b[pinned_vcount:]
+			arxr = Mr_f @ uvs[free,0]
+			del Mr_f
+			uvs[free,1] = np.linalg.lstsq( Mi_f, -r + arxr, rcond=None )[0]
+		else:
+			r = Mr_p @ b[:pinned_vcount]
+			aixi = Mi_f @ uvs[free,1]
+			del Mi_f
+			uvs[free,0] = np.linalg.lstsq( Mr_f, r + aixi, rcond=None )[0]
+	else:
+		A = np.zeros( ( 2 * tcount, 2 * vcount ) )
+		A[free_rows, free_cols] = free_w[:,0]
+		A[free_rows, free_cols + vcount] = -free_w[:,1]
+		A[free_rows + tcount, free_cols] = free_w[:,1]
+		A[free_rows + tcount, free_cols + vcount] = free_w[:,0]
+		B = np.block( [
+			[ Mr_p, Mi_p * -1.0 ],
+			[ Mi_p, Mr_p ] ] )
+		x = np.linalg.lstsq( A, -( B @ b ), rcond=None )[0]
+		uvs[free,0] = x[:vcount]
+		uvs[free,1] = x[vcount:]
+
+	uvs[pinned] = pinned_uvs
+	return uvs
@@ -0,0 +1,61 @@
+import math
+import numpy as np
+
+#stitch alignment. before the loops of two uv islands are welded, the target island is scaled, rotated and moved so
+#the ends of its edge chain land on the ends of the source chain ( or both islands meet halfway ).
+
+
+def rotation( angle ):
+	c = math.cos( angle )
+	s = math.sin( angle )
+	return np.array( ( ( c, -s ), ( s, c ) ), dtype=np.float64 )
+
+
+def affine( linear, pivot, offset ):
+	#2x3 affine p -> linear @ ( p - pivot ) + pivot + offset
+	mat = np.zeros( ( 2, 3 ), dtype=np.float64 )
+	mat[:,0:2] = linear
+	mat[:,2] = pivot + offset - linear @ pivot
+	return mat
+
+
+def align( source_uvs, target_uvs, midpoint=False ):
+	#source_uvs and target_uvs are the (S,2) and (T,2) uvs along the source and target edge chains, ordered so their
+	#first and last points should meet. returns the 2x3 affine of the target island and, when stitching at the
+	#midpoint, the 2x3 affine of the source island ( None otherwise ).
+	source_uvs = np.asarray( source_uvs, dtype=np.float64 ).reshape( -1, 2 )
+	target_uvs = np.asarray( target_uvs, dtype=np.float64 ).reshape( -1, 2 )
+
+	source_vec = source_uvs[0] - source_uvs[-1]
+	source_pos = ( source_uvs[0] + source_uvs[-1] + source_uvs.mean( axis=0 ) ) * 0.33333
+	target_vec = target_uvs[0] - target_uvs[-1]
+	target_pos = ( target_uvs[0] + target_uvs[-1] + target_uvs.mean( axis=0 ) ) * 0.33333
+
+	#compute scale. a chain whose ends meet has no direction to align.
+	source_length = float( np.linalg.norm( source_vec ) )
+	target_length = float( np.linalg.norm( target_vec ) )
+	if source_length > 0.0 and target_length > 0.0:
+		scale_factor = source_length / target_length
+		source_vec = source_vec / source_length
+		target_vec = target_vec / target_length
+	else:
+		scale_factor = 1.0
+
+	#compute rotation
+	rotation_angle = math.atan2( target_vec[0] * source_vec[1] - target_vec[1] * source_vec[0], float( target_vec @ source_vec ) )
+	if float( source_vec @ ( rotation( rotation_angle ) @ target_vec ) ) > 0:
+		rotation_angle += math.pi
+
+	#compute translation
+	offset = source_pos - target_pos
+
+	#rotate and move both islands halfway if we are stitching at midpoint
+	if midpoint:
+		rotation_angle *= 0.5
+		offset = offset * 0.5
+
+	rot = rotation( rotation_angle )
+	target_mat = affine( scale_factor * rot, target_pos, offset )
+	if not midpoint:
+		return target_mat, None
+	return target_mat, affine( rot.T, source_pos, -offset )
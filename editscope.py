@@ -0,0 +1,95 @@
+import bmesh
+from . import selection
+
+#`with rmmesh as rmmesh:` writes the bmesh back on exit ( update_edit_mesh in edit mode, to_mesh in object mode )
+#even when the operator cancelled or ended up changing nothing. on big meshes that write back costs more than the
+#operation. EditScope opens the same bmesh, but operators record their uv, seam and selection writes through it and
+#the bmesh is only written back when one of them actually changed a value. returning result() makes unchanged runs
+#CANCELLED, so blender does not push an undo step for them either.
+
+
+class EditScope():
+	__slots__ = ( 'object', 'rmmesh', 'dirty' )
+
+	def __init__( self, rmmesh ):
+		self.object = rmmesh.object
+		self.rmmesh = None #rmlib.rmMesh wrapping the open bmesh
+		self.dirty = False
+
+	def __enter__( self ):
+		self.rmmesh = selection.open_bmesh( self.object )
+		self.dirty = False
+		return self
+
+	def __exit__( self, type, value, traceback ):
+		bm = self.rmmesh.bmesh
+		mesh = self.object.data
+		if bm.is_wrapped:
+			if self.dirty:
+				#only uv, seam and selection data goes through a scope, so the tessellation stays valid
+				bmesh.update_edit_mesh( mesh, loop_triangles=False, destructive=False )
+				bm.select_flush_mode()
+		else:
+			if self.dirty:
+				bm.to_mesh( mesh )
+				mesh.update()
+			bm.free()
+		self.rmmesh.bmesh = None
+
+	def mark( self, changed=True ):
+		#record a change made without going through set_uv/set
+		if changed:
+			self.dirty = True
+			self.rmmesh.matches_mesh = False
+		return changed
+
+	def set_uv( self, luv, uv ):
+		#write uv ( any 2d sequence ) to a BMLoopUV. returns True when the value changed.
+		current = luv.uv
+		if current[0] == uv[0] and current[1] == uv[1]:
+			return False
+		luv.uv = uv
+		self.dirty = True
+		self.rmmesh.matches_mesh = False
+		return True
+
+	def set( self, item, attr, value ):
+		#write a flag such as select, select_edge, pin_uv or seam. returns True when the value changed.
+		if getattr( item, attr ) == value:
+			return False
+		setattr( item, attr, value )
+		self.dirty = True
+		self.rmmesh.matches_mesh = False
+		return True
+
+	def result( self ):
+		return { 'FINISHED' } if self.dirty else { 'CANCELLED' }
+
+
+class MultiEditScope():
+	#one EditScope per mesh in multi object edit mode. every mesh is opened once and only the meshes whose scope
+	#changed something are written back. the operator still pushes a single undo step for all of them.
+	__slots__ = ( 'scopes', )
+
+	def __init__( self, rmmeshes ):
+		self.scopes = [ EditScope( rmmesh ) for rmmesh in rmmeshes ]
+
+	def __enter__( self ):
+		for i, scope in enumerate( self.scopes ):
+			try:
+				scope.__enter__()
+			except Exception:
+				for opened in self.scopes[:i]:
+					opened.__exit__( None, None, None )
+				raise
+		return self
+
+	def __exit__( self, type, value, traceback ):
+		for scope in self.scopes:
+			scope.__exit__( type, value, traceback )
+
+	def __iter__( self ):
+		return iter( self.scopes )
+
+	def result( self ):
+		return { 'FINISHED' } if any( scope.dirty for scope in self.scopes ) else { 'CANCELLED' }
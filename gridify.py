@@ -1,16 +1,9 @@
-import bpy, bmesh, mathutils
+import bpy, bmesh
 import rmlib
+import numpy as np
+from . import editscope, selection, tagscope, uvarray
+from .core import gridmap
 
-def clear_tags( rmmesh ):
-	for v in rmmesh.bmesh.verts:
-		v.tag = False
-	for e in rmmesh.bmesh.edges:
-		e.tag = False
-	for f in rmmesh.bmesh.faces:
-		f.tag = False
-		for l in f.loops:
-			l.tag = False
-			
 def is_boundary( l ):
 	if l.edge.seam or l.edge.is_boundary:
 		return True
@@ -21,88 +14,12 @@ def is_boundary( l ):
 	return False
 
 
-def BBoxFromPoints( points ):
-	bbmin = mathutils.Vector( ( 99999.0, 99999.0 ) )
-	bbmax = mathutils.Vector( ( -99999.0, -99999.0 ) )
-	for i in range( len( points ) ):
-		bbmin[0] = min( bbmin[0], points[i][0] )
-		bbmin[1] = min( bbmin[1], points[i][1] )
-		bbmax[0] = max( bbmax[0], points[i][0] )
-		bbmax[1] = max( bbmax[1], points[i][1] )
-	if ( bbmax[0] - bbmin[0] ) <= rmlib.util.FLOAT_EPSILON or ( bbmax[1] - bbmin[1] ) <= rmlib.util.FLOAT_EPSILON:
-		bbmin = mathutils.Vector( ( 0.0, 0.0 ) )
-		bbmax = mathutils.Vector( ( 1.0, 1.0 ) )
-	return bbmin, bbmax
-
-
 def FitToBBox( faces, initial_bbmin, initial_bbmax, uvlayer ):
-	final_uvcoords = []
-	for f in faces:
-		for l in f.loops:
-			final_uvcoords.append( l[uvlayer].uv.copy() )
-	final_bbmin, final_bbmax = BBoxFromPoints( final_uvcoords )
-
-	trans_mat = mathutils.Matrix.Identity( 3 )
-	trans_mat[0][2] = ( initial_bbmin[0] + initial_bbmax[0] ) * 0.5
-	trans_mat[1][2] = ( initial_bbmin[1] + initial_bbmax[1] ) * 0.5
-
-	trans_mat_inv = mathutils.Matrix.Identity( 3 )
-	trans_mat_inv[0][2] = ( final_bbmin[0] + final_bbmax[0] ) * -0.5
-	trans_mat_inv[1][2] = ( final_bbmin[1] + final_bbmax[1] ) * -0.5
-
-	scl_mat = mathutils.Matrix.Identity( 3 )
-	initial_width = initial_bbmax[0] - initial_bbmin[0]
-	initial_height = initial_bbmax[1] - initial_bbmin[1]
-	initial_aspect = initial_height / initial_width
-	target_bounds_width = initial_bbmax[0] - initial_bbmin[0]
-	target_bounds_height = target_bounds_width * initial_aspect
-	final_width = final_bbmax[0] - final_bbmin[0]
-	final_height = final_bbmax[1] - final_bbmin[1]
-	final_aspect = final_height / final_width
-	if  ( final_aspect <= 1.0 and initial_aspect > 1.0 ) or ( final_aspect > 1.0 and initial_aspect <= 1.0 ):
-		temp = final_width
-		final_width = final_height
-		final_height = temp
-	scl_mat[0][0] = target_bounds_width / final_width
-	scl_mat[1][1] = target_bounds_height / final_height
-
-	mat = trans_mat @ scl_mat @ trans_mat_inv
-	for f in faces:
-		for l in f.loops:
-			uv = mathutils.Vector( l[uvlayer].uv.copy() ).to_3d()
-			uv[2] = 1.0
-			uv = mat @ uv
-			l[uvlayer].uv = uv.to_2d()
-
-
-def GetUnsyncUVVisibleFaces( rmmesh, sel_mode ):
-	visible_faces = rmlib.rmPolygonSet()
-	if sel_mode[0]:		
-		for f in rmmesh.bmesh.faces:
-			if f.hide:
-				continue
-			visible = True
-			for v in f.verts:
-				if not v.select:
-					visible = False
-					break
-			if visible:
-				visible_faces.append( f )
-	elif sel_mode[1]:
-		for f in rmmesh.bmesh.faces:
-			if f.hide:
-				continue
-			visible = True
-			for e in f.edges:
-				if not e.select:
-					visible = False
-					break
-			if visible:
-				visible_faces.append( f )
-	else:
-		visible_faces = rmlib.rmPolygonSet.from_selection( rmmesh )
-		
-	return visible_faces
+	loops = [ l for f in faces for l in f.loops ]
+	uvs = uvarray.gather_loop_uvs( loops, uvlayer )
+	mat = gridmap.fit_affine( initial_bbmin, initial_bbmax, uvs )
+	uvarray.apply_affine( uvs, np.arange( len( loops ) ), np.zeros( len( loops ), dtype=np.int64 ), [ mat ] )
+	uvarray.scatter_loop_uvs( loops, uvlayer, uvs )
 
 
 class MESH_OT_uvmaptogrid( bpy.types.Operator ):
@@ -125,7 +42,8 @@ class MESH_OT_uvmaptogrid( bpy.types.Operator ):
 		if rmmesh is None:
 			return { 'CANCELLED' }
 		
-		with rmmesh as rmmesh:
+		with editscope.EditScope( rmmesh ) as scope:
+			rmmesh = scope.rmmesh
 			if self.uv_map_name == '':
 				uvlayer = rmmesh.active_uv
 			else:
@@ -135,8 +53,6 @@ class MESH_OT_uvmaptogrid( bpy.types.Operator ):
 					self.report( { 'ERROR' }, 'No UVLayer with name {} exists on mesh {}'.format( self.uv_map_name, rmmesh.object ) )
 					return { 'CANCELLED' }
 
-			clear_tags( rmmesh )			
-
 			#get selection of faces
 			faces = rmlib.rmPolygonSet()
 			sel_sync = context.tool_settings.use_uv_select_sync
@@ -150,19 +66,19 @@ class MESH_OT_uvmaptogrid( bpy.types.Operator ):
 			else:
 				uv_sel_mode = context.tool_settings.uv_select_mode
 				if uv_sel_mode == 'FACE':
-					visible_faces = GetUnsyncUVVisibleFaces( rmmesh, sel_mode )
+					visible_faces = selection.visible_face_mask( rmmesh, sel_mode )
 					loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=rmmesh, uvlayer=uvlayer )
 					for l in loop_selection:
-						if l.face in visible_faces and l.face not in faces:
+						if visible_faces[l.face.index] and l.face not in faces:
 							faces.append( l.face )
 				else:
 					self.report( { 'ERROR' }, 'Must be in uvface mode.' )
 					return { 'CANCELLED' }
 			if len( faces ) < 1:
 				return { 'CANCELLED' }
+			tagscope.clear_region( faces )
 
-			complete_failure = True
-			for group in faces.group( use_seam=True ):
+			for group in tagscope.scoped_groups( faces.group( use_seam=True ) ):
 				#set tags
 				for f in group:
 					f.tag = True
@@ -188,11 +104,7 @@ class MESH_OT_uvmaptogrid( bpy.types.Operator ):
 					continue
 
 				#store initial bbox
-				initial_uvcoords = []
-				for f in group:
-					for l in f.loops:
-						initial_uvcoords.append( l[uvlayer].uv.copy() )
-				initial_bbmin, initial_bbmax = BBoxFromPoints( initial_uvcoords )
+				initial_bbmin, initial_bbmax = gridmap.bbox( uvarray.gather_loop_uvs( [ l for f in group for l in f.loops ], uvlayer ) )
 
 				#initialize start_loop
 				start_loop = None
@@ -293,21 +205,10 @@ class MESH_OT_uvmaptogrid( bpy.types.Operator ):
 					rings.append( ring )
 				rings[-1] = rings[-1][::-1]
 				
-				#build list of avg ring and loop lists
-				loop_steps = [ 0.0 ] * len( rings[0] )
-				for r in rings:
-					for i in range( 1, len( r ) ):
-						d = ( r[i].co - r[i-1].co ).length
-						loop_steps[i] += d
-				for i in range( len( loop_steps ) ):
-					loop_steps[i] /= len( rings )
-				ring_steps = [ 0.0 ] * len( rings )
-				for i in range( len( rings[0] ) ):
-					for j in range( 1, len( rings ) ):
-						d = ( rings[j][i].co - rings[j-1][i].co ).length
-						ring_steps[j] += d
-				for i in range( len( ring_steps ) ):
-					ring_steps[i] /= len( rings[0] )
+				#ring and loop spacing from the average edge lengths
+				if any( len( r ) != len( rings[0] ) for r in rings ):
+					continue
+				grid = gridmap.grid_uvs( [ [ tuple( v.co ) for v in r ] for r in rings ] ).tolist()
 
 				#build lists of faces
 				last_ring_faces = set( [ l.face for l in loop_rings[-1] ] )
@@ -318,13 +219,8 @@ class MESH_OT_uvmaptogrid( bpy.types.Operator ):
 					else:
 						last_loop_faces.add( r[0].face )
 
-				#compute scalar that will inscribe the resulting uv island to the unit square 
-				global_scalar = 1.0 / max( sum( ring_steps ), sum( loop_steps ) )				
-					
 				#set uv values
-				ring_offset = 0.0
 				for i, r in enumerate( rings ):
-					loop_offset = 0.0
 					for j, vert in enumerate( r ):
 						for l in vert.link_loops:
 							if i == len( rings ) - 1 and l.face not in last_ring_faces:
@@ -332,24 +228,15 @@ class MESH_OT_uvmaptogrid( bpy.types.Operator ):
 							if j == len( r ) - 1 and l.face not in last_loop_faces:
 								continue
 							if l.face in group:
-								u = ( ring_steps[i] + ring_offset ) * global_scalar
-								v = ( loop_steps[j] + loop_offset ) * global_scalar
-								l[uvlayer].uv = ( u, v )
-						loop_offset += loop_steps[j]
-					ring_offset += ring_steps[i]
-								
-				clear_tags( rmmesh )
+								l[uvlayer].uv = grid[i][j]
 
 				if context.area.type != 'VIEW_3D':
 					FitToBBox( group, initial_bbmin, initial_bbmax, uvlayer )
 
-				complete_failure = False
+				scope.mark()
 
 		#return failed if all poly groups failed to be gridified
-		if complete_failure:
-			return { 'CANCELLED' }
-			
-		return { 'FINISHED' }
+		return scope.result()
 
 
 def register():
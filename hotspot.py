@@ -1,26 +1,14 @@
 import rmlib
 import bpy, bmesh, mathutils
-import os, random, math, struct, ctypes
-
-MAT_CHUNK = 'MAT'
-HOT_CHUNK = 'HOT'
-
-MAX_SHORT = 1 << 15
-
-def clear_tags( rmmesh ):
-	for v in rmmesh.bmesh.verts:
-		v.tag = False
-	for e in rmmesh.bmesh.edges:
-		e.tag = False
-	for f in rmmesh.bmesh.faces:
-		f.tag = False
-		for l in f.loops:
-			l.tag = False
+from . import chunked, islandpick, islandtable, looptris, materialtable, redocache, selection, tagscope, uvarray
+from .core.hotfile import MAT_CHUNK, HOT_CHUNK, Bounds2d, Hotspot, fit_array, pack_bounds, write_default_file, write_hot_file, read_hot_file
+import os, random, math, time
+import numpy as np
 
+MIN_MATCH_AREA = 0.00001 #islands with a smaller uv bounds area are skipped by hotspot match
 
 def GetFaceSelection( context, rmmesh ):
 	uvlayer = rmmesh.active_uv
-	clear_tags( rmmesh )
 
 	faces = rmlib.rmPolygonSet()
 	sel_sync = context.tool_settings.use_uv_select_sync
@@ -34,589 +22,54 @@ def GetFaceSelection( context, rmmesh ):
 		sel_mode = context.tool_settings.uv_select_mode
 		loops = rmlib.rmUVLoopSet.from_selection( rmmesh, uvlayer=uvlayer )
 		loop_faces = set()
+		selected_loops = []
 		for l in loops:
 			if not l.face.select and sel_mode != 'EDGE':
 				continue
 			if not l[uvlayer].select_edge and sel_mode != 'VERT':
 				continue
 			loop_faces.add( l.face )
-			l.tag = True
-		for f in loop_faces:
-			all_loops_tagged = True
-			for l in f.loops:
-				if not l.tag:
-					all_loops_tagged = False
-				else:
-					l.tag = False
-			if all_loops_tagged:
-				faces.append( f )
-
-	clear_tags( rmmesh )
+			selected_loops.append( l )
+		with tagscope.TagScope( loop_faces ) as tags:
+			tags.tag_all( selected_loops )
+			for f in loop_faces:
+				all_loops_tagged = True
+				for l in f.loops:
+					if not l.tag:
+						all_loops_tagged = False
+						break
+				if all_loops_tagged:
+					faces.append( f )
 
 	return faces
 
 
-def load_mat_subchunk( chunk, offset ):
-	'''
-	#Chunk layout described below:
-	3s(chunkname)
-	I(groupcount)
-		I(strcount for group)
-			I(charcount fror string)
-			{}s.format(charcount)(string)
-			...
-		...
-	'''
-	chunk_name = struct.unpack_from( '>3s', chunk, offset )[0].decode( 'utf-8' )
-	if chunk_name != MAT_CHUNK:
-		raise RuntimeError
-	offset += 3
-	str_list = []
-	group_count = struct.unpack_from( '>I', chunk, offset )[0]
-	offset += 4
-	str_groups = []
-	for i in range( group_count ):
-		str_count = struct.unpack_from( '>I', chunk, offset )[0]
-		offset += 4
-		str_list = []
-		for j in range( str_count ):
-			size = struct.unpack_from( '>I', chunk, offset )[0]
-			offset += 4
-			s = struct.unpack_from( '>{}s'.format( size ), chunk, offset )[0].decode( 'utf-8' )
-			str_list.append( s )
-			offset += size
-		str_groups.append( str_list )
-	return str_groups, offset
-
-
-def load_hot_chunk( chunk, offset ):
-	'''
-	#Chunk layout described below:
-	3s(chunkname)
-	I(hotspotcount)
-		hotspot data
-		...
-	'''
-	chunk_name = struct.unpack_from( '>3s', chunk, offset )[0].decode( 'utf-8' )
-	if chunk_name != HOT_CHUNK:
-		raise RuntimeError
-	offset += 3
-	hotspots = []
-	hotspot_count = struct.unpack_from( '>I', chunk, offset )[0]
-	offset += 4
-	for i in range( hotspot_count ):
-		new_hotspot, offset = Hotspot.unpack( chunk, offset )
-		hotspots.append( new_hotspot )
-	return hotspots, offset
-
-
-class Bounds2d():
-	def __init__( self, points, **kwargs ):
-		self.__min = mathutils.Vector( ( 0.0, 0.0 ) )
-		self.__max = mathutils.Vector( ( 1.0, 1.0 ) )
-		self.__materialaspect = 1.0
-		self.__horizontal = self.__max[0] - self.__min[0] > self.__max[1] - self.__min[1]
-		if len( points ) > 0:
-			self.__min = points[0].copy()
-			self.__max = points[0].copy()
-		#self.__inset = mathutils.Vector( ( 0.0, 0.0 ) )
-		#self.__properties = {}
-		for p in points:
-			for i in range( 2 ):
-				self.__min[i] = min( p[i], self.__min[i] )
-				self.__max[i] = max( p[i], self.__max[i] )
-
-		for key, value in kwargs.items():
-			if key == 'materialaspect':
-				self.__materialaspect = value
-				self.__horizontal = ( self.__max[0] - self.__min[0] ) * self.__materialaspect > self.__max[1] - self.__min[1]
-
-	def __repr__( self ):
-		return 'min:Vec2( {}, {} )  max:Vec2( {}, {} )'.format( self.__min[0], self.__min[1], self.__max[0], self.max[1] )
-
-	def __eq__( self, __o ):
-		return rmlib.util.AlmostEqual_v2( self.__min, __o.__min ) and rmlib.util.AlmostEqual_v2( self.__max, __o.__max )
-
-	def __bytes__( self ):
-		return struct.pack( '>HHHH', ctypes.c_ushort( int( self.__min[0] * MAX_SHORT ) ).value,
-									ctypes.c_ushort( int( self.__min[1] * MAX_SHORT ) ).value,
-									ctypes.c_ushort( int( self.__max[0] * MAX_SHORT ) ).value,
-									ctypes.c_ushort( int( self.__max[1] * MAX_SHORT ) ).value )
-
-	@classmethod
-	def from_verts( cls, verts, **kwargs ):
-		#build bounds from list of BMVerts
-		poslist = [ v.co.to_2d() for v in verts ]
-		return cls( poslist, **kwargs )
-
-	@classmethod
-	def from_loops( cls, loops, uvlayer, **kwargs ):
-		#build bounds from list of BMVerts
-		uvlist = [ l[uvlayer].uv.copy() for l in loops ]
-		return cls( uvlist, **kwargs )
-
-	@property
-	def min( self ):
-		return self.__min
-
-	@property
-	def max( self ):
-		return self.__max
-
-	@property
-	def width( self ):
-		return self.__max[0] - self.__min[0]
-
-	@property
-	def height( self ):
-		return self.__max[1] - self.__min[1]
-
-	@property
-	def aspect( self ):
-		return self.width * self.__materialaspect / self.height
-	
-	@property
-	def invaspect( self ):
-		return self.height / ( self.width * self.__materialaspect )
-	
-	@property
-	def area( self ):
-		return self.width * self.height
-
-	@property
-	def center( self ):
-		return ( self.__min + self.__max ) * 0.5
-
-	@property
-	def horizontal( self ):
-		#returns true if self is wider than it is tall
-		return self.__horizontal
-
-	@property
-	def tiling( self ):
-		if self.__max[0] - self.__min[0] == 1.0:
-			return 1
-		if self.__max[1] - self.__min[1] == 1.0:
-			return 2
-		return 0
-
-	@property
-	def corners( self ):
-		#return corner coords of self in (u,v) domain
-		return [ self.__min, mathutils.Vector( ( self.__max[0], self.__min[1] ) ), self.__max, mathutils.Vector( ( self.__min[0], self.__max[1] ) ) ]
-	
-	@property
-	def materialaspect( self ):
-		return self.__materialaspect
-	
-	@materialaspect.setter
-	def materialaspect( self, value ):
-		self.__materialaspect = value
-		self.__horizontal = self.width * self.__materialaspect > self.height
-
-	def clamp( self ):
-		new_bounds = Bounds2d( [ self.__min, self.__max ] )
-
-		#move into unit square
-		center = ( new_bounds.__min + new_bounds.__max ) / 2.0
-		center.x = math.floor( center.x )
-		center.y = math.floor( center.y )
-		new_bounds.__min -= center
-		new_bounds.__max -= center
-
-		#clamp to 0.0-1.0 range
-		new_bounds.__min.x = max( new_bounds.__min.x, 0.0 )
-		new_bounds.__min.y = max( new_bounds.__min.y, 0.0 )
-		new_bounds.__max.x = min( new_bounds.__max.x, 1.0 )
-		new_bounds.__max.y = min( new_bounds.__max.y, 1.0 )
-
-		return new_bounds
-
-	def normalized( self ):
-		#ensure bounds overlapps the 0-1 region
-		center = self.center
-		new_bounds = Bounds2d( [ self.__min, self.__max ] )
-		new_bounds.__min[0] -= float( math.floor( center[0] ) )
-		new_bounds.__min[1] -= float( math.floor( center[1] ) )
-		new_bounds.__max[0] -= float( math.floor( center[0] ) )
-		new_bounds.__max[1] -= float( math.floor( center[1] ) )
-		return new_bounds
-
-	def inside( self, point ):
-		#test if point is inside self
-		return ( point[0] > self.min[0] and point[1] > self.min[1] and point[0] < self.max[0] and point[1] < self.max[1] )
-
-	def overlapping( self, bounds ):
-		#test if bounds overlapps self
-		return not ( self.__max[0] < bounds.__min[0] or self.__min[0] > bounds.max[0] or self.__max[1] < bounds.__min[1] or self.__min[1] > bounds.max[1] )
-	
-	def overlapping_area( self, bounds ):
-		#does not test if bounds actually overlapp
-		min_x = max( self.__min[0], bounds.min[0] )
-		min_y = max( self.__min[1], bounds.min[1] )
-		max_x = min( self.__max[0], bounds.max[0] )
-		max_y = min( self.__max[1], bounds.max[1] )
-		return ( max_x - min_x ) * ( max_y - min_y )
-
-	def transform( self, other, skip_rot=False, trim=False, inset=0.0, random_rot=False, random_flip=False ):
-		#compute the 3x3 matrix that transforms bound 'other' to self
-
-		if self.width < rmlib.util.FLOAT_EPSILON or self.height < rmlib.util.FLOAT_EPSILON:
-			return mathutils.Matrix.Identity( 3 )
-
-		trans_mat = mathutils.Matrix.Identity( 3 )
-		trans_mat[0][2] = self.center[0] * -1.0
-		trans_mat[1][2] = self.center[1] * -1.0
-		
-		trans_mat_inverse = mathutils.Matrix.Identity( 3 )
-		trans_mat_inverse[0][2] = other.center[0]
-		trans_mat_inverse[1][2] = other.center[1]
-
-		other_inset_width = other.width - inset
-		other_inset_height = other.height - inset * self.__materialaspect
-
-		#randomly rotate 180 degrees
-		rand_rot_mat = mathutils.Matrix.Identity( 3 )
-		if random_rot and random.random() > 0.5:
-			rand_rot_mat[0][0] = math.cos( math.pi )
-			rand_rot_mat[1][0] = math.sin( math.pi ) * -1.0
-			rand_rot_mat[0][1] = math.sin( math.pi )
-			rand_rot_mat[1][1] = math.cos( math.pi )
-
-		rot_mat = mathutils.Matrix.Identity( 3 )
-		scl_mat = mathutils.Matrix.Identity( 3 )
-		if trim and ( other.width >= 1.0 or other.height >= 1.0 ):
-			if self.horizontal != other.horizontal and not skip_rot:
-				rot_mat[0][0] = math.cos( math.pi / 2.0 )
-				rot_mat[1][0] = math.sin( math.pi / 2.0 ) * -1.0
-				rot_mat[0][1] = math.sin( math.pi / 2.0 )
-				rot_mat[1][1] = math.cos( math.pi / 2.0 )
-
-				if other.width >= 1.0:
-					scl_mat[1][1] *= other_inset_height / self.width
-					scl_mat[0][0] *= other_inset_height / self.width / ( self.__materialaspect * self.__materialaspect )
-				else:
-					scl_mat[0][0] *= other_inset_width / self.height / ( self.__materialaspect * self.__materialaspect )
-					scl_mat[1][1] *= other_inset_width / self.height
-			else:
-				if other.width >= 1.0:
-					scl_mat[1][1] = other_inset_height / self.height
-					scl_mat[0][0] = other_inset_height / self.height
-				else:
-					scl_mat[0][0] = other_inset_width / self.width
-					scl_mat[1][1] = other_inset_width / self.width
-		else:
-			if self.horizontal != other.horizontal and not skip_rot:
-				rot_mat[0][0] = math.cos( math.pi / 2.0 )
-				rot_mat[1][0] = math.sin( math.pi / 2.0 ) * -1.0
-				rot_mat[0][1] = math.sin( math.pi / 2.0 )
-				rot_mat[1][1] = math.cos( math.pi / 2.0 )
-				scl_mat[0][0] = other_inset_width / self.height
-				scl_mat[1][1] = other_inset_height / self.width
-			else:
-				scl_mat[0][0] = other_inset_width / self.width
-				scl_mat[1][1] = other_inset_height / self.height
-
-		#randomly flip along each axis
-		if random_flip and random.random() > 0.5:
-			scl_mat[0][0] *= -1.0
-		if random_flip and random.random() > 0.5:
-			scl_mat[1][1] *= -1.0
-
-		return trans_mat_inverse @ scl_mat @ rand_rot_mat @ rot_mat @ trans_mat
-	
-	def copy( self ):
-		return Bounds2d( [ self.__min, self.__max ], materialaspect=self.__materialaspect )
-
-	def inset( self, f, aspect=1.0 ):
-		self.__min[0] += f * aspect
-		self.__min[1] += f
-		self.__max[0] -= f * aspect
-		self.__max[1] -= f
-
-
-class Hotspot():
-	def __init__( self, bounds2d_list, **kwargs ):
-		self.__name = ''
-		self.__properties = None
-		self.__data = []
-		for b in bounds2d_list:
-			if b.area > 0.0:
-				self.__data.append( b )
-		for key, value in kwargs.items():
-			if key == 'name':
-				self.__name = value
-			elif key == 'properties':
-				self.__properties = None
-
-	def __repr__( self ):
-		s = 'HOTSPOT :: \"{}\" \n'.format( self.__name )
-		#s += '\tproperties :: {}\n'.format( self.__properties )
-		for i, r in enumerate( self.__data ):
-			s += '\t{} :: {}\n'.format( i, r )
-		return s
-
-	def __eq__( self, __o ):
-		if len( self.__data ) != len( __o.__data ):
-			return False
-		
-		for b in self.__data:
-			if b not in __o.__data:
-				return False
-			
-		return True
-
-	def __bytes__( self ):
-		bounds_data = struct.pack( '>I', len( self.__data ) )
-		for b in self.__data:
-			bounds_data += bytes( b )		
-		return bounds_data
-	
-	@property
-	def data( self ):
-		return self.__data
-
-	@staticmethod
-	def unpack( bytearray, offset ):
-		bounds_count = struct.unpack_from( '>I', bytearray, offset )[0]
-		offset += 4
-		data = []
-		for i in range( bounds_count ):
-			bmin_x, bmin_y, bmax_x, bmax_y = struct.unpack_from( '>HHHH', bytearray, offset )
-			min_pos = mathutils.Vector( ( bmin_x / MAX_SHORT, bmin_y / MAX_SHORT ) )
-			max_pos = mathutils.Vector( ( bmax_x / MAX_SHORT, bmax_y / MAX_SHORT ) )
-			data.append( Bounds2d( [ min_pos, max_pos ] ) )
-			offset += 8
-		return Hotspot( data ), offset
-
-	@classmethod
-	def from_bmesh( cls, rmmesh ):
-		#load hotspot from subrect_atlas		
-		boundslist = []
-		with rmmesh as rmmesh:
-			rmmesh.readonly = True
-			uv_layer = rmmesh.bmesh.loops.layers.uv.verify()
-			for f in rmmesh.bmesh.faces:
-				boundslist.append( Bounds2d.from_loops( f.loops, uv_layer ) )
-		return cls( boundslist )
-
-	@property
-	def name( self ):
-		return self.__name
-	
-	@property
-	def materialaspect( self ):
-		return self.__data[0].materialaspect
-
-	def save_bmesh( self, rmmesh ):
-		with rmmesh as rmmesh:
-			uvlayer = rmmesh.active_uv
-			del_faces = list( rmmesh.bmesh.faces )
-			
-			for bounds in self.__data:
-				verts = []
-				corners = bounds.corners
-				for c in corners:
-					verts.append( rmmesh.bmesh.verts.new( c.to_3d() ) )
-				f = rmmesh.bmesh.faces.new( verts )
-				for i, l in enumerate( f.loops ):
-					l[uvlayer].uv = corners[i]
-
-			bmesh.ops.delete( rmmesh.bmesh, geom=del_faces, context='FACES' )
-
-	def match( self, source_bounds, tollerance=0.01, random_orient=True, trim_filter='none' ):
-		#find the bound in this hotspot that best matches source
-		sb_aspect = min( source_bounds.aspect, source_bounds.invaspect )
-		source_coord = mathutils.Vector( ( math.sqrt( source_bounds.area ), sb_aspect ) )
-
-		min_dist = 9999999.9
-		best_bounds = self.__data[0]
-		for tb in self.__data:
-			if trim_filter == 'onlytrim':
-				if tb.width < 1.0 or tb.height < 1.0:
-					continue
-
-			elif trim_filter == 'notrim':
-				if tb.width >= 1.0 or tb.height >= 1.0:
-					continue
-
-			if not random_orient and tb.horizontal != best_bounds.horizontal:
-				continue
+def hotspot_from_bmesh( rmmesh ):
+	#load hotspot from subrect_atlas
+	boundslist = []
+	with rmmesh as rmmesh:
+		rmmesh.readonly = True
+		uv_layer = rmmesh.bmesh.loops.layers.uv.verify()
+		for f in rmmesh.bmesh.faces:
+			boundslist.append( Bounds2d.from_loops( f.loops, uv_layer ) )
+	return Hotspot( boundslist )
 
-			aspect = min( tb.aspect, tb.invaspect )
-			target_coord = mathutils.Vector( ( math.sqrt( tb.area ), aspect ) )
-			dist = ( target_coord - source_coord ).length
-			if dist < min_dist:
-				min_dist = dist
-				best_bounds = tb
-		best_aspect = min( best_bounds.aspect, best_bounds.invaspect )
-		best_coord = mathutils.Vector( ( math.sqrt( best_bounds.area ), best_aspect ) )
-
-		target_list = []
-		for tb in self.__data:
-			aspect = min( tb.aspect, tb.invaspect )
-			target_coord = mathutils.Vector( ( math.sqrt( tb.area ), aspect ) )
-			if ( target_coord - best_coord ).length <= tollerance:			
-				if not random_orient and tb.horizontal == best_bounds.horizontal:
-						target_list.append( tb )
-				else:
-					target_list.append( tb )
 
-		if len( target_list ) == 0:
-			return None
+def save_hotspot_bmesh( hotspot, rmmesh ):
+	with rmmesh as rmmesh:
+		uvlayer = rmmesh.active_uv
+		del_faces = list( rmmesh.bmesh.faces )
 
-		return random.choice( target_list )
-
-	def nearest( self, u, v ):
-		#normalize u and v
-		u -= math.floor( u )
-		v -= math.floor( v )
-
-		#find the bounds nearest to (u,v) coord
-		point = mathutils.Vector( ( u, v ) )
-		nearest_rect = self.__data[0]
-		nearest_rect_dist = 999999999.9
-		for b in self.__data:
-			if b.inside( point ):
-				return b
-			min_dist = 999999999.9
-			for c in b.corners:
-				dist = ( c - point ).length
-				if dist < min_dist:
-					min_dist = dist
-			if min_dist < nearest_rect_dist:
-				nearest_rect_dist = min_dist
-				nearest_rect = b
-
-		return nearest_rect
-
-	def overlapping( self, bounds2d ):
-		b_in = bounds2d.normalized()
-
-		#find the bounds that most overlapps bounds2d
-		max_overlap_area = -1.0
-		overlap_bounds = self.__data[0]
-		for b in self.__data:
-			if b.overlapping( b_in ):
-				overlap_area = b.overlapping_area( b_in )
-				if overlap_area > max_overlap_area:
-					max_overlap_area = overlap_area
-					overlap_bounds = b
-		return overlap_bounds
-	
-	def applymaterialaspect( self, material_aspect ):
-		for b in self.__data:
-			b.materialaspect = material_aspect
-
-
-def write_default_file( file ):
-	bounds = []
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.5, 0.0 ) ), mathutils.Vector( ( 0.75, 0.5 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.9375, 0.0 ) ), mathutils.Vector( ( 0.96875, 0.5 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.75, 0.0 ) ), mathutils.Vector( ( 0.875, 0.5 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.0, 0.0 ) ), mathutils.Vector( ( 0.5, 0.5 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.875, 0.0 ) ), mathutils.Vector( ( 0.9375, 0.5 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.75, 0.5 ) ), mathutils.Vector( ( 0.875, 0.75 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.875, 0.5 ) ), mathutils.Vector( ( 0.9375, 0.75 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.0, 0.5 ) ), mathutils.Vector( ( 0.5, 0.75 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.5, 0.5 ) ), mathutils.Vector( ( 0.75, 0.75 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.9375, 0.5 ) ), mathutils.Vector( ( 0.96875, 0.75 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.875, 0.75 ) ), mathutils.Vector( ( 0.9375, 0.875 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.5, 0.75 ) ), mathutils.Vector( ( 0.75, 0.875 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.9375, 0.75 ) ), mathutils.Vector( ( 0.96875, 0.875 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.75, 0.75 ) ), mathutils.Vector( ( 0.875, 0.875 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.0, 0.75 ) ), mathutils.Vector( ( 0.5, 0.875 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.0, 0.875 ) ), mathutils.Vector( ( 0.5, 0.9375 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.5, 0.875 ) ), mathutils.Vector( ( 0.75, 0.9375 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.9375, 0.875 ) ), mathutils.Vector( ( 0.96875, 0.9375 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.875, 0.875 ) ), mathutils.Vector( ( 0.9375, 0.9375 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.75, 0.875 ) ), mathutils.Vector( ( 0.875, 0.9375 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.875, 0.9375 ) ), mathutils.Vector( ( 0.9375, 0.96875 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.9375, 0.9375 ) ), mathutils.Vector( ( 0.96875, 0.96875 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.75, 0.9375 ) ), mathutils.Vector( ( 0.875, 0.96875 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.0, 0.9375 ) ), mathutils.Vector( ( 0.5, 0.96875 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.5, 0.9375 ) ), mathutils.Vector( ( 0.75, 0.96875 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.984375, 0.9375 ) ), mathutils.Vector( ( 1.0, 0.96875 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.96875, 0.9375 ) ), mathutils.Vector( ( 0.984375, 0.96875 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.984375, 0.875 ) ), mathutils.Vector( ( 1.0, 0.9375 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.96875, 0.875 ) ), mathutils.Vector( ( 0.984375, 0.9375 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.984375, 0.75 ) ), mathutils.Vector( ( 1.0, 0.875 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.96875, 0.75 ) ), mathutils.Vector( ( 0.984375, 0.875 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.984375, 0.0 ) ), mathutils.Vector( ( 1.0, 0.5 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.96875, 0.0 ) ), mathutils.Vector( ( 0.984375, 0.5 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.984375, 0.5 ) ), mathutils.Vector( ( 1.0, 0.75 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.96875, 0.5 ) ), mathutils.Vector( ( 0.984375, 0.75 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.0, 0.984375 ) ), mathutils.Vector( ( 0.5, 1.0 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.0, 0.96875 ) ), mathutils.Vector( ( 0.5, 0.984375 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.96875, 0.96875 ) ), mathutils.Vector( ( 0.984375, 0.984375 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.96875, 0.984375 ) ), mathutils.Vector( ( 0.984375, 1.0 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.9375, 0.984375 ) ), mathutils.Vector( ( 0.96875, 1.0 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.9375, 0.96875 ) ), mathutils.Vector( ( 0.96875, 0.984375 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.984375, 0.984375 ) ), mathutils.Vector( ( 1.0, 1.0 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.984375, 0.96875 ) ), mathutils.Vector( ( 1.0, 0.984375 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.5, 0.984375 ) ), mathutils.Vector( ( 0.75, 1.0 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.5, 0.96875 ) ), mathutils.Vector( ( 0.75, 0.984375 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.75, 0.984375 ) ), mathutils.Vector( ( 0.875, 1.0 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.75, 0.96875 ) ), mathutils.Vector( ( 0.875, 0.984375 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.875, 0.984375 ) ), mathutils.Vector( ( 0.9375, 1.0 ) ) ] ) )
-	bounds.append( Bounds2d( [ mathutils.Vector( ( 0.875, 0.96875 ) ), mathutils.Vector( ( 0.9375, 0.984375 ) ) ] ) )
-	hotspot = Hotspot( bounds, name='default' )
-
-	with open( file, 'wb' ) as f:
-		#write material chunk
-		f.write( struct.pack( '>3s', bytes( MAT_CHUNK, 'utf-8' ) ) )
-		f.write( struct.pack( '>I', 1 ) )
-		for matgroup in [ [ 'default' ] ]:
-			f.write( struct.pack( '>I', len( matgroup ) ) )
-			for mat in matgroup:
-				size = len( mat )
-				f.write( struct.pack( '>I', size ) )
-				f.write( struct.pack( '>{}s'.format( size ), bytes( mat, 'utf-8' ) ) )
-
-		#write hotspot chunk
-		f.write( struct.pack( '>3s', bytes( HOT_CHUNK, 'utf-8' ) ) )
-		f.write( struct.pack( '>I', 1 ) )
-		f.write( bytes( hotspot ) )
-
-
-def write_hot_file( file, materials, hotspots ):
-	if len( hotspots ) != len( materials ):
-		raise RuntimeError
-
-	with open( file, 'wb' ) as f:
-		#write material chunk
-		f.write( struct.pack( '>3s', bytes( MAT_CHUNK, 'utf-8' ) ) )
-		f.write( struct.pack( '>I', len( materials ) ) )
-		for matgroup in materials:
-			f.write( struct.pack( '>I', len( matgroup ) ) )
-			for mat in matgroup:
-				size = len( mat )
-				f.write( struct.pack( '>I', size ) )
-				f.write( struct.pack( '>{}s'.format( size ), bytes( mat, 'utf-8' ) ) )
-
-		#write hotspot chunk
-		f.write( struct.pack( '>3s', bytes( HOT_CHUNK, 'utf-8' ) ) )
-		f.write( struct.pack( '>I', len( hotspots ) ) )
-		for h in hotspots:
-			f.write( bytes( h ) )
-
-
-def read_hot_file( file ):
-	materials = []
-	hotspots = []
-	with open( file, 'rb' ) as f:
-		data = f.read()
-
-		offset = 0
-		chunkname = struct.unpack_from( '>3s', data, offset )[0].decode( 'utf-8' )
-		if chunkname == MAT_CHUNK:
-			materials, offset = load_mat_subchunk( data, offset )
-		
-		chunkname = struct.unpack_from( '>3s', data, offset )[0].decode( 'utf-8' )
-		if chunkname == HOT_CHUNK:
-			hotspots, offset = load_hot_chunk( data, offset )
+		for bounds in hotspot.data:
+			verts = []
+			corners = bounds.corners
+			for c in corners:
+				verts.append( rmmesh.bmesh.verts.new( c.to_3d() ) )
+			f = rmmesh.bmesh.faces.new( verts )
+			for i, l in enumerate( f.loops ):
+				l[uvlayer].uv = corners[i]
 
-	return materials, hotspots
+		bmesh.ops.delete( rmmesh.bmesh, geom=del_faces, context='FACES' )
 
 
 def get_hotfile_path():
@@ -635,24 +88,6 @@ def get_clipboardfile_path():
 	return filepath
 
 
-def load_hotspot_from_repo( material_name, material_aspect ):
-	#load hotspot repo file
-	hotfile = get_hotfile_path()
-	existing_materials, existing_hotspots = read_hot_file( hotfile )
-
-	hotspot_idx = -1
-	for i in range( len( existing_materials ) ):
-		if material_name in existing_materials[i]:
-			hotspot_idx = i
-			break
-	if hotspot_idx < 0:
-		return None
-	
-	existing_hotspots[hotspot_idx].applymaterialaspect( material_aspect )
-
-	return existing_hotspots[hotspot_idx]
-
-
 def get_hotspot( context ):
 	rmmesh = rmlib.rmMesh.GetActive( context )
 	if rmmesh is None:
@@ -683,30 +118,18 @@ def get_hotspot( context ):
 		faces = rmlib.rmPolygonSet.from_selection( rmmesh )
 		if len( faces ) <= 0:
 			return None, None
+
+		#read the repo once and resolve every material slot of the mesh against it
+		existing_materials, existing_hotspots = read_hot_file( get_hotfile_path() )
+		metrics = materialtable.build( rmmesh.mesh, existing_materials )
 		
-		failed_midxs = set()
 		hotspots = {}
-		for f in faces:
-			midx = f.material_index
-			if midx in hotspots or midx in failed_midxs:
-				continue
-
-			try:
-				material = rmmesh.mesh.materials[ midx ]
-			except IndexError:
+		for midx in set( f.material_index for f in faces ):
+			s = metrics.row( midx )
+			if metrics.names[s] is None or metrics.hotspot_ids[s] < 0:
 				continue
-
-			material_aspect = 1.0
-			try:
-				material_aspect = material["WorldMappingWidth"] / material["WorldMappingHeight"]
-			except:
-				pass			
-			
-			hotspot = load_hotspot_from_repo( material.name, material_aspect )
-			if hotspot is None:
-				failed_midxs.add( midx )
-				continue
-
+			hotspot = Hotspot( [ b.copy() for b in existing_hotspots[metrics.hotspot_ids[s]].data ] )
+			hotspot.applymaterialaspect( float( metrics.aspect[s] ) )
 			hotspots[midx] = hotspot
 	
 	return hotspots
@@ -735,6 +158,223 @@ def image_from_hotspot( hotspot, size=64 ):
 	return raw_data
 
 
+class MatchReport():
+	#result of a hotspot match dry run. no uvs are written while building one of these.
+	def __init__( self ):
+		self.histogram = {} #( material name, rect index ) -> island count
+		self.unmatched_materials = set() #names of materials with no hotspot in the repo
+		self.unmatched_islands = 0 #islands for which Hotspot.match returned None
+		self.small_islands = 0 #islands at or below MIN_MATCH_AREA that a real match skips
+		self.island_count = 0
+		self.timings = { 'selection' : 0.0, 'grouping' : 0.0, 'preprocessing' : 0.0, 'matching' : 0.0 }
+
+	def __repr__( self ):
+		s = 'HOTSPOT MATCH REPORT :: {} islands\n'.format( self.island_count )
+		s += '\tbelow area cutoff :: {}\n'.format( self.small_islands )
+		s += '\tno match :: {}\n'.format( self.unmatched_islands )
+		s += '\tunmatched materials :: {}\n'.format( ', '.join( sorted( self.unmatched_materials ) ) )
+		for key in sorted( self.histogram.keys() ):
+			s += '\t{} rect {} :: {}\n'.format( key[0], key[1], self.histogram[key] )
+		for stage, t in self.timings.items():
+			s += '\t{} :: {:.4f}s\n'.format( stage, t )
+		return s
+
+	@property
+	def matched_islands( self ):
+		return sum( self.histogram.values() )
+
+	@property
+	def total_time( self ):
+		return sum( self.timings.values() )
+
+
+def estimate_island_bounds( island, xfrm, material_size, material_aspect ):
+	#approximate the uv bounds the 3d viewport preprocessing (gridify/unwrap, unrotate, normalize texels,
+	#scale to material size) would produce, using only the world space geometry of the island.
+	world_co = {}
+	for f in island:
+		for v in f.verts:
+			if v not in world_co:
+				world_co[v] = xfrm @ v.co
+
+	normal = mathutils.Vector( ( 0.0, 0.0, 0.0 ) )
+	face_data = []
+	area = 0.0
+	for f in island:
+		coords = [ world_co[v] for v in f.verts ]
+		face_area = 0.0
+		for i in range( 1, len( coords ) - 1 ):
+			face_area += rmlib.util.TriangleArea( coords[0], coords[i], coords[i+1] )
+		face_normal = mathutils.geometry.normal( coords )
+		face_data.append( ( face_area, face_normal ) )
+		normal += face_normal * face_area
+		area += face_area
+	if area <= 0.0:
+		return Bounds2d.from_floats( 0.0, 0.0, 0.0, 0.0, materialaspect=material_aspect )
+
+	#curved islands get unwrapped flat, so fall back on a square of equal area
+	if normal.length < area * 0.1:
+		side = math.sqrt( area )
+		return Bounds2d.from_floats( 0.0, 0.0, side / material_size[0], side / material_size[1], materialaspect=material_aspect )
+	normal.normalize()
+
+	#unrotate aligns the longest edge of the island to the u axis
+	u_axis = None
+	longest = -1.0
+	for f in island:
+		for e in f.edges:
+			vec = world_co[e.verts[1]] - world_co[e.verts[0]]
+			vec -= normal * vec.dot( normal )
+			if vec.length > longest:
+				longest = vec.length
+				u_axis = vec
+	if u_axis is None or longest <= 0.0:
+		u_axis = normal.orthogonal()
+	u_axis.normalize()
+	v_axis = normal.cross( u_axis )
+
+	min_u = min_v = 9999999.9
+	max_u = max_v = -9999999.9
+	for co in world_co.values():
+		u = co.dot( u_axis )
+		v = co.dot( v_axis )
+		min_u = min( min_u, u )
+		min_v = min( min_v, v )
+		max_u = max( max_u, u )
+		max_v = max( max_v, v )
+
+	#unwrapping preserves surface area rather than projected area
+	projected_area = 0.0
+	for face_area, face_normal in face_data:
+		projected_area += face_area * abs( face_normal.dot( normal ) )
+	k = 1.0
+	if projected_area > 0.0:
+		k = math.sqrt( area / projected_area )
+
+	width = ( max_u - min_u ) * k / material_size[0]
+	height = ( max_v - min_v ) * k / material_size[1]
+	return Bounds2d.from_floats( 0.0, 0.0, width, height, materialaspect=material_aspect )
+
+
+def match_hotspot_report( context, objects=None, use_selection=True, estimate=True, tollerance=0.01, trim_filter=None ):
+	#dry run of MESH_OT_matchhotspot over objects ( defaults to the selected mesh objects ).
+	#when estimate is True, island bounds are estimated from geometry instead of running the 3d viewport
+	#preprocessing ops, otherwise the current uvs of each uv island are matched as they are.
+	#returns a MatchReport. uvs, selection and the undo stack are left untouched.
+	report = MatchReport()
+	hotspotprops = context.scene.rmkituv_props.hotspotprops
+	if trim_filter is None:
+		trim_filter = hotspotprops.hs_recttype_filter
+
+	if objects is None:
+		objects = [ o for o in context.selected_objects if o.type == 'MESH' ]
+		if context.active_object is not None and context.active_object.type == 'MESH' and context.active_object not in objects:
+			objects.insert( 0, context.active_object )
+
+	#load repo once for every material instead of per material lookup
+	clipboard_hotspot = None
+	if hotspotprops.hs_use_clipboard_atlas:
+		existing_materials, existing_hotspots = read_hot_file( get_clipboardfile_path() )
+		selected_index = int( context.window_manager.generated_icon_hotspotclipboard[-1] )
+		clipboard_hotspot = existing_hotspots[selected_index]
+		clipboard_hotspot.applymaterialaspect( 1.0 )
+	else:
+		existing_materials, existing_hotspots = read_hot_file( get_hotfile_path() )
+	material_hotspots = {}
+
+	def hotspot_for_material( metrics, s ):
+		if clipboard_hotspot is not None:
+			return clipboard_hotspot
+		name = metrics.names[s]
+		if name in material_hotspots:
+			return material_hotspots[name]
+		hotspot = None
+		if metrics.hotspot_ids[s] >= 0:
+			hotspot = Hotspot( [ b.copy() for b in existing_hotspots[metrics.hotspot_ids[s]].data ] )
+			hotspot.applymaterialaspect( float( metrics.aspect[s] ) )
+		material_hotspots[name] = hotspot
+		return hotspot
+
+	meshes = set()
+	for obj in objects:
+		if obj.type != 'MESH' or obj.data in meshes:
+			continue
+		meshes.add( obj.data )
+
+		#selection
+		st = time.perf_counter()
+		rmmesh = selection.open_bmesh( obj )
+		bm = rmmesh.bmesh
+		if len( bm.loops.layers.uv ) == 0 and not estimate:
+			if not obj.data.is_editmode:
+				bm.free()
+			continue
+		uvlayer = bm.loops.layers.uv.active
+		if not use_selection:
+			faces = rmlib.rmPolygonSet.from_mesh( rmmesh, filter_hidden=True )
+		elif estimate:
+			faces = rmlib.rmPolygonSet.from_selection( rmmesh )
+		else:
+			#same uv editor selection the match itself uses
+			faces = GetFaceSelection( context, rmmesh )
+		report.timings['selection'] += time.perf_counter() - st
+
+		#grouping
+		st = time.perf_counter()
+		if estimate:
+			auto_smooth_angle = math.pi
+			if bpy.app.version < (4,0,0) and obj.data.use_auto_smooth:
+				auto_smooth_angle = obj.data.auto_smooth_angle
+			islands = faces.group( element=False, use_seam=True, use_material=True, use_sharp=True, use_angle=auto_smooth_angle )
+		else:
+			islands = faces.island( uvlayer, use_seam=True )
+		report.timings['grouping'] += time.perf_counter() - st
+
+		xfrm = obj.matrix_world.to_3x3()
+		metrics = materialtable.build( obj.data, existing_materials )
+		for island in islands:
+			report.island_count += 1
+			s = metrics.row( island[0].material_index )
+			material_name = metrics.names[s]
+			if material_name is None:
+				report.unmatched_materials.add( '<none>' )
+				continue
+			hotspot = hotspot_for_material( metrics, s )
+			if hotspot is None:
+				report.unmatched_materials.add( material_name )
+				continue
+
+			#preprocessing
+			st = time.perf_counter()
+			if estimate:
+				material_size = metrics.size( s )
+				source_bounds = estimate_island_bounds( island, xfrm, material_size, hotspot.materialaspect )
+			else:
+				loops = [ l for f in island for l in f.loops ]
+				source_bounds = Bounds2d.from_loops( loops, uvlayer, materialaspect=hotspot.materialaspect )
+			report.timings['preprocessing'] += time.perf_counter() - st
+
+			if source_bounds.area <= MIN_MATCH_AREA:
+				report.small_islands += 1
+				continue
+
+			#matching
+			st = time.perf_counter()
+			target_bounds = hotspot.match( source_bounds, tollerance=tollerance, trim_filter=trim_filter )
+			if target_bounds is None:
+				report.unmatched_islands += 1
+			else:
+				rect_index = next( i for i, b in enumerate( hotspot.data ) if b is target_bounds )
+				key = ( material_name, rect_index )
+				report.histogram[key] = report.histogram.get( key, 0 ) + 1
+			report.timings['matching'] += time.perf_counter() - st
+
+		if not obj.data.is_editmode:
+			bm.free()
+
+	return report
+
+
 class OBJECT_OT_savehotspot( bpy.types.Operator ):
 	"""Save the hotspot layout to the hotspot user config file."""
 	bl_idname = 'object.savehotspot'
@@ -1020,47 +660,37 @@ class MESH_OT_grabapplyuvbounds( bpy.types.Operator ):
 		if not sel_mode[2]:
 			return { 'CANCELLED' }
 
-		#get target_bounds from MOS
+		#get target_bounds from MOS. the island under the cursor comes from a cached bvh and face->island lookup
 		mouse_pos = mathutils.Vector( ( float( self.mos[0] ), float( self.mos[1] ) ) )
 		mos_rmmesh = rmlib.rmMesh.from_mos( context, mouse_pos )
 		if mos_rmmesh is None:
 			return { 'CANCELLED' }
-		with mos_rmmesh as rmmesh:
-			rmmesh.readonly = True
-			if len( rmmesh.bmesh.loops.layers.uv ) < 1:
+		pick = islandpick.pick_island( context, mos_rmmesh.object, mouse_pos )
+		if pick is None:
+			return { 'CANCELLED' }
+		cache, face_index, island_label = pick
+		target_bounds = Bounds2d.from_floats( *cache.bounds[island_label] )
+
+		#move selection to target_bounds. the islands are fit on a snapshot of the uv layer, which only writes back
+		#the rows that moved
+		rmmesh = selection.open_bmesh( context.active_object )
+		try:
+			uvlayer = rmmesh.bmesh.loops.layers.uv.active
+			if uvlayer is None:
 				return { 'CANCELLED' }
-			uvlayer = rmmesh.active_uv
-		
-			faces = rmlib.rmPolygonSet.from_mos( rmmesh, context, mouse_pos )
-			if len( faces ) < 1:
+			source_faces = rmlib.rmPolygonSet.from_selection( rmmesh )
+			islands = islandtable.get( rmmesh, uvlayer ).islands( rmmesh, source_faces, uvlayer )
+			if len( islands ) < 1:
 				return { 'CANCELLED' }
-			
-			target_faces = faces.island( uvlayer, element=True )[0]
-			target_loops = set()
-			for f in target_faces:
-				for l in f.loops:
-					target_loops.add( l )
-			target_bounds = Bounds2d.from_loops( target_loops, uvlayer )
 
-		#move selection to target_bounds
-		rmmesh = rmlib.rmMesh.GetActive( context )
-		with rmmesh as rmmesh:
-			uvlayer = rmmesh.active_uv
-
-			source_faces = rmlib.rmPolygonSet.from_selection( rmmesh )
-			for source_island in source_faces.island( uvlayer ):
-				loops = set()
-				for f in source_island:
-					for l in f.loops:
-						loops.add( l )
-				source_bounds = Bounds2d.from_loops( loops, uvlayer )
-
-				mat = source_bounds.transform( target_bounds )		
-				for l in loops:
-					uv = mathutils.Vector( l[uvlayer].uv.copy() ).to_3d()
-					uv[2] = 1.0
-					uv = mat @ uv
-					l[uvlayer].uv = uv.to_2d()
+			snap = uvarray.UVSnapshot.capture( rmmesh.object, uvlayer.name )
+			rows, island_ids = snap.island_rows( [ [ f.index for f in island ] for island in islands ] )
+			mats = [ Bounds2d.from_floats( *b ).fit( target_bounds ) for b in snap.bounds( rows, island_ids, len( islands ) ).tolist() ]
+			snap.transform( rows, island_ids, mats )
+			snap.commit()
+		finally:
+			if not rmmesh.mesh.is_editmode:
+				rmmesh.bmesh.free()
 
 		return { 'FINISHED' }
 
@@ -1124,7 +754,9 @@ class MESH_OT_moshotspot( bpy.types.Operator ):
 			if len( faces ) < 1:
 				return { 'CANCELLED' }
 
-			for island in faces.island( uvlayer ):
+			loop_groups = []
+			mats = []
+			for island in islandtable.get( rmmesh, uvlayer ).islands( rmmesh, faces, uvlayer ):
 				hotspot = None
 				if context.scene.rmkituv_props.hotspotprops.hs_use_multiUV:
 					if uvlayer.name == uvlayers[0].name and uv_modes[0] == 'clipboard':
@@ -1146,18 +778,13 @@ class MESH_OT_moshotspot( bpy.types.Operator ):
 
 				target_bounds = hotspot.nearest( self.mos_uv[0], self.mos_uv[1] ).copy()
 
-				loops = set()
-				for f in island:
-					for l in f.loops:
-						loops.add( l )
+				loops = [ l for f in island for l in f.loops ]
 				source_bounds = Bounds2d.from_loops( loops, uvlayer, materialaspect=hotspot.materialaspect )
 
-				mat = source_bounds.transform( target_bounds, skip_rot=False, trim=use_trim, inset=context.scene.rmkituv_props.hotspotprops.hs_hotspot_inset / 1024.0, random_rot=context.scene.rmkituv_props.hotspotprops.hs_random_rotation, random_flip=context.scene.rmkituv_props.hotspotprops.hs_random_flip )
-				for l in loops:
-					uv = mathutils.Vector( l[uvlayer].uv.copy() ).to_3d()
-					uv[2] = 1.0
-					uv = mat @ uv
-					l[uvlayer].uv = uv.to_2d()
+				loop_groups.append( loops )
+				mats.append( source_bounds.fit( target_bounds, skip_rot=False, trim=use_trim, inset=context.scene.rmkituv_props.hotspotprops.hs_hotspot_inset / 1024.0, random_rot=context.scene.rmkituv_props.hotspotprops.hs_random_rotation, random_flip=context.scene.rmkituv_props.hotspotprops.hs_random_flip ) )
+
+			uvarray.transform_islands( loop_groups, uvlayer, mats )
 
 		return { 'FINISHED' }
 
@@ -1166,6 +793,212 @@ class MESH_OT_moshotspot( bpy.types.Operator ):
 		return self.execute( context )
 
 
+class PaintIsland():
+	#uv island cached by MESH_OT_painthotspot when the paint stroke starts
+	__slots__ = ( 'index', 'loops', 'tris', 'hotspot', 'bounds', 'rect' )
+
+	def __init__( self, index, loops, hotspot ):
+		self.index = index
+		self.loops = loops
+		self.tris = []
+		self.hotspot = hotspot
+		self.bounds = None
+		self.rect = None
+
+
+class IslandGrid():
+	#uniform grid over the uv bounds of the paint islands, so a mouse event only tests the islands listed in the cell
+	#under the cursor. cells are about the size of a typical island. islands spanning more than MAX_CELLS cells are
+	#kept in a short list tested on every lookup instead.
+	__slots__ = ( 'cell_size', 'cells', 'island_cells', 'large' )
+	MAX_CELLS = 64
+
+	def __init__( self, islands ):
+		sizes = [ max( island.bounds.width, island.bounds.height ) for island in islands ]
+		self.cell_size = max( float( np.median( sizes ) ), 1e-4 ) if len( sizes ) > 0 else 1.0
+		self.cells = {} #( x, y ) -> [ island index ]
+		self.island_cells = {} #island index -> cell keys, None for large islands
+		self.large = set()
+		for island in islands:
+			self.insert( island.index, island.bounds )
+
+	def insert( self, index, bounds ):
+		x0 = math.floor( bounds.min[0] / self.cell_size )
+		y0 = math.floor( bounds.min[1] / self.cell_size )
+		x1 = math.floor( bounds.max[0] / self.cell_size )
+		y1 = math.floor( bounds.max[1] / self.cell_size )
+		if ( x1 - x0 + 1 ) * ( y1 - y0 + 1 ) > self.MAX_CELLS:
+			self.large.add( index )
+			self.island_cells[index] = None
+			return
+		keys = [ ( x, y ) for x in range( x0, x1 + 1 ) for y in range( y0, y1 + 1 ) ]
+		for key in keys:
+			self.cells.setdefault( key, [] ).append( index )
+		self.island_cells[index] = keys
+
+	def remove( self, index ):
+		keys = self.island_cells.pop( index )
+		if keys is None:
+			self.large.discard( index )
+			return
+		for key in keys:
+			self.cells[key].remove( index )
+
+	def move( self, index, bounds ):
+		self.remove( index )
+		self.insert( index, bounds )
+
+	def candidates( self, point ):
+		#island indexes whose bounds may contain point, in island order
+		key = ( math.floor( point[0] / self.cell_size ), math.floor( point[1] / self.cell_size ) )
+		return sorted( self.large.union( self.cells.get( key, () ) ) )
+
+
+class MESH_OT_painthotspot( bpy.types.Operator ):
+	"""Click-drag over uv islands to map each island to the hotspot under the cursor. The whole stroke is a single undo step."""
+	bl_idname = 'mesh.painthotspot'
+	bl_label = 'Hotspot Paint (MOS)'
+	bl_options = { 'UNDO' } #no REGISTER, a stroke cannot be replayed from the redo panel
+
+	@classmethod
+	def poll( cls, context ):
+		return ( context.area.type == 'IMAGE_EDITOR' and
+				context.active_object is not None and
+				context.active_object.type == 'MESH' and
+				context.object.data.is_editmode )
+
+	def restore( self ):
+		for l, uv in self.initial_uvs:
+			l[self.uvlayer].uv = uv
+		bmesh.update_edit_mesh( self.mesh, loop_triangles=False, destructive=False )
+
+	def finish( self, context ):
+		context.area.header_text_set( None )
+		self.islands = []
+		self.grid = None
+		self.initial_uvs = []
+		self.bmesh = None
+
+	def cancel( self, context ):
+		self.finish( context )
+
+	def island_at( self, point ):
+		#the grid and the cached bounds reject most islands, then the island tris are tested in their current uv position
+		for index in self.grid.candidates( point ):
+			island = self.islands[index]
+			if not island.bounds.inside( point ):
+				continue
+			for tri in island.tris:
+				if mathutils.geometry.intersect_point_tri_2d( point, tri[0][self.uvlayer].uv, tri[1][self.uvlayer].uv, tri[2][self.uvlayer].uv ):
+					return island
+		return None
+
+	def paint( self, context, event ):
+		point = mathutils.Vector( self.region.view2d.region_to_view( event.mouse_x - self.region.x, event.mouse_y - self.region.y ) )
+		island = self.island_at( point )
+		if island is None:
+			return
+
+		target_bounds = island.hotspot.nearest( point[0], point[1] )
+		if target_bounds is island.rect:
+			return
+
+		hotspotprops = context.scene.rmkituv_props.hotspotprops
+		row0, row1 = island.bounds.fit( target_bounds, skip_rot=False, trim=self.use_trim, inset=hotspotprops.hs_hotspot_inset / 1024.0, random_rot=hotspotprops.hs_random_rotation, random_flip=hotspotprops.hs_random_flip )
+		for l in island.loops:
+			u, v = l[self.uvlayer].uv
+			l[self.uvlayer].uv = ( row0[0] * u + row0[1] * v + row0[2], row1[0] * u + row1[1] * v + row1[2] )
+		island.bounds = Bounds2d.from_loops( island.loops, self.uvlayer, materialaspect=island.hotspot.materialaspect )
+		island.rect = target_bounds
+		self.grid.move( island.index, island.bounds )
+
+		bmesh.update_edit_mesh( self.mesh, loop_triangles=False, destructive=False )
+
+	def modal( self, context, event ):
+		if event.type == 'MOUSEMOVE':
+			if self.painting:
+				self.paint( context, event )
+			return { 'RUNNING_MODAL' }
+
+		elif event.type == 'LEFTMOUSE':
+			if event.value == 'PRESS':
+				self.painting = True
+				self.paint( context, event )
+				return { 'RUNNING_MODAL' }
+			elif event.value == 'RELEASE' and self.painting:
+				self.finish( context )
+				return { 'FINISHED' }
+
+		elif event.type in { 'RIGHTMOUSE', 'ESC' }:
+			self.restore()
+			self.finish( context )
+			return { 'CANCELLED' }
+
+		return { 'PASS_THROUGH' }
+
+	def invoke( self, context, event ):
+		sel_mode = context.tool_settings.mesh_select_mode[:]
+		if not sel_mode[2]:
+			self.report( { 'WARNING' }, 'Must be in face selection mode.' )
+			return { 'CANCELLED' }
+
+		self.region = None
+		for region in context.area.regions:
+			if region.type == 'WINDOW':
+				self.region = region
+				break
+		if self.region is None:
+			return { 'CANCELLED' }
+
+		#everything the stroke needs is gathered once up front
+		hotspot_dict = get_hotspot( context )
+		if not isinstance( hotspot_dict, dict ) or len( hotspot_dict ) < 1:
+			self.report( { 'WARNING' }, 'Could not find hotspot atlas!!!' )
+			return { 'CANCELLED' }
+		self.use_trim = context.scene.rmkituv_props.hotspotprops.hs_recttype_filter != 'notrim'
+
+		self.mesh = context.active_object.data
+		self.bmesh = bmesh.from_edit_mesh( self.mesh )
+		rmmesh = rmlib.rmMesh.from_bmesh( context.active_object, self.bmesh )
+		self.uvlayer = self.bmesh.loops.layers.uv.verify()
+
+		faces = GetFaceSelection( context, rmmesh )
+		if len( faces ) < 1:
+			self.report( { 'WARNING' }, 'No uv faces selected!!!' )
+			return { 'CANCELLED' }
+
+		self.islands = []
+		self.initial_uvs = []
+		face_islands = {}
+		for island_faces in islandtable.get( rmmesh, self.uvlayer ).islands( rmmesh, faces, self.uvlayer ):
+			try:
+				hotspot = hotspot_dict[island_faces[0].material_index]
+			except KeyError:
+				continue
+			island = PaintIsland( len( self.islands ), [ l for f in island_faces for l in f.loops ], hotspot )
+			island.bounds = Bounds2d.from_loops( island.loops, self.uvlayer, materialaspect=hotspot.materialaspect )
+			for f in island_faces:
+				face_islands[f.index] = island
+			self.islands.append( island )
+			self.initial_uvs += [ ( l, l[self.uvlayer].uv.copy() ) for l in island.loops ]
+		if len( self.islands ) < 1:
+			self.report( { 'WARNING' }, 'Hotspot atlas not found for selection!!!' )
+			return { 'CANCELLED' }
+		self.grid = IslandGrid( self.islands )
+
+		tris = looptris.get( selection.sync( rmmesh ) )
+		self.bmesh.faces.ensure_lookup_table()
+		painted_faces = np.zeros( len( self.bmesh.faces ), dtype=bool )
+		painted_faces[list( face_islands.keys() )] = True
+		for tri in np.flatnonzero( painted_faces[tris.faces] ).tolist():
+			face_islands[int( tris.faces[tri] )].tris.append( tris.bmloops( self.bmesh, tri ) )
+
+		self.painting = event.type == 'LEFTMOUSE' and event.value == 'PRESS'
+		context.area.header_text_set( 'Hotspot Paint :: LMB drag over islands to hotspot them, RMB/Esc to cancel' )
+		context.window_manager.modal_handler_add( self )
+		return { 'RUNNING_MODAL' }
+
+
 class MESH_OT_nrsthotspot( bpy.types.Operator ):
 	"""Use the hotspot nearest to the selected uv faces in the atlas defined by its material."""
 	bl_idname = 'mesh.nrsthotspot'
@@ -1221,7 +1054,9 @@ class MESH_OT_nrsthotspot( bpy.types.Operator ):
 			if len( faces ) < 1:
 				return { 'CANCELLED' }
 
-			for island in faces.island( uvlayer ):
+			loop_groups = []
+			mats = []
+			for island in islandtable.get( rmmesh, uvlayer ).islands( rmmesh, faces, uvlayer ):
 				hotspot = None
 				if context.scene.rmkituv_props.hotspotprops.hs_use_multiUV:
 					if uvlayer.name == uvlayers[0].name and uv_modes[0] == 'clipboard':
@@ -1241,23 +1076,18 @@ class MESH_OT_nrsthotspot( bpy.types.Operator ):
 						self.report( { 'WARNING' }, 'Hotspot atlas not found for {}'.format( rmmesh.mesh.materials[island[0].material_index].name ) )
 						continue
 
-				loops = set()
-				for f in island:
-					for l in f.loops:
-						loops.add( l )
+				loops = [ l for f in island for l in f.loops ]
 				source_bounds = Bounds2d.from_loops( loops, uvlayer, materialaspect=hotspot.materialaspect )
-				target_bounds = hotspot.nearest( source_bounds.center.x, source_bounds.center.y ).copy()
-				mat = source_bounds.transform( target_bounds, skip_rot=True, trim=use_trim, inset=context.scene.rmkituv_props.hotspotprops.hs_hotspot_inset / 1024.0 )
-				for l in loops:
-					uv = mathutils.Vector( l[uvlayer].uv.copy() ).to_3d()
-					uv[2] = 1.0
-					uv = mat @ uv
-					l[uvlayer].uv = uv.to_2d()
+				target_bounds = hotspot.nearest( *source_bounds.center ).copy()
+				loop_groups.append( loops )
+				mats.append( source_bounds.fit( target_bounds, skip_rot=True, trim=use_trim, inset=context.scene.rmkituv_props.hotspotprops.hs_hotspot_inset / 1024.0 ) )
+
+			uvarray.transform_islands( loop_groups, uvlayer, mats )
 
 		return { 'FINISHED' }
 	
 
-class MESH_OT_matchhotspot( bpy.types.Operator ):
+class MESH_OT_matchhotspot( chunked.ChunkedOperator, bpy.types.Operator ):
 	"""Map the current face selection to the best fit hotspot on the atlas defined by the material."""
 	bl_idname = 'mesh.matchhotspot'
 	bl_label = 'Hotspot Match'
@@ -1268,6 +1098,21 @@ class MESH_OT_matchhotspot( bpy.types.Operator ):
 		default=0.01
 	)
 
+	dry_run: bpy.props.BoolProperty(
+		name='Dry Run',
+		description='Report how islands would map to the atlas without writing any uvs',
+		default=False,
+		options={ 'SKIP_SAVE' }
+	)
+
+	dry_run_scope: bpy.props.EnumProperty(
+		items=[ ( "selection", "Selection", "", 1 ),
+				( "scene", "Scene", "", 2 ) ],
+		name='Dry Run Scope',
+		default='selection',
+		options={ 'SKIP_SAVE' }
+	)
+
 	@classmethod
 	def poll( cls, context ):
 		return ( ( context.area.type == 'VIEW_3D' or context.area.type == 'IMAGE_EDITOR' ) and
@@ -1275,40 +1120,56 @@ class MESH_OT_matchhotspot( bpy.types.Operator ):
 				context.active_object.type == 'MESH' and
 				context.object.data.is_editmode )
 
-	def execute( self, context ):
+	def execute_dry_run( self, context ):
+		if self.dry_run_scope == 'scene':
+			objects = [ o for o in context.scene.objects if o.type == 'MESH' ]
+			use_selection = False
+		else:
+			objects = None
+			use_selection = True
+		report = match_hotspot_report( context, objects=objects, use_selection=use_selection, estimate=( context.area.type == 'VIEW_3D' ), tollerance=self.tollerance )
+		self.report( { 'INFO' }, 'Dry Run :: {} of {} islands matched, {} below area cutoff, {} unmatched materials, {:.3f}s'.format( report.matched_islands, report.island_count, report.small_islands, len( report.unmatched_materials ), report.total_time ) )
+		#nothing was written, so no undo step is pushed
+		return { 'CANCELLED' }
+
+	def chunk_begin( self, context ):
 		sel_mode = context.tool_settings.mesh_select_mode[:]
 		if not sel_mode[2]:
 			self.report( { 'WARNING' }, 'Must be in face selection mode.' )
 			return { 'CANCELLED' }
 
-		hotspot_dict = get_hotspot( context )
-		if len( hotspot_dict ) < 1:
+		if self.dry_run:
+			return self.execute_dry_run( context )
+
+		self.hotspot_dict = get_hotspot( context )
+		if not isinstance( self.hotspot_dict, dict ) or len( self.hotspot_dict ) < 1:
 			self.report( { 'WARNING' }, 'Could not find hotspot atlas!!!' )
 			return { 'CANCELLED' }
 
-		use_trim = context.scene.rmkituv_props.hotspotprops.hs_recttype_filter != 'notrim'
+		self.use_trim = context.scene.rmkituv_props.hotspotprops.hs_recttype_filter != 'notrim'
 
-		uvlayers = []
+		#uv layers are stored by name since the edit bmesh is written back between chunks
+		self.uvlayer_names = []
+		self.uv_modes = ( 'hotspot', 'hotspot' )
+		self.clipboard_hotspot = None
+		self.initial_selection = []
 
-		#preprocess uvs
-		clipboard_hotspot = None
 		islands_as_indexes = []
 		if context.area.type == 'VIEW_3D': #if in 3dvp, scale to mat size then rectangularize/gridify uv islands
 
-			uv_modes = ( 'hotspot', 'hotspot' )
 			if context.scene.rmkituv_props.hotspotprops.hs_use_multiUV:
-				uv_modes = ( context.scene.rmkituv_props.hotspotprops.hs_hotspot_uv1, context.scene.rmkituv_props.hotspotprops.hs_hotspot_uv2 )
-				if uv_modes[0] == 'none' and uv_modes[1] == 'none':
-					self.repo( {'ERROR'}, 'Could not hotspot multiUV match because both uv enums set to None!!!' )
+				self.uv_modes = ( context.scene.rmkituv_props.hotspotprops.hs_hotspot_uv1, context.scene.rmkituv_props.hotspotprops.hs_hotspot_uv2 )
+				if self.uv_modes[0] == 'none' and self.uv_modes[1] == 'none':
+					self.report( {'ERROR'}, 'Could not hotspot multiUV match because both uv enums set to None!!!' )
 					return { 'CANCELLED' }
 			elif context.scene.rmkituv_props.hotspotprops.hs_use_clipboard_atlas:
-				uv_modes = ( 'clipboard', 'clipboard' )
+				self.uv_modes = ( 'clipboard', 'clipboard' )
 
-			if 'clipboard' in uv_modes:
+			if 'clipboard' in self.uv_modes:
 				selected_key = context.window_manager.generated_icon_hotspotclipboard
 				selected_index = int( selected_key[-1] )
 				existing_clipboard_materials, existing_clipboard_hotspots = read_hot_file( get_clipboardfile_path() )
-				clipboard_hotspot = existing_clipboard_hotspots[selected_index]
+				self.clipboard_hotspot = existing_clipboard_hotspots[selected_index]
 			
 			rmmesh = rmlib.rmMesh.GetActive( context )
 			with rmmesh as rmmesh:
@@ -1318,14 +1179,14 @@ class MESH_OT_matchhotspot( bpy.types.Operator ):
 					return { 'CANCELLED' }				
 
 				if context.scene.rmkituv_props.hotspotprops.hs_use_multiUV:
-					for i, uvmode in enumerate( uv_modes ):
+					for i, uvmode in enumerate( self.uv_modes ):
 						if uvmode != 'none':
 							try:
-								uvlayers.append( rmmesh.bmesh.loops.layers.uv.values()[i] )
+								self.uvlayer_names.append( rmmesh.bmesh.loops.layers.uv.values()[i].name )
 							except IndexError:
-								uvlayers.append( rmmesh.bmesh.loops.layers.uv.new( 'UVMap' ) )
+								self.uvlayer_names.append( rmmesh.bmesh.loops.layers.uv.new( 'UVMap' ).name )
 				else:
-					uvlayers.append( rmmesh.active_uv )
+					self.uvlayer_names.append( rmmesh.active_uv.name )
 
 				faces = rmlib.rmPolygonSet.from_selection( rmmesh )
 				if len( faces ) < 1:
@@ -1336,23 +1197,8 @@ class MESH_OT_matchhotspot( bpy.types.Operator ):
 				if bpy.app.version < (4,0,0) and rmmesh.mesh.use_auto_smooth:
 					auto_smooth_angle = rmmesh.mesh.auto_smooth_angle
 
-				current_active_layer_index = rmmesh.mesh.uv_layers.active_index
 				for island in faces.group( element=False, use_seam=True, use_material=True, use_sharp=True, use_angle=auto_smooth_angle ):
-					islands_as_indexes.append( [ f.index for f in island ] )					
-					island.select( replace=True )
-					for i, uvlayer in enumerate( uvlayers ):
-						if not context.scene.rmkituv_props.hotspotprops.hs_use_multiUV or uv_modes[i] == 'hotspot' or uv_modes[i] == 'clipboard':
-							result = bpy.ops.mesh.rm_uvgridify( uv_map_name=uvlayer.name ) #gridify
-							if result == { 'CANCELLED' }:
-								rmmesh.mesh.uv_layers.active_index = i
-								bpy.ops.uv.unwrap( 'INVOKE_DEFAULT', method='CONFORMAL' )
-								bpy.ops.mesh.rm_uvunrotate() #unrotate uv by longest edge in island
-								#bpy.ops.mesh.rm_uvrectangularize() #rectangularize
-							bpy.ops.mesh.rm_normalizetexels( uv_map_name=uvlayer.name ) #account for non-square materials
-							bpy.ops.mesh.rm_scaletomaterialsize( uv_map_name=uvlayer.name ) #scale to mat size
-						elif uv_modes[i] == 'worldspace':
-							bpy.ops.mesh.rm_worldspaceproject( uv_map_name=uvlayer.name )
-				rmmesh.mesh.uv_layers.active_index = current_active_layer_index
+					islands_as_indexes.append( [ f.index for f in island ] )
 
 		elif context.area.type == 'IMAGE_EDITOR': #if in uvvp, scale to mat sizecomplete_failure
 			rmmesh = rmlib.rmMesh.GetActive( context )
@@ -1362,89 +1208,126 @@ class MESH_OT_matchhotspot( bpy.types.Operator ):
 					self.report( { 'WARNING' }, 'No uv data found!!!' )
 					return { 'CANCELLED' }
 
-				uvlayers.append( rmmesh.active_uv )
+				uvlayer = rmmesh.active_uv
+				self.uvlayer_names.append( uvlayer.name )
 
 				faces = GetFaceSelection( context, rmmesh )
 				if len( faces ) < 1:
 					self.report( { 'WARNING' }, 'No uv faces selected!!!' )
 					return { 'CANCELLED' }
-				for island in faces.island( uvlayers[0], use_seam=True ):
+				for island in faces.island( uvlayer, use_seam=True ):
 					islands_as_indexes.append( [ f.index for f in island ] )
-					#island.select( replace=True )
-					#bpy.ops.mesh.rm_scaletomaterialsize() #scale to mat size
+
+		return islands_as_indexes
+
+	def chunk_step( self, context, islands_as_indexes ):
+		hotspotprops = context.scene.rmkituv_props.hotspotprops
+		uv_modes = self.uv_modes
+
+		#preprocess uvs
+		if context.area.type == 'VIEW_3D':
+			rmmesh = rmlib.rmMesh.GetActive( context )
+			with rmmesh as rmmesh:
+				rmmesh.readonly = True
+				rmmesh.bmesh.faces.ensure_lookup_table()
+				current_active_layer_index = rmmesh.mesh.uv_layers.active_index
+				islands = [ rmlib.rmPolygonSet( [ rmmesh.bmesh.faces[pidx] for pidx in pidx_list ] ) for pidx_list in islands_as_indexes ]
+				for island in islands:
+					island.select( replace=True )
+					for i, uvlayer_name in enumerate( self.uvlayer_names ):
+						if not hotspotprops.hs_use_multiUV or uv_modes[i] == 'hotspot' or uv_modes[i] == 'clipboard':
+							result = bpy.ops.mesh.rm_uvgridify( uv_map_name=uvlayer_name ) #gridify
+							if result == { 'CANCELLED' }:
+								rmmesh.mesh.uv_layers.active_index = i
+								bpy.ops.uv.unwrap( 'INVOKE_DEFAULT', method='CONFORMAL' )
+								bpy.ops.mesh.rm_uvunrotate() #unrotate uv by longest edge in island
+								#bpy.ops.mesh.rm_uvrectangularize() #rectangularize
+							bpy.ops.mesh.rm_normalizetexels( uv_map_name=uvlayer_name ) #account for non-square materials
+							bpy.ops.mesh.rm_scaletomaterialsize( uv_map_name=uvlayer_name ) #scale to mat size
+						elif uv_modes[i] == 'worldspace':
+							bpy.ops.mesh.rm_worldspaceproject( uv_map_name=uvlayer_name )
+				rmmesh.mesh.uv_layers.active_index = current_active_layer_index
 					
 		#hotspot
 		rmmesh = rmlib.rmMesh.GetActive( context )
 		with rmmesh as rmmesh:
+			rmmesh.bmesh.faces.ensure_lookup_table()
+			uvlayers = [ rmmesh.bmesh.loops.layers.uv[name] for name in self.uvlayer_names ]
 			if context.area.type == 'VIEW_3D':
-				initial_selection = []
+				layer_loop_groups = [ [] for uvlayer in uvlayers ]
+				layer_sources = [ [] for uvlayer in uvlayers ]
+				layer_targets = [ [] for uvlayer in uvlayers ]
 				for pidx_list in islands_as_indexes:
 					island = [ rmmesh.bmesh.faces[pidx] for pidx in pidx_list ]
 
 					try:
-						hotspot = hotspot_dict[island[0].material_index]
+						hotspot = self.hotspot_dict[island[0].material_index]
 					except KeyError:
 						self.report( { 'WARNING' }, 'Hotspot atlas not found for {}'.format( rmmesh.mesh.materials[island[0].material_index].name ) )
 						continue
 
-					initial_selection += set( island )
+					self.initial_selection += pidx_list
 					loops = []
 					for f in island:
 						for l in f.loops:
 							loops.append( l )
 					for i, uvlayer in enumerate( uvlayers ):
-						if not context.scene.rmkituv_props.hotspotprops.hs_use_multiUV or ( uv_modes[i] == 'hotspot' or uv_modes[i] == 'clipboard' ):
+						if not hotspotprops.hs_use_multiUV or ( uv_modes[i] == 'hotspot' or uv_modes[i] == 'clipboard' ):
 							source_bounds = Bounds2d.from_loops( loops, uvlayer, materialaspect=hotspot.materialaspect )
-							if source_bounds.area <= 0.00001:
+							if source_bounds.area <= MIN_MATCH_AREA:
 								continue
 							if uv_modes[i] == 'hotspot':
-								target_bounds = hotspot.match( source_bounds, tollerance=self.tollerance, trim_filter=context.scene.rmkituv_props.hotspotprops.hs_recttype_filter ).copy()
+								target_bounds = hotspot.match( source_bounds, tollerance=self.tollerance, trim_filter=hotspotprops.hs_recttype_filter ).copy()
 							elif uv_modes[i] == 'clipboard':
-								target_bounds = clipboard_hotspot.match( source_bounds, tollerance=self.tollerance, trim_filter=context.scene.rmkituv_props.hotspotprops.hs_recttype_filter ).copy()
+								target_bounds = self.clipboard_hotspot.match( source_bounds, tollerance=self.tollerance, trim_filter=hotspotprops.hs_recttype_filter ).copy()
 							if target_bounds is None:
 								self.report( { 'WARNING' }, 'Could not find a hotspot match for a uvisland!!!' )
 								continue
-							mat = source_bounds.transform( target_bounds, skip_rot=False, trim=use_trim, inset=context.scene.rmkituv_props.hotspotprops.hs_hotspot_inset / 1024.0, random_rot=context.scene.rmkituv_props.hotspotprops.hs_random_rotation, random_flip=context.scene.rmkituv_props.hotspotprops.hs_random_flip )
-							for l in loops:
-								uv = mathutils.Vector( l[uvlayer].uv.copy() ).to_3d()
-								uv[2] = 1.0
-								uv = mat @ uv
-								l[uvlayer].uv = uv.to_2d()
+							layer_loop_groups[i].append( loops )
+							layer_sources[i].append( source_bounds )
+							layer_targets[i].append( target_bounds )
 
-				for f in initial_selection:
-					f.select = True
+				for i, uvlayer in enumerate( uvlayers ):
+					mats = fit_array( pack_bounds( layer_sources[i] ), pack_bounds( layer_targets[i] ), skip_rot=False, trim=self.use_trim, inset=hotspotprops.hs_hotspot_inset / 1024.0, random_rot=hotspotprops.hs_random_rotation, random_flip=hotspotprops.hs_random_flip )
+					uvarray.transform_islands( layer_loop_groups[i], uvlayer, mats )
 
 			elif context.area.type == 'IMAGE_EDITOR':
 				uvlayer = uvlayers[0]
-				initial_selection = []
+				loop_groups = []
+				sources = []
+				targets = []
 				for pidx_list in islands_as_indexes:					
 					island = [ rmmesh.bmesh.faces[pidx] for pidx in pidx_list ]
 
 					try:
-						hotspot = hotspot_dict[island[0].material_index]
+						hotspot = self.hotspot_dict[island[0].material_index]
 					except KeyError:
 						self.report( { 'WARNING' }, 'Hotspot atlas not found for {}'.format( rmmesh.mesh.materials[island[0].material_index].name ) )
 						continue
 
-					initial_selection += set( island )
+					self.initial_selection += pidx_list
 					loops = []
 					for f in island:
 						for l in f.loops:
 							loops.append( l )
 					source_bounds = Bounds2d.from_loops( loops, uvlayer, materialaspect = hotspot.materialaspect )
-					target_bounds = hotspot.match( source_bounds, tollerance=self.tollerance, trim_filter=context.scene.rmkituv_props.hotspotprops.hs_recttype_filter ).copy()
+					target_bounds = hotspot.match( source_bounds, tollerance=self.tollerance, trim_filter=hotspotprops.hs_recttype_filter ).copy()
 					if target_bounds is None:
 						self.report( { 'WARNING' }, 'Could not find a hotspot match for a uvisland!!!' )
 						continue
-					mat = source_bounds.transform( target_bounds, skip_rot=False, trim=use_trim, inset=context.scene.rmkituv_props.hotspotprops.hs_hotspot_inset / 1024.0, random_rot=context.scene.rmkituv_props.hotspotprops.hs_random_rotation, random_flip=context.scene.rmkituv_props.hotspotprops.hs_random_flip )		
-					for l in loops:
-						uv = mathutils.Vector( l[uvlayer].uv.copy() ).to_3d()
-						uv[2] = 1.0
-						uv = mat @ uv
-						l[uvlayer].uv = uv.to_2d()
+					loop_groups.append( loops )
+					sources.append( source_bounds )
+					targets.append( target_bounds )
+
+				mats = fit_array( pack_bounds( sources ), pack_bounds( targets ), skip_rot=False, trim=self.use_trim, inset=hotspotprops.hs_hotspot_inset / 1024.0, random_rot=hotspotprops.hs_random_rotation, random_flip=hotspotprops.hs_random_flip )
+				uvarray.transform_islands( loop_groups, uvlayer, mats )
 
-				for f in initial_selection:
-					f.select = True
+	def chunk_end( self, context ):
+		rmmesh = rmlib.rmMesh.GetActive( context )
+		with rmmesh as rmmesh:
+			rmmesh.bmesh.faces.ensure_lookup_table()
+			for pidx in self.initial_selection:
+				rmmesh.bmesh.faces[pidx].select = True
 
 		return { 'FINISHED' }
 
@@ -1474,71 +1357,92 @@ class MESH_OT_uvaspectscale( bpy.types.Operator ):
 		
 	def execute( self, context ):
 		offset = self.scale / 10.0
-		if self.shift_sensitivity:
+		if getattr( self, 'shift_sensitivity', False ):
 			offset /= 10.0
 
 		targetObj = context.active_object
 		targetMesh = targetObj.data
 
-		bpy.ops.object.mode_set( mode='OBJECT', toggle=False )
-		
-		bm = self.bmesh.copy()
-		
-		uvlayer = bm.loops.layers.uv.verify()
-		
-		rmmesh = rmlib.rmMesh.from_bmesh( targetObj, bm )
-		faces = GetFaceSelection( context, rmmesh )
-		if len( faces ) < 1:
-			bpy.ops.object.mode_set( mode='EDIT', toggle=False )
-			return { 'CANCELLED' }
-
-		for island in faces.island( uvlayer ):
-
-			#get the material aspect ratio on the first poly of this island
-			material_aspect = 1.0
-			try:
-				material = rmmesh.mesh.materials[island[0].material_index]
-			except IndexError:
-				pass
-			try:
-				material_aspect = material["WorldMappingWidth"] / material["WorldMappingHeight"]
-			except:
-				pass
-
-			loops = set()
-			for f in island:
-				for l in f.loops:
-					loops.add( l )
-			source_bounds = Bounds2d.from_loops( loops, uvlayer, materialaspect=material_aspect )
+		#modal updates and redo panel tweaks only recompute the island transforms
+		inputs = getattr( self, 'inputs', None )
+		if inputs is None:
+			inputs = self.island_inputs( context )
+			if inputs is None:
+				return { 'CANCELLED' }
+			self.inputs = inputs
+		rows, island_ids, source_bounds, uvlayer_name, base_uvs = inputs
 
-			new_min = source_bounds.min.copy()
+		mats = []
+		for bounds in source_bounds:
+			new_min = bounds.min.copy()
 			new_min[0] += offset
 			new_min[1] += offset
 
-			new_max = source_bounds.max.copy()
+			new_max = bounds.max.copy()
 			new_max[0] -= offset
 			new_max[1] -= offset
 
 			target_bounds = Bounds2d( [ new_min, new_max ] )
-			target_bounds.materialaspect = source_bounds.materialaspect
+			target_bounds.materialaspect = bounds.materialaspect
 
-			mat = source_bounds.transform( target_bounds, skip_rot=True, trim=False, inset=0.0 )		
-			for l in loops:
-				uv = mathutils.Vector( l[uvlayer].uv.copy() ).to_3d()
-				uv[2] = 1.0
-				uv = mat @ uv
-				l[uvlayer].uv = uv.to_2d()
+			mats.append( bounds.fit( target_bounds, skip_rot=True, trim=False, inset=0.0 ) )
 
-		
-		bm.to_mesh( targetMesh )
-		bm.calc_loop_triangles()
+		uvs = base_uvs.copy()
+		uvarray.apply_affine( uvs, rows, island_ids, mats )
+
+		bpy.ops.object.mode_set( mode='OBJECT', toggle=False )
+		uv_layer = targetMesh.uv_layers.get( uvlayer_name )
+		if uv_layer is None:
+			uv_layer = targetMesh.uv_layers.new( name=uvlayer_name )
+		uvarray.write_uvs( uv_layer, uvs )
 		targetMesh.update()
-		bm.free()
-		
 		bpy.ops.object.mode_set( mode='EDIT', toggle=False )
 		
 		return { 'FINISHED' }
 
+	def island_inputs( self, context ):
+		#islands of the selection, their bounds and the uvs of the whole mesh before the operator ran
+		targetObj = context.active_object
+		bm = getattr( self, 'bmesh', None )
+		if bm is None:
+			bm = bmesh.from_edit_mesh( targetObj.data )
+		#a drag executes once per mouse move, all from the copy taken at invoke
+		inputs = getattr( self, 'modal_inputs', None )
+		if inputs is not None:
+			return inputs
+		key = redocache.mesh_key( targetObj, bm )
+		inputs = redocache.get( self, key )
+		if inputs is not None:
+			return inputs
+
+		bm = bm.copy()
+		uvlayer = bm.loops.layers.uv.verify()
+		rmmesh = rmlib.rmMesh.from_bmesh( targetObj, bm )
+		faces = GetFaceSelection( context, rmmesh )
+		if len( faces ) < 1:
+			bm.free()
+			return None
+
+		loop_groups = []
+		source_bounds = []
+		metrics = materialtable.build( targetObj.data )
+		for island in faces.island( uvlayer ):
+
+			#get the material aspect ratio on the first poly of this island
+			material_aspect = float( metrics.aspect[metrics.row( island[0].material_index )] )
+
+			loops = [ l for f in island for l in f.loops ]
+			loop_groups.append( loops )
+			source_bounds.append( Bounds2d.from_loops( loops, uvlayer, materialaspect=material_aspect ) )
+
+		bm.faces.index_update()
+		islands = redocache.IslandLoops( loop_groups )
+		base_uvs, loop_start = uvarray.read_bmesh_uvs( bm, uvlayer )
+		inputs = ( islands.rows( loop_start ), islands.island_ids, source_bounds, uvlayer.name, base_uvs )
+		bm.free()
+		self.modal_inputs = inputs
+		return redocache.store( self, key, inputs )
+
 	def modal( self, context, event ):
 		if event.type == 'LEFTMOUSE':
 			return { 'FINISHED' }
@@ -1556,6 +1460,7 @@ class MESH_OT_uvaspectscale( bpy.types.Operator ):
 	
 	def invoke( self, context, event ):
 		self.bmesh = None
+		self.modal_inputs = None
 		self.prev_delta = 0
 		self.shift_sensitivity = False
 
@@ -1718,7 +1623,12 @@ class UV_PT_UVHotspotTools( bpy.types.Panel ):
 		layout.operator( 'object.savehotspot', text='New Hotspot' )
 		layout.operator( 'mesh.refhotspot', text='Ref Hotspot' )
 		layout.operator( 'mesh.matchhotspot', text='Hotspot Match' )
+		layout.operator( 'mesh.matchhotspot', text='Hotspot Match (Dry Run)' ).dry_run = True
+		op = layout.operator( 'mesh.matchhotspot', text='Hotspot Match (Dry Run Scene)' )
+		op.dry_run = True
+		op.dry_run_scope = 'scene'
 		layout.operator( 'mesh.nrsthotspot', text='Hotspot Nearest' )
+		layout.operator( 'mesh.painthotspot', text='Hotspot Paint' )
 
 
 class VIEW3D_PT_UVHotspotTools( bpy.types.Panel ):
@@ -1763,6 +1673,10 @@ class VIEW3D_PT_UVHotspotTools( bpy.types.Panel ):
 		r4.prop( context.scene.rmkituv_props.hotspotprops, 'hs_hotspot_uv2' )
 		r4.enabled = context.scene.rmkituv_props.hotspotprops.hs_use_multiUV and not context.scene.rmkituv_props.hotspotprops.hs_use_clipboard_atlas
 		layout.operator( 'mesh.matchhotspot' )
+		layout.operator( 'mesh.matchhotspot', text='Hotspot Match (Dry Run)' ).dry_run = True
+		op = layout.operator( 'mesh.matchhotspot', text='Hotspot Match (Dry Run Scene)' )
+		op.dry_run = True
+		op.dry_run_scope = 'scene'
 
 
 update_clipboard_thumbs = True
@@ -1802,6 +1716,7 @@ def register():
 	bpy.utils.register_class( MESH_OT_matchhotspot )
 	bpy.utils.register_class( MESH_OT_nrsthotspot )
 	bpy.utils.register_class( MESH_OT_moshotspot )
+	bpy.utils.register_class( MESH_OT_painthotspot )
 	bpy.utils.register_class( MESH_OT_grabapplyuvbounds )
 	bpy.utils.register_class( UV_PT_UVHotspotTools )
 	bpy.utils.register_class( VIEW3D_PT_UVHotspotTools )
@@ -1829,6 +1744,7 @@ def unregister():
 	bpy.utils.unregister_class( MESH_OT_matchhotspot )
 	bpy.utils.unregister_class( MESH_OT_nrsthotspot )
 	bpy.utils.unregister_class( MESH_OT_moshotspot )
+	bpy.utils.unregister_class( MESH_OT_painthotspot )
 	bpy.utils.unregister_class( MESH_OT_grabapplyuvbounds )
 	bpy.utils.unregister_class( UV_PT_UVHotspotTools )
 	bpy.utils.unregister_class( VIEW3D_PT_UVHotspotTools )
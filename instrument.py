@@ -0,0 +1,414 @@
+import bpy
+import cProfile, functools, io, json, os, pstats, threading, time, tracemalloc
+import numpy as np
+from . import islandtable
+
+#operator instrumentation. register() wraps invoke, execute and modal of every rmKitUV operator class. a run starts
+#when an operator is invoked or executed and ends once it stops returning RUNNING_MODAL, so a modal tool is measured
+#over all of its modal calls. rmKitUV operators called from inside another one ( bpy.ops re-entry ) belong to the
+#outer run.
+#with Profile Operators enabled in the add-on preferences every run is captured with cProfile. the .prof file and a
+#text summary ( top functions, own time per module ) are written to the profiles folder of the extension user
+#directory. load the .prof in snakeviz or pstats for the full call graph.
+#with Trace Memory enabled a run is traced with tracemalloc. a sampler thread snapshots the traced allocations
+#whenever they reach a new high, the peak and the allocation sites that grew the most between the start of the run and
+#that snapshot go to the operator report and memory.log in the same folder. numpy buffers are traced, blender's own
+#allocations are not. tracing slows the operator down, so only the memory numbers are meaningful in this mode.
+#unless Log Timings is turned off, every finished run that is neither profiled nor traced appends one json line to
+#timings.jsonl ( operator, selected faces, islands, wall time and the add-on and rmlib versions ). the log rolls over
+#to timings.1.jsonl once it grows past TIMING_LOG_SIZE. operators that split their work into islands add them to the
+#run with count_islands(), runs of the others log null islands.
+
+OPERATOR_METHODS = ( 'invoke', 'execute', 'modal' )
+RUNNING = { 'RUNNING_MODAL', 'PASS_THROUGH' }
+SAMPLE_INTERVAL = 0.005 #seconds between checks of the memory sampler
+ADDON_DIR = os.path.dirname( os.path.abspath( __file__ ) )
+TIMING_LOG = 'timings.jsonl'
+TIMING_LOG_OLD = 'timings.1.jsonl'
+TIMING_LOG_SIZE = 2 * 1024 * 1024 #bytes
+
+_originals = [] #( class, method name, function in the class dict or None when it was inherited )
+_runs = {} #operator pointer -> Run of a modal operator between its modal calls
+_active = None #Run of the operator whose method is on the stack
+_versions = None #( add-on version, rmlib version ) written with each timing
+_timing_stats = ( None, [] ) #( stat of the timing logs, rows of timing_stats() computed from them )
+
+
+class MemoryTrace():
+	#tracemalloc peak of a run and a snapshot of the allocations at their highest sampled point
+	__slots__ = ( 'owner', 'baseline', 'start_snapshot', 'peak_snapshot', 'peak_size', 'stop_event', 'thread' )
+
+	def __init__( self ):
+		self.owner = not tracemalloc.is_tracing()
+		if self.owner:
+			tracemalloc.start()
+		else:
+			tracemalloc.reset_peak()
+		self.baseline = tracemalloc.get_traced_memory()[0]
+		self.start_snapshot = tracemalloc.take_snapshot()
+		self.peak_snapshot = None
+		self.peak_size = self.baseline
+		self.stop_event = threading.Event()
+		self.thread = threading.Thread( target=self.sample, daemon=True )
+		self.thread.start()
+
+	def sample( self ):
+		while not self.stop_event.wait( SAMPLE_INTERVAL ):
+			if _active is not None:
+				self.check()
+
+	def check( self ):
+		current = tracemalloc.get_traced_memory()[0]
+		if current > self.peak_size or self.peak_snapshot is None:
+			self.peak_size = max( current, self.peak_size )
+			self.peak_snapshot = tracemalloc.take_snapshot()
+
+	def stop( self ):
+		#stops tracing, returns the peak in bytes above the start of the run
+		self.stop_event.set()
+		self.thread.join()
+		self.check()
+		peak = tracemalloc.get_traced_memory()[1] - self.baseline
+		if self.owner:
+			tracemalloc.stop()
+		return peak
+
+	def top_sites( self, count ):
+		#[ ( 'file:line', bytes ) ] of the allocation sites that grew the most up to the peak snapshot
+		filters = [ tracemalloc.Filter( False, tracemalloc.__file__ ), tracemalloc.Filter( False, threading.__file__ ), tracemalloc.Filter( False, __file__ ) ]
+		stats = self.peak_snapshot.filter_traces( filters ).compare_to( self.start_snapshot.filter_traces( filters ), 'lineno' )
+		stats = sorted( [ stat for stat in stats if stat.size_diff > 0 ], key=lambda stat: stat.size_diff, reverse=True )
+		return [ ( site_name( stat.traceback[0] ), stat.size_diff ) for stat in stats[:count] ]
+
+
+class Run():
+	__slots__ = ( 'idname', 'elapsed', 'faces', 'islands', 'profile', 'memory' )
+
+	def __init__( self, idname, prefs, faces ):
+		self.idname = idname
+		self.elapsed = 0.0 #seconds spent inside the operator's methods
+		self.faces = faces #selected faces when the run started
+		self.islands = None #islands added by count_islands(), None when the operator does not count them
+		self.profile = cProfile.Profile() if prefs.profile_operators else None
+		self.memory = MemoryTrace() if prefs.trace_memory else None
+
+	def resume( self ):
+		if self.profile is not None:
+			self.profile.enable()
+
+	def pause( self ):
+		if self.profile is not None:
+			self.profile.disable()
+
+
+def get_prefs( context ):
+	addon = context.preferences.addons.get( __package__ )
+	if addon is None:
+		return None
+	return addon.preferences
+
+
+def count_islands( count ):
+	#adds count islands to the run on the stack, called by operators while they gather their work
+	if _active is not None:
+		_active.islands = ( _active.islands or 0 ) + count
+
+
+def face_count( context ):
+	#selected faces of the meshes in edit mode, all faces of the selected meshes in object mode
+	if context.mode == 'EDIT_MESH':
+		return sum( obj.data.total_face_sel for obj in context.objects_in_mode_unique_data if obj.type == 'MESH' )
+	return sum( len( obj.data.polygons ) for obj in context.selected_objects if obj.type == 'MESH' )
+
+
+def begin( op, context ):
+	prefs = get_prefs( context )
+	if prefs is None or not ( prefs.log_timings or prefs.profile_operators or prefs.trace_memory ):
+		return None
+	return Run( op.bl_idname, prefs, face_count( context ) )
+
+
+def end( op, context, run, result ):
+	#instrumentation output must never fail the operator it measured, so every error is only printed
+	prefs = get_prefs( context )
+	if run.profile is None and run.memory is None:
+		try:
+			write_timing( run, result )
+		except Exception as e:
+			print( 'rmKitUV: could not write the timing of {} :: {}'.format( run.idname, e ) )
+		return
+
+	message = '{} :: {:.1f} ms'.format( op.bl_label, run.elapsed * 1000.0 )
+	try:
+		if run.memory is not None:
+			peak = run.memory.stop()
+			sites = run.memory.top_sites( prefs.memory_top_sites if prefs is not None else 10 )
+			message += ', peak {}'.format( format_size( peak ) )
+			if len( sites ) > 0:
+				message += ' ( {} +{} )'.format( sites[0][0], format_size( sites[0][1] ) )
+			message += ', memory log {}'.format( write_memory_log( run, result, peak, sites ) )
+		if run.profile is not None:
+			message += ', profile {}'.format( write_profile( run, result, prefs.profile_top_functions if prefs is not None else 40 ) )
+	except Exception as e:
+		print( 'rmKitUV: could not write the instrumentation output of {} :: {}'.format( run.idname, e ) )
+		return
+	op.report( { 'INFO' }, message )
+
+
+def wrap( func ):
+	#every invoke and execute, nested ones included, may start from uvs changed by the operator before it
+	drop_tables = func.__name__ != 'modal'
+
+	@functools.wraps( func )
+	def wrapper( self, context, *args ):
+		global _active
+		if drop_tables:
+			islandtable.invalidate()
+		if _active is not None:
+			return func( self, context, *args )
+
+		key = self.as_pointer()
+		run = _runs.pop( key, None )
+		if run is None:
+			run = begin( self, context )
+			if run is None:
+				return func( self, context, *args )
+
+		_active = run
+		t = time.perf_counter()
+		run.resume()
+		try:
+			result = func( self, context, *args )
+		except Exception:
+			run.pause()
+			run.elapsed += time.perf_counter() - t
+			_active = None
+			end( self, context, run, { 'ERROR' } )
+			raise
+		run.pause()
+		run.elapsed += time.perf_counter() - t
+		_active = None
+
+		if RUNNING.isdisjoint( result ):
+			end( self, context, run, result )
+		else:
+			_runs[key] = run
+		return result
+
+	return wrapper
+
+
+def operator_classes():
+	#registered operator classes defined in this add-on
+	classes = []
+	pending = list( bpy.types.Operator.__subclasses__() )
+	while pending:
+		cls = pending.pop()
+		pending += cls.__subclasses__()
+		if cls.__module__.startswith( __package__ + '.' ) and cls not in classes:
+			classes.append( cls )
+	return classes
+
+
+def profile_dir( create=False ):
+	#profiles folder in the extension user directory. legacy add-on installs ( and blender before 4.2 ) have no
+	#extension directory, they use a folder in the blender config directory.
+	try:
+		return bpy.utils.extension_path_user( __package__, path='profiles', create=create )
+	except ( AttributeError, ValueError, KeyError ):
+		pass
+	folder = os.path.join( bpy.utils.user_resource( 'CONFIG' ), 'rmKitUV', 'profiles' )
+	if create:
+		os.makedirs( folder, exist_ok=True )
+	return folder
+
+
+def format_size( size ):
+	return '{:.1f} MB'.format( size / ( 1024.0 * 1024.0 ) )
+
+
+def site_name( frame ):
+	#file:line of a traceback frame, add-on files relative to the add-on directory
+	path = os.path.normpath( os.path.abspath( frame.filename ) )
+	if path.startswith( ADDON_DIR + os.sep ):
+		path = os.path.relpath( path, ADDON_DIR )
+	else:
+		path = os.path.basename( path )
+	return '{}:{}'.format( path, frame.lineno )
+
+
+def write_memory_log( run, result, peak, sites ):
+	#appends the run to memory.log, returns the path of the log
+	path = os.path.join( profile_dir( create=True ), 'memory.log' )
+	with open( path, 'a' ) as f:
+		f.write( '{} {} {} :: {:.1f} ms, peak {}\n'.format( time.strftime( '%Y-%m-%d %H:%M:%S' ), run.idname, ','.join( sorted( result ) ), run.elapsed * 1000.0, format_size( peak ) ) )
+		for site, size in sites:
+			f.write( '  {:>12}  {}\n'.format( format_size( size ), site ) )
+	return path
+
+
+def versions():
+	global _versions
+	if _versions is None:
+		addon_version = 'unknown'
+		try:
+			import tomllib
+			with open( os.path.join( ADDON_DIR, 'blender_manifest.toml' ), 'rb' ) as f:
+				addon_version = tomllib.load( f ).get( 'version', addon_version )
+		except ( ImportError, OSError, ValueError ):
+			pass
+		rmlib_version = 'unknown'
+		try:
+			import importlib.metadata
+			rmlib_version = importlib.metadata.version( 'rmlib' )
+		except ( ImportError, ValueError ):
+			pass
+		_versions = ( addon_version, rmlib_version )
+	return _versions
+
+
+def timing_logs( create=False ):
+	#paths of the rolled over and the current timing log
+	folder = profile_dir( create )
+	return os.path.join( folder, TIMING_LOG_OLD ), os.path.join( folder, TIMING_LOG )
+
+
+def write_timing( run, result ):
+	old_path, path = timing_logs( create=True )
+	if os.path.exists( path ) and os.path.getsize( path ) > TIMING_LOG_SIZE:
+		os.replace( path, old_path )
+	addon_version, rmlib_version = versions()
+	record = { 'time' : round( time.time(), 3 ), 'op' : run.idname, 'result' : ','.join( sorted( result ) ),
+		'faces' : run.faces, 'islands' : run.islands, 'ms' : round( run.elapsed * 1000.0, 3 ),
+		'version' : addon_version, 'rmlib' : rmlib_version }
+	with open( path, 'a' ) as f:
+		f.write( json.dumps( record ) + '\n' )
+
+
+def read_timings():
+	#{ idname : ( [ ms of runs with the current versions ], [ ms of earlier runs ] ) } of the finished runs in the logs
+	current = list( versions() )
+	timings = {}
+	for path in timing_logs():
+		if not os.path.exists( path ):
+			continue
+		with open( path, 'r' ) as f:
+			for line in f:
+				try:
+					record = json.loads( line )
+					if record['result'] != 'FINISHED':
+						continue
+					times = timings.setdefault( record['op'], ( [], [] ) )
+					times[0 if [ record['version'], record['rmlib'] ] == current else 1].append( float( record['ms'] ) )
+				except ( ValueError, KeyError, TypeError ):
+					continue
+	return timings
+
+
+def timing_stats():
+	#[ ( idname, runs, p50 ms, p95 ms, p50 ms of earlier versions or None ) ] sorted by p95, recomputed only when
+	#the logs changed since the last call. operators only run with earlier versions are left out.
+	global _timing_stats
+	try:
+		key = tuple( ( os.path.getmtime( path ), os.path.getsize( path ) ) if os.path.exists( path ) else None for path in timing_logs() )
+	except Exception:
+		return []
+	if key == _timing_stats[0]:
+		return _timing_stats[1]
+
+	try:
+		timings = read_timings()
+	except Exception:
+		return []
+	rows = []
+	for idname, ( times, earlier ) in timings.items():
+		if len( times ) == 0:
+			continue
+		p50, p95 = np.percentile( times, ( 50.0, 95.0 ) )
+		rows.append( ( idname, len( times ), float( p50 ), float( p95 ), float( np.median( earlier ) ) if len( earlier ) > 0 else None ) )
+	rows.sort( key=lambda row: row[3], reverse=True )
+	_timing_stats = ( key, rows )
+	return rows
+
+
+def module_group( filename, funcname ):
+	#bucket of a profiled function for the per module summary
+	if filename == '~':
+		if 'numpy' in funcname:
+			return 'numpy'
+		if 'bpy' in funcname or 'bmesh' in funcname or 'mathutils' in funcname:
+			return 'blender api'
+		return 'python builtins'
+	path = os.path.normpath( os.path.abspath( filename ) )
+	if path.startswith( ADDON_DIR + os.sep ):
+		return 'rmKitUV.' + os.path.splitext( os.path.relpath( path, ADDON_DIR ) )[0].replace( os.sep, '.' )
+	parts = path.split( os.sep )
+	if 'rmlib' in parts:
+		return 'rmlib'
+	if 'numpy' in parts:
+		return 'numpy'
+	if parts[-2:] == [ 'bpy', 'ops.py' ]:
+		return 'bpy.ops'
+	if 'bpy' in parts or 'bl_ui' in parts or 'bl_operators' in parts:
+		return 'blender python'
+	return 'other'
+
+
+def summarize( stats, top ):
+	#text report: time per module group, bpy.ops re-entry and the top functions by cumulative time
+	groups = {}
+	reentry_time = 0.0
+	reentry_calls = 0
+	for ( filename, line, funcname ), ( cc, nc, tt, ct, callers ) in stats.stats.items():
+		group = module_group( filename, funcname )
+		groups[group] = groups.get( group, 0.0 ) + tt
+		if group == 'bpy.ops' and funcname == '__call__':
+			reentry_time += ct
+			reentry_calls += nc
+
+	out = io.StringIO()
+	out.write( 'own time per module\n' )
+	total = max( sum( groups.values() ), 1e-9 )
+	for group, t in sorted( groups.items(), key=lambda item: item[1], reverse=True ):
+		out.write( '  {:<40}{:>10.1f} ms {:>6.1f}%\n'.format( group, t * 1000.0, t * 100.0 / total ) )
+	out.write( '\nbpy.ops re-entry: {} calls, {:.1f} ms cumulative\n\n'.format( reentry_calls, reentry_time * 1000.0 ) )
+	stats.stream = out
+	stats.sort_stats( 'cumulative' ).print_stats( top )
+	return out.getvalue()
+
+
+def write_profile( run, result, top ):
+	#writes <idname>_<time>.prof and .txt, returns the path of the text summary
+	now = time.time()
+	name = '{}_{}_{:03d}'.format( run.idname.replace( '.', '_' ), time.strftime( '%Y%m%d_%H%M%S', time.localtime( now ) ), int( now * 1000.0 ) % 1000 )
+	path = os.path.join( profile_dir( create=True ), name )
+	run.profile.dump_stats( path + '.prof' )
+	stats = pstats.Stats( run.profile )
+	with open( path + '.txt', 'w' ) as f:
+		f.write( '{} {} :: {:.1f} ms\n\n'.format( run.idname, ','.join( sorted( result ) ), run.elapsed * 1000.0 ) )
+		f.write( summarize( stats, top ) )
+	return path + '.txt'
+
+
+def register():
+	for cls in operator_classes():
+		for name in OPERATOR_METHODS:
+			if not hasattr( cls, name ):
+				continue
+			_originals.append( ( cls, name, cls.__dict__.get( name ) ) )
+			setattr( cls, name, wrap( getattr( cls, name ) ) )
+
+
+def unregister():
+	global _active
+	for cls, name, original in reversed( _originals ):
+		if original is None:
+			delattr( cls, name )
+		else:
+			setattr( cls, name, original )
+	_originals.clear()
+	for run in _runs.values():
+		if run.memory is not None:
+			run.memory.stop()
+	_runs.clear()
+	_active = None
@@ -0,0 +1,225 @@
+import numpy as np
+
+#uv island labeling over flat mesh arrays. faces are joined when they share a vert whose uvs coincide, which is the
+#connectivity rmPolygonSet.island( uvlayer ) walks. uvs at a vert are welded the way AlmostEqual_v2 compares them:
+#they are binned into epsilon sized cells, loops in one cell always weld and loops in neighbouring cells weld when
+#they are within epsilon. connected components come from min-label propagation with pointer jumping, so every step
+#is a NumPy pass.
+
+UV_EPSILON = 0.000001
+
+
+def group_ids( columns ):
+	#assign an id to every distinct row of the int64 columns.
+	#returns ( ids, order, starts ) where order sorts the rows by id and starts are the first sorted row of each id.
+	order = np.lexsort( columns[::-1] )
+	changed = np.zeros( len( order ), dtype=bool )
+	if len( order ) > 0:
+		changed[0] = True
+		for c in columns:
+			sorted_c = c[order]
+			changed[1:] |= sorted_c[1:] != sorted_c[:-1]
+	ids = np.empty( len( order ), dtype=np.int64 )
+	ids[order] = np.cumsum( changed ) - 1
+	return ids, order, np.flatnonzero( changed )
+
+
+def quantize( uvs, epsilon=UV_EPSILON ):
+	#( cu, cv ) epsilon cell of every uv. uvs in one cell are within epsilon of each other, uvs within epsilon of
+	#each other are in the same or a neighbouring cell.
+	q = np.floor( np.asarray( uvs, dtype=np.float64 ).reshape( -1, 2 ) / epsilon ).astype( np.int64 )
+	return q[:,0], q[:,1]
+
+
+def connected_pairs( count, a, b ):
+	#components of the graph of count nodes joined by the edges a[i] - b[i]. returns the smallest node of each
+	#node's component.
+	labels = np.arange( count, dtype=np.int64 )
+	while len( a ) > 0:
+		m = np.minimum( labels[a], labels[b] )
+		new_labels = labels.copy()
+		np.minimum.at( new_labels, labels[a], m )
+		np.minimum.at( new_labels, labels[b], m )
+		while True:
+			jumped = new_labels[new_labels]
+			if np.array_equal( jumped, new_labels ):
+				break
+			new_labels = jumped
+		if np.array_equal( new_labels, labels ):
+			break
+		labels = new_labels
+	return labels
+
+
+def bit_width( count ):
+	return max( 1, int( count - 1 ).bit_length() )
+
+
+def pack_cells( columns, cu, cv ):
+	#one int64 key per row for ( columns, cu, cv ) and the key step of one cell in u. the cells are offset so a cell
+	#and its neighbours never carry into another column or u cell. when the raw cell range does not fit in 62 bits
+	#the cells are ranked first, which makes rank neighbours of cells that are not adjacent, but those pairs are
+	#still rejected by the distance test.
+	if len( columns ) == 1:
+		col = columns[0] - columns[0].min()
+	else:
+		col = group_ids( columns )[0]
+	for rank in ( False, True ):
+		if rank:
+			cu = np.unique( cu, return_inverse=True )[1].reshape( -1 )
+			cv = np.unique( cv, return_inverse=True )[1].reshape( -1 )
+		ru = cu - cu.min() + 1
+		rv = cv - cv.min() + 1
+		col_bits = bit_width( int( col.max() ) + 1 )
+		u_bits = bit_width( int( ru.max() ) + 2 )
+		v_bits = bit_width( int( rv.max() ) + 2 )
+		if col_bits + u_bits + v_bits <= 62:
+			break
+	return ( col << ( u_bits + v_bits ) ) | ( ru << v_bits ) | rv, 1 << v_bits
+
+
+def weld_ids( columns, uvs, epsilon=UV_EPSILON ):
+	#id of every row, equal for rows with equal int64 columns whose uvs are joined by a chain of AlmostEqual_v2 pairs
+	uvs = np.asarray( uvs, dtype=np.float64 ).reshape( -1, 2 )
+	if len( uvs ) == 0:
+		return np.zeros( 0, dtype=np.int64 )
+	cu, cv = quantize( uvs, epsilon )
+	keys, u_step = pack_cells( [ np.asarray( c, dtype=np.int64 ) for c in columns ], cu, cv )
+
+	#rows sorted by cell, the first sorted row of every cell and the cell of every row
+	order = np.argsort( keys, kind='stable' )
+	sorted_keys = keys[order]
+	changed = np.r_[ True, sorted_keys[1:] != sorted_keys[:-1] ]
+	starts = np.flatnonzero( changed )
+	cell_ids = np.empty( len( order ), dtype=np.int64 )
+	cell_ids[order] = np.cumsum( changed ) - 1
+	cell_keys = sorted_keys[starts]
+	cell_count = len( starts )
+	counts = np.diff( np.r_[ starts, len( order ) ] )
+
+	#half of the neighbour cells, the other half is covered from the other side
+	pair_a = []
+	pair_b = []
+	for du, dv in ( ( 1, -1 ), ( 1, 0 ), ( 1, 1 ), ( 0, 1 ) ):
+		probe = cell_keys + ( du * u_step + dv )
+		found = np.minimum( np.searchsorted( cell_keys, probe ), cell_count - 1 )
+		hit = cell_keys[found] == probe
+		cells_a = np.flatnonzero( hit )
+		cells_b = found[hit]
+		if len( cells_a ) == 0:
+			continue
+
+		#every row of cell a against every row of cell b
+		pair_counts = counts[cells_a] * counts[cells_b]
+		pair_cell_a = np.repeat( cells_a, pair_counts )
+		pair_cell_b = np.repeat( cells_b, pair_counts )
+		pair_start = np.repeat( np.cumsum( pair_counts ) - pair_counts, pair_counts )
+		k = np.arange( len( pair_cell_a ) ) - pair_start
+		rows_a = order[starts[pair_cell_a] + k // counts[pair_cell_b]]
+		rows_b = order[starts[pair_cell_b] + k % counts[pair_cell_b]]
+		close = ( np.abs( uvs[rows_a] - uvs[rows_b] ) <= epsilon ).all( axis=1 )
+		pair_a.append( pair_cell_a[close] )
+		pair_b.append( pair_cell_b[close] )
+
+	if len( pair_a ) == 0:
+		return cell_ids
+	roots = connected_pairs( cell_count, np.concatenate( pair_a ), np.concatenate( pair_b ) )
+	return np.unique( roots, return_inverse=True )[1].reshape( -1 )[cell_ids]
+
+
+def connected_faces( face_count, member_faces, member_nodes ):
+	#components of the bipartite graph where face member_faces[i] touches node member_nodes[i].
+	#returns the smallest face index of each face's component.
+	labels = np.arange( face_count, dtype=np.int64 )
+	if len( member_faces ) == 0:
+		return labels
+	node_ids, node_order, node_starts = group_ids( [ member_nodes ] )
+	face_order = np.argsort( member_faces, kind='stable' )
+	sorted_faces = member_faces[face_order]
+	face_starts = np.flatnonzero( np.r_[ True, sorted_faces[1:] != sorted_faces[:-1] ] )
+	touched_faces = sorted_faces[face_starts]
+
+	while True:
+		#hook every face to the smallest label reachable through one node
+		node_min = np.minimum.reduceat( labels[member_faces][node_order], node_starts )
+		via_node = node_min[node_ids]
+		face_min = np.minimum.reduceat( via_node[face_order], face_starts )
+		new_labels = labels.copy()
+		np.minimum.at( new_labels, touched_faces, face_min )
+		np.minimum.at( new_labels, labels[touched_faces], face_min ) #hook the old root as well
+
+		#pointer jumping
+		while True:
+			jumped = new_labels[new_labels]
+			if np.array_equal( jumped, new_labels ):
+				break
+			new_labels = jumped
+
+		if np.array_equal( new_labels, labels ):
+			return labels
+		labels = new_labels
+
+
+def label_islands( loop_start, loop_total, loop_verts, loop_edges, uvs, face_mask=None, split_edges=None, face_materials=None, epsilon=UV_EPSILON ):
+	#returns ( face_labels, loop_labels ) with island ids numbered 0..I-1 in order of each island's first face.
+	#faces outside face_mask are left out of every island and labeled -1, the same restriction as calling
+	#island() on a subset of faces. split_edges is a per-edge bool mask ( seams and/or sharp edges ): at verts
+	#touching a split edge, faces only join across a shared edge that is not split. face_materials keeps faces
+	#of different materials apart.
+	loop_start = np.asarray( loop_start, dtype=np.int64 )
+	loop_total = np.asarray( loop_total, dtype=np.int64 )
+	loop_verts = np.asarray( loop_verts, dtype=np.int64 )
+	loop_edges = np.asarray( loop_edges, dtype=np.int64 )
+	face_count = len( loop_start )
+	loop_count = len( loop_verts )
+
+	loop_face = np.repeat( np.arange( face_count, dtype=np.int64 ), loop_total )
+	material = np.zeros( loop_count, dtype=np.int64 ) if face_materials is None else np.asarray( face_materials, dtype=np.int64 )[loop_face]
+
+	if face_mask is None:
+		loop_mask = np.ones( loop_count, dtype=bool )
+	else:
+		loop_mask = np.asarray( face_mask, dtype=bool )[loop_face]
+
+	#uv verts of the loops in the mask
+	welds = np.full( loop_count, -1, dtype=np.int64 )
+	welds[loop_mask] = weld_ids( [ loop_verts[loop_mask] ], np.asarray( uvs, dtype=np.float64 ).reshape( -1, 2 )[loop_mask], epsilon )
+
+	if split_edges is None:
+		split_vert_loops = np.zeros( loop_count, dtype=bool )
+	else:
+		split_edges = np.asarray( split_edges, dtype=bool )
+		split_verts = np.zeros( loop_verts.max() + 1 if loop_count > 0 else 0, dtype=bool )
+		split_loop_edges = split_edges[loop_edges]
+		split_verts[loop_verts[split_loop_edges]] = True
+		#the edge of a loop also ends at the vert of the next loop of the face
+		next_rows = np.arange( 1, loop_count + 1 )
+		next_rows[loop_start + loop_total - 1] = loop_start
+		split_verts[loop_verts[next_rows][split_loop_edges]] = True
+		split_vert_loops = split_verts[loop_verts]
+
+	#plain corners join through ( vert, uv vert ) nodes
+	plain = loop_mask & ~split_vert_loops
+	members_face = [ loop_face[plain] ]
+	members_key = [ ( np.zeros( plain.sum(), dtype=np.int64 ), loop_verts[plain], np.full( plain.sum(), -1, dtype=np.int64 ), welds[plain], material[plain] ) ]
+
+	#corners at split verts join through ( vert, edge, uv vert ) nodes of their two non split edges
+	if split_edges is not None:
+		corner = loop_mask & split_vert_loops
+		prev_rows = np.arange( -1, loop_count - 1 )
+		prev_rows[loop_start] = loop_start + loop_total - 1
+		for edges in ( loop_edges, loop_edges[prev_rows] ):
+			rows = corner & ~split_edges[edges]
+			members_face.append( loop_face[rows] )
+			members_key.append( ( np.ones( rows.sum(), dtype=np.int64 ), loop_verts[rows], edges[rows], welds[rows], material[rows] ) )
+
+	member_faces = np.concatenate( members_face )
+	member_nodes, _, _ = group_ids( [ np.concatenate( [ k[i] for k in members_key ] ) for i in range( 5 ) ] )
+	roots = connected_faces( face_count, member_faces, member_nodes )
+
+	face_labels = np.full( face_count, -1, dtype=np.int32 )
+	valid = np.ones( face_count, dtype=bool ) if face_mask is None else np.asarray( face_mask, dtype=bool )
+	#roots are the smallest face index of each island, so sorting them orders islands by their first face
+	unique_roots, inverse = np.unique( roots[valid], return_inverse=True )
+	face_labels[valid] = inverse
+	return face_labels, face_labels[loop_face]
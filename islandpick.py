@@ -0,0 +1,130 @@
+import bpy, bmesh
+from mathutils.bvhtree import BVHTree
+from bpy.app.handlers import persistent
+from bpy_extras import view3d_utils
+import numpy as np
+from . import islandtable, selection
+
+#object name -> IslandPickCache. entries are dropped by the depsgraph handler when their mesh changes.
+_caches = {}
+
+
+class IslandPickCache():
+	#BVHTree over the base mesh of an object plus a face index -> uv island label array and the uv bounds
+	#( min_u, min_v, max_u, max_v ) of every island. labels and bounds are for the uvlayer named uvlayer_name.
+	__slots__ = ( 'mesh_name', 'fingerprint', 'uvlayer_name', 'bvh', 'labels', 'bounds' )
+
+	def __init__( self, mesh_name, fingerprint, uvlayer_name, bvh, labels, bounds ):
+		self.mesh_name = mesh_name
+		self.fingerprint = fingerprint
+		self.uvlayer_name = uvlayer_name
+		self.bvh = bvh
+		self.labels = labels
+		self.bounds = bounds
+
+	def island_faces( self, label ):
+		#face indexes of island label
+		return np.flatnonzero( self.labels == label )
+
+
+def mesh_fingerprint( obj ):
+	#cheap topology check in case a depsgraph update was missed
+	mesh = obj.data
+	if mesh.is_editmode:
+		bm = bmesh.from_edit_mesh( mesh )
+		uvlayer = bm.loops.layers.uv.active
+		return ( len( bm.verts ), len( bm.edges ), len( bm.faces ), uvlayer.name if uvlayer is not None else '' )
+	uvlayer = mesh.uv_layers.active
+	return ( len( mesh.vertices ), len( mesh.edges ), len( mesh.polygons ), uvlayer.name if uvlayer is not None else '' )
+
+
+def build_cache( obj, fingerprint ):
+	#read the mesh without going through a rmMesh "with" context. exiting that context writes the mesh back,
+	#which would trigger a depsgraph update and immediately invalidate the cache being built.
+	mesh = obj.data
+	rmmesh = selection.open_bmesh( obj )
+	bm = rmmesh.bmesh
+	uvlayer = bm.loops.layers.uv.active
+
+	table = islandtable.get( rmmesh, uvlayer )
+	bvh = BVHTree.FromBMesh( bm )
+	labels = table.face_labels
+	bounds = table.bounds
+
+	if not mesh.is_editmode:
+		bm.free()
+
+	return IslandPickCache( mesh.name, fingerprint, uvlayer.name, bvh, labels, bounds )
+
+
+def get_cache( obj ):
+	#return the cached IslandPickCache for obj, rebuilding it if it is stale.
+	#returns None if obj has no uv data.
+	fingerprint = mesh_fingerprint( obj )
+	if fingerprint[3] == '':
+		return None
+	cache = _caches.get( obj.name )
+	if cache is None or cache.mesh_name != obj.data.name or cache.fingerprint != fingerprint:
+		cache = build_cache( obj, fingerprint )
+		_caches[obj.name] = cache
+	return cache
+
+
+def pick_island( context, obj, mouse_pos ):
+	#cast a ray from the mouse position into the cached BVHTree of obj.
+	#returns ( cache, face_index, island_label ) or None if nothing was hit.
+	cache = get_cache( obj )
+	if cache is None:
+		return None
+
+	ray_origin = view3d_utils.region_2d_to_origin_3d( context.region, context.region_data, mouse_pos )
+	view_vector = view3d_utils.region_2d_to_vector_3d( context.region, context.region_data, mouse_pos )
+	world_to_local = obj.matrix_world.inverted()
+	ray_origin_local = world_to_local @ ray_origin
+	ray_direction_local = ( world_to_local.to_3x3() @ view_vector ).normalized()
+
+	loc, nml, face_index, dist = cache.bvh.ray_cast( ray_origin_local, ray_direction_local )
+	if face_index is None:
+		return None
+
+	return cache, face_index, int( cache.labels[face_index] )
+
+
+def invalidate( object_name=None ):
+	if object_name is None:
+		_caches.clear()
+	else:
+		_caches.pop( object_name, None )
+
+
+@persistent
+def depsgraph_update_post_handler( scene, depsgraph ):
+	if len( _caches ) == 0:
+		return
+	for update in depsgraph.updates:
+		if not update.is_updated_geometry:
+			continue
+		id = update.id
+		if isinstance( id, bpy.types.Object ):
+			invalidate( id.name )
+		elif isinstance( id, bpy.types.Mesh ):
+			for key in [ k for k, c in _caches.items() if c.mesh_name == id.name ]:
+				invalidate( key )
+
+
+@persistent
+def load_post_handler( dummy ):
+	invalidate()
+
+
+def register():
+	bpy.app.handlers.depsgraph_update_post.append( depsgraph_update_post_handler )
+	bpy.app.handlers.load_post.append( load_post_handler )
+
+
+def unregister():
+	if depsgraph_update_post_handler in bpy.app.handlers.depsgraph_update_post:
+		bpy.app.handlers.depsgraph_update_post.remove( depsgraph_update_post_handler )
+	if load_post_handler in bpy.app.handlers.load_post:
+		bpy.app.handlers.load_post.remove( load_post_handler )
+	invalidate()
@@ -0,0 +1,212 @@
+import bpy
+from bpy.app.handlers import persistent
+import rmlib
+import numpy as np
+from . import islandlabel, selection, uvarray
+
+#( mesh name, uvlayer name ) -> IslandTable. a cached table is reused while the vert, edge and face counts of the
+#bmesh still match it, without syncing or reading the mesh. operators and the blender tools they call write uvs
+#straight through the bmesh, so the whole cache is dropped whenever a rmKitUV operator is invoked or executed
+#( instrument.wrap ) and on undo, redo and file load. VERIFY_CHECKSUM also checks a reused table against a checksum
+#of the mesh topology and uvs, which costs a full sync and read of the mesh on every lookup.
+VERIFY_CHECKSUM = False
+_tables = {}
+
+
+class IslandTable():
+	#uv islands of a whole mesh for one uvlayer. islands are element islands ( faces joined through a shared vert
+	#with coincident uvs ), the same grouping as rmPolygonSet.island( uvlayer, element=True ).
+	#the flat loop arrays the labels were computed from are kept for relabeling subsets of faces.
+	#face_order and loop_order hold face indexes and loop rows sorted by island. island i owns the slice
+	#[ offsets[i], offsets[i+1] ) of each. bounds rows are ( min_u, min_v, max_u, max_v ), centers are the average
+	#loop uv and area_3d is in object space.
+	__slots__ = ( 'mesh_name', 'uvlayer_name', 'checksum', 'counts', 'face_labels', 'loop_labels', 'face_order', 'face_offsets',
+		'loop_order', 'loop_offsets', 'bounds', 'centers', 'uv_area', 'area_3d',
+		'loop_start', 'loop_total', 'loop_verts', 'loop_edges', 'uvs', 'twins', 'weld_ids' )
+
+	def __init__( self, mesh_name, uvlayer_name, checksum ):
+		self.mesh_name = mesh_name
+		self.uvlayer_name = uvlayer_name
+		self.checksum = checksum
+		self.counts = None #( verts, edges, faces )
+		self.face_labels = None #(F,) int32
+		self.loop_labels = None #(L,) int32
+		self.face_order = None #(F,) int64
+		self.face_offsets = None #(I+1,) int64
+		self.loop_order = None #(L,) int64
+		self.loop_offsets = None #(I+1,) int64
+		self.bounds = None #(I,4) float64
+		self.centers = None #(I,2) float64
+		self.uv_area = None #(I,) float64
+		self.area_3d = None #(I,) float64
+		self.loop_start = None #(F,) int32
+		self.loop_total = None #(F,) int32
+		self.loop_verts = None #(L,) int32
+		self.loop_edges = None #(L,) int32
+		self.uvs = None #(L,2) float64
+		self.twins = None #(L,) int64, filled in by uvhalfedge
+		self.weld_ids = None #(L,) int64, filled in by uvhalfedge
+
+	def __len__( self ):
+		return len( self.bounds )
+
+	def island_faces( self, label ):
+		return self.face_order[self.face_offsets[label]:self.face_offsets[label+1]]
+
+	def island_loop_rows( self, label ):
+		return self.loop_order[self.loop_offsets[label]:self.loop_offsets[label+1]]
+
+	def labels_of_faces( self, face_indexes ):
+		#sorted unique island labels of face_indexes
+		return np.unique( self.face_labels[np.asarray( face_indexes, dtype=np.int64 )] )
+
+	def polygon_set( self, rmmesh, label ):
+		faces = rmmesh.bmesh.faces
+		faces.ensure_lookup_table()
+		return rmlib.rmPolygonSet( [ faces[i] for i in self.island_faces( label ).tolist() ] )
+
+	def loop_set( self, rmmesh, label, uvlayer ):
+		faces = rmmesh.bmesh.faces
+		faces.ensure_lookup_table()
+		return rmlib.rmUVLoopSet( [ l for i in self.island_faces( label ).tolist() for l in faces[i].loops ], uvlayer=uvlayer )
+
+	def islands( self, rmmesh, faces, uvlayer ):
+		#same islands as faces.island( uvlayer ). when an island is only partly in faces, walking it through faces
+		#alone can split it differently, so those faces are relabeled on their own.
+		face_indexes = np.fromiter( ( f.index for f in faces ), dtype=np.int64, count=len( faces ) )
+		labels, counts = np.unique( self.face_labels[face_indexes], return_counts=True )
+		if np.array_equal( counts, np.diff( self.face_offsets )[labels] ):
+			return [ self.polygon_set( rmmesh, label ) for label in labels.tolist() ]
+
+		face_mask = np.zeros( len( self.face_labels ), dtype=bool )
+		face_mask[face_indexes] = True
+		sub_labels, _ = islandlabel.label_islands( self.loop_start, self.loop_total, self.loop_verts, self.loop_edges, self.uvs, face_mask=face_mask )
+		order = np.argsort( sub_labels[face_indexes], kind='stable' )
+		sorted_labels = sub_labels[face_indexes][order]
+		bmfaces = rmmesh.bmesh.faces
+		bmfaces.ensure_lookup_table()
+		islands = []
+		for group in np.split( face_indexes[order], np.flatnonzero( np.diff( sorted_labels ) ) + 1 ):
+			islands.append( rmlib.rmPolygonSet( [ bmfaces[i] for i in group.tolist() ] ) )
+		return islands
+
+	def loop_groups( self, rmmesh, loops, uvlayer ):
+		#one rmUVLoopSet per island touched by loops, holding every loop of that island.
+		#equivalent to loops.group_vertices( element=True ).
+		labels = self.labels_of_faces( [ l.face.index for l in loops ] )
+		return [ self.loop_set( rmmesh, label, uvlayer ) for label in labels.tolist() ]
+
+
+def read_checksum( mesh, uv_layer ):
+	loop_count = len( mesh.loops )
+	uvs = uvarray.read_uvs( uv_layer, loop_count )
+	vert_indexes = selection.read_int( mesh.loops, 'vertex_index' )
+	checksum = ( len( mesh.vertices ), len( mesh.edges ), len( mesh.polygons ), loop_count,
+		hash( uvs.tobytes() ), hash( vert_indexes.tobytes() ) )
+	return checksum, uvs
+
+
+def segment_offsets( labels, count ):
+	offsets = np.zeros( count + 1, dtype=np.int64 )
+	np.cumsum( np.bincount( labels, minlength=count ), out=offsets[1:] )
+	return offsets
+
+
+def build( mesh, uvlayer_name, uvs, checksum ):
+	table = IslandTable( mesh.name, uvlayer_name, checksum )
+	table.counts = ( len( mesh.vertices ), len( mesh.edges ), len( mesh.polygons ) )
+
+	loop_start = selection.read_int( mesh.polygons, 'loop_start' )
+	loop_total = selection.read_int( mesh.polygons, 'loop_total' )
+	uvs = uvs.astype( np.float64 )
+	table.loop_start = loop_start
+	table.loop_total = loop_total
+	table.loop_verts = selection.read_int( mesh.loops, 'vertex_index' )
+	table.loop_edges = selection.read_int( mesh.loops, 'edge_index' )
+	table.uvs = uvs
+
+	table.face_labels, table.loop_labels = islandlabel.label_islands( loop_start, loop_total, table.loop_verts, table.loop_edges, uvs )
+	island_count = int( table.face_labels.max() ) + 1 if len( table.face_labels ) > 0 else 0
+
+	table.face_order = np.argsort( table.face_labels, kind='stable' )
+	table.face_offsets = segment_offsets( table.face_labels, island_count )
+	table.loop_order = np.argsort( table.loop_labels, kind='stable' )
+	table.loop_offsets = segment_offsets( table.loop_labels, island_count )
+
+	if island_count == 0:
+		table.bounds = np.zeros( ( 0, 4 ), dtype=np.float64 )
+		table.centers = np.zeros( ( 0, 2 ), dtype=np.float64 )
+		table.uv_area = np.zeros( 0, dtype=np.float64 )
+		table.area_3d = np.zeros( 0, dtype=np.float64 )
+		return table
+
+	sorted_uvs = uvs[table.loop_order]
+	starts = table.loop_offsets[:-1]
+	table.bounds = np.hstack( ( np.minimum.reduceat( sorted_uvs, starts, axis=0 ), np.maximum.reduceat( sorted_uvs, starts, axis=0 ) ) )
+	table.centers = np.add.reduceat( sorted_uvs, starts, axis=0 ) / np.diff( table.loop_offsets )[:,None]
+
+	#shoelace area of every face in uv space
+	next_rows = np.arange( 1, len( uvs ) + 1 )
+	next_rows[loop_start + loop_total - 1] = loop_start
+	cross = uvs[:,0] * uvs[next_rows,1] - uvs[next_rows,0] * uvs[:,1]
+	face_uv_area = np.abs( np.add.reduceat( cross, loop_start ) ) * 0.5
+	table.uv_area = np.bincount( table.face_labels, weights=face_uv_area, minlength=island_count )
+
+	face_area = np.empty( len( loop_start ), dtype=np.float32 )
+	mesh.polygons.foreach_get( 'area', face_area )
+	table.area_3d = np.bincount( table.face_labels, weights=face_area, minlength=island_count )
+
+	return table
+
+
+def get( rmmesh, uvlayer ):
+	#return the IslandTable of rmmesh for uvlayer ( a BMesh uv layer ), rebuilding it if the mesh changed.
+	#bmesh face indexes match the table once this returns. loops map to table rows through selection.loop_row.
+	#the mesh datablock is only synced when the table is rebuilt. callers that read it sync it themselves.
+	bm = rmmesh.bmesh
+	key = ( rmmesh.mesh.name, uvlayer.name )
+	counts = ( len( bm.verts ), len( bm.edges ), len( bm.faces ) )
+	table = _tables.get( key )
+	if table is not None and table.counts == counts and not VERIFY_CHECKSUM:
+		bm.faces.index_update()
+		return table
+
+	mesh = selection.sync( rmmesh )
+	checksum, uvs = read_checksum( mesh, mesh.uv_layers[uvlayer.name] )
+	if table is None or table.counts != counts or table.checksum != checksum:
+		table = build( mesh, uvlayer.name, uvs, checksum )
+		_tables[key] = table
+	return table
+
+
+def invalidate( mesh_name=None ):
+	if mesh_name is None:
+		_tables.clear()
+	else:
+		for key in [ k for k in _tables.keys() if k[0] == mesh_name ]:
+			del _tables[key]
+
+
+@persistent
+def undo_redo_post_handler( scene, *args ):
+	invalidate()
+
+
+@persistent
+def load_post_handler( dummy, *args ):
+	invalidate()
+
+
+def register():
+	bpy.app.handlers.undo_post.append( undo_redo_post_handler )
+	bpy.app.handlers.redo_post.append( undo_redo_post_handler )
+	bpy.app.handlers.load_post.append( load_post_handler )
+
+
+def unregister():
+	for handlers, handler in ( ( bpy.app.handlers.undo_post, undo_redo_post_handler ),
+			( bpy.app.handlers.redo_post, undo_redo_post_handler ),
+			( bpy.app.handlers.load_post, load_post_handler ) ):
+		if handler in handlers:
+			handlers.remove( handler )
+	invalidate()
@@ -2,6 +2,7 @@ import bpy, bmesh, mathutils, bpy_extras, gpu
 from gpu_extras.batch import batch_for_shader
 import rmlib
 import math
+from . import selection
 
 pass_keys = { 'NUMPAD_0', 'NUMPAD_1', 'NUMPAD_3', 'NUMPAD_4', 
 			 'NUMPAD_5', 'NUMPAD_6', 'NUMPAD_7', 'NUMPAD_8', 
@@ -372,31 +373,6 @@ def GetSelectedLoops( context, rmmesh ):
 	uvlayer = rmmesh.active_uv
 
 	sel_mode = context.tool_settings.mesh_select_mode[:]
-	visible_faces = rmlib.rmPolygonSet()
-	if sel_mode[0]:		
-		for f in rmmesh.bmesh.faces:
-			if f.hide:
-				continue
-			visible = True
-			for v in f.verts:
-				if not v.select:
-					visible = False
-					break
-			if visible:
-				visible_faces.append( f )
-	elif sel_mode[1]:
-		for f in rmmesh.bmesh.faces:
-			if f.hide:
-				continue
-			visible = True
-			for e in f.edges:
-				if not e.select:
-					visible = False
-					break
-			if visible:
-				visible_faces.append( f )
-	else:
-		visible_faces = rmlib.rmPolygonSet.from_selection( rmmesh )
 
 	if context.tool_settings.use_uv_select_sync:
 		if sel_mode[0]:
@@ -415,22 +391,14 @@ def GetSelectedLoops( context, rmmesh ):
 			return rmlib.rmUVLoopSet( loopset, uvlayer=uvlayer )
 
 	else:
+		visible_faces = selection.visible_face_mask( rmmesh, sel_mode )
 		sel_mode = context.tool_settings.uv_select_mode			
 		if sel_mode == 'EDGE':
-			loop_selection = rmlib.rmUVLoopSet.from_edge_selection( rmmesh=rmmesh, uvlayer=uvlayer )
-			loops = rmlib.rmUVLoopSet( uvlayer=uvlayer )
-			for l in loop_selection:
-				if l.face in visible_faces:
-					loops.append( l )
+			loops = selection.visible_uv_loops( rmmesh, uvlayer, visible_faces, edge=True )
 			loops.add_overlapping_loops( True )
 			return loops
 		else:
-			loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=rmmesh, uvlayer=uvlayer )
-			loops = rmlib.rmUVLoopSet( uvlayer=uvlayer )
-			for l in loop_selection:
-				if l.face in visible_faces:
-					loops.append( l )
-			return loops
+			return selection.visible_uv_loops( rmmesh, uvlayer, visible_faces )
 
 
 class MESH_OT_Linear_Deformer_UV( bpy.types.Operator ):
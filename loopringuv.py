@@ -1,112 +1,69 @@
-import bpy, bmesh, mathutils
+import bpy, bmesh
 import rmlib
+from . import editscope, uvhalfedge, uvweld
 
 
-def uvedge_boundary( l, uvlayer ):
-	#test if edge loop is a boundary of a uv island
-	for f in l.edge.link_faces:
-		if f == l.face:
-			continue
-		if edge_continuous( l.face, f, uvlayer ):
-			return False		
-	return True
-
-
-def edge_continuous( f1, f2, uvlayer ):
-	#test if two faces are conntected by an edge in uv space
-	for l1 in f1.loops:
-		for l2 in f2.loops:
-			if l1.edge == l2.edge:
-				if ( rmlib.util.AlmostEqual_v2( l1.link_loop_next[uvlayer].uv, l2[uvlayer].uv ) and
-				rmlib.util.AlmostEqual_v2( l1[uvlayer].uv, l2.link_loop_next[uvlayer].uv ) ):
-					return True
-	return False
-
-def uvedge_loop_fwd( loop, group, uvlayer, force_boundary=False ):
-	nl = loop.link_loop_next
-				
-	#count uv edges coming out of nl
+def uvedge_count( vert_loop, halfedges ):
+	#count uv edges coming out of the uv vert of vert_loop
 	uvedgecount = 0
-	possible_edges = nl.vert.link_edges
+	possible_edges = vert_loop.vert.link_edges
 	counted_edges = set()
-	for f in nl.vert.link_faces:
+	for f in vert_loop.vert.link_faces:
 		for l in f.loops:
 			if l.edge not in possible_edges or l.edge in counted_edges:
 				continue
-			if l.vert == nl.vert:
-				if rmlib.util.AlmostEqual_v2( l[uvlayer].uv, nl[uvlayer].uv ):
-					if not uvedge_boundary( l, uvlayer ):
+			if l.vert == vert_loop.vert:
+				if halfedges.coincident( l, vert_loop ):
+					if not halfedges.is_boundary( l ):
 						counted_edges.add( l.edge )
 					uvedgecount += 1
 			else:
-				if rmlib.util.AlmostEqual_v2( l.link_loop_next[uvlayer].uv, nl[uvlayer].uv ):
-					if not uvedge_boundary( l, uvlayer ):
+				if halfedges.coincident( l.link_loop_next, vert_loop ):
+					if not halfedges.is_boundary( l ):
 						counted_edges.add( l.edge )
 					uvedgecount += 1
-						
+	return uvedgecount
+
+
+def uvedge_loop_fwd( loop, group, halfedges, force_boundary=False ):
+	nl = loop.link_loop_next
+	uvedgecount = uvedge_count( nl, halfedges )
 	if uvedgecount == 3 or uvedgecount == 4:
-		if uvedge_boundary( nl, uvlayer ):
+		twin = halfedges.twin( nl )
+		if twin is None:
 			return group
-		for f in nl.edge.link_faces:
-			if f == nl.face:
-				continue
-			for l in f.loops:
-
-				if l.edge == nl.edge:
-					next_loop = l.link_loop_next
-					if next_loop.tag:
-						continue
-					if uvedgecount == 3 and not uvedge_boundary( next_loop, uvlayer ):
-						continue
-					next_loop.tag = True
-					group.append( next_loop )
-					uvedge_loop_fwd( next_loop, group, uvlayer, force_boundary )
+		next_loop = twin.link_loop_next
+		if next_loop.tag:
+			return group
+		if uvedgecount == 3 and not halfedges.is_boundary( next_loop ):
+			return group
+		next_loop.tag = True
+		group.append( next_loop )
+		uvedge_loop_fwd( next_loop, group, halfedges, force_boundary )
 		
 	return group
 
 
-def uvedge_loop_rev( loop, group, uvlayer, force_boundary=False ):	
-	#count uv edges coming out of nl
-	uvedgecount = 0
-	possible_edges = loop.vert.link_edges
-	counted_edges = set()
-	for f in loop.vert.link_faces:
-		for l in f.loops:
-			if l.edge not in possible_edges or l.edge in counted_edges:
-				continue
-			if l.vert == loop.vert:
-				if rmlib.util.AlmostEqual_v2( l[uvlayer].uv, loop[uvlayer].uv ):
-					if not uvedge_boundary( l, uvlayer ):
-						counted_edges.add( l.edge )
-					uvedgecount += 1
-			else:
-				if rmlib.util.AlmostEqual_v2( l.link_loop_next[uvlayer].uv, loop[uvlayer].uv ):
-					if not uvedge_boundary( l, uvlayer ):
-						counted_edges.add( l.edge )
-					uvedgecount += 1
-										
+def uvedge_loop_rev( loop, group, halfedges, force_boundary=False ):	
+	uvedgecount = uvedge_count( loop, halfedges )
 	nl = loop.link_loop_prev
 	if uvedgecount == 3 or uvedgecount == 4:
-		if uvedge_boundary( nl, uvlayer ):
+		twin = halfedges.twin( nl )
+		if twin is None:
 			return group
-		for f in nl.edge.link_faces:
-			if f == nl.face:
-				continue
-			for l in f.loops:
-				if l.edge == nl.edge:
-					prev_loop = l.link_loop_prev
-					if prev_loop.tag:
-						continue
-					if uvedgecount == 3 and not uvedge_boundary( prev_loop, uvlayer ):
-						continue
-					prev_loop.tag = True
-					group.append( prev_loop )
-					uvedge_loop_rev( prev_loop, group, uvlayer, force_boundary )
+		prev_loop = twin.link_loop_prev
+		if prev_loop.tag:
+			return group
+		if uvedgecount == 3 and not halfedges.is_boundary( prev_loop ):
+			return group
+		prev_loop.tag = True
+		group.append( prev_loop )
+		uvedge_loop_rev( prev_loop, group, halfedges, force_boundary )
 		
 	return group
 
 
-def uvedge_ring( loop, group, uvlayer ):
+def uvedge_ring( loop, group, halfedges ):
 	if len( loop.face.verts ) != 4:
 		return group
 	
@@ -116,17 +73,12 @@ def uvedge_ring( loop, group, uvlayer ):
 	next_loop.tag = True
 	group.append( next_loop )
 	
-	for f in next_loop.edge.link_faces:
-		if f == next_loop.face:
-			continue
-		for l in f.loops:
-			if l.edge == next_loop.edge and edge_continuous( f, next_loop.face, uvlayer ):
-				next_loop = l
-				if next_loop.tag:
-					return group
-				next_loop.tag = True
-				group.append( next_loop )
-				uvedge_ring( next_loop, group, uvlayer )
+	twin = halfedges.twin( next_loop )
+	if twin is None or twin.tag:
+		return group
+	twin.tag = True
+	group.append( twin )
+	uvedge_ring( twin, group, halfedges )
 				
 	return group
 
@@ -152,10 +104,12 @@ class MESH_OT_uvloop( bpy.types.Operator ):
 
 	def execute( self, context ):		
 		rmmesh = rmlib.rmMesh.GetActive( context )
-		with rmmesh as rmmesh:			
+		with editscope.EditScope( rmmesh ) as scope:
+			rmmesh = scope.rmmesh
 			sel_sync = context.tool_settings.use_uv_select_sync
 			if sel_sync:
 				bpy.ops.mesh.rm_loop( force_boundary=self.force_boundary )
+				return { 'FINISHED' }
 				
 			else:				
 				sel_mode = context.tool_settings.uv_select_mode
@@ -164,6 +118,7 @@ class MESH_OT_uvloop( bpy.types.Operator ):
 					return { 'FINISHED' }
 				
 				uvlayer = rmmesh.active_uv
+				halfedges = uvhalfedge.get( rmmesh, uvlayer )
 			
 				#clear loopm tags
 				for f in rmmesh.bmesh.faces:
@@ -174,30 +129,27 @@ class MESH_OT_uvloop( bpy.types.Operator ):
 				loop_selection = rmlib.rmUVLoopSet.from_edge_selection( rmmesh=rmmesh, uvlayer=uvlayer )
 				for l in loop_selection:
 					l.tag = True
-					l[uvlayer].select_edge = False
 				
+				groups = []
 				for l in loop_selection:					
-					group = uvedge_loop_fwd( l, [ l ], uvlayer, self.force_boundary )
-					group = uvedge_loop_rev( l, group, uvlayer, self.force_boundary )
+					group = uvedge_loop_fwd( l, [ l ], halfedges, self.force_boundary )
+					group = uvedge_loop_rev( l, group, halfedges, self.force_boundary )
+					groups.append( group )
 					
+				weld = uvweld.from_loops( [ l for group in groups for l in group ], uvlayer, next_verts=True )
+				for group in groups:
 					for l in group:
-						l[uvlayer].select_edge = True
-						uvcoord = mathutils.Vector( l[uvlayer].uv )
-						for n_l in l.vert.link_loops:
-							n_uvcoord = mathutils.Vector( n_l[uvlayer].uv )
-							if rmlib.util.AlmostEqual_v2( uvcoord, n_uvcoord ):
-								n_l[uvlayer].select = True
-						uvcoord = mathutils.Vector( l.link_loop_next[uvlayer].uv )
-						for n_l in l.link_loop_next.vert.link_loops:
-							n_uvcoord = mathutils.Vector( n_l[uvlayer].uv )
-							if rmlib.util.AlmostEqual_v2( uvcoord, n_uvcoord ):
-								n_l[uvlayer].select = True
+						scope.set( l[uvlayer], 'select_edge', True )
+						for n_l in weld.welded( l ):
+							scope.set( n_l[uvlayer], 'select', True )
+						for n_l in weld.welded( l.link_loop_next ):
+							scope.set( n_l[uvlayer], 'select', True )
 				
 				for f in rmmesh.bmesh.faces:
 					for l in f.loops:
 						l.tag = False
 
-		return { 'FINISHED' }
+		return scope.result()
 
 
 class MESH_OT_uvring( bpy.types.Operator ):
@@ -215,14 +167,17 @@ class MESH_OT_uvring( bpy.types.Operator ):
 
 	def execute( self, context ):		
 		rmmesh = rmlib.rmMesh.GetActive( context )
-		with rmmesh as rmmesh:			
+		with editscope.EditScope( rmmesh ) as scope:
+			rmmesh = scope.rmmesh
 			sel_sync = context.tool_settings.use_uv_select_sync
 			if sel_sync:
 				bpy.ops.mesh.rm_ring()
+				return { 'FINISHED' }
 			else:				
 				sel_mode = context.tool_settings.uv_select_mode
 				if sel_mode == 'EDGE':				
 					uvlayer = rmmesh.active_uv
+					halfedges = uvhalfedge.get( rmmesh, uvlayer )
 				
 					#clear tags
 					for f in rmmesh.bmesh.faces:
@@ -233,23 +188,17 @@ class MESH_OT_uvring( bpy.types.Operator ):
 					loop_selection = rmlib.rmUVLoopSet.from_edge_selection( rmmesh=rmmesh, uvlayer=uvlayer )
 					for l in loop_selection:
 						l.tag = True
-						l[uvlayer].select_edge = False
 					
-					for l in loop_selection:								
-						group = uvedge_ring( l, [ l ], uvlayer )
-						
+					groups = [ uvedge_ring( l, [ l ], halfedges ) for l in loop_selection ]
+					
+					weld = uvweld.from_loops( [ l for group in groups for l in group ], uvlayer, next_verts=True )
+					for group in groups:
 						for l in group:
-							l[uvlayer].select_edge = True
-							uvcoord = mathutils.Vector( l[uvlayer].uv )
-							for n_l in l.vert.link_loops:
-								n_uvcoord = mathutils.Vector( n_l[uvlayer].uv )
-								if rmlib.util.AlmostEqual_v2( uvcoord, n_uvcoord ):
-									n_l[uvlayer].select = True
-							uvcoord = mathutils.Vector( l.link_loop_next[uvlayer].uv )
-							for n_l in l.link_loop_next.vert.link_loops:
-								n_uvcoord = mathutils.Vector( n_l[uvlayer].uv )
-								if rmlib.util.AlmostEqual_v2( uvcoord, n_uvcoord ):
-									n_l[uvlayer].select = True
+							scope.set( l[uvlayer], 'select_edge', True )
+							for n_l in weld.welded( l ):
+								scope.set( n_l[uvlayer], 'select', True )
+							for n_l in weld.welded( l.link_loop_next ):
+								scope.set( n_l[uvlayer], 'select', True )
 					
 					for f in rmmesh.bmesh.faces:
 						for l in f.loops:
@@ -258,6 +207,7 @@ class MESH_OT_uvring( bpy.types.Operator ):
 
 				elif sel_mode == 'FACE':					
 					uvlayer = rmmesh.active_uv
+					halfedges = uvhalfedge.get( rmmesh, uvlayer )
 
 					#clear tags
 					for f in rmmesh.bmesh.faces:
@@ -266,10 +216,10 @@ class MESH_OT_uvring( bpy.types.Operator ):
 							
 					#tag selection
 					loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=rmmesh, uvlayer=uvlayer )
+					loop_selection_initial = list( loop_selection )
 					faces = set()
 					for l in loop_selection:
 						l.tag = True
-						l[uvlayer].select = False
 						faces.add( l.face )
 
 					#get face selection
@@ -304,27 +254,33 @@ class MESH_OT_uvring( bpy.types.Operator ):
 					#gather ring selection			
 					all_loops = set()
 					for l in loop_selection:								
-						all_loops |= set( uvedge_ring( l, [ l ], uvlayer ) )
+						all_loops |= set( uvedge_ring( l, [ l ], halfedges ) )
 						
-					#select resulting face loops
+					#select resulting face loops. the previous selection is replaced, and it only counts as a change
+					#when the resulting selection differs from it.
+					new_selection = set()
+					for l in all_loops:
+						new_selection.update( l.face.loops )
+					weld = uvweld.from_loops( all_loops, uvlayer )
+					for l in all_loops:
+						new_selection.update( weld.welded( l ) )
+					for l in loop_selection_initial:
+						if l not in new_selection:
+							scope.set( l[uvlayer], 'select', False )
 					for l in all_loops:
 						for nl in l.face.loops:
-							nl[uvlayer].select = True
-							nl[uvlayer].select_edge = True
-							
+							scope.set( nl[uvlayer], 'select', True )
+							scope.set( nl[uvlayer], 'select_edge', True )
 					for l in all_loops:
-						for nl in l.vert.link_loops:
-							if nl[uvlayer].select:
-								continue
-							if rmlib.util.AlmostEqual_v2( l[uvlayer].uv, nl[uvlayer].uv ):
-								nl[uvlayer].select = True
+						for nl in weld.welded( l ):
+							scope.set( nl[uvlayer], 'select', True )
 								
 					for f in rmmesh.bmesh.faces:
 						f.tag = False
 						for l in f.loops:
 							l.tag = False
 
-		return { 'FINISHED' }
+		return scope.result()
 
 
 def register():
@@ -0,0 +1,118 @@
+import bpy
+from bpy.app.handlers import persistent
+import numpy as np
+from . import selection
+
+#mesh name -> LoopTriangles. tessellation only depends on topology and, for quads and ngons, vert positions, so the
+#cached triangles are reused until a fingerprint of both changes. uv only operations never re-tessellate.
+#undo and redo drop the cache as well, since they swap the mesh data out under the same name.
+_cache = {}
+
+
+class LoopTriangles():
+	#loop triangulation of a mesh as loop rows ( see selection.loop_row ) in the order calc_loop_triangles returns them
+	__slots__ = ( 'fingerprint', 'loops', 'faces', 'loop_start' )
+
+	def __init__( self, fingerprint ):
+		self.fingerprint = fingerprint
+		self.loops = None #(T,3) int64
+		self.faces = None #(T,) int64 face index of each triangle
+		self.loop_start = None #(F,) int64
+
+	def __len__( self ):
+		return len( self.faces )
+
+	def uv_areas( self, uvs ):
+		#(T,) unsigned uv area of every triangle. uvs is the (L,2) uv array of the mesh.
+		a = uvs[self.loops[:,0]]
+		b = uvs[self.loops[:,1]]
+		c = uvs[self.loops[:,2]]
+		return np.abs( ( b[:,0] - a[:,0] ) * ( c[:,1] - a[:,1] ) - ( c[:,0] - a[:,0] ) * ( b[:,1] - a[:,1] ) ) * 0.5
+
+	def areas( self, loop_cos ):
+		#(T,) area of every triangle. loop_cos is the (L,3) position of the vert of every loop.
+		a = loop_cos[self.loops[:,0]]
+		return np.linalg.norm( np.cross( loop_cos[self.loops[:,1]] - a, loop_cos[self.loops[:,2]] - a ), axis=1 ) * 0.5
+
+	def face_sums( self, values, face_count ):
+		#(F,) sum of the per triangle values over the triangles of each face
+		return np.bincount( self.faces, weights=values, minlength=face_count )
+
+	def bmloops( self, bm, tri ):
+		#BMLoop triple of triangle tri. bm.faces must have a lookup table.
+		f = int( self.faces[tri] )
+		start = int( self.loop_start[f] )
+		loops = bm.faces[f].loops
+		return tuple( loops[row - start] for row in self.loops[tri].tolist() )
+
+
+def fingerprint( mesh ):
+	loop_start = selection.read_int( mesh.polygons, 'loop_start' )
+	loop_verts = selection.read_int( mesh.loops, 'vertex_index' )
+	cos = np.empty( len( mesh.vertices ) * 3, dtype=np.float32 )
+	mesh.vertices.foreach_get( 'co', cos )
+	key = ( len( mesh.polygons ), len( mesh.loops ), hash( loop_start.tobytes() ), hash( loop_verts.tobytes() ), hash( cos.tobytes() ) )
+	return key, loop_start
+
+
+def get( mesh ):
+	#LoopTriangles of a mesh datablock whose data matches the bmesh being edited ( see selection.sync )
+	key, loop_start = fingerprint( mesh )
+	tris = _cache.get( mesh.name )
+	if tris is not None and tris.fingerprint == key:
+		return tris
+
+	tris = LoopTriangles( key )
+	mesh.calc_loop_triangles()
+	tri_count = len( mesh.loop_triangles )
+	tri_loops = np.empty( tri_count * 3, dtype=np.int32 )
+	mesh.loop_triangles.foreach_get( 'loops', tri_loops )
+	tri_faces = np.empty( tri_count, dtype=np.int32 )
+	mesh.loop_triangles.foreach_get( 'polygon_index', tri_faces )
+	tris.loops = tri_loops.astype( np.int64 ).reshape( tri_count, 3 )
+	tris.faces = tri_faces.astype( np.int64 )
+	tris.loop_start = loop_start.astype( np.int64 )
+	_cache[mesh.name] = tris
+	return tris
+
+
+def loop_cos( mesh, matrix=None ):
+	#(L,3) position of the vert of every loop, optionally transformed by a 3x3 matrix
+	cos = np.empty( len( mesh.vertices ) * 3, dtype=np.float32 )
+	mesh.vertices.foreach_get( 'co', cos )
+	cos = cos.astype( np.float64 ).reshape( -1, 3 )
+	if matrix is not None:
+		cos = cos @ np.array( matrix, dtype=np.float64 ).T
+	return cos[selection.read_int( mesh.loops, 'vertex_index' )]
+
+
+def invalidate( mesh_name=None ):
+	if mesh_name is None:
+		_cache.clear()
+	else:
+		_cache.pop( mesh_name, None )
+
+
+@persistent
+def undo_redo_post_handler( scene, *args ):
+	invalidate()
+
+
+@persistent
+def load_post_handler( dummy, *args ):
+	invalidate()
+
+
+def register():
+	bpy.app.handlers.undo_post.append( undo_redo_post_handler )
+	bpy.app.handlers.redo_post.append( undo_redo_post_handler )
+	bpy.app.handlers.load_post.append( load_post_handler )
+
+
+def unregister():
+	for handlers, handler in ( ( bpy.app.handlers.undo_post, undo_redo_post_handler ),
+			( bpy.app.handlers.redo_post, undo_redo_post_handler ),
+			( bpy.app.handlers.load_post, load_post_handler ) ):
+		if handler in handlers:
+			handlers.remove( handler )
+	invalidate()
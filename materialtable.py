@@ -0,0 +1,63 @@
+import numpy as np
+
+#world mapping metrics of the material slots of a mesh, read once per operation. per island code indexes these arrays
+#by material slot instead of looking up materials and catching KeyError/IndexError for every island.
+
+DEFAULT_MAPPING_SIZE = 2.0
+
+
+class MaterialMetrics():
+	#row s holds material slot s. one extra row at the end stands in for material indexes without a material slot.
+	#width and height default to DEFAULT_MAPPING_SIZE where a material lacks the WorldMappingWidth/Height property.
+	#aspect is width / height when both are set and 1.0 otherwise. hotspot_ids is the index of the hotspot repo
+	#entry that lists the material, or -1.
+	__slots__ = ( 'names', 'width', 'height', 'aspect', 'hotspot_ids' )
+
+	def __init__( self, slot_count ):
+		self.names = [ None ] * ( slot_count + 1 ) #(S+1,) material name or None
+		self.width = np.full( slot_count + 1, DEFAULT_MAPPING_SIZE, dtype=np.float64 ) #(S+1,)
+		self.height = np.full( slot_count + 1, DEFAULT_MAPPING_SIZE, dtype=np.float64 ) #(S+1,)
+		self.aspect = np.ones( slot_count + 1, dtype=np.float64 ) #(S+1,)
+		self.hotspot_ids = np.full( slot_count + 1, -1, dtype=np.int64 ) #(S+1,)
+
+	def __len__( self ):
+		return len( self.names ) - 1
+
+	def row( self, material_index ):
+		#row of a material index, the fallback row when the mesh has no such slot
+		if 0 <= material_index < len( self.names ) - 1:
+			return material_index
+		return len( self.names ) - 1
+
+	def rows( self, material_indexes ):
+		material_indexes = np.asarray( material_indexes, dtype=np.int64 )
+		fallback = len( self.names ) - 1
+		return np.where( ( material_indexes >= 0 ) & ( material_indexes < fallback ), material_indexes, fallback )
+
+	def size( self, material_index ):
+		s = self.row( material_index )
+		return [ float( self.width[s] ), float( self.height[s] ) ]
+
+
+def build( mesh, existing_materials=None ):
+	#MaterialMetrics of mesh. existing_materials is the material name list of every hotspot repo entry
+	#( see read_hot_file ); without it hotspot_ids stays -1.
+	metrics = MaterialMetrics( len( mesh.materials ) )
+	for s, material in enumerate( mesh.materials ):
+		if material is None:
+			continue
+		metrics.names[s] = material.name
+		width = material.get( 'WorldMappingWidth' )
+		height = material.get( 'WorldMappingHeight' )
+		if width is not None:
+			metrics.width[s] = width
+		if height is not None:
+			metrics.height[s] = height
+		if width is not None and height is not None and height != 0:
+			metrics.aspect[s] = width / height
+		if existing_materials is not None:
+			for i, matgroup in enumerate( existing_materials ):
+				if material.name in matgroup:
+					metrics.hotspot_ids[s] = i
+					break
+	return metrics
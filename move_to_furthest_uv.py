@@ -1,36 +1,7 @@
 import mathutils
 import rmlib
 import bpy, bmesh
-
-
-def GetUnsyncUVVisibleFaces( rmmesh, sel_mode ):
-	visible_faces = rmlib.rmPolygonSet()
-	if sel_mode[0]:		
-		for f in rmmesh.bmesh.faces:
-			if f.hide:
-				continue
-			visible = True
-			for v in f.verts:
-				if not v.select:
-					visible = False
-					break
-			if visible:
-				visible_faces.append( f )
-	elif sel_mode[1]:
-		for f in rmmesh.bmesh.faces:
-			if f.hide:
-				continue
-			visible = True
-			for e in f.edges:
-				if not e.select:
-					visible = False
-					break
-			if visible:
-				visible_faces.append( f )
-	else:
-		visible_faces = rmlib.rmPolygonSet.from_selection( rmmesh )
-		
-	return visible_faces
+from . import editscope, instrument, selection
 
 
 class MESH_OT_uvmovetofurthest( bpy.types.Operator ):
@@ -67,126 +38,130 @@ class MESH_OT_uvmovetofurthest( bpy.types.Operator ):
 		if context.object is None or context.mode == 'OBJECT':
 			return { 'CANCELLED' }
 
-		rmmesh = rmlib.rmMesh.GetActive( context )
-		if rmmesh is None:
-			return { 'CANCELLED' }
-		
-		with rmmesh as rmmesh:
-			rmlib.clear_tags( rmmesh.bmesh )
-
-			uvlayer = rmmesh.active_uv
-
-			loop_groups = []
-
-			sel_mode = context.tool_settings.mesh_select_mode[:]
-			
-			sel_sync = context.tool_settings.use_uv_select_sync
-			if sel_sync:
-				if sel_mode[0]:
-					vert_selection = rmlib.rmVertexSet.from_selection( rmmesh )
-					loop_selection = rmlib.rmUVLoopSet( vert_selection.loops, uvlayer=uvlayer )
-					if self.local:
-						loop_groups += loop_selection.group_vertices()
-					else:
-						loop_groups.append( loop_selection )
-
-				elif sel_mode[1]:
-					edge_selection = rmlib.rmEdgeSet.from_selection( rmmesh )
-					loop_selection = rmlib.rmUVLoopSet( edge_selection.vertices.loops, uvlayer=uvlayer )
-					if self.local:
-						loop_groups += loop_selection.group_vertices()
-					else:
-						loop_groups.append( loop_selection )
-
-				elif sel_mode[2]:
-					face_selection = rmlib.rmPolygonSet.from_selection( rmmesh )
-					loopset = set()
-					for f in face_selection:
-						loopset |= set( f.loops )
-					loop_selection = rmlib.rmUVLoopSet( loopset, uvlayer=uvlayer )
-					if self.local:
-						loop_groups += loop_selection.group_vertices()
-					else:
-						loop_groups.append( loop_selection )
-
+		with editscope.MultiEditScope( rmlib.iter_edit_meshes( context ) ) as scopes:
+			#( scope, uvlayer, loops ) parts of every mesh. in local mode each part is aligned on its own, otherwise
+			#all parts share the bounds of the whole selection.
+			parts = []
+			for scope in scopes:
+				if len( scope.rmmesh.bmesh.loops.layers.uv ) == 0:
+					continue
+				rmlib.clear_tags( scope.rmmesh.bmesh )
+				uvlayer = scope.rmmesh.active_uv
+				parts += [ ( scope, uvlayer, g ) for g in self.get_loop_groups( context, scope.rmmesh, uvlayer ) ]
+			if self.local:
+				groups = [ [ part ] for part in parts ]
 			else:
-				visible_faces = GetUnsyncUVVisibleFaces( rmmesh, sel_mode )
-				uv_sel_mode = context.tool_settings.uv_select_mode
-				if uv_sel_mode == 'VERTEX':
-					loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=rmmesh, uvlayer=uvlayer )
-					visible_loop_selection = rmlib.rmUVLoopSet( uvlayer=uvlayer )
-					for l in loop_selection:
-						if l.face in visible_faces:
-							visible_loop_selection.append( l )
-					if self.local:
-						loop_groups += visible_loop_selection.group_vertices()
-					else:
-						loop_groups.append( visible_loop_selection )
-					
-				elif uv_sel_mode == 'EDGE':
-					loop_selection = rmlib.rmUVLoopSet.from_edge_selection( rmmesh=rmmesh, uvlayer=uvlayer )
-					visible_loop_selection = rmlib.rmUVLoopSet( uvlayer=uvlayer )
-					for l in loop_selection:
-						if l.face in visible_faces:
-							visible_loop_selection.append( l )
-					if self.local:
-						loop_groups = visible_loop_selection.group_edges()
-						for i in range( len( loop_groups ) ):
-							loop_groups[i].add_overlapping_loops( True )
-					else:
-						loop_groups.append( visible_loop_selection )
-						loop_groups[0].add_overlapping_loops( True )
+				groups = [ parts ] if len( parts ) > 0 else []
 
-				else: #FACE mode
-					loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=rmmesh, uvlayer=uvlayer )
-					visible_loop_selection = rmlib.rmUVLoopSet( uvlayer=uvlayer )
-					for l in loop_selection:
-						if l.face in visible_faces:
-							visible_loop_selection.append( l )
-					if self.local:
-						loop_groups += loop_selection.group_faces()
-					else:
-						loop_groups.append( visible_loop_selection )
-				
-			for g in loop_groups:
+			for group in groups:
 				min_u = 99999999.9
 				min_v = 99999999.9
 				max_u = -99999999.9
 				max_v = -99999999.9
-				for l in g:
-					u, v = l[uvlayer].uv
-					if u < min_u:
-						min_u = u
-					if u > max_u:
-						max_u = u
-					if v < min_v:
-						min_v = v
-					if v > max_v:
-						max_v = v
+				for scope, uvlayer, g in group:
+					for l in g:
+						u, v = l[uvlayer].uv
+						if u < min_u:
+							min_u = u
+						if u > max_u:
+							max_u = u
+						if v < min_v:
+							min_v = v
+						if v > max_v:
+							max_v = v
 						
 				avg_u = ( min_u + max_u ) * 0.5
 				avg_v = ( min_v + max_v ) * 0.5
 				
-				for l in g:
-					u, v = l[uvlayer].uv
-					if self.str_dir == 'up':
-						l[uvlayer].uv = ( u, max_v )
-					elif self.str_dir == 'down':
-						l[uvlayer].uv = ( u, min_v )
-					elif self.str_dir == 'left':
-						l[uvlayer].uv = ( min_u, v )
-					elif self.str_dir == 'right':
-						l[uvlayer].uv = ( max_u, v )
-					elif self.str_dir == 'vertical':
-						l[uvlayer].uv = ( u, avg_v )
-					elif self.str_dir == 'horizontal':
-						l[uvlayer].uv = ( avg_u, v )
-					else:
-						continue
-
-			rmlib.clear_tags( rmmesh.bmesh )
+				for scope, uvlayer, g in group:
+					for l in g:
+						u, v = l[uvlayer].uv
+						if self.str_dir == 'up':
+							scope.set_uv( l[uvlayer], ( u, max_v ) )
+						elif self.str_dir == 'down':
+							scope.set_uv( l[uvlayer], ( u, min_v ) )
+						elif self.str_dir == 'left':
+							scope.set_uv( l[uvlayer], ( min_u, v ) )
+						elif self.str_dir == 'right':
+							scope.set_uv( l[uvlayer], ( max_u, v ) )
+						elif self.str_dir == 'vertical':
+							scope.set_uv( l[uvlayer], ( u, avg_v ) )
+						elif self.str_dir == 'horizontal':
+							scope.set_uv( l[uvlayer], ( avg_u, v ) )
+						else:
+							continue
+
+			for scope in scopes:
+				rmlib.clear_tags( scope.rmmesh.bmesh )
 			
-		return { 'FINISHED' }
+		return scopes.result()
+
+	def get_loop_groups( self, context, rmmesh, uvlayer ):
+		#selected loops of one mesh, one group per island in local mode
+		loop_groups = []
+
+		sel_mode = context.tool_settings.mesh_select_mode[:]
+		
+		sel_sync = context.tool_settings.use_uv_select_sync
+		if sel_sync:
+			if sel_mode[0]:
+				vert_selection = rmlib.rmVertexSet.from_selection( rmmesh )
+				loop_selection = rmlib.rmUVLoopSet( vert_selection.loops, uvlayer=uvlayer )
+				if self.local:
+					loop_groups += loop_selection.group_vertices()
+				else:
+					loop_groups.append( loop_selection )
+
+			elif sel_mode[1]:
+				edge_selection = rmlib.rmEdgeSet.from_selection( rmmesh )
+				loop_selection = rmlib.rmUVLoopSet( edge_selection.vertices.loops, uvlayer=uvlayer )
+				if self.local:
+					loop_groups += loop_selection.group_vertices()
+				else:
+					loop_groups.append( loop_selection )
+
+			elif sel_mode[2]:
+				face_selection = rmlib.rmPolygonSet.from_selection( rmmesh )
+				loopset = set()
+				for f in face_selection:
+					loopset |= set( f.loops )
+				loop_selection = rmlib.rmUVLoopSet( loopset, uvlayer=uvlayer )
+				if self.local:
+					loop_groups += loop_selection.group_vertices()
+				else:
+					loop_groups.append( loop_selection )
+
+		else:
+			visible_faces = selection.visible_face_mask( rmmesh, sel_mode )
+			uv_sel_mode = context.tool_settings.uv_select_mode
+			if uv_sel_mode == 'VERTEX':
+				visible_loop_selection = selection.visible_uv_loops( rmmesh, uvlayer, visible_faces )
+				if self.local:
+					loop_groups += visible_loop_selection.group_vertices()
+				else:
+					loop_groups.append( visible_loop_selection )
+				
+			elif uv_sel_mode == 'EDGE':
+				visible_loop_selection = selection.visible_uv_loops( rmmesh, uvlayer, visible_faces, edge=True )
+				if self.local:
+					loop_groups = visible_loop_selection.group_edges()
+					for i in range( len( loop_groups ) ):
+						loop_groups[i].add_overlapping_loops( True )
+				else:
+					loop_groups.append( visible_loop_selection )
+					loop_groups[0].add_overlapping_loops( True )
+
+			else: #FACE mode
+				visible_loop_selection = selection.visible_uv_loops( rmmesh, uvlayer, visible_faces )
+				if self.local:
+					loop_groups += visible_loop_selection.group_faces()
+				else:
+					loop_groups.append( visible_loop_selection )
+
+		if self.local:
+			instrument.count_islands( len( loop_groups ) )
+
+		return loop_groups
 
 
 class IMAGE_EDITOR_MT_PIE_uvmovetofurthest( bpy.types.Menu ):
@@ -1,4 +1,5 @@
 import bpy, rna_keymap_ui
+from . import instrument, startup
 
 RM_MESH_KEYMAP = []
 RM_UV_KEYMAP = []
@@ -23,6 +24,7 @@ def register_keyboard_keymap():
 		#UV EDITOR KEYMAPS
 		RM_UV_KEYMAP.append( ( km_uv, km_uv.keymap_items.new( 'mesh.moshotspot', 'NONE', 'PRESS' ) ) )
 		RM_UV_KEYMAP.append( ( km_uv, km_uv.keymap_items.new( 'mesh.nrsthotspot', 'NONE', 'PRESS' ) ) )
+		RM_UV_KEYMAP.append( ( km_uv, km_uv.keymap_items.new( 'mesh.painthotspot', 'NONE', 'PRESS' ) ) )
 		RM_UV_KEYMAP.append( ( km_uv, km_uv.keymap_items.new( 'mesh.matchhotspot', 'NONE', 'PRESS' ) ) )
 		RM_UV_KEYMAP.append( ( km_uv, km_uv.keymap_items.new( 'object.savehotspot', 'NONE', 'PRESS' ) ) )
 		RM_UV_KEYMAP.append( ( km_uv, km_uv.keymap_items.new( 'mesh.rm_uvloop', 'NONE', 'PRESS' ) ) )
@@ -72,10 +74,44 @@ class RMKITUVPreferences( bpy.types.AddonPreferences ):
 
 	mesh_checkbox: bpy.props.BoolProperty( name="Mesh", default=False )
 	uv_checkbox: bpy.props.BoolProperty( name="UV Editor", default=False )
+	timings_checkbox: bpy.props.BoolProperty( name="Operator Timings", default=False )
+
+	chunked_threshold: bpy.props.IntProperty( name="Chunked Threshold", description="Hotspot Match, Rectangularize and Relative Islands run in interruptible chunks when invoked on more islands than this", default=2000, min=1 )
+	chunk_size: bpy.props.IntProperty( name="Islands per Tick", description="Islands processed between ui updates when running in chunks", default=200, min=1 )
+
+	profile_operators: bpy.props.BoolProperty( name="Profile Operators", description="Capture every rmKitUV operator run with cProfile and write a .prof file and a text summary to the profiles folder", default=False )
+	profile_top_functions: bpy.props.IntProperty( name="Top Functions", description="Functions listed in the text summary of a profile", default=40, min=1 )
+	trace_memory: bpy.props.BoolProperty( name="Trace Memory", description="Trace every rmKitUV operator run with tracemalloc and report its peak and top allocation sites. Slows operators down", default=False )
+	memory_top_sites: bpy.props.IntProperty( name="Top Allocation Sites", description="Allocation sites written to the memory log per run", default=10, min=1 )
+	log_timings: bpy.props.BoolProperty( name="Log Timings", description="Append the wall time, face count and island count of every rmKitUV operator run to timings.jsonl in the profiles folder", default=True )
 
 	def draw( self, context ):
 		layout = self.layout
 
+		col = layout.column( align=True )
+		col.prop( self, 'chunked_threshold' )
+		col.prop( self, 'chunk_size' )
+
+		layout.label( text='Startup: ' + startup.summary() )
+
+		col = layout.column( align=True )
+		col.prop( self, 'log_timings' )
+		col.prop( self, 'profile_operators' )
+		if self.profile_operators:
+			col.prop( self, 'profile_top_functions' )
+		col.prop( self, 'trace_memory' )
+		if self.trace_memory:
+			col.prop( self, 'memory_top_sites' )
+		if self.log_timings or self.profile_operators or self.trace_memory:
+			col.operator( 'wm.path_open', text='Open Profiles Folder' ).filepath = instrument.profile_dir()
+
+		box = layout.box()
+		row_timings = box.row()
+		row_timings.prop( self, 'timings_checkbox', icon='TRIA_DOWN' if self.timings_checkbox else 'TRIA_RIGHT', icon_only=True, emboss=False )
+		row_timings.label( text='Operator Timings' )
+		if self.timings_checkbox:
+			self.draw_timings( box.column( align=True ) )
+
 		box = layout.box()
 
 		row_mesh = box.row()
@@ -92,6 +128,29 @@ class RMKITUVPreferences( bpy.types.AddonPreferences ):
 			col = box.column( align=True )
 			self.draw_keymap_items( col, 'UV Editor', RM_UV_KEYMAP, {'ACTIONZONE', 'KEYBOARD', 'MOUSE', 'NDOF'}, False )
 
+	@staticmethod
+	def draw_timings( col ):
+		rows = instrument.timing_stats()
+		addon_version, rmlib_version = instrument.versions()
+		col.label( text='Finished runs of rmKitUV {} with rmlib {}'.format( addon_version, rmlib_version ) )
+		if len( rows ) == 0:
+			col.label( text='No timings logged yet.' )
+			return
+
+		split = col.split( factor=0.4 )
+		split.label( text='Operator' )
+		row = split.row()
+		for text in ( 'Runs', 'p50', 'p95', 'Earlier p50' ):
+			row.label( text=text )
+		for idname, runs, p50, p95, earlier in rows:
+			split = col.split( factor=0.4 )
+			split.label( text=idname )
+			row = split.row()
+			row.label( text=str( runs ) )
+			row.label( text='{:.1f} ms'.format( p50 ) )
+			row.label( text='{:.1f} ms'.format( p95 ) )
+			row.label( text='-' if earlier is None else '{:.1f} ms'.format( earlier ) )
+
 	@staticmethod
 	def draw_keymap_items( col, km_name, keymap, map_type, allow_remove=False ):
 		kc = bpy.context.window_manager.keyconfigs.user
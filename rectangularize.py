@@ -2,6 +2,8 @@ import bpy, mathutils
 import rmlib
 import math, random, sys
 import numpy as np
+from . import chunked, selection, tagscope, uvarray, uvhalfedge
+from .core import lscm as core_lscm
 
 def shortest_path( source, end_verts, verts ):
 	for v in verts:
@@ -77,45 +79,7 @@ def shortest_path( source, end_verts, verts ):
 	return shortest_path[::-1]
 
 
-def next_boundary_loop( loop ):
-	next_loop = loop.link_loop_next
-	while not is_boundary( next_loop ):
-		l = next_loop
-		next_loop = None
-		for other_f in l.edge.link_faces:
-			if other_f != l.face:
-				break
-		for nl in other_f.loops:
-			if nl.edge == l.edge:
-				next_loop = nl.link_loop_next
-				break
-		if next_loop is None:
-			next_loop = l
-			break
-	return next_loop
-
-
-def prev_boundary_loop( loop ):
-	prev_loops = [ loop.link_loop_prev ]
-	prev_loop = prev_loops[0]
-	while not is_boundary( prev_loop ):
-		l = prev_loop
-		prev_loop = None
-		for other_f in l.edge.link_faces:
-			if other_f != l.face:
-				break
-		for nl in other_f.loops:
-			if nl.edge == l.edge:
-				prev_loop = nl.link_loop_prev
-				prev_loops.append( prev_loop )
-				break
-		if prev_loop is None:
-			prev_loop = l
-			break
-	return prev_loops
-
-
-def sort_loop_chain( loops ):
+def sort_loop_chain( loops, halfedges ):
 	#sorts the loops by the "flow" of the winding of the member faces.
 	for l in loops:
 		l.tag = True
@@ -125,13 +89,13 @@ def sort_loop_chain( loops ):
 	for i in range( 1, len( loops ) ):
 
 		#append to end
-		nl = next_boundary_loop( sorted_loops[-1] )
+		nl = halfedges.next_boundary_loop( sorted_loops[-1] )
 		if nl.tag:
 			nl.tag = False
 			sorted_loops.append( nl )
 
 		#insert to start
-		pls = prev_boundary_loop( sorted_loops[0] )
+		pls = halfedges.prev_boundary_loops( sorted_loops[0] )
 		pl = pls[-1]
 		if pl.tag:
 			pl.tag = False
@@ -158,21 +122,14 @@ def BBoxFromPoints( points ):
 
 
 def FitToBBox( faces, initial_bbmin, initial_bbmax, uvlayer, uniform=False ):
-	final_uvcoords = []
-	for f in faces:
-		for l in f.loops:
-			final_uvcoords.append( l[uvlayer].uv.copy() )
-	final_bbmin, final_bbmax = BBoxFromPoints( final_uvcoords )
+	loops = [ l for f in faces for l in f.loops ]
+	uvs = uvarray.gather_loop_uvs( loops, uvlayer )
+	final_bbmin = uvs.min( axis=0 )
+	final_bbmax = uvs.max( axis=0 )
+	if ( final_bbmax - final_bbmin ).min() <= rmlib.util.FLOAT_EPSILON:
+		final_bbmin = np.array( ( 0.0, 0.0 ) )
+		final_bbmax = np.array( ( 1.0, 1.0 ) )
 
-	trans_mat = mathutils.Matrix.Identity( 3 )
-	trans_mat[0][2] = ( initial_bbmin[0] + initial_bbmax[0] ) * 0.5
-	trans_mat[1][2] = ( initial_bbmin[1] + initial_bbmax[1] ) * 0.5
-
-	trans_mat_inv = mathutils.Matrix.Identity( 3 )
-	trans_mat_inv[0][2] = ( final_bbmin[0] + final_bbmax[0] ) * -0.5
-	trans_mat_inv[1][2] = ( final_bbmin[1] + final_bbmax[1] ) * -0.5
-
-	scl_mat = mathutils.Matrix.Identity( 3 )
 	initial_width = initial_bbmax[0] - initial_bbmin[0]
 	initial_height = initial_bbmax[1] - initial_bbmin[1]
 	initial_aspect = initial_height / initial_width
@@ -187,19 +144,17 @@ def FitToBBox( faces, initial_bbmin, initial_bbmax, uvlayer, uniform=False ):
 		final_width = final_height
 		final_height = temp
 	'''
-	scl_mat[0][0] = target_bounds_width / final_width
-	scl_mat[1][1] = target_bounds_height / final_height
+	scl_x = target_bounds_width / final_width
+	scl_y = target_bounds_height / final_height
 
 	if uniform:
-		scl_mat[1][1] = scl_mat[0][0]
+		scl_y = scl_x
 
-	mat = trans_mat @ scl_mat @ trans_mat_inv
-	for f in faces:
-		for l in f.loops:
-			uv = mathutils.Vector( l[uvlayer].uv.copy() ).to_3d()
-			uv[2] = 1.0
-			uv = mat @ uv
-			l[uvlayer].uv = uv.to_2d()
+	#translate final center to origin, scale, then translate to initial center
+	mat = ( ( scl_x, 0.0, ( initial_bbmin[0] + initial_bbmax[0] ) * 0.5 - scl_x * ( final_bbmin[0] + final_bbmax[0] ) * 0.5 ),
+			( 0.0, scl_y, ( initial_bbmin[1] + initial_bbmax[1] ) * 0.5 - scl_y * ( final_bbmin[1] + final_bbmax[1] ) * 0.5 ) )
+	uvarray.apply_affine( uvs, np.arange( len( loops ) ), np.zeros( len( loops ), dtype=np.int64 ), [ mat ] )
+	uvarray.scatter_loop_uvs( loops, uvlayer, uvs )
 
 
 def GetPinCornersByAngle( sorted_boundary_loops, uvlayer ):
@@ -228,30 +183,22 @@ def GetPinCornersByAngle( sorted_boundary_loops, uvlayer ):
 	return [ p[1] for p in sorted_tuples ][:4]
 
 
-def clear_tags( rmmesh ):
-	for v in rmmesh.bmesh.verts:
-		v.tag = False
-	for e in rmmesh.bmesh.edges:
-		e.tag = False
-	for f in rmmesh.bmesh.faces:
-		f.tag = False
-		for l in f.loops:
-			l.tag = False
-			
-def is_boundary( l ):
-	if l.edge.seam or l.edge.is_boundary:
-		return True
-	else:
-		for nf in l.edge.link_faces:
-			if nf != l.face and not nf.tag:
-				return True
-	return False
-
-def GetBoundaryLoops( faces ):
+def loop_key( l ):
+	#( face index, corner ) of a loop. stays valid while the topology does not change.
+	for i, fl in enumerate( l.face.loops ):
+		if fl == l:
+			return ( l.face.index, i )
+
+
+def key_loop( faces, key ):
+	return faces[key[0]].loops[key[1]]
+
+
+def GetBoundaryLoops( faces, halfedges ):
 	bounary_loops = set()
 	for f in faces:
 		for l in f.loops:
-			if is_boundary( l ):
+			if halfedges.is_boundary( l ):
 				bounary_loops.add( l )
 	return bounary_loops
 
@@ -332,16 +279,12 @@ def lscm_patches( polygons ):
 		RelaxVertex.all_verts.clear()
 
 
-def DoubleTriangleArea( p1, p2, p3 ):
-	return ( p1[0] * p2[1] - p1[1] * p2[0] ) + ( p2[0] * p3[1] - p2[1] * p3[0] ) + ( p3[0] * p1[1] - p3[1] * p1[0] )
-
-
 def lscm( faces, uvlayer, axisidx ):
 	RelaxVertex.all_verts.clear()
 	for patch in lscm_patches( faces ):
 		#gather input 3dcoords, uvcoords, tri index mappings, and loops
-		verts = [ rv._v for rv in RelaxVertex.all_verts ]		
-		unique_3d_coords = [ mathutils.Vector( v.co.copy() ) for v in verts ]
+		verts = [ rv._v for rv in RelaxVertex.all_verts ]
+		coords = np.array( [ tuple( v.co ) for v in verts ], dtype=np.float64 ).reshape( -1, 3 )
 
 		tris = []
 		for rlxPoly in patch:
@@ -349,172 +292,48 @@ def lscm( faces, uvlayer, axisidx ):
 				continue
 			root_vert = rlxPoly[0]
 			for i in range( len( rlxPoly ) - 2 ):
-				tris += [ root_vert._idx, rlxPoly[i+1]._idx, rlxPoly[i+2]._idx ]
+				tris.append( ( root_vert._idx, rlxPoly[i+1]._idx, rlxPoly[i+2]._idx ) )
 
-		all_uv_coords = []
-		for rv in RelaxVertex.all_verts:
+		uvs = np.zeros( ( len( verts ), 2 ), dtype=np.float64 )
+		for i, rv in enumerate( RelaxVertex.all_verts ):
 			for l in rv._v.link_loops:
-				if l.face not in rv._polygons:
-					continue
-				else:
-					all_uv_coords.append( mathutils.Vector( l[uvlayer].uv.copy() ) )
+				if l.face in rv._polygons:
+					uvs[i] = l[uvlayer].uv
 					break
 
 		pinned_indexes = []
-		pinned_uv_coords = []		
+		pinned_uv_coords = []
 		for i, rv in enumerate( RelaxVertex.all_verts ):
-			pinned_loop = False
 			for l in rv._v.link_loops:
 				if l.face not in rv._polygons:
 					continue
 				if l[uvlayer].pin_uv:
-					pinned_indexes.append( RelaxVertex.all_verts[i]._idx )
-					pinned_uv_coords.append( mathutils.Vector( l[uvlayer].uv.copy() ) )
-					pinned_loop = True
+					pinned_indexes.append( rv._idx )
+					pinned_uv_coords.append( tuple( l[uvlayer].uv ) )
 					break
-			
 
 		if len( pinned_indexes ) < 2:
-			pinned_indexes.clear()
-			pinned_uv_coords.clear()
-			pinned_indexes.append( RelaxVertex.all_verts[0]._idx )
-			pinned_indexes.append( RelaxVertex.all_verts[-1]._idx )
-			pinned_uv_coords.append( mathutils.Vector( RelaxVertex.all_verts[0]._v.link_loops[0][uvlayer].uv.copy() ) )
-			pinned_uv_coords.append( mathutils.Vector( RelaxVertex.all_verts[-1]._v.link_loops[0][uvlayer].uv.copy() ) )
-			
-		#allocate memory for block matrices and pinned vert vector
-		tcount = int( len( tris ) / 3 )
-		pinned_vcount = len( pinned_indexes )
-		vcount = len( verts ) - pinned_vcount
-		Mr_f = np.zeros( ( tcount, vcount ) )
-		Mi_f = np.zeros( ( tcount, vcount ) )
-		Mr_p = np.zeros( ( tcount, pinned_vcount ) )
-		Mi_p = np.zeros( ( tcount, pinned_vcount ) )
-		b = np.zeros( ( pinned_vcount * 2 ) )
-
-		constrained = np.zeros( ( vcount ) )
-		constrain_axis = 1
-		
-		#compute coefficients
-		for i in range( tcount ):
-			idx1 = tris[i*3]
-			idx2 = tris[i*3+1]
-			idx3 = tris[i*3+2]
-			
-			#project 3d tri to its own plane to get rid of z component
-			tri3d = [ unique_3d_coords[idx1], unique_3d_coords[idx2], unique_3d_coords[idx3] ]
-			edge_lengths = [ ( tri3d[n-1] - tri3d[n-2] ).length for n in range( 3 ) ]
-			theta = math.acos( ( edge_lengths[1] * edge_lengths[1] + edge_lengths[2] * edge_lengths[2] - edge_lengths[0] * edge_lengths[0] ) / ( 2.0 * edge_lengths[1] * edge_lengths[2] ) )                
-			proj_tri = []
-			proj_tri.append( mathutils.Vector( ( 0.0, 0.0 ) ) )
-			proj_tri.append( mathutils.Vector( ( edge_lengths[2], 0.0 ) ) )
-			proj_tri.append( mathutils.Vector( ( edge_lengths[1] * math.cos( theta ), edge_lengths[1] * math.sin( theta )  ) ) )
-			
-			#compute projected tri area
-			a = DoubleTriangleArea( proj_tri[0], proj_tri[1], proj_tri[2] )
-					
-			#compute tris as complex numbers     
-			ws = []
-			for j in range( 3 ):
-				vec = proj_tri[j-1] - proj_tri[j-2]
-				ws.append( vec * ( 1.0 / a ) )
-				
-			#build A (free) and B (pinned) block matrices as well as pinned uv vector ( b )
-			for j, vidx in enumerate( [ idx1, idx2, idx3 ] ):
-				if vidx in pinned_indexes:
-					pvidx = pinned_indexes.index( vidx )
-					Mr_p[i][pvidx] = ws[j][0]
-					Mi_p[i][pvidx] = ws[j][1]
-					
-					b[pvidx] = pinned_uv_coords[pvidx][0]
-					b[pvidx+pinned_vcount] = pinned_uv_coords[pvidx][1]
-				else:
-					#adjust for pinned vert indexes
-					pin_count = 0
-					for pidx in pinned_indexes:
-						if vidx > pidx:
-							pin_count += 1
-					Mr_f[i][vidx-pin_count] = ws[j][0]
-					Mi_f[i][vidx-pin_count] = ws[j][1]
-
-					constrained[vidx-pin_count] = all_uv_coords[vidx][constrain_axis]
-					
-		if constrain_axis == 0:
-			bi = b[pinned_vcount:]
-			r = Mr_p @ bi
-			arxr = Mr_f @ constrained
-			x = np.linalg.lstsq( Mi_f, -r + arxr, rcond=None )[0]
-
-		elif constrain_axis == 1:
-			br = b[:pinned_vcount]
-			r = Mr_p @ br
-			aixi = Mi_f @ constrained
-			x = np.linalg.lstsq( Mr_f, r + aixi, rcond=None )[0]
+			pinned_indexes = [ RelaxVertex.all_verts[0]._idx, RelaxVertex.all_verts[-1]._idx ]
+			pinned_uv_coords = [ tuple( RelaxVertex.all_verts[0]._v.link_loops[0][uvlayer].uv ), tuple( RelaxVertex.all_verts[-1]._v.link_loops[0][uvlayer].uv ) ]
 
-		else:
-			A = np.block( [
-				[ Mr_f, Mi_f * -1.0 ],
-				[ Mi_f, Mr_f ] ] )
-				
-			B = np.block( [
-				[ Mr_p, Mi_p * -1.0 ],
-				[ Mi_p, Mr_p ] ] )
-			
-			#compute r = -(B * b)
-			r = B @ b
-			r = r * -1.0
-			
-			#solve for x inf Ax=b
-			x = np.linalg.lstsq( A, r, rcond=None )[0]
+		constrain_axis = 1
+		solved = core_lscm.solve( coords, tris, pinned_indexes, pinned_uv_coords, uvs, constrain_axis )
 
 		#assign new uv values
-		for vidx, v in enumerate( verts ):
-			count = 0
-			for pidx in pinned_indexes:
-				if vidx > pidx:
-					count += 1
-			if vidx in pinned_indexes:
+		pinned_set = set( pinned_indexes )
+		for vidx, uv in enumerate( solved.tolist() ):
+			if vidx in pinned_set:
 				continue
 			for l in verts[vidx].link_loops:
 				if l.face in RelaxVertex.all_verts[vidx]._polygons:
 					if constrain_axis == 0:
-						l[uvlayer].uv[1] = x[vidx-count]
+						l[uvlayer].uv[1] = uv[1]
 					elif constrain_axis == 1:
-						l[uvlayer].uv[0] = x[vidx-count]
+						l[uvlayer].uv[0] = uv[0]
 					else:
-						l[uvlayer].uv = mathutils.Vector( ( x[vidx-count], x[(vidx-count+vcount)] ) )
+						l[uvlayer].uv = uv
 
-def GetUnsyncUVVisibleFaces( rmmesh, sel_mode ):
-	visible_faces = rmlib.rmPolygonSet()
-	if sel_mode[0]:		
-		for f in rmmesh.bmesh.faces:
-			if f.hide:
-				continue
-			visible = True
-			for v in f.verts:
-				if not v.select:
-					visible = False
-					break
-			if visible:
-				visible_faces.append( f )
-	elif sel_mode[1]:
-		for f in rmmesh.bmesh.faces:
-			if f.hide:
-				continue
-			visible = True
-			for e in f.edges:
-				if not e.select:
-					visible = False
-					break
-			if visible:
-				visible_faces.append( f )
-	else:
-		visible_faces = rmlib.rmPolygonSet.from_selection( rmmesh )
-		
-	return visible_faces
-
-
-class MESH_OT_uvrectangularize( bpy.types.Operator ):
+class MESH_OT_uvrectangularize( chunked.ChunkedOperator, bpy.types.Operator ):
 	"""Map the selection to a box."""
 	bl_idname = 'mesh.rm_uvrectangularize'
 	bl_label = 'Rectangularize'
@@ -527,14 +346,13 @@ class MESH_OT_uvrectangularize( bpy.types.Operator ):
 				context.active_object.type == 'MESH' and
 				context.object.data.is_editmode )
 
-	def execute( self, context ):
+	def chunk_begin( self, context ):
 		rmmesh = rmlib.rmMesh.GetActive( context )
 		if rmmesh is None:
 			return { 'CANCELLED' }
 			
 		with rmmesh as rmmesh:
 			uvlayer = rmmesh.active_uv
-			clear_tags( rmmesh )
 
 			#get selection of faces
 			faces = rmlib.rmPolygonSet()
@@ -546,6 +364,7 @@ class MESH_OT_uvrectangularize( bpy.types.Operator ):
 			if sel_sync or context.area.type == 'VIEW_3D':				
 				if sel_mode[2]:
 					faces = rmlib.rmPolygonSet.from_selection( rmmesh )
+					tagscope.clear_region( faces )
 					groups = faces.group( use_seam=True )
 				else:
 					self.report( { 'ERROR' }, 'Must be in face mode.' )
@@ -553,6 +372,7 @@ class MESH_OT_uvrectangularize( bpy.types.Operator ):
 			else:
 				if uv_sel_mode == 'VERTEX':
 					loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=rmmesh, uvlayer=uvlayer )
+					tagscope.clear_loop_region( loop_selection )
 					override_corners = loop_selection.border_loops()
 					if len( override_corners ) != 4:
 						self.report( { 'ERROR' }, 'Must have exactly 4 uvverts selected. All must be on the boundary of the same uvisland.' )
@@ -561,17 +381,18 @@ class MESH_OT_uvrectangularize( bpy.types.Operator ):
 					if len( vertgroups ) != 1:
 						self.report( { 'ERROR' }, 'Corner uvverts must all be members of the same uvisland.' )
 						return { 'CANCELLED' }
-					visible_faces = GetUnsyncUVVisibleFaces( rmmesh, sel_mode )
+					visible_faces = selection.visible_face_mask( rmmesh, sel_mode )
 					for l in vertgroups[0]:
-						if l.face in visible_faces and l.face not in faces:
+						if visible_faces[l.face.index] and l.face not in faces:
 							faces.append( l.face )
 					groups = [faces]
 				elif uv_sel_mode == 'FACE':
-					visible_faces = GetUnsyncUVVisibleFaces( rmmesh, sel_mode )
+					visible_faces = selection.visible_face_mask( rmmesh, sel_mode )
 					loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=rmmesh, uvlayer=uvlayer )
 					for l in loop_selection:
-						if l.face in visible_faces and l.face not in faces:
+						if visible_faces[l.face.index] and l.face not in faces:
 							faces.append( l.face )
+					tagscope.clear_region( faces )
 					groups = faces.group( use_seam=True )
 				else:
 					self.report( { 'ERROR' }, 'Must be in uvvert or uvface mode.' )
@@ -591,182 +412,220 @@ class MESH_OT_uvrectangularize( bpy.types.Operator ):
 						l[uvlayer].select = False
 						l[uvlayer].select_edge = False
 
-			for group in groups:
-				clear_tags( rmmesh )
-
-				#tag faces in group
-				if sel_sync or context.area.type == 'VIEW_3D':
-					for f in group:
-						f.tag = True
-						f.select = True
-				else:
-					for f in group:
-						f.tag = True
-						for l in f.loops:
-							l[uvlayer].select = True
-							l[uvlayer].select_edge = True
-					
-				#get list of boundary loops
-				bounary_loops = GetBoundaryLoops( group )
-				if len( bounary_loops ) < 4:
-						continue
-				
-				#unpin boundary loops so they dont interfere and store initial bbox
-				initial_uvcoords = []
-				for f in group:
-					for l in f.loops:
-						l[uvlayer].pin_uv = False
-						initial_uvcoords.append( l[uvlayer].uv.copy() )
-				initial_bbmin, initial_bbmax = BBoxFromPoints( initial_uvcoords )
-
-				#if there are exactly two boundary_loop_groups then we assume the shape a cylinder and
-				#we need to add seam edges to map it to a plane.
-				boundary_edge_groups = rmlib.rmEdgeSet( [ l.edge for l in bounary_loops ] ).chain()
-				if ( len( boundary_edge_groups ) == 2 and
-				boundary_edge_groups[0][0][0] == boundary_edge_groups[0][-1][-1] and
-				boundary_edge_groups[-1][0][0] == boundary_edge_groups[-1][-1][-1] and
-				len( override_corners ) != 4 ):
-					starting_vert = boundary_edge_groups[0][0][0]
-					end_verts = [ pair[0] for pair in boundary_edge_groups[-1] ]
-					all_verts = group.vertices
-					path_verts = shortest_path( starting_vert, end_verts, all_verts )
-					for i in range( 1, len( path_verts ) ):
-						e = rmlib.rmEdgeSet.from_endpoints( path_verts[i-1], path_verts[i] )
-						e.seam = True
-					bounary_loops = GetBoundaryLoops( group )
-					if len( bounary_loops ) < 4:
-							continue
-				elif len( override_corners ) == 4:
-					for l in rmlib.rmUVLoopSet( faces.loops, uvlayer=uvlayer ).border_loops():
-						l.edge.seam = True
-					bounary_loops = GetBoundaryLoops( group )
-					if len( bounary_loops ) < 4:
-							continue
-				sorted_boundary_loops = sort_loop_chain( rmlib.rmUVLoopSet( bounary_loops, uvlayer=uvlayer ) )
-				
-				#lscm - initial conformal map to find four corners
-				#clear_tags( rmmesh )
-				pinned_loops = set()
-				for l in sorted_boundary_loops[0].vert.link_loops:
-					l[uvlayer].pin_uv = True
-					pinned_loops.add( l )
-				middle_idx = int( len( sorted_boundary_loops ) / 2.0 )
-				for l in sorted_boundary_loops[middle_idx].vert.link_loops:
-					l[uvlayer].pin_uv = True
-					pinned_loops.add( l )			
-				sorted_boundary_loops[middle_idx][uvlayer].pin_uv = True
-				bpy.ops.uv.unwrap(method="CONFORMAL")
-				#lscm( faces, uvlayer )
-				#clear_tags( rmmesh )
-				for l in pinned_loops:
-					l[uvlayer].pin_uv = False
-				sorted_boundary_loops[0][uvlayer].pin_uv = False
-				sorted_boundary_loops[middle_idx][uvlayer].pin_uv = False
-
-				#re-tag face tags
-				clear_tags( rmmesh )
-				for f in group:
-					f.tag = True
-
-				corner_loops = []
-				if len( override_corners ) == 4:
-					corner_loops = override_corners
-				else:
-					corner_loops = GetPinCornersByAngle( sorted_boundary_loops, uvlayer )
-
-				#compute the distance between the corners
-				lcount = len( sorted_boundary_loops )
-				distance_between_corners = []
-				edge_distances = [ 0.0 ] * lcount
-				starting_idx = sorted_boundary_loops.index( corner_loops[0] )
-				for i in range( lcount ):
-					idx = ( starting_idx + i ) % lcount
-					l = sorted_boundary_loops[idx]
-					if l in corner_loops:
-						distance_between_corners.append( 0.0 )
-					v1, v2 = l.edge.verts
-					d = ( mathutils.Vector( v1.co ) - mathutils.Vector( v2.co ) ).length
-					edge_distances[idx] = d
-					distance_between_corners[-1] += d
-
-				dir_lookup = [ mathutils.Vector( ( 1.0, 0.0 ) ), mathutils.Vector( ( 0.0, 1.0 ) ), mathutils.Vector( ( -1.0, 0.0 ) ), mathutils.Vector( ( 0.0, -1.0 ) ) ]
-				max_len = -1.0
-				for i in range( 2, 4 ):
-					dir_lookup[i] = dir_lookup[i] * ( distance_between_corners[i-2] / distance_between_corners[i] )
-				for i in range( 4 ):
-					max_len = max( max_len, distance_between_corners[i] )
-				for i in range( 4 ):
-					dir_lookup[i] *= 1.0 / max_len
-
-				#set and pin loops to said corners
-				only_pin_corners = False
-				origin = mathutils.Vector( ( 0.0, 0.0 ) )
-				pinned_loops = set()
-				corner_count = -1
-				for i in range( lcount ):
-					idx = ( starting_idx + i ) % lcount
-					l = sorted_boundary_loops[idx]
-					
-					origin += dir_lookup[corner_count] * edge_distances[idx-1]
-
-					if l in corner_loops:
-						corner_count += 1
-					else:
-						if only_pin_corners:
-							continue
-
-					pls = prev_boundary_loop( l )
-					for nl in pls:
-						nl = nl.link_loop_next
-						nl[uvlayer].uv = origin
-						nl[uvlayer].pin_uv = True
-						pinned_loops.add( nl )
-					
-				#lscm
-				#clear_tags( rmmesh )
-				#lscm( faces, uvlayer )
-				bpy.ops.uv.unwrap( method='CONFORMAL' )
-				clear_tags( rmmesh )
-
-				if context.area.type != 'VIEW_3D':
-					FitToBBox( faces, initial_bbmin, initial_bbmax, uvlayer )
-	
-				#clear pins
-				for l in pinned_loops:
-					l[uvlayer].pin_uv = False
-
-				#unscale island horizontally
-				if sel_sync and sel_mode[0]:
-					context.tool_settings.mesh_select_mode = ( False, False, True )
-				elif not sel_sync and uv_sel_mode == 'VERTEX':
-					context.tool_settings.uv_select_mode = 'FACE'
-				bpy.ops.mesh.rm_normalizetexels( uv_map_name=uvlayer.name, horizontal=True )
-				if sel_sync and sel_mode[0]:
-					context.tool_settings.mesh_select_mode = ( sel_mode[0], False, False )
-				elif not sel_sync and uv_sel_mode == 'VERTEX':
-					context.tool_settings.uv_select_mode = 'VERTEX'
-
-				#clear loop selection
-				if sel_sync or context.area.type == 'VIEW_3D':
-					for f in group:
-						f.select = False
-				else:
-					for f in group:
-						for l in f.loops:
-							l[uvlayer].select = False
-							l[uvlayer].select_edge = False
+			#faces and loops are stored by index since the edit bmesh is written back between chunks
+			rmmesh.bmesh.faces.index_update()
+			self.uvlayer_name = uvlayer.name
+			self.sel_sync = sel_sync
+			self.sel_mode = sel_mode
+			self.uv_sel_mode = uv_sel_mode
+			self.face_indexes = [ f.index for f in faces ]
+			self.override_corners = [ loop_key( l ) for l in override_corners ]
+			self.loop_selection = []
+			if not ( sel_sync or context.area.type == 'VIEW_3D' ):
+				self.loop_selection = [ loop_key( l ) for l in loop_selection ]
+			return [ [ f.index for f in group ] for group in groups ]
+
+	def chunk_step( self, context, items ):
+		rmmesh = rmlib.rmMesh.GetActive( context )
+		with rmmesh as rmmesh:
+			uvlayer = rmmesh.bmesh.loops.layers.uv[self.uvlayer_name]
+			bmfaces = rmmesh.bmesh.faces
+			bmfaces.ensure_lookup_table()
+			faces = rmlib.rmPolygonSet( [ bmfaces[i] for i in self.face_indexes ] )
+			override_corners = [ key_loop( bmfaces, k ) for k in self.override_corners ]
+			groups = [ rmlib.rmPolygonSet( [ bmfaces[i] for i in group ] ) for group in items ]
+			for group in tagscope.scoped_groups( groups ):
+				self.rectangularize_group( context, rmmesh, uvlayer, faces, group, override_corners )
+
+	def chunk_end( self, context ):
+		rmmesh = rmlib.rmMesh.GetActive( context )
+		with rmmesh as rmmesh:
+			uvlayer = rmmesh.bmesh.loops.layers.uv[self.uvlayer_name]
+			bmfaces = rmmesh.bmesh.faces
+			bmfaces.ensure_lookup_table()
 
 			#restore initial loop selection
-			if sel_sync or context.area.type == 'VIEW_3D':
-				faces.select()
+			if self.sel_sync or context.area.type == 'VIEW_3D':
+				rmlib.rmPolygonSet( [ bmfaces[i] for i in self.face_indexes ] ).select()
 			else:
-				for l in loop_selection:
+				for k in self.loop_selection:
+					l = key_loop( bmfaces, k )
 					l[uvlayer].select = True
-					if len( override_corners ) != 4:
+					if len( self.override_corners ) != 4:
 						l[uvlayer].select_edge = True
 
 		return { 'FINISHED' }
+
+	def rectangularize_group( self, context, rmmesh, uvlayer, faces, group, override_corners ):
+		sel_sync = self.sel_sync
+		sel_mode = self.sel_mode
+		uv_sel_mode = self.uv_sel_mode
+
+		#tag faces in group
+		if sel_sync or context.area.type == 'VIEW_3D':
+			for f in group:
+				f.tag = True
+				f.select = True
+		else:
+			for f in group:
+				f.tag = True
+				for l in f.loops:
+					l[uvlayer].select = True
+					l[uvlayer].select_edge = True
+			
+		#get list of boundary loops
+		halfedges = uvhalfedge.from_faces( rmmesh, group )
+		bounary_loops = GetBoundaryLoops( group, halfedges )
+		if len( bounary_loops ) < 4:
+				return
+		
+		#unpin boundary loops so they dont interfere and store initial bbox
+		initial_uvcoords = []
+		for f in group:
+			for l in f.loops:
+				l[uvlayer].pin_uv = False
+				initial_uvcoords.append( l[uvlayer].uv.copy() )
+		initial_bbmin, initial_bbmax = BBoxFromPoints( initial_uvcoords )
+
+		#if there are exactly two boundary_loop_groups then we assume the shape a cylinder and
+		#we need to add seam edges to map it to a plane.
+		boundary_edge_groups = rmlib.rmEdgeSet( [ l.edge for l in bounary_loops ] ).chain()
+		if ( len( boundary_edge_groups ) == 2 and
+		boundary_edge_groups[0][0][0] == boundary_edge_groups[0][-1][-1] and
+		boundary_edge_groups[-1][0][0] == boundary_edge_groups[-1][-1][-1] and
+		len( override_corners ) != 4 ):
+			starting_vert = boundary_edge_groups[0][0][0]
+			end_verts = [ pair[0] for pair in boundary_edge_groups[-1] ]
+			all_verts = group.vertices
+			path_verts = shortest_path( starting_vert, end_verts, all_verts )
+			for i in range( 1, len( path_verts ) ):
+				e = rmlib.rmEdgeSet.from_endpoints( path_verts[i-1], path_verts[i] )
+				e.seam = True
+			halfedges = uvhalfedge.from_faces( rmmesh, group )
+			bounary_loops = GetBoundaryLoops( group, halfedges )
+			if len( bounary_loops ) < 4:
+					return
+		elif len( override_corners ) == 4:
+			for l in rmlib.rmUVLoopSet( faces.loops, uvlayer=uvlayer ).border_loops():
+				l.edge.seam = True
+			halfedges = uvhalfedge.from_faces( rmmesh, group )
+			bounary_loops = GetBoundaryLoops( group, halfedges )
+			if len( bounary_loops ) < 4:
+					return
+		sorted_boundary_loops = sort_loop_chain( rmlib.rmUVLoopSet( bounary_loops, uvlayer=uvlayer ), halfedges )
+		
+		#lscm - initial conformal map to find four corners
+		#clear_tags( rmmesh )
+		pinned_loops = set()
+		for l in sorted_boundary_loops[0].vert.link_loops:
+			l[uvlayer].pin_uv = True
+			pinned_loops.add( l )
+		middle_idx = int( len( sorted_boundary_loops ) / 2.0 )
+		for l in sorted_boundary_loops[middle_idx].vert.link_loops:
+			l[uvlayer].pin_uv = True
+			pinned_loops.add( l )			
+		sorted_boundary_loops[middle_idx][uvlayer].pin_uv = True
+		bpy.ops.uv.unwrap(method="CONFORMAL")
+		#lscm( faces, uvlayer )
+		#clear_tags( rmmesh )
+		for l in pinned_loops:
+			l[uvlayer].pin_uv = False
+		sorted_boundary_loops[0][uvlayer].pin_uv = False
+		sorted_boundary_loops[middle_idx][uvlayer].pin_uv = False
+
+		#re-tag face tags
+		tagscope.clear_region( group )
+		for f in group:
+			f.tag = True
+
+		corner_loops = []
+		if len( override_corners ) == 4:
+			corner_loops = override_corners
+		else:
+			corner_loops = GetPinCornersByAngle( sorted_boundary_loops, uvlayer )
+
+		#compute the distance between the corners
+		lcount = len( sorted_boundary_loops )
+		distance_between_corners = []
+		edge_distances = [ 0.0 ] * lcount
+		starting_idx = sorted_boundary_loops.index( corner_loops[0] )
+		for i in range( lcount ):
+			idx = ( starting_idx + i ) % lcount
+			l = sorted_boundary_loops[idx]
+			if l in corner_loops:
+				distance_between_corners.append( 0.0 )
+			v1, v2 = l.edge.verts
+			d = ( mathutils.Vector( v1.co ) - mathutils.Vector( v2.co ) ).length
+			edge_distances[idx] = d
+			distance_between_corners[-1] += d
+
+		dir_lookup = [ mathutils.Vector( ( 1.0, 0.0 ) ), mathutils.Vector( ( 0.0, 1.0 ) ), mathutils.Vector( ( -1.0, 0.0 ) ), mathutils.Vector( ( 0.0, -1.0 ) ) ]
+		max_len = -1.0
+		for i in range( 2, 4 ):
+			dir_lookup[i] = dir_lookup[i] * ( distance_between_corners[i-2] / distance_between_corners[i] )
+		for i in range( 4 ):
+			max_len = max( max_len, distance_between_corners[i] )
+		for i in range( 4 ):
+			dir_lookup[i] *= 1.0 / max_len
+
+		#set and pin loops to said corners
+		only_pin_corners = False
+		origin = mathutils.Vector( ( 0.0, 0.0 ) )
+		pinned_loops = set()
+		corner_count = -1
+		for i in range( lcount ):
+			idx = ( starting_idx + i ) % lcount
+			l = sorted_boundary_loops[idx]
+			
+			origin += dir_lookup[corner_count] * edge_distances[idx-1]
+
+			if l in corner_loops:
+				corner_count += 1
+			else:
+				if only_pin_corners:
+					continue
+
+			pls = halfedges.prev_boundary_loops( l )
+			for nl in pls:
+				nl = nl.link_loop_next
+				nl[uvlayer].uv = origin
+				nl[uvlayer].pin_uv = True
+				pinned_loops.add( nl )
+			
+		#lscm
+		#clear_tags( rmmesh )
+		#lscm( faces, uvlayer )
+		bpy.ops.uv.unwrap( method='CONFORMAL' )
+		tagscope.clear_region( group )
+
+		if context.area.type != 'VIEW_3D':
+			FitToBBox( faces, initial_bbmin, initial_bbmax, uvlayer )
 	
+		#clear pins
+		for l in pinned_loops:
+			l[uvlayer].pin_uv = False
+
+		#unscale island horizontally
+		if sel_sync and sel_mode[0]:
+			context.tool_settings.mesh_select_mode = ( False, False, True )
+		elif not sel_sync and uv_sel_mode == 'VERTEX':
+			context.tool_settings.uv_select_mode = 'FACE'
+		bpy.ops.mesh.rm_normalizetexels( uv_map_name=uvlayer.name, horizontal=True )
+		if sel_sync and sel_mode[0]:
+			context.tool_settings.mesh_select_mode = ( sel_mode[0], False, False )
+		elif not sel_sync and uv_sel_mode == 'VERTEX':
+			context.tool_settings.uv_select_mode = 'VERTEX'
+
+		#clear loop selection
+		if sel_sync or context.area.type == 'VIEW_3D':
+			for f in group:
+				f.select = False
+		else:
+			for f in group:
+				for l in f.loops:
+					l[uvlayer].select = False
+					l[uvlayer].select_edge = False
+
 
 class MESH_OT_lscm( bpy.types.Operator ):
 	"""Map the selection to a box."""
@@ -788,7 +647,6 @@ class MESH_OT_lscm( bpy.types.Operator ):
 			
 		with rmmesh as rmmesh:
 			uvlayer = rmmesh.active_uv
-			clear_tags( rmmesh )
 
 			#get selection of faces
 			faces = rmlib.rmPolygonSet()
@@ -800,6 +658,7 @@ class MESH_OT_lscm( bpy.types.Operator ):
 			if sel_sync or context.area.type == 'VIEW_3D':				
 				if sel_mode[2]:
 					faces = rmlib.rmPolygonSet.from_selection( rmmesh )
+					tagscope.clear_region( faces )
 					groups = faces.group( use_seam=True )
 				else:
 					self.report( { 'ERROR' }, 'Must be in face mode.' )
@@ -807,6 +666,7 @@ class MESH_OT_lscm( bpy.types.Operator ):
 			else:
 				if uv_sel_mode == 'VERTEX':
 					loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=rmmesh, uvlayer=uvlayer )
+					tagscope.clear_loop_region( loop_selection )
 					override_corners = loop_selection.border_loops()
 					if len( override_corners ) != 4:
 						self.report( { 'ERROR' }, 'Must have exactly 4 uvverts selected. All must be on the boundary of the same uvisland.' )
@@ -815,17 +675,18 @@ class MESH_OT_lscm( bpy.types.Operator ):
 					if len( vertgroups ) != 1:
 						self.report( { 'ERROR' }, 'Corner uvverts must all be members of the same uvisland.' )
 						return { 'CANCELLED' }
-					visible_faces = GetUnsyncUVVisibleFaces( rmmesh, sel_mode )
+					visible_faces = selection.visible_face_mask( rmmesh, sel_mode )
 					for l in vertgroups[0]:
-						if l.face in visible_faces and l.face not in faces:
+						if visible_faces[l.face.index] and l.face not in faces:
 							faces.append( l.face )
 					groups = [faces]
 				elif uv_sel_mode == 'FACE':
-					visible_faces = GetUnsyncUVVisibleFaces( rmmesh, sel_mode )
+					visible_faces = selection.visible_face_mask( rmmesh, sel_mode )
 					loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=rmmesh, uvlayer=uvlayer )
 					for l in loop_selection:
-						if l.face in visible_faces and l.face not in faces:
+						if visible_faces[l.face.index] and l.face not in faces:
 							faces.append( l.face )
+					tagscope.clear_region( faces )
 					groups = faces.group( use_seam=True )
 				else:
 					self.report( { 'ERROR' }, 'Must be in uvvert or uvface mode.' )
@@ -845,8 +706,7 @@ class MESH_OT_lscm( bpy.types.Operator ):
 						l[uvlayer].select = False
 						l[uvlayer].select_edge = False
 
-			for group in groups:
-				clear_tags( rmmesh )
+			for group in tagscope.scoped_groups( groups ):
 				
 				#unpin boundary loops so they dont interfere and store initial bbox
 				initial_uvcoords = []
@@ -862,8 +722,6 @@ class MESH_OT_lscm( bpy.types.Operator ):
 				#else:
 				#	FitToBBox( group, initial_bbmin, initial_bbmax, uvlayer, True )
 
-			clear_tags( rmmesh )
-
 		return { 'FINISHED' }
 
 
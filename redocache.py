@@ -0,0 +1,83 @@
+import bpy
+from bpy.app.handlers import persistent
+import numpy as np
+
+#a redo panel tweak undoes an operator and executes it again with the new properties, so every replay starts from
+#the same pre-operator state. operators cache the inputs they derive from that state ( selected edges, island loops,
+#base uvs ) here and replays only redo the final transform. an entry is only handed back to redo panel replays
+#( Operator.options.is_repeat ) of the operator that stored it, on a mesh that still matches its key. a plain second
+#run is not a replay, it starts from whatever the previous runs and other tools left behind, so it always rebuilds
+#its inputs and replaces the entry. file loads drop everything.
+
+#operator bl_idname -> ( key, inputs )
+_cache = {}
+
+
+class IslandLoops():
+	#loops of a list of islands stored as ( face index, corner ) so they survive the undo that precedes a redo
+	__slots__ = ( 'faces', 'corners', 'island_ids', 'count' )
+
+	def __init__( self, loop_groups ):
+		#loop_groups is a list of BMLoop lists. face indexes must be up to date.
+		loops = [ l for g in loop_groups for l in g ]
+		self.faces = np.fromiter( ( l.face.index for l in loops ), dtype=np.int64, count=len( loops ) ) #(K,)
+		self.corners = np.fromiter( ( corner( l ) for l in loops ), dtype=np.int64, count=len( loops ) ) #(K,)
+		self.island_ids = np.repeat( np.arange( len( loop_groups ) ), [ len( g ) for g in loop_groups ] ) #(K,)
+		self.count = len( loop_groups )
+
+	def __len__( self ):
+		return len( self.faces )
+
+	def rows( self, loop_start ):
+		#(K,) mesh loop rows given the (F,) loop_start of the mesh datablock
+		return loop_start[self.faces] + self.corners
+
+	def loops( self, bm ):
+		#BMLoops of a bmesh with the same topology as the one the islands were read from
+		bm.faces.ensure_lookup_table()
+		faces = bm.faces
+		return [ faces[f].loops[c] for f, c in zip( self.faces.tolist(), self.corners.tolist() ) ]
+
+
+def corner( l ):
+	#position of a loop within its face
+	for i, fl in enumerate( l.face.loops ):
+		if fl == l:
+			return i
+	return -1
+
+
+def mesh_key( obj, bm ):
+	return ( obj.name, obj.data.name, len( bm.verts ), len( bm.edges ), len( bm.faces ) )
+
+
+def get( op, key ):
+	#inputs cached for op, when this execution is a redo of the one that stored them
+	entry = _cache.get( op.bl_idname )
+	if entry is None or entry[0] != key or not op.options.is_repeat:
+		return None
+	return entry[1]
+
+
+def store( op, key, inputs ):
+	_cache[op.bl_idname] = ( key, inputs )
+	return inputs
+
+
+def invalidate():
+	_cache.clear()
+
+
+@persistent
+def load_post_handler( dummy, *args ):
+	invalidate()
+
+
+def register():
+	bpy.app.handlers.load_post.append( load_post_handler )
+
+
+def unregister():
+	if load_post_handler in bpy.app.handlers.load_post:
+		bpy.app.handlers.load_post.remove( load_post_handler )
+	invalidate()
@@ -1,22 +1,41 @@
 import bpy, bmesh, mathutils
 import rmlib
 import math
+import numpy as np
+from . import chunked, islandtable, looptris, materialtable, selection, tagscope
+
+def GetLoopFaces( rmmesh, uvlayer ):
+	#faces whose loops are all uv selected
+	loops = rmlib.rmUVLoopSet.from_selection( rmmesh, uvlayer=uvlayer )
+	loop_faces = set()
+	selected_loops = []
+	for l in loops:
+		if not l.face.select:
+			continue
+		if not l[uvlayer].select_edge:
+			continue
+		loop_faces.add( l.face )
+		selected_loops.append( l )
+
+	faces = rmlib.rmPolygonSet()
+	with tagscope.TagScope( loop_faces ) as tags:
+		tags.tag_all( selected_loops )
+		for f in loop_faces:
+			all_loops_tagged = True
+			for l in f.loops:
+				if not l.tag:
+					all_loops_tagged = False
+					break
+			if all_loops_tagged:
+				faces.append( f )
+	return faces
+
 
-def clear_tags( rmmesh ):
-	for v in rmmesh.bmesh.verts:
-		v.tag = False
-	for e in rmmesh.bmesh.edges:
-		e.tag = False
-	for f in rmmesh.bmesh.faces:
-		f.tag = False
-		for l in f.loops:
-			l.tag = False
-
-class MESH_OT_scaleislandrelative( bpy.types.Operator ):
+class MESH_OT_scaleislandrelative( chunked.ChunkedOperator, bpy.types.Operator ):
 	"""Scale Selected UV Islands Relative to Onanother"""
 	bl_idname = 'mesh.rm_relativeislands'
 	bl_label = 'Relative Islands'
-	bl_options = { 'UNDO' }
+	bl_options = { 'REGISTER', 'UNDO' }
 
 	relative: bpy.props.EnumProperty(
 		items=[ ( "avg", "Average", "", 1 ),
@@ -37,19 +56,13 @@ class MESH_OT_scaleislandrelative( bpy.types.Operator ):
 		layout= self.layout
 		layout.prop( self, 'relative' )
 
-	def invoke( self, context, event ):
-		wm = context.window_manager
-		return wm.invoke_props_dialog( self )
-
-	def execute( self, context ):
+	def chunk_begin( self, context ):
 		rmmesh = rmlib.rmMesh.GetActive( context )
 		if rmmesh is None:
 			return { 'CANCELLED' }
 		
 		with rmmesh as rmmesh:
 			uvlayer = rmmesh.active_uv
-			clear_tags( rmmesh )
-
 			#get face selection from uv loop selection
 			faces = rmlib.rmPolygonSet()
 			sel_sync = context.tool_settings.use_uv_select_sync
@@ -62,24 +75,7 @@ class MESH_OT_scaleislandrelative( bpy.types.Operator ):
 			else:
 				uv_sel_mode = context.tool_settings.uv_select_mode
 				if uv_sel_mode == 'FACE':
-					loops = rmlib.rmUVLoopSet.from_selection( rmmesh, uvlayer=uvlayer )
-					loop_faces = set()
-					for l in loops:
-						if not l.face.select:
-							continue
-						if not l[uvlayer].select_edge:
-							continue
-						loop_faces.add( l.face )
-						l.tag = True
-					for f in loop_faces:
-						all_loops_tagged = True
-						for l in f.loops:
-							if not l.tag:
-								all_loops_tagged = False
-							else:
-								l.tag = False
-						if all_loops_tagged:
-							faces.append( f )
+					faces = GetLoopFaces( rmmesh, uvlayer )
 				else:
 					return { 'CANCELLED' }
 
@@ -87,22 +83,17 @@ class MESH_OT_scaleislandrelative( bpy.types.Operator ):
 				return { 'CANCELLED' }
 
 			#create list of uvislands and compute a density ( 3darea/uvarea ) for each
-			tri_loops = rmmesh.bmesh.calc_loop_triangles()
-			islands = faces.island( uvlayer )
+			tagscope.clear_region( faces )
+			table = islandtable.get( rmmesh, uvlayer )
+			islands = table.islands( rmmesh, faces, uvlayer )
+			tris = looptris.get( selection.sync( rmmesh ) )
+			face_uvareas = tris.face_sums( tris.uv_areas( table.uvs ), len( table.loop_start ) )
+			face_areas = tris.face_sums( tris.areas( looptris.loop_cos( rmmesh.mesh ) ), len( table.loop_start ) )
 			densities = []
 			for island in islands:
-				island_uvarea = 0.0
-				for tri in tri_loops:
-					if tri[0].face in island:
-						uv1 = mathutils.Vector( tri[0][uvlayer].uv )
-						uv2 = mathutils.Vector( tri[1][uvlayer].uv )
-						uv3 = mathutils.Vector( tri[2][uvlayer].uv )
-						uvarea = mathutils.geometry.area_tri( uv1, uv2, uv3 )
-						island_uvarea += uvarea
-
-				island_3darea = 0.0
-				for f in island:
-					island_3darea += f.calc_area()
+				face_indexes = [ f.index for f in island ]
+				island_uvarea = float( face_uvareas[face_indexes].sum() )
+				island_3darea = float( face_areas[face_indexes].sum() )
 					
 				try:
 					densities.append( island_uvarea / island_3darea )
@@ -122,13 +113,25 @@ class MESH_OT_scaleislandrelative( bpy.types.Operator ):
 				target_density -= densities[0]
 				target_density /= len( densities )
 
-			#set the density of all islands to the target
+			#work items are ( face indexes, scale factor ) of every island that needs scaling
+			items = []
 			for i, island in enumerate( islands ):
 				try:
 					scale_factor = math.sqrt( target_density / densities[i] )
 				except ZeroDivisionError:
 					continue
+				items.append( ( [ f.index for f in island ], scale_factor ) )
+			self.uvlayer_name = uvlayer.name
+			return items
 
+	def chunk_step( self, context, items ):
+		rmmesh = rmlib.rmMesh.GetActive( context )
+		with rmmesh as rmmesh:
+			uvlayer = rmmesh.bmesh.loops.layers.uv[self.uvlayer_name]
+			bmfaces = rmmesh.bmesh.faces
+			bmfaces.ensure_lookup_table()
+			for face_indexes, scale_factor in items:
+				island = [ bmfaces[i] for i in face_indexes ]
 				island_center = mathutils.Vector( ( 0.0, 0.0 ) )
 				lcount = 0
 				for f in island:
@@ -145,46 +148,28 @@ class MESH_OT_scaleislandrelative( bpy.types.Operator ):
 						uv += island_center
 						l[uvlayer].uv = uv
 
-			clear_tags( rmmesh )
-
+	def chunk_end( self, context ):
 		return { 'FINISHED' }
 
 
 def ScaleToMaterialSize( rmmesh, faces, uvlayer ):
 	#create list of uvislands and compute a density ( 3darea/uvarea ) for each
-	tri_loops = rmmesh.bmesh.calc_loop_triangles()
-	islands = faces.island( uvlayer )
+	tagscope.clear_region( faces )
+	table = islandtable.get( rmmesh, uvlayer )
+	islands = table.islands( rmmesh, faces, uvlayer )
+	tris = looptris.get( selection.sync( rmmesh ) )
+	face_uvareas = tris.face_sums( tris.uv_areas( table.uvs ), len( table.loop_start ) )
+	face_areas = tris.face_sums( tris.areas( looptris.loop_cos( rmmesh.mesh, rmmesh.world_transform.to_3x3() ) ), len( table.loop_start ) )
+	metrics = materialtable.build( rmmesh.mesh )
 	for island in islands:
 
 		#get the world space size of the material on the first poly of this island
-		material_size = [ 2.0, 2.0 ]
-		try:
-			material = rmmesh.mesh.materials[island[0].material_index]
-		except IndexError:
-			pass
-		try:
-			material_size[0] = material["WorldMappingWidth"]
-			material_size[1] = material["WorldMappingHeight"]
-		except:
-			pass
-
-		xfrm = rmmesh.world_transform.to_3x3()
+		material_size = metrics.size( island[0].material_index )
 
 		#compute island 3d and uv surface area
-		island_3darea = 0.0
-		island_uvarea = 0.0
-		for tri in tri_loops:
-			if tri[0].face in island:
-				uv1 = mathutils.Vector( tri[0][uvlayer].uv )
-				uv2 = mathutils.Vector( tri[1][uvlayer].uv )
-				uv3 = mathutils.Vector( tri[2][uvlayer].uv )
-				uvarea = mathutils.geometry.area_tri( uv1, uv2, uv3 )
-				island_uvarea += uvarea
-
-				co1 = xfrm @ tri[0].vert.co
-				co2 = xfrm @ tri[1].vert.co
-				co3 = xfrm @ tri[2].vert.co
-				island_3darea += rmlib.util.TriangleArea( co1, co2, co3 )
+		face_indexes = [ f.index for f in island ]
+		island_3darea = float( face_areas[face_indexes].sum() )
+		island_uvarea = float( face_uvareas[face_indexes].sum() )
 
 		#compute island center in uv space
 		island_center = mathutils.Vector( ( 0.0, 0.0 ) )
@@ -241,8 +226,6 @@ class MESH_OT_scaletomaterialsize( bpy.types.Operator ):
 					self.report( { 'ERROR' }, 'No UVLayer with name {} exists on mesh {}'.format( self.uv_map_name, rmmesh.object ) )
 					return { 'CANCELLED' }
 				
-			clear_tags( rmmesh )
-
 			#get face selection from uv loop selection
 			faces = rmlib.rmPolygonSet()
 			sel_sync = context.tool_settings.use_uv_select_sync
@@ -255,29 +238,10 @@ class MESH_OT_scaletomaterialsize( bpy.types.Operator ):
 			else:
 				uv_sel_mode = context.tool_settings.uv_select_mode
 				if uv_sel_mode == 'FACE':
-					loops = rmlib.rmUVLoopSet.from_selection( rmmesh, uvlayer=uvlayer )
-					loop_faces = set()
-					for l in loops:
-						if not l.face.select:
-							continue
-						if not l[uvlayer].select_edge:
-							continue
-						loop_faces.add( l.face )
-						l.tag = True
-					for f in loop_faces:
-						all_loops_tagged = True
-						for l in f.loops:
-							if not l.tag:
-								all_loops_tagged = False
-							else:
-								l.tag = False
-						if all_loops_tagged:
-							faces.append( f )
+					faces = GetLoopFaces( rmmesh, uvlayer )
 				else:
 					return { 'CANCELLED' }
 
-			clear_tags( rmmesh )
-
 			if len( faces ) < 1:				
 				return { 'CANCELLED' }
 
@@ -316,8 +280,6 @@ class MESH_OT_normalizetexels( bpy.types.Operator ):
 					self.report( { 'ERROR' }, 'No UVLayer with name {} exists on mesh {}'.format( self.uv_map_name, rmmesh.object ) )
 					return { 'CANCELLED' }
 				
-			clear_tags( rmmesh )
-
 			#get face selection from uv loop selection
 			faces = rmlib.rmPolygonSet()
 			sel_sync = context.tool_settings.use_uv_select_sync
@@ -330,24 +292,7 @@ class MESH_OT_normalizetexels( bpy.types.Operator ):
 			else:
 				uv_sel_mode = context.tool_settings.uv_select_mode
 				if uv_sel_mode == 'FACE':
-					loops = rmlib.rmUVLoopSet.from_selection( rmmesh, uvlayer=uvlayer )
-					loop_faces = set()
-					for l in loops:
-						if not l.face.select:
-							continue
-						if not l[uvlayer].select_edge:
-							continue
-						loop_faces.add( l.face )
-						l.tag = True
-					for f in loop_faces:
-						all_loops_tagged = True
-						for l in f.loops:
-							if not l.tag:
-								all_loops_tagged = False
-							else:
-								l.tag = False
-						if all_loops_tagged:
-							faces.append( f )
+					faces = GetLoopFaces( rmmesh, uvlayer )
 				else:
 					return { 'CANCELLED' }
 
@@ -355,37 +300,31 @@ class MESH_OT_normalizetexels( bpy.types.Operator ):
 				return { 'CANCELLED' }
 
 			#create list of uvislands and compute a density ( 3darea/uvarea ) for each
-			tri_loops = rmmesh.bmesh.calc_loop_triangles()
-			islands = faces.island( uvlayer )
+			tagscope.clear_region( faces )
+			table = islandtable.get( rmmesh, uvlayer )
+			islands = table.islands( rmmesh, faces, uvlayer )
+			tris = looptris.get( selection.sync( rmmesh ) )
+			tri_uvareas = tris.uv_areas( table.uvs )
+			loop_cos = looptris.loop_cos( rmmesh.mesh )
+			face_tris = np.zeros( len( table.loop_start ), dtype=bool )
+			metrics = materialtable.build( rmmesh.mesh )
 			for island in islands:
 
 				#get the world space size of the material on the first poly of this island
-				material_size = [ 2.0, 2.0 ]
-				try:
-					material = rmmesh.mesh.materials[island[0].material_index]
-				except IndexError:
-					pass
-				try:
-					material_size[0] = material["WorldMappingWidth"]
-					material_size[1] = material["WorldMappingHeight"]
-				except:
-					pass
-
-				#compute uv island area
-				for tri in tri_loops:
-					if tri[0].face in island:
-						uvarea = mathutils.geometry.area_tri( tri[0][uvlayer].uv, tri[1][uvlayer].uv, tri[2][uvlayer].uv )
-						if uvarea > rmlib.util.FLOAT_EPSILON:
-							break
+				material_size = metrics.size( island[0].material_index )
+
+				#find the first triangle of the island with a non zero uv area
+				face_indexes = [ f.index for f in island ]
+				face_tris[face_indexes] = True
+				candidates = np.flatnonzero( face_tris[tris.faces] & ( tri_uvareas > rmlib.util.FLOAT_EPSILON ) )
+				face_tris[face_indexes] = False
+				if len( candidates ) < 1:
+					continue
+				tri = tris.loops[candidates[0]]
 
 				#compute tangent and bitangent vectors
-				v1 = mathutils.Vector( tri[0].vert.co.copy() )
-				v2 = mathutils.Vector( tri[1].vert.co.copy() )
-				v3 = mathutils.Vector( tri[2].vert.co.copy() )
-
-				w1 = mathutils.Vector( tri[0][uvlayer].uv )
-				w2 = mathutils.Vector( tri[1][uvlayer].uv )
-				w3 = mathutils.Vector( tri[2][uvlayer].uv )
+				v1, v2, v3 = ( mathutils.Vector( loop_cos[row] ) for row in tri )
+				w1, w2, w3 = ( mathutils.Vector( table.uvs[row] ) for row in tri )
 
 				x1 = v2.x - v1.x
 				x2 = v3.x - v1.x
@@ -436,8 +375,6 @@ class MESH_OT_normalizetexels( bpy.types.Operator ):
 						uv += island_center
 						l[uvlayer].uv = uv
 
-			clear_tags( rmmesh )
-
 		return { 'FINISHED' }
 	
 
@@ -470,8 +407,6 @@ class MESH_OT_worldspaceproject( bpy.types.Operator ):
 						return { 'CANCELLED' }
 				target_uvlayername = uvlayer.name
 					
-				clear_tags( rmmesh )
-
 				#get face selection from uv loop selection
 				faces = rmlib.rmPolygonSet()
 				if ( context.mode == 'OBJECT' ):
@@ -487,29 +422,10 @@ class MESH_OT_worldspaceproject( bpy.types.Operator ):
 					else:
 						uv_sel_mode = context.tool_settings.uv_select_mode
 						if uv_sel_mode == 'FACE':
-							loops = rmlib.rmUVLoopSet.from_selection( rmmesh, uvlayer=uvlayer )
-							loop_faces = set()
-							for l in loops:
-								if not l.face.select:
-									continue
-								if not l[uvlayer].select_edge:
-									continue
-								loop_faces.add( l.face )
-								l.tag = True
-							for f in loop_faces:
-								all_loops_tagged = True
-								for l in f.loops:
-									if not l.tag:
-										all_loops_tagged = False
-									else:
-										l.tag = False
-								if all_loops_tagged:
-									faces.append( f )
+							faces = GetLoopFaces( rmmesh, uvlayer )
 						else:
 							return { 'CANCELLED' }
 
-				clear_tags( rmmesh )
-
 				if len( faces ) < 1:
 					return { 'CANCELLED' }
 				
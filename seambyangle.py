@@ -1,6 +1,8 @@
 import bpy, bmesh
 import rmlib
 import math
+import numpy as np
+from . import redocache
 
 
 def edge_face_angle( edge ):
@@ -67,26 +69,30 @@ class MESH_OT_set_seams_by_angle( bpy.types.Operator ):
 		bm = bmesh.from_edit_mesh( obj.data )
 		bm.edges.ensure_lookup_table()
 
-		for edge in bm.edges:
-			if not edge.select:
-				continue
-				
-			angle = edge_face_angle( edge )
-			if angle is None:
-				continue
-				
-			concave = self.angle_threshold <= abs( angle ) and angle < 0.0
-			if self.use_concave and concave:
-				edge.seam = True
-			else:
-				edge.seam = False
-
-			convex = self.angle_threshold <= abs( angle ) and angle > 0.0
-			if self.use_convex and convex:
-				edge.seam = True
-
-			if self.use_concave and self.use_convex:
-				edge.seam = concave or convex
+		#selected edges and their angles only depend on the mesh, so redo panel tweaks reuse them
+		key = redocache.mesh_key( obj, bm )
+		inputs = redocache.get( self, key )
+		if inputs is None:
+			edge_indexes = []
+			angles = []
+			for i, edge in enumerate( bm.edges ):
+				if not edge.select:
+					continue
+				angle = edge_face_angle( edge )
+				if angle is None:
+					continue
+				edge_indexes.append( i )
+				angles.append( angle )
+			inputs = redocache.store( self, key, ( edge_indexes, np.array( angles, dtype=np.float64 ) ) )
+		edge_indexes, angles = inputs
+
+		steep = self.angle_threshold <= np.abs( angles )
+		concave = steep & ( angles < 0.0 )
+		convex = steep & ( angles > 0.0 )
+		seams = ( concave & self.use_concave ) | ( convex & self.use_convex )
+		edges = bm.edges
+		for i, seam in zip( edge_indexes, seams.tolist() ):
+			edges[i].seam = seam
 
 		bmesh.update_edit_mesh( obj.data )
 
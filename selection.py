@@ -0,0 +1,116 @@
+import bmesh
+import rmlib
+import numpy as np
+from . import uvarray
+
+#selection and visibility masks as NumPy bool arrays read from the mesh datablock attributes.
+#face masks are indexed by BMFace.index and loop masks by loop row, the position of a loop in the mesh loop arrays.
+#the bmesh is synced to the datablock first ( update_from_editmode in edit mode, to_mesh in object mode ) and the
+#bmesh face indexes are updated so they match. bmesh has no index_update for loops and BMLoop.index is not kept up
+#to date, so the row of a loop is the loop_start of its face plus its corner ( see loop_row ).
+#an object mode bmesh flagged with matches_mesh was read with from_mesh and not changed since, so it is not written
+#back. to_mesh is a full copy of the mesh and tags the datablock for a depsgraph update.
+
+
+def open_bmesh( obj ):
+	#rmMesh of obj over its edit bmesh, or over a new bmesh read from the mesh in object mode. free the bmesh of an
+	#object mode mesh when done.
+	mesh = obj.data
+	if mesh.is_editmode:
+		return rmlib.rmMesh.from_bmesh( obj, bmesh.from_edit_mesh( mesh ) )
+	bm = bmesh.new()
+	bm.from_mesh( mesh )
+	rmmesh = rmlib.rmMesh.from_bmesh( obj, bm )
+	rmmesh.matches_mesh = True
+	return rmmesh
+
+
+def sync( rmmesh ):
+	#returns the mesh datablock of rmmesh with its attributes matching rmmesh.bmesh
+	mesh = rmmesh.mesh
+	bm = rmmesh.bmesh
+	if mesh.is_editmode:
+		rmmesh.object.update_from_editmode()
+	elif not getattr( rmmesh, 'matches_mesh', False ):
+		bm.to_mesh( mesh )
+	bm.faces.index_update()
+	return mesh
+
+
+def loop_row( loop, loop_start ):
+	#row of loop in the mesh loop arrays. loop_start is the (F,) loop_start of the synced mesh.
+	f = loop.face
+	row = int( loop_start[f.index] )
+	for l in f.loops:
+		if l == loop:
+			return row
+		row += 1
+	return -1
+
+
+def read_bool( collection, attr ):
+	mask = np.zeros( len( collection ), dtype=bool )
+	collection.foreach_get( attr, mask )
+	return mask
+
+
+def read_int( collection, attr ):
+	values = np.empty( len( collection ), dtype=np.int32 )
+	collection.foreach_get( attr, values )
+	return values
+
+
+def visible_face_mask( rmmesh, sel_mode ):
+	#(F,) mask of the faces displayed in the uv editor when uv sync selection is off.
+	#in vert/edge mode a face is shown when it is unhidden and all its verts/edges are selected.
+	mesh = sync( rmmesh )
+	if sel_mode[0] or sel_mode[1]:
+		if len( mesh.polygons ) == 0:
+			return np.zeros( 0, dtype=bool )
+		if sel_mode[0]:
+			loop_select = read_bool( mesh.vertices, 'select' )[read_int( mesh.loops, 'vertex_index' )]
+		else:
+			loop_select = read_bool( mesh.edges, 'select' )[read_int( mesh.loops, 'edge_index' )]
+		loop_start = read_int( mesh.polygons, 'loop_start' )
+		mask = np.logical_and.reduceat( loop_select, loop_start )
+		mask &= ~read_bool( mesh.polygons, 'hide' )
+		return mask
+	return read_bool( mesh.polygons, 'select' )
+
+
+def uv_select_mask( rmmesh, uvlayer, edge=False, synced=False ):
+	#(L,) mask of the uv vert ( or uv edge ) selection of uvlayer. pass synced when rmmesh was just synced.
+	mesh = rmmesh.mesh if synced else sync( rmmesh )
+	uv_layer = mesh.uv_layers[uvlayer.name]
+	mask = np.zeros( len( mesh.loops ), dtype=bool )
+	if edge:
+		uvarray.get_flag( uv_layer, 'edge_selection', 'select_edge', mask )
+	else:
+		uvarray.get_flag( uv_layer, 'vertex_selection', 'select', mask )
+	return mask
+
+
+def faces_from_mask( rmmesh, mask ):
+	faces = rmmesh.bmesh.faces
+	faces.ensure_lookup_table()
+	return rmlib.rmPolygonSet( [ faces[i] for i in np.flatnonzero( mask ).tolist() ] )
+
+
+def loops_from_mask( rmmesh, mask, uvlayer ):
+	#only the faces holding a masked loop are visited. expects rmmesh to be synced.
+	loop_start = read_int( rmmesh.mesh.polygons, 'loop_start' )
+	rows = np.flatnonzero( mask )
+	face_rows = np.searchsorted( loop_start, rows, side='right' ) - 1
+	corners = rows - loop_start[face_rows]
+	faces = rmmesh.bmesh.faces
+	faces.ensure_lookup_table()
+	return rmlib.rmUVLoopSet( [ faces[f].loops[c] for f, c in zip( face_rows.tolist(), corners.tolist() ) ], uvlayer=uvlayer )
+
+
+def visible_uv_loops( rmmesh, uvlayer, visible_faces, edge=False ):
+	#rmUVLoopSet of the uv selected loops of uvlayer that lie on faces in the visible_faces mask.
+	#visible_faces comes from visible_face_mask, which already synced rmmesh.
+	mask = uv_select_mask( rmmesh, uvlayer, edge=edge, synced=True )
+	loop_total = read_int( rmmesh.mesh.polygons, 'loop_total' )
+	mask &= np.repeat( visible_faces, loop_total )
+	return loops_from_mask( rmmesh, mask, uvlayer )
@@ -0,0 +1,57 @@
+import importlib, time
+
+#add-on launch cost. __init__ imports and registers its modules through import_modules/register_modules, which time
+#every import and every module's register(). the result is shown in the add-on preferences so slow startups on farm
+#and artist machines can be traced to a module.
+#an import time includes the first import of everything the module pulls in ( numpy, gpu, ... ).
+
+#module name -> seconds spent importing it / in its register() during the last registration
+import_times = {}
+register_times = {}
+
+
+def reset():
+	#the package import happens once per session, so its import time survives re-registration
+	package_import = import_times.get( '__init__' )
+	import_times.clear()
+	register_times.clear()
+	if package_import is not None:
+		import_times['__init__'] = package_import
+
+
+def import_modules( package, names ):
+	modules = []
+	for name in names:
+		t = time.perf_counter()
+		modules.append( importlib.import_module( '.' + name, package ) )
+		import_times[name] = time.perf_counter() - t
+	return modules
+
+
+def register_modules( modules ):
+	for module in modules:
+		t = time.perf_counter()
+		module.register()
+		register_times[module.__name__.rsplit( '.', 1 )[-1]] = time.perf_counter() - t
+
+
+def import_total():
+	return sum( import_times.values() )
+
+
+def register_total():
+	return sum( register_times.values() )
+
+
+def slowest( count=3 ):
+	#( module name, seconds ) of the modules with the highest import + register() time
+	names = set( import_times ) | set( register_times )
+	totals = { name : import_times.get( name, 0.0 ) + register_times.get( name, 0.0 ) for name in names }
+	return sorted( totals.items(), key=lambda item: item[1], reverse=True )[:count]
+
+
+def summary():
+	text = 'import {:.1f} ms, register() {:.1f} ms'.format( import_total() * 1000.0, register_total() * 1000.0 )
+	if len( import_times ) + len( register_times ) > 0:
+		text += ' ( slowest: {} )'.format( ', '.join( '{} {:.1f} ms'.format( name, t * 1000.0 ) for name, t in slowest() ) )
+	return text
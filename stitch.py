@@ -1,35 +1,7 @@
 import bpy, bmesh, mathutils
 import rmlib
-import math
-
-def GetUnsyncUVVisibleFaces( rmmesh, sel_mode ):
-	visible_faces = rmlib.rmPolygonSet()
-	if sel_mode[0]:		
-		for f in rmmesh.bmesh.faces:
-			if f.hide:
-				continue
-			visible = True
-			for v in f.verts:
-				if not v.select:
-					visible = False
-					break
-			if visible:
-				visible_faces.append( f )
-	elif sel_mode[1]:
-		for f in rmmesh.bmesh.faces:
-			if f.hide:
-				continue
-			visible = True
-			for e in f.edges:
-				if not e.select:
-					visible = False
-					break
-			if visible:
-				visible_faces.append( f )
-	else:
-		visible_faces = rmlib.rmPolygonSet.from_selection( rmmesh )
-		
-	return visible_faces
+from . import selection, tagscope, uvarray, uvweld
+from .core import stitchalign
 
 def sort_loop_chain( loops ):
 	#sorts the loops by the "flow" of the winding of the member faces.
@@ -76,18 +48,6 @@ def tri_area( tri_loops, uvlayer ):
 	return m.determinant()
 
 
-def clear_all_tags( bmesh ):
-	#should not be needed unless theres a bug in a previously run op
-	for v in bmesh.verts:
-		v.tag = False
-	for e in bmesh.edges:
-		e.tag = False
-	for f in bmesh.faces:
-		f.tag = False
-		for l in f.loops:
-			l.tag = False
-	
-
 def stitch( source_loops, target_loops, uvlayer ):
 	#determines if we should stitch at midpoint between source and target loops
 	target_loops_selected = True
@@ -107,76 +67,16 @@ def stitch( source_loops, target_loops, uvlayer ):
 	
 	#transform target island such that the endpoints of target_loops lie on top of the endpoints of source_loops
 	if not is_same_island:
-		source_poslist = [ mathutils.Vector( l[uvlayer].uv.copy() ) for l in source_loops ]
-		target_poslist = [ mathutils.Vector( l[uvlayer].uv.copy() ) for l in target_loops ]
-		
-		source_avg = mathutils.Vector( ( 0.0, 0.0 ) )
-		for pos in source_poslist:
-			source_avg += pos
-		source_avg /= len( source_poslist )
-		target_avg = mathutils.Vector( ( 0.0, 0.0 ) )
-		for pos in target_poslist:
-			target_avg += pos
-		target_avg /= len( target_poslist )
-		
-		source_vec = source_poslist[0] - source_poslist[-1]
-		source_pos = ( source_poslist[0] + source_poslist[-1] + source_avg ) * 0.33333
-		target_vec = target_poslist[0] - target_poslist[-1]
-		target_pos = ( target_poslist[0] + target_poslist[-1] + target_avg ) * 0.33333
-		
-		#compute scale
-		scale_factor = source_vec.length / target_vec.length
-		
-		source_vec.normalize()
-		target_vec.normalize()
-		
-		#compute rotation
-		rotation_angle = rmlib.util.CCW_Angle2D( target_vec, source_vec )
-		r1 = [ math.cos( rotation_angle ), -math.sin( rotation_angle ) ]
-		r2 = [ math.sin( rotation_angle ), math.cos( rotation_angle ) ]
-		rot = mathutils.Matrix( [ r1, r2 ] )
-		target_vec = rot @ target_vec
-		if source_vec.dot( target_vec ) > 0:
-			rotation_angle += math.pi
-		
-		#compute translation
-		offset = source_pos - target_pos
-		
-		#scale offset by half if we are stitching at midpoint
-		if target_loops_selected:
-			rotation_angle *= 0.5
-			offset *= 0.5	
-		
-		#build orientation matrix
-		r1 = [ math.cos( rotation_angle ), -math.sin( rotation_angle ) ]
-		r2 = [ math.sin( rotation_angle ), math.cos( rotation_angle ) ]
-		rot = mathutils.Matrix( [ r1, r2 ] )
-		scl = mathutils.Matrix( [ [ scale_factor, 0.0 ], [ 0.0, scale_factor ] ] )
-		targ_mat = scl @ rot
-		
-		#transform target island into position		
-		for l in target_island:
-			new_uv = mathutils.Vector( l[uvlayer].uv )
-			new_uv -= target_pos
-			new_uv = targ_mat @ new_uv
-			new_uv += target_pos + offset
-			l[uvlayer].uv = new_uv
-			
+		target_mat, source_mat = stitchalign.align( uvarray.gather_loop_uvs( source_loops, uvlayer ), uvarray.gather_loop_uvs( target_loops, uvlayer ), midpoint=target_loops_selected )
+		uvarray.transform_islands( [ target_island ], uvlayer, [ target_mat ] )
+
 		#transform source island by inverse of target island transform if we are stitching at midpoint
-		if target_loops_selected:
+		if source_mat is not None:
 			source_island = source_loops.group_vertices( element=True )[0]
-			r1 = [ math.cos( rotation_angle ), -math.sin( rotation_angle ) ]
-			r2 = [ math.sin( rotation_angle ), math.cos( rotation_angle ) ]
-			rot = mathutils.Matrix( [ r1, r2 ] )
-			src_mat = rot.inverted()			
-			for l in source_island:
-				new_uv = mathutils.Vector( l[uvlayer].uv )
-				new_uv -= source_pos
-				new_uv = src_mat @ new_uv
-				new_uv += source_pos - offset
-				l[uvlayer].uv = new_uv
+			uvarray.transform_islands( [ source_island ], uvlayer, [ source_mat ] )
 		
 	#stitch target loops to source loops		
+	weld = uvweld.from_loops( source_loops, uvlayer )
 	tagged_loops = set()
 	for i in range( len( source_loops ) ):
 		sl = source_loops[i]		
@@ -184,21 +84,15 @@ def stitch( source_loops, target_loops, uvlayer ):
 		if sv.tag:
 			continue
 		sl_uv = sl[uvlayer].uv
-		s_linkloops = []
-		for nl in sv.link_loops:
-			if rmlib.util.AlmostEqual_v2( sl[uvlayer].uv, nl[uvlayer].uv ):
-				s_linkloops.append( nl )
-				tagged_loops.add( nl )
+		s_linkloops = weld.welded( sl )
+		tagged_loops.update( s_linkloops )
 		for j in range( len( target_loops ) ):
 			tl = target_loops[j]
 			tv = tl.vert
 			if tl.tag or sv != tv:
 				continue
-			t_linkloops = []
-			for nl in tv.link_loops:
-				if rmlib.util.AlmostEqual_v2( tl[uvlayer].uv, nl[uvlayer].uv ):
-					t_linkloops.append( nl )
-					tagged_loops.add( nl )
+			t_linkloops = weld.welded( tl )
+			tagged_loops.update( t_linkloops )
 			if is_same_island:
 				mp_uv = ( sl_uv + tl[uvlayer].uv ) * 0.5
 				for l in s_linkloops + t_linkloops:
@@ -235,9 +129,7 @@ class MESH_OT_uvstitcht( bpy.types.Operator ):
 		with rmmesh as rmmesh:
 			uvlayer = rmmesh.active_uv
 			
-			clear_all_tags( rmmesh.bmesh ) #shouldnt be needed
-
-			visible_faces = set()
+			visible_faces = None
 
 			sel_sync = context.tool_settings.use_uv_select_sync
 			if sel_sync:
@@ -248,17 +140,19 @@ class MESH_OT_uvstitcht( bpy.types.Operator ):
 						l[uvlayer].select_edge = False
 						if l.edge.select and len( l.edge.link_faces ) > 1:
 							edgeloop_selection.append( l )
+				tagscope.clear_loop_region( edgeloop_selection )
 				border_edgeloop_selection = edgeloop_selection.border_loops()
 				for l in border_edgeloop_selection:
 					l[uvlayer].select_edge = True
 			else:
 				sel_mode = context.tool_settings.mesh_select_mode[:]
-				visible_faces = GetUnsyncUVVisibleFaces( rmmesh, sel_mode )
+				visible_faces = selection.visible_face_mask( rmmesh, sel_mode )
 				edgeloop_selection = rmlib.rmUVLoopSet( [], uvlayer=uvlayer )
-				for f in visible_faces:
+				for f in selection.faces_from_mask( rmmesh, visible_faces ):
 					for l in f.loops:
 						if l[uvlayer].select_edge:
 							edgeloop_selection.append( l )
+				tagscope.clear_loop_region( edgeloop_selection )
 				border_edgeloop_selection = rmlib.rmUVLoopSet( [ l for l in edgeloop_selection if len( l.edge.link_faces ) > 1 ], uvlayer=uvlayer ).border_loops()
 			
 			#break up into groups
@@ -313,11 +207,13 @@ class MESH_OT_uvstitcht( bpy.types.Operator ):
 				target_faces = set( [ l.face for l in target_groups[i] ] )
 				for f in target_faces:
 					f.hide = False
-					if f not in visible_faces:
+					if visible_faces is None or not visible_faces[f.index]:
 						f.select = True
 
 				stitch( source_groups[i], target_groups[i], uvlayer )
 
+			tagscope.clear_loop_region( edgeloop_selection )
+
 		return { 'FINISHED' }
 
 
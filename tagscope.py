@@ -0,0 +1,75 @@
+#bmesh element tags are scratch state shared by every script and by rmlib. instead of sweeping the whole mesh
+#before and after each algorithm, the helpers here only reset the elements an algorithm can actually reach.
+#rmlib's group/island functions untag every element they visit, so after a TagScope exits, tags are clean
+#again everywhere the addon touched.
+
+
+class TagScope():
+	#records the elements tagged through it and untags exactly those on exit.
+	#faces passed in are cleared with clear_region on enter and exit, which covers tags set directly on
+	#their elements by code that does not go through tag()/tag_all().
+	__slots__ = ( '__tagged', '__region' )
+
+	def __init__( self, region=None ):
+		self.__tagged = []
+		self.__region = region
+
+	def __enter__( self ):
+		if self.__region is not None:
+			clear_region( self.__region )
+		return self
+
+	def __exit__( self, type, value, traceback ):
+		self.release()
+		if self.__region is not None:
+			clear_region( self.__region )
+
+	def tag( self, elem ):
+		elem.tag = True
+		self.__tagged.append( elem )
+
+	def tag_all( self, elems ):
+		for elem in elems:
+			elem.tag = True
+			self.__tagged.append( elem )
+
+	def release( self ):
+		for elem in self.__tagged:
+			elem.tag = False
+		self.__tagged.clear()
+
+
+def clear_region( faces ):
+	#untag faces, their loops, verts and edges, plus the verts, edges and faces one step away from them.
+	#these are all the elements the face walks in this addon read tags from.
+	for f in faces:
+		f.tag = False
+		for l in f.loops:
+			l.tag = False
+			v = l.vert
+			v.tag = False
+			for e in v.link_edges:
+				e.tag = False
+				e.other_vert( v ).tag = False
+			for nf in v.link_faces:
+				nf.tag = False
+
+
+def clear_loop_region( loops ):
+	#untag loops, every loop sharing a vert with them and the faces, verts and edges of those loops
+	for l in loops:
+		v = l.vert
+		v.tag = False
+		for nl in v.link_loops:
+			nl.tag = False
+			nl.edge.tag = False
+			nl.face.tag = False
+			nl.link_loop_next.vert.tag = False
+
+
+def scoped_groups( groups ):
+	#iterate face groups, clearing the region of each group before the loop body runs and again after it,
+	#including when the body continues, breaks or returns early.
+	for group in groups:
+		with TagScope( group ):
+			yield group
@@ -0,0 +1,83 @@
+#run with blender's python from the add-on's parent directory, rmlib has to be importable:
+#	blender -b --factory-startup --python-expr "import sys, pytest; sys.exit( pytest.main( [ '<addon folder>/tests' ] ) )"
+#without bpy the tests are skipped.
+
+import importlib, os, sys
+import pytest
+
+bpy = pytest.importorskip( 'bpy' )
+bmesh = pytest.importorskip( 'bmesh' )
+pytest.importorskip( 'rmlib' )
+
+ADDON_DIR = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ) )
+sys.path.insert( 0, os.path.dirname( ADDON_DIR ) )
+PACKAGE = os.path.basename( ADDON_DIR )
+selection = importlib.import_module( PACKAGE + '.selection' )
+uvhalfedge = importlib.import_module( PACKAGE + '.uvhalfedge' )
+islandtable = importlib.import_module( PACKAGE + '.islandtable' )
+
+GRID = 4
+SEAM_COLUMN = 2
+
+
+@pytest.fixture
+def seamed_grid():
+	#GRID x GRID quads with a seam down x == SEAM_COLUMN. the faces right of the seam are moved over in uv space,
+	#so the uv boundaries are exactly the mesh boundary plus the seam.
+	mesh = bpy.data.meshes.new( 'uvhalfedge_test' )
+	bm = bmesh.new()
+	uvlayer = bm.loops.layers.uv.new( 'UVMap' )
+	verts = [ [ bm.verts.new( ( x, y, 0.0 ) ) for y in range( GRID + 1 ) ] for x in range( GRID + 1 ) ]
+	for x in range( GRID ):
+		for y in range( GRID ):
+			f = bm.faces.new( ( verts[x][y], verts[x+1][y], verts[x+1][y+1], verts[x][y+1] ) )
+			offset = 10.0 if x >= SEAM_COLUMN else 0.0
+			for l in f.loops:
+				l[uvlayer].uv = ( l.vert.co.x + offset, l.vert.co.y )
+	for e in bm.edges:
+		e.seam = all( v.co.x == SEAM_COLUMN for v in e.verts ) and not e.is_boundary
+	bm.to_mesh( mesh )
+	bm.free()
+
+	obj = bpy.data.objects.new( mesh.name, mesh )
+	islandtable.invalidate() #outside an operator nothing drops the table of the previous fixture mesh
+	rmmesh = selection.open_bmesh( obj )
+	yield rmmesh
+	rmmesh.bmesh.free()
+	bpy.data.objects.remove( obj )
+	bpy.data.meshes.remove( mesh )
+
+
+def test_twins_match_face_half_edges( seamed_grid ):
+	rmmesh = seamed_grid
+	bm = rmmesh.bmesh
+	uvlayer = bm.loops.layers.uv.active
+
+	#bmesh does not keep BMLoop.index up to date, so the lookups must not depend on it
+	for f in bm.faces:
+		for l in f.loops:
+			l.index = 0
+
+	uv_halfedges = uvhalfedge.get( rmmesh, uvlayer )
+	face_halfedges = uvhalfedge.from_faces( rmmesh, list( bm.faces ), split_seams=True )
+	boundary_count = 0
+	for f in bm.faces:
+		for l in f.loops:
+			assert uv_halfedges.is_boundary( l ) == face_halfedges.is_boundary( l )
+			assert uv_halfedges.twin( l ) == face_halfedges.twin( l )
+			boundary_count += uv_halfedges.is_boundary( l )
+	assert boundary_count == GRID * 4 + GRID * 2
+
+
+def test_seam_splits_uv_verts( seamed_grid ):
+	rmmesh = seamed_grid
+	bm = rmmesh.bmesh
+	uv_halfedges = uvhalfedge.get( rmmesh, bm.loops.layers.uv.active )
+	for v in bm.verts:
+		if v.co.x != SEAM_COLUMN:
+			continue
+		left = [ l for l in v.link_loops if l.face.calc_center_median().x < SEAM_COLUMN ]
+		right = [ l for l in v.link_loops if l.face.calc_center_median().x > SEAM_COLUMN ]
+		assert all( uv_halfedges.coincident( left[0], l ) for l in left )
+		assert all( uv_halfedges.coincident( right[0], l ) for l in right )
+		assert not uv_halfedges.coincident( left[0], right[0] )
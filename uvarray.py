@@ -0,0 +1,233 @@
+import bpy, bmesh
+import numpy as np
+
+#NumPy snapshot/commit of a single uv layer, plus batched uv transforms of bmesh loops.
+#rows follow the mesh loop order, which is also the order loops are visited when iterating bmesh faces and
+#their loops. a BMLoop maps to its row through selection.loop_row.
+
+
+def get_flag( uv_layer, attribute_name, loop_prop_name, out ):
+	#3.5+ stores uv pins/selection as lazily created bool attributes. when the attribute does not exist yet
+	#every loop is False, which is what out is initialized to.
+	if bpy.app.version >= ( 3, 5, 0 ):
+		collection = getattr( uv_layer, attribute_name )
+		if len( collection ) == len( out ):
+			collection.foreach_get( 'value', out )
+	else:
+		uv_layer.data.foreach_get( loop_prop_name, out )
+
+
+def set_flag( uv_layer, attribute_name, loop_prop_name, values ):
+	if bpy.app.version >= ( 3, 5, 0 ):
+		collection = getattr( uv_layer, attribute_name )
+		if len( collection ) == len( values ):
+			collection.foreach_set( 'value', values )
+			return
+		if not values.any():
+			return
+	#writing through the loop property creates the attribute when it is missing
+	uv_layer.data.foreach_set( loop_prop_name, values )
+
+
+def read_uvs( uv_layer, loop_count ):
+	#(L,2) float32 array of the uvs of a mesh datablock uv layer
+	uvs = np.empty( loop_count * 2, dtype=np.float32 )
+	if bpy.app.version >= ( 3, 5, 0 ):
+		uv_layer.uv.foreach_get( 'vector', uvs )
+	else:
+		uv_layer.data.foreach_get( 'uv', uvs )
+	uvs.shape = ( loop_count, 2 )
+	return uvs
+
+
+def write_uvs( uv_layer, uvs ):
+	#write an (L,2) uv array to a mesh datablock uv layer
+	uvs = np.ascontiguousarray( uvs, dtype=np.float32 ).ravel()
+	if bpy.app.version >= ( 3, 5, 0 ):
+		uv_layer.uv.foreach_set( 'vector', uvs )
+	else:
+		uv_layer.data.foreach_set( 'uv', uvs )
+
+
+class UVSnapshot():
+	__slots__ = ( 'object', 'uvlayer_name', 'uvs', 'pins', 'vert_select', 'edge_select', 'loop_start', 'loop_total', 'loop_face',
+		'__initial_uvs', '__initial_pins', '__initial_vert_select', '__initial_edge_select' )
+
+	def __init__( self, obj, uvlayer_name ):
+		self.object = obj
+		self.uvlayer_name = uvlayer_name
+		self.uvs = None #(L,2) float32
+		self.pins = None #(L,) bool
+		self.vert_select = None #(L,) bool
+		self.edge_select = None #(L,) bool
+		self.loop_start = None #(F,) int32
+		self.loop_total = None #(F,) int32
+		self.loop_face = None #(L,) int32 face index of every row
+
+	@classmethod
+	def capture( cls, obj, uvlayer_name=None, synced=False ):
+		#snapshot uvs, pins and uv selection of obj in one foreach_get per attribute.
+		#in edit mode the edit bmesh is first synced to the mesh datablock ( update_from_editmode ) and its face
+		#indexes are updated, unless the caller just did that ( synced ).
+		mesh = obj.data
+		if mesh.is_editmode and not synced:
+			obj.update_from_editmode()
+			bmesh.from_edit_mesh( mesh ).faces.index_update()
+
+		if uvlayer_name is None:
+			if mesh.uv_layers.active is None:
+				mesh.uv_layers.new( name='UVMap' )
+			uvlayer_name = mesh.uv_layers.active.name
+		uv_layer = mesh.uv_layers[uvlayer_name]
+
+		snap = cls( obj, uvlayer_name )
+		loop_count = len( mesh.loops )
+		face_count = len( mesh.polygons )
+
+		snap.uvs = read_uvs( uv_layer, loop_count )
+		snap.pins = np.zeros( loop_count, dtype=bool )
+		snap.vert_select = np.zeros( loop_count, dtype=bool )
+		snap.edge_select = np.zeros( loop_count, dtype=bool )
+		get_flag( uv_layer, 'pin', 'pin_uv', snap.pins )
+		get_flag( uv_layer, 'vertex_selection', 'select', snap.vert_select )
+		get_flag( uv_layer, 'edge_selection', 'select_edge', snap.edge_select )
+
+		snap.loop_start = np.empty( face_count, dtype=np.int32 )
+		snap.loop_total = np.empty( face_count, dtype=np.int32 )
+		mesh.polygons.foreach_get( 'loop_start', snap.loop_start )
+		mesh.polygons.foreach_get( 'loop_total', snap.loop_total )
+		snap.loop_face = np.repeat( np.arange( face_count, dtype=np.int32 ), snap.loop_total )
+
+		snap.__initial_uvs = snap.uvs.copy()
+		snap.__initial_pins = snap.pins.copy()
+		snap.__initial_vert_select = snap.vert_select.copy()
+		snap.__initial_edge_select = snap.edge_select.copy()
+		return snap
+
+	def face_rows( self, face_indexes ):
+		#row indexes of every loop of the faces in face_indexes
+		face_indexes = np.asarray( face_indexes, dtype=np.int64 )
+		starts = self.loop_start[face_indexes]
+		totals = self.loop_total[face_indexes]
+		offsets = np.arange( totals.sum() ) - np.repeat( np.cumsum( totals ) - totals, totals )
+		return np.repeat( starts, totals ) + offsets
+
+	def island_rows( self, face_groups ):
+		#(K,) rows of every loop of the face index groups and the (K,) group of each row
+		face_groups = [ np.asarray( g, dtype=np.int64 ) for g in face_groups ]
+		if len( face_groups ) == 0:
+			return np.zeros( 0, dtype=np.int64 ), np.zeros( 0, dtype=np.int64 )
+		face_indexes = np.concatenate( face_groups )
+		face_ids = np.repeat( np.arange( len( face_groups ) ), [ len( g ) for g in face_groups ] )
+		return self.face_rows( face_indexes ), np.repeat( face_ids, self.loop_total[face_indexes] )
+
+	def bounds( self, rows, island_ids, count ):
+		#(count,4) min_u, min_v, max_u, max_v of the uvs of rows per island
+		bounds = np.empty( ( count, 4 ), dtype=np.float64 )
+		bounds[:,0:2] = np.inf
+		bounds[:,2:4] = -np.inf
+		uvs = self.uvs[rows]
+		np.minimum.at( bounds[:,0], island_ids, uvs[:,0] )
+		np.minimum.at( bounds[:,1], island_ids, uvs[:,1] )
+		np.maximum.at( bounds[:,2], island_ids, uvs[:,0] )
+		np.maximum.at( bounds[:,3], island_ids, uvs[:,1] )
+		return bounds
+
+	def transform( self, rows, island_ids, mats ):
+		#apply mats[i] ( a 2x3 affine ) to the uvs of the rows of island i
+		apply_affine( self.uvs, rows, island_ids, mats )
+
+	def changed_rows( self ):
+		#rows where any snapshot array differs from its captured state
+		changed = np.any( self.uvs != self.__initial_uvs, axis=1 )
+		changed |= self.pins != self.__initial_pins
+		changed |= self.vert_select != self.__initial_vert_select
+		changed |= self.edge_select != self.__initial_edge_select
+		return np.flatnonzero( changed )
+
+	@property
+	def dirty( self ):
+		return len( self.changed_rows() ) > 0
+
+	def commit( self ):
+		#write changed rows back to blender. returns the number of rows written.
+		rows = self.changed_rows()
+		if len( rows ) == 0:
+			return 0
+
+		mesh = self.object.data
+		if mesh.is_editmode:
+			#the edit bmesh owns the data in edit mode, so only the changed rows are written through it
+			bm = bmesh.from_edit_mesh( mesh )
+			bm.faces.ensure_lookup_table()
+			uvlayer = bm.loops.layers.uv[self.uvlayer_name]
+			faces = bm.faces
+			for row in rows.tolist():
+				fidx = self.loop_face[row]
+				luv = faces[fidx].loops[row - self.loop_start[fidx]][uvlayer]
+				luv.uv = self.uvs[row]
+				luv.pin_uv = bool( self.pins[row] )
+				luv.select = bool( self.vert_select[row] )
+				luv.select_edge = bool( self.edge_select[row] )
+			bmesh.update_edit_mesh( mesh, loop_triangles=False, destructive=False )
+		else:
+			uv_layer = mesh.uv_layers[self.uvlayer_name]
+			write_uvs( uv_layer, self.uvs )
+			set_flag( uv_layer, 'pin', 'pin_uv', self.pins )
+			set_flag( uv_layer, 'vertex_selection', 'select', self.vert_select )
+			set_flag( uv_layer, 'edge_selection', 'select_edge', self.edge_select )
+			mesh.update()
+
+		self.__initial_uvs[rows] = self.uvs[rows]
+		self.__initial_pins[rows] = self.pins[rows]
+		self.__initial_vert_select[rows] = self.vert_select[rows]
+		self.__initial_edge_select[rows] = self.edge_select[rows]
+		return len( rows )
+
+	def revert( self ):
+		#discard uncommitted changes
+		self.uvs[:] = self.__initial_uvs
+		self.pins[:] = self.__initial_pins
+		self.vert_select[:] = self.__initial_vert_select
+		self.edge_select[:] = self.__initial_edge_select
+
+
+def apply_affine( uvs, rows, island_ids, mats ):
+	#batched per island affine. uvs is an (L,2) array updated in place, rows are the (K,) rows to transform,
+	#island_ids the (K,) island of each row and mats an (I,2,3) stack of island transforms.
+	mats = np.asarray( mats, dtype=np.float64 ).reshape( -1, 2, 3 )
+	m = mats[island_ids]
+	p = uvs[rows]
+	uvs[rows] = np.einsum( 'kij,kj->ki', m[:,:,0:2], p ) + m[:,:,2]
+
+
+def gather_loop_uvs( loops, uvlayer ):
+	#(K,2) float64 array of the uvs of a sequence of BMLoops
+	return np.fromiter( ( c for l in loops for c in l[uvlayer].uv ), dtype=np.float64, count=len( loops ) * 2 ).reshape( -1, 2 )
+
+
+def read_bmesh_uvs( bm, uvlayer ):
+	#(L,2) float64 uvs of every loop of a bmesh in mesh loop order and the (F,) loop_start of its faces.
+	#these match the mesh datablock the bmesh is written to.
+	loop_total = np.fromiter( ( len( f.loops ) for f in bm.faces ), dtype=np.int64, count=len( bm.faces ) )
+	loop_start = np.cumsum( loop_total ) - loop_total
+	return gather_loop_uvs( [ l for f in bm.faces for l in f.loops ], uvlayer ), loop_start
+
+
+def scatter_loop_uvs( loops, uvlayer, uvs ):
+	for l, uv in zip( loops, uvs.tolist() ):
+		l[uvlayer].uv = uv
+
+
+def transform_islands( loop_groups, uvlayer, mats ):
+	#apply mats[i] ( a 2x3 affine ) to every BMLoop of loop_groups[i] in a single gather/matmul/scatter.
+	#loop groups must not share loops. bmesh can only be read and written a loop at a time, so operators that work
+	#on whole islands of the mesh should go through a UVSnapshot instead.
+	loop_groups = [ list( g ) for g in loop_groups ]
+	if len( loop_groups ) == 0:
+		return
+	loops = [ l for g in loop_groups for l in g ]
+	island_ids = np.repeat( np.arange( len( loop_groups ) ), [ len( g ) for g in loop_groups ] )
+	uvs = gather_loop_uvs( loops, uvlayer )
+	apply_affine( uvs, np.arange( len( loops ) ), island_ids, mats )
+	scatter_loop_uvs( loops, uvlayer, uvs )
@@ -3,6 +3,8 @@ import rmlib
 import gpu
 from gpu_extras.batch import batch_for_shader
 from bpy_extras.view3d_utils import region_2d_to_vector_3d, region_2d_to_location_3d
+import numpy as np
+from . import redocache, selection, uvarray
 
 class Bounds2D():
 	size = 6.0
@@ -210,36 +212,6 @@ class BoundsHandle():
 							region.tag_redraw()
 
 
-def GetUnsyncUVVisibleFaces( rmmesh, sel_mode ):
-	visible_faces = rmlib.rmPolygonSet()
-	if sel_mode[0]:		
-		for f in rmmesh.bmesh.faces:
-			if f.hide:
-				continue
-			visible = True
-			for v in f.verts:
-				if not v.select:
-					visible = False
-					break
-			if visible:
-				visible_faces.append( f )
-	elif sel_mode[1]:
-		for f in rmmesh.bmesh.faces:
-			if f.hide:
-				continue
-			visible = True
-			for e in f.edges:
-				if not e.select:
-					visible = False
-					break
-			if visible:
-				visible_faces.append( f )
-	else:
-		visible_faces = rmlib.rmPolygonSet.from_selection( rmmesh )
-		
-	return visible_faces
-
-
 def GetLoopSelection( context, rmmesh, uvlayer ):
 	sel_mode = context.tool_settings.mesh_select_mode[:]
 	sel_sync = context.tool_settings.use_uv_select_sync
@@ -260,31 +232,21 @@ def GetLoopSelection( context, rmmesh, uvlayer ):
 			return rmlib.rmUVLoopSet( loopset, uvlayer=uvlayer )
 
 	else:
-		visible_faces = GetUnsyncUVVisibleFaces( rmmesh, sel_mode )
+		visible_faces = selection.visible_face_mask( rmmesh, sel_mode )
 		uv_sel_mode = context.tool_settings.uv_select_mode
 		if uv_sel_mode == 'VERTEX':
-			loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=rmmesh, uvlayer=uvlayer )
-			visible_loop_selection = rmlib.rmUVLoopSet( uvlayer=uvlayer )
-			for l in loop_selection:
-				if l.face in visible_faces:
-					visible_loop_selection.append( l )
+			visible_loop_selection = selection.visible_uv_loops( rmmesh, uvlayer, visible_faces )
 			return visible_loop_selection
 
 		elif uv_sel_mode == 'EDGE':
-			loop_selection = rmlib.rmUVLoopSet.from_edge_selection( rmmesh=rmmesh, uvlayer=uvlayer )
 			visible_loop_selection = rmlib.rmUVLoopSet( uvlayer=uvlayer )
-			for l in loop_selection:
-				if l.face in visible_faces:
-					visible_loop_selection.append( l )
-					visible_loop_selection.append( l.link_loop_next )
+			for l in selection.visible_uv_loops( rmmesh, uvlayer, visible_faces, edge=True ):
+				visible_loop_selection.append( l )
+				visible_loop_selection.append( l.link_loop_next )
 			return visible_loop_selection
 
 		elif uv_sel_mode == 'FACE':
-			loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=rmmesh, uvlayer=uvlayer )
-			visible_loop_selection = rmlib.rmUVLoopSet( uvlayer=uvlayer )
-			for l in loop_selection:
-				if l.face in visible_faces:
-					visible_loop_selection.append( l )
+			visible_loop_selection = selection.visible_uv_loops( rmmesh, uvlayer, visible_faces )
 			return visible_loop_selection
 
 	return rmlib.rmUVLoopSet( [], uvlayer=uvlayer )
@@ -324,19 +286,14 @@ class MESH_OT_uvboundstransform( bpy.types.Operator ):
 		if not MESH_OT_uvboundstransform.BOUNDS_RENDER:
 			return { 'CANCELLED' }
 
-		bpy.ops.object.mode_set( mode='OBJECT', toggle=False )
-		
-		#fetch bmesh member and wrap in rmMesh to get loop selection
-		bm = self.bmesh.copy()
-		rmmesh = rmlib.rmMesh.from_bmesh( context.active_object, bm )
-		if rmmesh is None:
-			bpy.ops.object.mode_set( mode='EDIT', toggle=False )
-			return { 'CANCELLED' }
-		uvlayer = rmmesh.active_uv
-		loop_selection = GetLoopSelection( context, rmmesh, uvlayer )
-		if len( loop_selection ) < 2:
-			bpy.ops.object.mode_set( mode='EDIT', toggle=False )
-			return { 'CANCELLED' }
+		#the selection and the uvs it starts from are read once, each update only writes the transformed uvs
+		inputs = getattr( self, 'inputs', None )
+		if inputs is None:
+			inputs = self.selection_inputs( context )
+			if inputs is None:
+				return { 'CANCELLED' }
+			self.inputs = inputs
+		rows, uvlayer_name, base_uvs = inputs
 
 		#fetch tool bounding box from BOUNDS_RENDER
 		tool_bounds = MESH_OT_uvboundstransform.BOUNDS_RENDER.bounds
@@ -347,51 +304,45 @@ class MESH_OT_uvboundstransform( bpy.types.Operator ):
 		tool_center = ( uvmin + uvmax ) * 0.5
 
 		#compute loop_selection bounding box
-		loop_sel_min = loop_selection[0][uvlayer].uv.copy()
-		loop_sel_max = loop_selection[0][uvlayer].uv.copy()
-		for l in loop_selection:
-			uvcoord = l[uvlayer].uv.copy()
-			for i in range( 2 ):
-				if uvcoord[i] < loop_sel_min[i]:
-					loop_sel_min[i] = uvcoord[i]
-				if uvcoord[i] > loop_sel_max[i]:
-					loop_sel_max[i] = uvcoord[i]
+		selected_uvs = base_uvs[rows]
+		loop_sel_min = selected_uvs.min( axis=0 ).tolist()
+		loop_sel_max = selected_uvs.max( axis=0 ).tolist()
 		loop_sel_width = loop_sel_max[0] - loop_sel_min[0]
 		loop_sel_height = loop_sel_max[1] - loop_sel_min[1]
-		loop_sel_center = ( loop_sel_max + loop_sel_min ) * 0.5
+		loop_sel_center = ( ( loop_sel_max[0] + loop_sel_min[0] ) * 0.5, ( loop_sel_max[1] + loop_sel_min[1] ) * 0.5 )
 
 		#compute transformation matrix
-		trans_mat = mathutils.Matrix.Identity( 3 )
-		trans_mat[0][2] = loop_sel_center[0] * -1.0
-		trans_mat[1][2] = loop_sel_center[1] * -1.0
-		
-		trans_mat_inverse = mathutils.Matrix.Identity( 3 )
-		trans_mat_inverse[0][2] = tool_center[0]
-		trans_mat_inverse[1][2] = tool_center[1]
-		
-		scl_mat = mathutils.Matrix.Identity( 3 )
-		scl_mat[0][0] = tool_width / loop_sel_width
-		scl_mat[1][1] = tool_height / loop_sel_height
-
-		mat = trans_mat_inverse @ scl_mat @ trans_mat
+		scl_x = tool_width / loop_sel_width
+		scl_y = tool_height / loop_sel_height
+		mat = ( ( scl_x, 0.0, tool_center[0] - scl_x * loop_sel_center[0] ),
+				( 0.0, scl_y, tool_center[1] - scl_y * loop_sel_center[1] ) )
 
 		#transform uv coords
-		for l in loop_selection:
-			uv = mathutils.Vector( l[uvlayer].uv.copy() ).to_3d()
-			uv[2] = 1.0
-			uv = mat @ uv
-			l[uvlayer].uv = uv.to_2d()
+		uvs = base_uvs.copy()
+		uvarray.apply_affine( uvs, rows, np.zeros( len( rows ), dtype=np.int64 ), [ mat ] )
 
-		#commit bmesh to mesh obj
+		#commit uvs to mesh obj
+		bpy.ops.object.mode_set( mode='OBJECT', toggle=False )
 		targetMesh = context.active_object.data
-		bm.to_mesh( targetMesh )
+		uvarray.write_uvs( targetMesh.uv_layers[uvlayer_name], uvs )
 		targetMesh.update()
-		bm.free()
 		
 		bpy.ops.object.mode_set( mode='EDIT', toggle=False )
 		
 		return { 'FINISHED' }
 
+	def selection_inputs( self, context ):
+		#rows of the selected loops, and the uvs of the whole mesh when the tool was invoked
+		rmmesh = rmlib.rmMesh.from_bmesh( context.active_object, self.bmesh )
+		uvlayer = rmmesh.active_uv
+		loop_selection = GetLoopSelection( context, rmmesh, uvlayer )
+		if len( loop_selection ) < 2:
+			return None
+		self.bmesh.faces.index_update()
+		base_uvs, loop_start = uvarray.read_bmesh_uvs( self.bmesh, uvlayer )
+		rows = np.unique( redocache.IslandLoops( [ loop_selection ] ).rows( loop_start ) )
+		return ( rows, uvlayer.name, base_uvs )
+
 	def InitBoundsRender( self, context, event ):
 		#compute a bbox from the uv selection
 		rmmesh = rmlib.rmMesh.from_bmesh( context.active_object, self.bmesh )
@@ -1,5 +1,6 @@
 import bpy, mathutils
 import rmlib
+from . import editscope, uvweld
 
 def uv_border_edge( uvlayer, loop ):
 	if loop.edge.is_boundary:
@@ -16,7 +17,7 @@ def uv_border_edge( uvlayer, loop ):
 	return False
 		
 
-def shrink_face_loop( uvlayer, loops ):
+def shrink_face_loop( scope, uvlayer, loops ):
 	included_faces = set( [ l.face for l in loops ] )
 	
 	'''
@@ -61,35 +62,32 @@ def shrink_face_loop( uvlayer, loops ):
 	if len( fully_selected_faces ) == len( included_faces ):
 		#shrink to next sequence of loops
 		excluded_faces = set()
+		weld = uvweld.from_loops( loops, uvlayer )
 		for l in loops:
-			uvcoord = mathutils.Vector( l[uvlayer].uv )
 			deselect = False
-			deselect_loops = set()
-			for n_l in l.vert.link_loops:
-				n_uvcoord = mathutils.Vector( n_l[uvlayer].uv )
-				if rmlib.AlmostEqual_v2( uvcoord, n_uvcoord ):
-					deselect_loops.add( n_l )
-					if not n_l[uvlayer].select:
-						deselect = True
+			deselect_loops = weld.welded( l )
+			for n_l in deselect_loops:
+				if not n_l[uvlayer].select:
+					deselect = True
 			if deselect:
 				excluded_faces.add( l.face )
 				for d_l in deselect_loops:
-					d_l[uvlayer].select = False	
+					scope.set( d_l[uvlayer], 'select', False )
 		for f in excluded_faces:
 			for l in f.loops:
-				l[uvlayer].select_edge = False		
+				scope.set( l[uvlayer], 'select_edge', False )
 	else:
 		#shrink to only fully_selected_faces
 		for l in loops:
-				l[uvlayer].select = False
-				l[uvlayer].select_edge = False
+			if l.face not in fully_selected_faces:
+				scope.set( l[uvlayer], 'select', False )
+				scope.set( l[uvlayer], 'select_edge', False )
 		for f in fully_selected_faces:
 			for l in f.loops:
-				l[uvlayer].select = True
-				l[uvlayer].select_edge = True
+				scope.set( l[uvlayer], 'select_edge', True )
 				
 				
-def grow_face_loop( uvlayer, loops ):
+def grow_face_loop( scope, uvlayer, loops ):
 	included_faces = set( [ l.face for l in loops ] )
 	fully_selected_faces = set()
 	for f in included_faces:
@@ -102,20 +100,16 @@ def grow_face_loop( uvlayer, loops ):
 			
 	if len( fully_selected_faces ) == len( included_faces ):
 		#get next sequence of loops
+		weld = uvweld.from_loops( loops, uvlayer )
 		for l in loops:
-			uvcoord = mathutils.Vector( l[uvlayer].uv )
-			for n_l in l.vert.link_loops:
-				if n_l[uvlayer].select or l == n_l:
-					continue
-				n_uvcoord = mathutils.Vector( n_l[uvlayer].uv )
-				if rmlib.AlmostEqual_v2( uvcoord, n_uvcoord ):
-					n_l[uvlayer].select = True
+			for n_l in weld.welded( l ):
+				scope.set( n_l[uvlayer], 'select', True )
 	else:
 		#fill loop selection
 		for f in included_faces:
 			for l in f.loops:
-				l[uvlayer].select = True
-				l[uvlayer].select_edge = True
+				scope.set( l[uvlayer], 'select', True )
+				scope.set( l[uvlayer], 'select_edge', True )
 
 
 class MESH_OT_uvgrowshrink( bpy.types.Operator ):
@@ -153,20 +147,20 @@ class MESH_OT_uvgrowshrink( bpy.types.Operator ):
 		else:				
 			if self.mode == 'GROW':
 				if sel_mode_uv == 'FACE':
-					with rmmesh as rmmesh:
-						rmmesh.readonly = True
-						uvlayer = rmmesh.active_uv
-						loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=rmmesh, uvlayer=uvlayer )
-						grow_face_loop( uvlayer, loop_selection )
+					with editscope.EditScope( rmmesh ) as scope:
+						uvlayer = scope.rmmesh.active_uv
+						loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=scope.rmmesh, uvlayer=uvlayer )
+						grow_face_loop( scope, uvlayer, loop_selection )
+					return scope.result()
 				else:
 					bpy.ops.uv.select_more()
 			else:
 				if sel_mode_uv == 'FACE':
-					with rmmesh as rmmesh:
-						rmmesh.readonly = True
-						uvlayer = rmmesh.active_uv
-						loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=rmmesh, uvlayer=uvlayer )
-						shrink_face_loop( uvlayer, loop_selection )
+					with editscope.EditScope( rmmesh ) as scope:
+						uvlayer = scope.rmmesh.active_uv
+						loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=scope.rmmesh, uvlayer=uvlayer )
+						shrink_face_loop( scope, uvlayer, loop_selection )
+					return scope.result()
 				else:
 					bpy.ops.uv.select_less()
 
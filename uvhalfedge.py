@@ -0,0 +1,160 @@
+import numpy as np
+from . import islandlabel, islandtable, selection
+
+#uv half-edges: every loop is the half-edge running from its vert to the vert of link_loop_next. its twin is the loop
+#of another face on the same edge running the other way, or -1 when there is none and the loop is a boundary.
+#twins are stored per loop row ( see selection.loop_row ), so boundary tests and loop/ring walks are array lookups
+#instead of rescanning the faces around an edge.
+
+
+def continuous_twins( loop_start, loop_total, loop_verts, loop_edges, uvs, epsilon=islandlabel.UV_EPSILON, welds=None ):
+	#(L,) twin row of every loop row, joining loops across an edge only when the uvs of both ends coincide
+	#( the test edge_continuous does ). -1 marks uv boundaries. welds are the (L,) islandlabel.weld_ids of the loops
+	#when the caller already has them.
+	loop_start = np.asarray( loop_start, dtype=np.int64 )
+	loop_total = np.asarray( loop_total, dtype=np.int64 )
+	loop_edges = np.asarray( loop_edges, dtype=np.int64 )
+	loop_count = len( loop_edges )
+	if loop_count == 0:
+		return np.zeros( 0, dtype=np.int64 )
+	loop_face = np.repeat( np.arange( len( loop_start ), dtype=np.int64 ), loop_total )
+	next_rows = np.arange( 1, loop_count + 1 )
+	next_rows[loop_start + loop_total - 1] = loop_start
+	if welds is None:
+		welds = islandlabel.weld_ids( [ loop_verts ], uvs, epsilon )
+
+	#a loop's twin is a loop whose forward key equals the loop's reversed key
+	forward = ( loop_edges, welds, welds[next_rows] )
+	reverse = ( loop_edges, welds[next_rows], welds )
+	ids, _, _ = islandlabel.group_ids( [ np.concatenate( ( f, r ) ) for f, r in zip( forward, reverse ) ] )
+	forward_ids = ids[:loop_count]
+	reverse_ids = ids[loop_count:]
+
+	group_count = int( ids.max() ) + 1
+	counts = np.bincount( forward_ids, minlength=group_count )
+	forward_order = np.argsort( forward_ids, kind='stable' )
+	group_starts = np.zeros( group_count, dtype=np.int64 )
+	np.cumsum( counts[:-1], out=group_starts[1:] )
+
+	#a degenerate uv edge matches its own reversed key, so the second candidate of a group is tried as well
+	twins = np.full( loop_count, -1, dtype=np.int64 )
+	candidate_counts = counts[reverse_ids]
+	for k in ( 1, 0 ):
+		has = candidate_counts > k
+		candidates = np.full( loop_count, -1, dtype=np.int64 )
+		candidates[has] = forward_order[group_starts[reverse_ids[has]] + k]
+		valid = has.copy()
+		valid[has] = loop_face[candidates[has]] != loop_face[has]
+		twins[valid] = candidates[valid]
+	return twins
+
+
+class HalfEdgeWalk():
+	#boundary walks shared by the half-edge tables, which provide twin( loop ) and is_boundary( loop )
+	__slots__ = ()
+
+	def next_boundary_loop( self, loop ):
+		#walk forward around the vert at the end of loop until the next boundary loop
+		next_loop = loop.link_loop_next
+		while not self.is_boundary( next_loop ):
+			next_loop = self.twin( next_loop ).link_loop_next
+			if next_loop == loop.link_loop_next:
+				break
+		return next_loop
+
+	def prev_boundary_loops( self, loop ):
+		#walk backward around the vert of loop. returns every loop passed, ending at the previous boundary loop.
+		prev_loops = [ loop.link_loop_prev ]
+		while not self.is_boundary( prev_loops[-1] ):
+			prev_loop = self.twin( prev_loops[-1] ).link_loop_prev
+			if prev_loop == prev_loops[0]:
+				break
+			prev_loops.append( prev_loop )
+		return prev_loops
+
+
+class UVHalfEdges( HalfEdgeWalk ):
+	#twins ( and uv vert weld ids when built from an IslandTable ) of the loops of one bmesh.
+	#a loop's row is the loop_start of its face plus its corner, the inverse of loop( row ). BMFace.index must match
+	#the mesh the arrays were read from, which selection.sync ensures.
+	__slots__ = ( 'twins', 'weld_ids', '__faces', '__loop_face', '__loop_start' )
+
+	def __init__( self, bm, twins, loop_face, loop_start, weld_ids=None ):
+		bm.faces.ensure_lookup_table()
+		self.__faces = bm.faces
+		self.twins = twins #(L,) int64
+		self.weld_ids = weld_ids #(L,) int64
+		self.__loop_face = loop_face #(L,) int64
+		self.__loop_start = loop_start #(F,) int64
+
+	def loop( self, row ):
+		f = int( self.__loop_face[row] )
+		return self.__faces[f].loops[row - int( self.__loop_start[f] )]
+
+	def row( self, loop ):
+		return selection.loop_row( loop, self.__loop_start )
+
+	def twin( self, loop ):
+		row = self.twins[self.row( loop )]
+		if row < 0:
+			return None
+		return self.loop( row )
+
+	def is_boundary( self, loop ):
+		return self.twins[self.row( loop )] < 0
+
+	def coincident( self, l1, l2 ):
+		#True when l1 and l2 share a uv vert
+		return self.weld_ids[self.row( l1 )] == self.weld_ids[self.row( l2 )]
+
+
+def get( rmmesh, uvlayer ):
+	#uv continuous half-edges of the whole mesh. the arrays are cached on the IslandTable of rmmesh, so they are only
+	#recomputed when the mesh or its uvs change.
+	table = islandtable.get( rmmesh, uvlayer )
+	if table.twins is None:
+		table.weld_ids = islandlabel.weld_ids( [ table.loop_verts ], table.uvs )
+		table.twins = continuous_twins( table.loop_start, table.loop_total, table.loop_verts, table.loop_edges, table.uvs, welds=table.weld_ids )
+	loop_face = np.repeat( np.arange( len( table.loop_start ), dtype=np.int64 ), table.loop_total )
+	return UVHalfEdges( rmmesh.bmesh, table.twins, loop_face, table.loop_start, table.weld_ids )
+
+
+class FaceHalfEdges( HalfEdgeWalk ):
+	#topological twins of the loops of a set of faces, keyed by BMLoop so building them only touches those faces
+	__slots__ = ( 'twins', )
+
+	def __init__( self, twins ):
+		self.twins = twins #BMLoop -> twin BMLoop, loops without a twin are left out
+
+	def twin( self, loop ):
+		return self.twins.get( loop )
+
+	def is_boundary( self, loop ):
+		return loop not in self.twins
+
+
+def from_faces( rmmesh, faces, split_seams=True ):
+	#topological half-edges restricted to faces. an edge has no twin when it is a mesh boundary, a seam
+	#( with split_seams ) or borders a face outside of faces. only the loops of faces are visited.
+	face_set = set( faces )
+	twins = {}
+	for f in face_set:
+		for l in f.loops:
+			e = l.edge
+			if e.is_boundary or ( split_seams and e.seam ):
+				continue
+			twin = None
+			for nf in e.link_faces:
+				if nf == f:
+					continue
+				if nf not in face_set:
+					twin = None
+					break
+				if twin is None:
+					for nl in nf.loops:
+						if nl.edge == e:
+							twin = nl
+							break
+			if twin is not None:
+				twins[l] = twin
+	return FaceHalfEdges( twins )
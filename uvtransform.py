@@ -2,6 +2,8 @@ import bpy, mathutils
 from bpy.app.handlers import persistent
 import rmlib
 import math, os, random
+import numpy as np
+from . import editscope, instrument, redocache, selection, uvarray
 
 ANCHOR_PROP_LIST = ( 'uv_anchor_nw', 'uv_anchor_n', 'uv_anchor_ne',
 			'uv_anchor_w', 'uv_anchor_c', 'uv_anchor_e',
@@ -13,31 +15,6 @@ STATE_PROP_LIST = ( 'uv_state_ctrl', 'uv_state_shift', 'uv_state_alt' )
 
 def GetLoopGroups( context, rmmesh, uvlayer, local ):
 	sel_mode = context.tool_settings.mesh_select_mode[:]
-	visible_faces = rmlib.rmPolygonSet()
-	if sel_mode[0]:		
-		for f in rmmesh.bmesh.faces:
-			if f.hide:
-				continue
-			visible = True
-			for v in f.verts:
-				if not v.select:
-					visible = False
-					break
-			if visible:
-				visible_faces.append( f )
-	elif sel_mode[1]:
-		for f in rmmesh.bmesh.faces:
-			if f.hide:
-				continue
-			visible = True
-			for e in f.edges:
-				if not e.select:
-					visible = False
-					break
-			if visible:
-				visible_faces.append( f )
-	else:
-		visible_faces = rmlib.rmPolygonSet.from_selection( rmmesh )
 
 	loop_groups = []
 	sel_sync = context.tool_settings.use_uv_select_sync
@@ -70,21 +47,14 @@ def GetLoopGroups( context, rmmesh, uvlayer, local ):
 				loop_groups.append( loop_selection )
 
 	else:
+		visible_faces = selection.visible_face_mask( rmmesh, sel_mode )
 		sel_mode = context.tool_settings.uv_select_mode
 		if sel_mode == 'VERTEX' and local:
-			loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=rmmesh, uvlayer=uvlayer )
-			visible_loop_selection = rmlib.rmUVLoopSet( uvlayer=uvlayer )
-			for l in loop_selection:
-				if l.face in visible_faces:
-					visible_loop_selection.append( l )
+			visible_loop_selection = selection.visible_uv_loops( rmmesh, uvlayer, visible_faces )
 			loop_groups += visible_loop_selection.group_vertices()
 			
 		elif sel_mode == 'EDGE':
-			loop_selection = rmlib.rmUVLoopSet.from_edge_selection( rmmesh=rmmesh, uvlayer=uvlayer )
-			visible_loop_selection = rmlib.rmUVLoopSet( uvlayer=uvlayer )
-			for l in loop_selection:
-				if l.face in visible_faces:
-					visible_loop_selection.append( l )
+			visible_loop_selection = selection.visible_uv_loops( rmmesh, uvlayer, visible_faces, edge=True )
 			if local:
 				loop_groups = visible_loop_selection.group_edges()
 				for i in range( len( loop_groups ) ):
@@ -95,28 +65,55 @@ def GetLoopGroups( context, rmmesh, uvlayer, local ):
 
 
 		elif sel_mode == 'FACE' and local:
-			loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=rmmesh, uvlayer=uvlayer )
-			visible_loop_selection = rmlib.rmUVLoopSet( uvlayer=uvlayer )
-			for l in loop_selection:
-				if l.face in visible_faces:
-					visible_loop_selection.append( l )
+			visible_loop_selection = selection.visible_uv_loops( rmmesh, uvlayer, visible_faces )
 			loop_groups += visible_loop_selection.group_faces()
 
 		else:
-			loop_selection = rmlib.rmUVLoopSet.from_selection( rmmesh=rmmesh, uvlayer=uvlayer )
-			visible_loop_selection = rmlib.rmUVLoopSet( uvlayer=uvlayer )
-			for l in loop_selection:
-				if l.face in visible_faces:
-					visible_loop_selection.append( l )
+			visible_loop_selection = selection.visible_uv_loops( rmmesh, uvlayer, visible_faces )
 			loop_groups = [ visible_loop_selection ]
 
 	for i in range( len( loop_groups ) - 1, -1, -1 ):
 		if len( loop_groups[i] ) == 0:
 			loop_groups.pop( i )
 
+	if local:
+		instrument.count_islands( len( loop_groups ) )
 	return loop_groups
 
 
+def GetMultiLoopGroups( context, scopes, local ):
+	#loop groups of every mesh in edit mode. a group is a list of ( scope, uvlayer, loops ) parts. in local mode
+	#each island is a group of its own, otherwise the selections of all meshes form one group that shares its bounds.
+	parts = []
+	for scope in scopes:
+		if len( scope.rmmesh.bmesh.loops.layers.uv ) == 0:
+			continue
+		uvlayer = scope.rmmesh.active_uv
+		parts += [ ( scope, uvlayer, g ) for g in GetLoopGroups( context, scope.rmmesh, uvlayer, local ) ]
+	if local:
+		return [ [ part ] for part in parts ]
+	if len( parts ) == 0:
+		return []
+	return [ parts ]
+
+
+def GetGroupUVBounds( group ):
+	bbmin, bbmax = GetUVBounds( group[0][2], group[0][1] )
+	for scope, uvlayer, loops in group[1:]:
+		part_min, part_max = GetUVBounds( loops, uvlayer )
+		bbmin = mathutils.Vector( ( min( bbmin[0], part_min[0] ), min( bbmin[1], part_min[1] ) ) )
+		bbmax = mathutils.Vector( ( max( bbmax[0], part_max[0] ), max( bbmax[1], part_max[1] ) ) )
+	return ( bbmin, bbmax )
+
+
+def GetContinuousLoops( context, loops ):
+	#with Move Continuous enabled a transform takes the uv connected elements of the selection along
+	if context.scene.rmkituv_props.uvtransformprops.uv_fit_movecontinuous:
+		loops = loops.group_vertices( element=True )[0]
+		loops.add_overlapping_loops( True )
+	return loops
+
+
 class MESH_OT_uvmove( bpy.types.Operator ):
 	"""Move selection in uv space."""
 	bl_idname = 'mesh.rm_uvmove'
@@ -159,10 +156,6 @@ class MESH_OT_uvmove( bpy.types.Operator ):
 	'''
 
 	def execute( self, context ):
-		rmmesh = rmlib.rmMesh.GetActive( context )
-		if rmmesh is None:
-			return { 'CANCELLED' }
-		
 		'''
 		if self.__ctrl:
 			bpy.ops.mesh.rm_uvslam( "INVOKE_DEFAULT", dir=( 'l' + self.dir ) )
@@ -177,11 +170,9 @@ class MESH_OT_uvmove( bpy.types.Operator ):
 			return { 'FINISHED' }
 		'''
 		
-		with rmmesh as rmmesh:
-			uvlayer = rmmesh.active_uv
-
+		with editscope.MultiEditScope( rmlib.iter_edit_meshes( context ) ) as scopes:
 			#get loop groups	
-			groups = GetLoopGroups( context, rmmesh, uvlayer, False )
+			groups = GetMultiLoopGroups( context, scopes, False )
 			if len( groups ) == 0:
 				self.report( { 'ERROR' }, 'Nothing selected in UV View.' )
 				return { 'CANCELLED' }
@@ -201,15 +192,12 @@ class MESH_OT_uvmove( bpy.types.Operator ):
 
 			#offset loops
 			for g in groups:
-				if context.scene.rmkituv_props.uvtransformprops.uv_fit_movecontinuous:
-					g = g.group_vertices( element=True )[0]
-					g.add_overlapping_loops( True )
+				for scope, uvlayer, loops in g:
+					for l in GetContinuousLoops( context, loops ):
+						uv = mathutils.Vector( l[uvlayer].uv.copy() )
+						scope.set_uv( l[uvlayer], uv + offset_vec )
 
-				for l in g:
-					uv = mathutils.Vector( l[uvlayer].uv.copy() )
-					l[uvlayer].uv = uv + offset_vec
-
-		return { 'FINISHED' }
+		return scopes.result()
 
 
 def GetActiveAnchorStr( context ):
@@ -274,24 +262,18 @@ class MESH_OT_uvslam( bpy.types.Operator ):
 				context.object.data.is_editmode )
 
 	def execute( self, context ):
-		rmmesh = rmlib.rmMesh.GetActive( context )
-		if rmmesh is None:
-			return { 'CANCELLED' }
-		
-		with rmmesh as rmmesh:
-			uvlayer = rmmesh.active_uv
-
+		with editscope.MultiEditScope( rmlib.iter_edit_meshes( context ) ) as scopes:
 			anchor_str = GetActiveAnchorStr( context )
 
 			#get loop groups	
-			groups = GetLoopGroups( context, rmmesh, uvlayer, 'l' in self.dir )
+			groups = GetMultiLoopGroups( context, scopes, 'l' in self.dir )
 			if len( groups ) == 0:
 				self.report( { 'ERROR' }, 'Nothing selected in UV View.' )
 				return { 'CANCELLED' }
 			
 			for g in groups:
 				#compute the anchor pos
-				bbmin, bbmax = GetUVBounds( g, uvlayer )
+				bbmin, bbmax = GetGroupUVBounds( g )
 				bbcenter = ( bbmin + bbmax ) * 0.5
 
 				#compute target position
@@ -325,17 +307,14 @@ class MESH_OT_uvslam( bpy.types.Operator ):
 					if 'w' in anchor_str:
 						anchor_pos[0] = bbmin[0]
 
-				if context.scene.rmkituv_props.uvtransformprops.uv_fit_movecontinuous:
-					g = g.group_vertices( element=True )[0]
-					g.add_overlapping_loops( True )
-
 				#transform loops
-				for l in g:
-					uv = mathutils.Vector( l[uvlayer].uv.copy() )
-					uv += target_pos - anchor_pos
-					l[uvlayer].uv = uv
+				for scope, uvlayer, loops in g:
+					for l in GetContinuousLoops( context, loops ):
+						uv = mathutils.Vector( l[uvlayer].uv.copy() )
+						uv += target_pos - anchor_pos
+						scope.set_uv( l[uvlayer], uv )
 
-		return { 'FINISHED' }
+		return scopes.result()
 
 
 class MESH_OT_uvrotate( bpy.types.Operator ):
@@ -361,13 +340,7 @@ class MESH_OT_uvrotate( bpy.types.Operator ):
 				context.object.data.is_editmode )
 
 	def execute( self, context ):
-		rmmesh = rmlib.rmMesh.GetActive( context )
-		if rmmesh is None:
-			return { 'CANCELLED' }
-		
-		with rmmesh as rmmesh:
-			uvlayer = rmmesh.active_uv
-
+		with editscope.MultiEditScope( rmlib.iter_edit_meshes( context ) ) as scopes:
 			anchor_str = GetActiveAnchorStr( context )
 			
 			#compute affine transform
@@ -380,14 +353,14 @@ class MESH_OT_uvrotate( bpy.types.Operator ):
 			rot_mat = mathutils.Matrix( [ r1, r2 ] )
 
 			#get loop groups	
-			groups = GetLoopGroups( context, rmmesh, uvlayer, 'l' in self.dir )
+			groups = GetMultiLoopGroups( context, scopes, 'l' in self.dir )
 			if len( groups ) == 0:
 				self.report( { 'ERROR' }, 'Nothing selected in UV View.' )
 				return { 'CANCELLED' }
 
 			for g in groups:
 				#compute the anchor pos
-				bbmin, bbmax = GetUVBounds( g, uvlayer )
+				bbmin, bbmax = GetGroupUVBounds( g )
 				bbcenter = ( bbmin + bbmax ) * 0.5
 				anchor_pos = bbcenter.copy()
 				if 'n' in anchor_str:
@@ -399,19 +372,16 @@ class MESH_OT_uvrotate( bpy.types.Operator ):
 				if 'w' in anchor_str:
 					anchor_pos[0] = bbmin[0]
 
-				if context.scene.rmkituv_props.uvtransformprops.uv_fit_movecontinuous:
-					g = g.group_vertices( element=True )[0]
-					g.add_overlapping_loops( True )
-
 				#transform loops
-				for l in g:
-					uv = mathutils.Vector( l[uvlayer].uv )
-					uv -= anchor_pos
-					uv = rot_mat @ uv
-					uv += anchor_pos
-					l[uvlayer].uv = uv
+				for scope, uvlayer, loops in g:
+					for l in GetContinuousLoops( context, loops ):
+						uv = mathutils.Vector( l[uvlayer].uv )
+						uv -= anchor_pos
+						uv = rot_mat @ uv
+						uv += anchor_pos
+						scope.set_uv( l[uvlayer], uv )
 					
-		return { 'FINISHED' }
+		return scopes.result()
 
 
 class MESH_OT_uvscale( bpy.types.Operator ):
@@ -445,13 +415,7 @@ class MESH_OT_uvscale( bpy.types.Operator ):
 				context.object.data.is_editmode )
 
 	def execute( self, context ):
-		rmmesh = rmlib.rmMesh.GetActive( context )
-		if rmmesh is None:
-			return { 'CANCELLED' }
-		
-		with rmmesh as rmmesh:
-			uvlayer = rmmesh.active_uv
-
+		with editscope.MultiEditScope( rmlib.iter_edit_meshes( context ) ) as scopes:
 			anchor_str = GetActiveAnchorStr( context )
 			
 			#compute affine transform
@@ -467,14 +431,14 @@ class MESH_OT_uvscale( bpy.types.Operator ):
 					scl_mat[1][1] = 1.0 / scl_mat[1][1]
 			
 			#get loop groups	
-			groups = GetLoopGroups( context, rmmesh, uvlayer, 'l' in self.dir )
+			groups = GetMultiLoopGroups( context, scopes, 'l' in self.dir )
 			if len( groups ) == 0:
 				self.report( { 'ERROR' }, 'Nothing selected in UV View.' )
 				return { 'CANCELLED' }
 			
 			for g in groups:
 				#compute the anchor pos
-				bbmin, bbmax = GetUVBounds( g, uvlayer )
+				bbmin, bbmax = GetGroupUVBounds( g )
 				bbcenter = ( bbmin + bbmax ) * 0.5
 				anchor_pos = bbcenter.copy()
 				if 'n' in anchor_str:
@@ -486,19 +450,16 @@ class MESH_OT_uvscale( bpy.types.Operator ):
 				if 'w' in anchor_str:
 					anchor_pos[0] = bbmin[0]
 
-				if context.scene.rmkituv_props.uvtransformprops.uv_fit_movecontinuous:
-					g = g.group_vertices( element=True )[0]
-					g.add_overlapping_loops( True )
-
 				#transform loops
-				for l in g:
-					uv = mathutils.Vector( l[uvlayer].uv )
-					uv -= anchor_pos
-					uv = scl_mat @ uv
-					uv += anchor_pos
-					l[uvlayer].uv = uv
+				for scope, uvlayer, loops in g:
+					for l in GetContinuousLoops( context, loops ):
+						uv = mathutils.Vector( l[uvlayer].uv )
+						uv -= anchor_pos
+						uv = scl_mat @ uv
+						uv += anchor_pos
+						scope.set_uv( l[uvlayer], uv )
 					
-		return { 'FINISHED' }
+		return scopes.result()
 
 
 class MESH_OT_uvflip( bpy.types.Operator ):
@@ -524,13 +485,7 @@ class MESH_OT_uvflip( bpy.types.Operator ):
 				context.object.data.is_editmode )
 
 	def execute( self, context ):
-		rmmesh = rmlib.rmMesh.GetActive( context )
-		if rmmesh is None:
-			return { 'CANCELLED' }
-		
-		with rmmesh as rmmesh:
-			uvlayer = rmmesh.active_uv
-
+		with editscope.MultiEditScope( rmlib.iter_edit_meshes( context ) ) as scopes:
 			anchor_str = GetActiveAnchorStr( context )
 			
 			#compute affine transform
@@ -541,14 +496,14 @@ class MESH_OT_uvflip( bpy.types.Operator ):
 				scl_mat[1][1] *= -1.0
 			
 			#get loop groups	
-			groups = GetLoopGroups( context, rmmesh, uvlayer, 'l' in self.dir )
+			groups = GetMultiLoopGroups( context, scopes, 'l' in self.dir )
 			if len( groups ) == 0:
 				self.report( { 'ERROR' }, 'Nothing selected in UV View.' )
 				return { 'CANCELLED' }
 			
 			for g in groups:
 				#compute the anchor pos
-				bbmin, bbmax = GetUVBounds( g, uvlayer )
+				bbmin, bbmax = GetGroupUVBounds( g )
 				bbcenter = ( bbmin + bbmax ) * 0.5
 				anchor_pos = bbcenter.copy()
 				if 'n' in anchor_str:
@@ -560,19 +515,16 @@ class MESH_OT_uvflip( bpy.types.Operator ):
 				if 'w' in anchor_str:
 					anchor_pos[0] = bbmin[0]
 
-				if context.scene.rmkituv_props.uvtransformprops.uv_fit_movecontinuous:
-					g = g.group_vertices( element=True )[0]
-					g.add_overlapping_loops( True )
-
 				#transform loops
-				for l in g:
-					uv = mathutils.Vector( l[uvlayer].uv )
-					uv -= anchor_pos
-					uv = scl_mat @ uv
-					uv += anchor_pos
-					l[uvlayer].uv = uv
+				for scope, uvlayer, loops in g:
+					for l in GetContinuousLoops( context, loops ):
+						uv = mathutils.Vector( l[uvlayer].uv )
+						uv -= anchor_pos
+						uv = scl_mat @ uv
+						uv += anchor_pos
+						scope.set_uv( l[uvlayer], uv )
 					
-		return { 'FINISHED' }
+		return scopes.result()
 
 
 class MESH_OT_uvfitsample( bpy.types.Operator ):
@@ -593,7 +545,8 @@ class MESH_OT_uvfitsample( bpy.types.Operator ):
 		if rmmesh is None:
 			return { 'CANCELLED' }
 		
-		with rmmesh as rmmesh:
+		with editscope.EditScope( rmmesh ) as scope:
+			rmmesh = scope.rmmesh
 			uvlayer = rmmesh.active_uv
 			
 			#get loop groups	
@@ -650,10 +603,6 @@ class MESH_OT_uvfit( bpy.types.Operator ):
 				context.object.data.is_editmode )
 
 	def execute( self, context ):
-		rmmesh = rmlib.rmMesh.GetActive( context )
-		if rmmesh is None:
-			return { 'CANCELLED' }
-
 		use_aspect = context.scene.rmkituv_props.uvtransformprops.uv_fit_aspect
 
 		if '0' in self.dir:
@@ -664,18 +613,16 @@ class MESH_OT_uvfit( bpy.types.Operator ):
 			target_bounds_max = mathutils.Vector( context.scene.rmkituv_props.uvtransformprops.uv_fit_bounds_max )
 		target_bounds_center = ( target_bounds_max + target_bounds_min ) * 0.5
 		
-		with rmmesh as rmmesh:
-			uvlayer = rmmesh.active_uv
-			
+		with editscope.MultiEditScope( rmlib.iter_edit_meshes( context ) ) as scopes:
 			#get loop groups	
-			groups = GetLoopGroups( context, rmmesh, uvlayer, 'l' in self.dir )
+			groups = GetMultiLoopGroups( context, scopes, 'l' in self.dir )
 			if len( groups ) == 0:
 				self.report( { 'ERROR' }, 'Nothing selected in UV View.' )
 				return { 'CANCELLED' }
 
 			for g in groups:
 				#compute the anchor pos
-				bbmin, bbmax = GetUVBounds( g, uvlayer )
+				bbmin, bbmax = GetGroupUVBounds( g )
 				bbcenter = ( bbmin + bbmax ) * 0.5
 				bbwidth = bbmax[0] - bbmin[0]
 				bbheight = bbmax[1] - bbmin[1]
@@ -712,25 +659,22 @@ class MESH_OT_uvfit( bpy.types.Operator ):
 
 				mat = trans_mat_inverse @ scl_mat @ trans_mat
 
-				if context.scene.rmkituv_props.uvtransformprops.uv_fit_movecontinuous:
-					g = g.group_vertices( element=True )[0]
-					g.add_overlapping_loops( True )
-
 				#transform loops
-				for l in g:
-					uv = mathutils.Vector( l[uvlayer].uv.copy() ).to_3d()
-					uv[2] = 1.0
-					uv = mat @ uv
-					l[uvlayer].uv = uv.to_2d()
+				for scope, uvlayer, loops in g:
+					for l in GetContinuousLoops( context, loops ):
+						uv = mathutils.Vector( l[uvlayer].uv.copy() ).to_3d()
+						uv[2] = 1.0
+						uv = mat @ uv
+						scope.set_uv( l[uvlayer], uv.to_2d() )
 					
-		return { 'FINISHED' }
+		return scopes.result()
 
 
 class MESH_OT_uvrandom( bpy.types.Operator ):
 	"""Randomize UV Selection."""
 	bl_idname = 'mesh.rm_uvrandom'
 	bl_label = 'Randomize Island Transforms'
-	bl_options = { 'UNDO' }
+	bl_options = { 'REGISTER', 'UNDO' }
 
 	flip_axis: bpy.props.EnumProperty(
 		name='Flip Axis',
@@ -757,69 +701,86 @@ class MESH_OT_uvrandom( bpy.types.Operator ):
 				context.active_object.type == 'MESH' and
 				context.object.data.is_editmode )
 
-	def execute( self, context ):
-		rmmesh = rmlib.rmMesh.GetActive( context )
-		if rmmesh is None:
-			return { 'CANCELLED' }
-
-		with rmmesh as rmmesh:
-			uvlayer = rmmesh.active_uv
-			
-			#get loop groups	
-			groups = GetLoopGroups( context, rmmesh, uvlayer, True )
-			if len( groups ) == 0:
-				self.report( { 'ERROR' }, 'Nothing selected in UV View.' )
-				return { 'CANCELLED' }
-			
-			for g in groups:
-				#compute the anchor pos
-				bbmin, bbmax = GetUVBounds( g, uvlayer )
-				bbcenter = ( bbmin + bbmax ) * 0.5
-				bbwidth = bbmax[0] - bbmin[0]
-				bbheight = bbmax[1] - bbmin[1]
-
-				trans_mat = mathutils.Matrix.Identity( 3 )
-				trans_mat[0][2] = bbcenter[0] * -1.0
-				trans_mat[1][2] = bbcenter[1] * -1.0
-				
-				trans_mat_inverse = mathutils.Matrix.Identity( 3 )
-				trans_mat_inverse[0][2] = bbcenter[0]
-				trans_mat_inverse[1][2] = bbcenter[1]
-				
-				u_sign = 1.0
-				if self.flip_axis == 'u' or self.flip_axis == 'uv':
-					u_sign = 1 if random.random() < 0.5 else -1
+	def random_affine( self, bbcenter ):
+		#2x3 random flip and rotation about bbcenter
+		trans_mat = mathutils.Matrix.Identity( 3 )
+		trans_mat[0][2] = bbcenter[0] * -1.0
+		trans_mat[1][2] = bbcenter[1] * -1.0
+		
+		trans_mat_inverse = mathutils.Matrix.Identity( 3 )
+		trans_mat_inverse[0][2] = bbcenter[0]
+		trans_mat_inverse[1][2] = bbcenter[1]
+		
+		u_sign = 1.0
+		if self.flip_axis == 'u' or self.flip_axis == 'uv':
+			u_sign = 1 if random.random() < 0.5 else -1
 
-				v_sign = 1.0
-				if self.flip_axis == 'v' or self.flip_axis == 'uv':
-					v_sign = 1 if random.random() < 0.5 else -1
+		v_sign = 1.0
+		if self.flip_axis == 'v' or self.flip_axis == 'uv':
+			v_sign = 1 if random.random() < 0.5 else -1
 
-				scl_mat = mathutils.Matrix.Identity( 3 )
-				scl_mat[0][0] = u_sign
-				scl_mat[1][1] = v_sign			
+		scl_mat = mathutils.Matrix.Identity( 3 )
+		scl_mat[0][0] = u_sign
+		scl_mat[1][1] = v_sign			
 
-				rot_mat = mathutils.Matrix.Identity( 3 )
-				if self.rot_step != 0.0:
-					theta = self.rot_step * math.floor( random.random() * 100.0 )
-					rot_mat[0][0] = math.cos( theta )
-					rot_mat[1][0] = math.sin( theta ) * -1.0
-					rot_mat[0][1] = math.sin( theta )
-					rot_mat[1][1] = math.cos( theta )
+		rot_mat = mathutils.Matrix.Identity( 3 )
+		if self.rot_step != 0.0:
+			theta = self.rot_step * math.floor( random.random() * 100.0 )
+			rot_mat[0][0] = math.cos( theta )
+			rot_mat[1][0] = math.sin( theta ) * -1.0
+			rot_mat[0][1] = math.sin( theta )
+			rot_mat[1][1] = math.cos( theta )
 
-				mat = trans_mat_inverse @ scl_mat @ rot_mat @ trans_mat
+		mat = trans_mat_inverse @ scl_mat @ rot_mat @ trans_mat
+		return ( mat[0][:], mat[1][:] )
 
-				#include continuous elems in transformation
-				g = g.group_vertices( element=True )[0]
-				g.add_overlapping_loops( True )
+	def execute( self, context ):
+		with editscope.MultiEditScope( rmlib.iter_edit_meshes( context ) ) as scopes:
+			uv_scopes = [ scope for scope in scopes if len( scope.rmmesh.bmesh.loops.layers.uv ) > 0 ]
+
+			#islands and their bbox centers only depend on the meshes, so redo panel tweaks reuse them
+			key = tuple( redocache.mesh_key( scope.rmmesh.object, scope.rmmesh.bmesh ) for scope in uv_scopes )
+			inputs = redocache.get( self, key )
+			if inputs is None:
+				inputs = []
+				for scope in uv_scopes:
+					rmmesh = scope.rmmesh
+					uvlayer = rmmesh.active_uv
+
+					#get loop groups	
+					loop_groups = []
+					centers = []
+					for g in GetLoopGroups( context, rmmesh, uvlayer, True ):
+						bbmin, bbmax = GetUVBounds( g, uvlayer )
+						centers.append( ( bbmin + bbmax ) * 0.5 )
+
+						#include continuous elems in transformation
+						g = g.group_vertices( element=True )[0]
+						g.add_overlapping_loops( True )
+						loop_groups.append( g )
+
+					rmmesh.bmesh.faces.index_update()
+					inputs.append( ( redocache.IslandLoops( loop_groups ), centers ) )
+
+				if sum( len( centers ) for islands, centers in inputs ) == 0:
+					self.report( { 'ERROR' }, 'Nothing selected in UV View.' )
+					return { 'CANCELLED' }
+				redocache.store( self, key, inputs )
+
+			for scope, ( islands, centers ) in zip( uv_scopes, inputs ):
+				if len( centers ) == 0:
+					continue
+				mats = [ self.random_affine( bbcenter ) for bbcenter in centers ]
 
 				#transform loops
-				for l in g:
-					uv = mathutils.Vector( l[uvlayer].uv.copy() ).to_3d()
-					uv[2] = 1.0
-					uv = mat @ uv
-					l[uvlayer].uv = uv.to_2d()
+				uvlayer = scope.rmmesh.active_uv
+				loops = islands.loops( scope.rmmesh.bmesh )
+				uvs = uvarray.gather_loop_uvs( loops, uvlayer )
+				uvarray.apply_affine( uvs, np.arange( len( loops ) ), islands.island_ids, mats )
+				for l, uv in zip( loops, uvs.tolist() ):
+					scope.set_uv( l[uvlayer], uv )
 					
-		return { 'FINISHED' }
+		return scopes.result()
 
 	def draw( self, context ):
 		layout= self.layout
@@ -847,7 +808,7 @@ class UV_PT_UVTransformTools( bpy.types.Panel ):
 		r.prop( context.scene.stateprops, 'uv_state_alt', toggle=1 )
 		layout.separator( factor=0.2 )
 
-		pcoll = preview_collections['main']
+		pcoll = get_icons()
 		flow = layout.grid_flow( columns=3, even_columns=True, align=True )
 
 		if context.scene.stateprops.uv_state_ctrl:
@@ -1152,6 +1113,15 @@ def load_icons():
 	pcoll.load( 'UV0', os.path.join( icons_dir, 'LV.png' ), 'IMAGE' )
 
 	preview_collections['main'] = pcoll
+	return pcoll
+
+
+def get_icons():
+	#the icons are only needed once the transform panel draws, so they are loaded then instead of in register()
+	pcoll = preview_collections.get( 'main' )
+	if pcoll is None:
+		pcoll = load_icons()
+	return pcoll
 
 class AnchorProps( bpy.types.PropertyGroup ):
 	uv_anchor_nw: bpy.props.BoolProperty( name='ANW', default=False, update=lambda self, context : anchor_update( self, context ) )
@@ -1170,8 +1140,6 @@ class StateProps( bpy.types.PropertyGroup ):
 	uv_state_alt: bpy.props.BoolProperty( name='Anchor', default=False, update=lambda self, context : state_update( self, context ) )
 	
 def register():
-	load_icons()
-
 	bpy.utils.register_class( AnchorProps )
 	bpy.utils.register_class( StateProps )
 	bpy.types.Scene.anchorprops = bpy.props.PointerProperty( type=AnchorProps )
@@ -0,0 +1,73 @@
+import numpy as np
+from . import islandlabel
+
+#uv verts: the loops of one mesh vert whose uvs coincide form a single uv vert, the way the uv editor welds them.
+#instead of walking vert.link_loops and comparing uvs with AlmostEqual_v2 for every query, the loops around a
+#region of verts are welded once ( islandlabel.weld_ids ) and every query becomes a lookup.
+
+
+class WeldIndex():
+	#snapshot of the uv verts around a set of mesh verts. uvs written after the index is built are not seen by it,
+	#so build it after any transform that precedes the queries.
+	#loop rows are positions in self.loops. uv vert w owns rows order[offsets[w]:offsets[w+1]].
+	__slots__ = ( 'loops', 'weld_ids', '__rows', '__order', '__offsets' )
+
+	def __init__( self, loops, vert_ids, uvs, epsilon=islandlabel.UV_EPSILON ):
+		self.loops = loops #(L,) BMLoop
+		self.__rows = { l : i for i, l in enumerate( loops ) }
+		if len( loops ) == 0:
+			self.weld_ids = []
+			self.__order = []
+			self.__offsets = [ 0 ]
+			return
+		ids, order, starts = islandlabel.group_ids( [ islandlabel.weld_ids( [ vert_ids ], uvs, epsilon ) ] )
+		self.weld_ids = ids.tolist() #(L,) uv vert id of each row
+		self.__order = order.tolist()
+		self.__offsets = starts.tolist() + [ len( loops ) ]
+
+	def __len__( self ):
+		return len( self.__offsets ) - 1
+
+	def __contains__( self, loop ):
+		return loop in self.__rows
+
+	def weld_id( self, loop ):
+		return self.weld_ids[self.__rows[loop]]
+
+	def welded( self, loop ):
+		#every loop of the uv vert of loop, loop included
+		w = self.weld_ids[self.__rows[loop]]
+		return [ self.loops[r] for r in self.__order[self.__offsets[w]:self.__offsets[w+1]] ]
+
+	def welded_count( self, loop ):
+		w = self.weld_ids[self.__rows[loop]]
+		return self.__offsets[w+1] - self.__offsets[w]
+
+	def coincident( self, l1, l2 ):
+		#True when l1 and l2 belong to the same uv vert. loops outside the index never coincide.
+		r1 = self.__rows.get( l1 )
+		r2 = self.__rows.get( l2 )
+		if r1 is None or r2 is None:
+			return False
+		return self.weld_ids[r1] == self.weld_ids[r2]
+
+
+def from_verts( verts, uvlayer ):
+	#WeldIndex over every loop of verts
+	verts = list( dict.fromkeys( verts ) )
+	loops = []
+	vert_ids = []
+	for i, v in enumerate( verts ):
+		for l in v.link_loops:
+			loops.append( l )
+			vert_ids.append( i )
+	uvs = np.array( [ tuple( l[uvlayer].uv ) for l in loops ], dtype=np.float64 ).reshape( -1, 2 )
+	return WeldIndex( loops, vert_ids, uvs )
+
+
+def from_loops( loops, uvlayer, next_verts=False ):
+	#WeldIndex over the verts of loops. with next_verts the verts at the far end of each loop's edge are included.
+	verts = [ l.vert for l in loops ]
+	if next_verts:
+		verts += [ l.link_loop_next.vert for l in loops ]
+	return from_verts( verts, uvlayer )